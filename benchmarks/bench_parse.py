@@ -0,0 +1,94 @@
+# benchmarks/bench_parse.py
+"""Parse latency and peak RSS: streaming extractor vs. the BeautifulSoup tree walk.
+
+Usage:
+    python -m benchmarks.bench_parse --sizes 1 10 40 --repeat 3
+
+Each (implementation, size) pair runs in a fresh interpreter so that
+``ru_maxrss`` reflects only that parse.
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from benchmarks.synthetic import inflate_page
+
+IMPLEMENTATIONS = ("soup", "stream")
+
+
+def _soup_parse_irs_data(html: str) -> dict:
+    """The tree-walking implementation parse_html used before the streaming extractor."""
+    from bs4 import BeautifulSoup
+    from tax_bracket_ingest.parser.parser import parse_table
+
+    soup = BeautifulSoup(html, "html.parser")
+    data = {}
+    for tag in soup.find_all(["h2", "h4", "table"]):
+        if tag.name in ["h2", "h4"]:
+            data[tag.get_text(strip=True)] = {}
+        elif data:
+            data[list(data.keys())[-1]]["table"] = parse_table(tag)
+    return {k: v for k, v in data.items() if v and any(v.values())}
+
+
+def _worker(impl: str, size_mb: float, repeat: int) -> dict:
+    from tax_bracket_ingest.parser.parser import parse_irs_data
+
+    parse = _soup_parse_irs_data if impl == "soup" else parse_irs_data
+    html = inflate_page(int(size_mb * 1024 * 1024))
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse(html)
+        timings.append(time.perf_counter() - start)
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "impl": impl,
+        "size_mb": size_mb,
+        "best_s": min(timings),
+        "peak_rss_delta_mb": (peak_kb - baseline_kb) / 1024,
+        "brackets": sum(len(v["table"]) for v in result.values()),
+    }
+
+
+def run(sizes, repeat):
+    results = []
+    for size_mb in sizes:
+        for impl in IMPLEMENTATIONS:
+            out = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_parse", "--worker", impl,
+                 "--sizes", str(size_mb), "--repeat", str(repeat)],
+                check=True, capture_output=True, text=True,
+            )
+            results.append(json.loads(out.stdout))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 10, 40],
+                        help="Synthetic page sizes in MiB")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--worker", choices=IMPLEMENTATIONS, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(_worker(args.worker, args.sizes[0], args.repeat)))
+        return
+
+    results = run(args.sizes, args.repeat)
+    print(f"{'impl':<8}{'size MiB':>10}{'best s':>10}{'peak RSS +MiB':>16}{'brackets':>10}")
+    for r in results:
+        print(f"{r['impl']:<8}{r['size_mb']:>10.1f}{r['best_s']:>10.3f}"
+              f"{r['peak_rss_delta_mb']:>16.1f}{r['brackets']:>10}")
+
+
+if __name__ == "__main__":
+    main()
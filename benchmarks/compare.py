@@ -0,0 +1,135 @@
+# benchmarks/compare.py
+"""Compare a pytest-benchmark JSON report against the stored baseline.
+
+Usage:
+    pytest benchmarks/test_pipeline.py --no-cov --benchmark-disable-gc --benchmark-json=run1.json  # x3
+    python -m benchmarks.compare run1.json run2.json run3.json  # exit 1 on a regression
+    python -m benchmarks.compare run1.json run2.json run3.json --update  # rewrite the baseline
+
+Each benchmark's median round is divided by the ``test_calibration``
+benchmark's median from the same run before they are compared, so a baseline
+recorded on one machine stays usable on a faster or slower CI runner. A
+benchmark regresses when its normalized time grows by more than
+``--threshold`` (a fraction; 0.75 = 75%). The fastest round is not used: on
+shared runners it swings by 2x between runs. Given several reports, each
+benchmark's median across them is used. One slow run on a noisy machine
+therefore cannot fail the check, and the same holds when recording a
+baseline. Benchmarks whose baseline is below ``--min-baseline`` (in
+calibration units) are reported but not gated: at microseconds, the
+scheduler noise is larger than any regression worth catching.
+"""
+import argparse
+import json
+import statistics
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+CALIBRATION = "test_calibration"
+DEFAULT_THRESHOLD = 0.75
+DEFAULT_MIN_BASELINE = 0.1
+DEFAULT_STAT = "median"
+
+
+class Comparison(NamedTuple):
+    name: str
+    baseline: Optional[float]
+    current: Optional[float]
+
+    @property
+    def ratio(self) -> Optional[float]:
+        if self.baseline is None or self.current is None:
+            return None
+        return self.current / self.baseline
+
+
+def relative_timings(report: dict, stat: str = DEFAULT_STAT) -> Dict[str, float]:
+    """Every benchmark's ``stat`` divided by the calibration benchmark's."""
+    timings = {bench["name"]: bench["stats"][stat] for bench in report["benchmarks"]}
+    calibration = timings.pop(CALIBRATION, None)
+    if not calibration:
+        raise ValueError(f"The report has no {CALIBRATION} benchmark to normalize against")
+    return {name: value / calibration for name, value in sorted(timings.items())}
+
+
+def combined_timings(reports: List[dict], stat: str = DEFAULT_STAT) -> Dict[str, float]:
+    """Per-benchmark median of ``relative_timings`` over several reports."""
+    runs = [relative_timings(report, stat) for report in reports]
+    names = sorted(set().union(*runs))
+    return {name: statistics.median(run[name] for run in runs if name in run) for name in names}
+
+
+def compare(baseline: Dict[str, float], current: Dict[str, float]) -> List[Comparison]:
+    return [
+        Comparison(name, baseline.get(name), current.get(name))
+        for name in sorted(baseline.keys() | current.keys())
+    ]
+
+
+def is_gated(comparison: Comparison, min_baseline: float) -> bool:
+    return comparison.baseline is not None and comparison.baseline >= min_baseline
+
+
+def regressions(comparisons: List[Comparison], threshold: float, min_baseline: float = 0.0) -> List[Comparison]:
+    return [
+        c for c in comparisons
+        if is_gated(c, min_baseline) and c.ratio is not None and c.ratio > 1 + threshold
+    ]
+
+
+def build_baseline(reports: List[dict], stat: str = DEFAULT_STAT) -> dict:
+    machine = reports[0].get("machine_info", {})
+    return {
+        "stat": stat,
+        "machine": {
+            "python": machine.get("python_version"),
+            "cpu": machine.get("cpu", {}).get("brand_raw"),
+        },
+        "runs": len(reports),
+        "benchmarks": combined_timings(reports, stat),
+    }
+
+
+def _format(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.3f}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("reports", type=Path, nargs="+", help="JSON written by --benchmark-json")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--min-baseline", type=float, default=DEFAULT_MIN_BASELINE,
+                        help="Only gate benchmarks at least this long, in calibration units")
+    parser.add_argument("--update", action="store_true", help="Write the report as the new baseline")
+    args = parser.parse_args(argv)
+
+    reports = [json.loads(path.read_text()) for path in args.reports]
+    if args.update:
+        args.baseline.write_text(json.dumps(build_baseline(reports), indent=2, sort_keys=True) + "\n")
+        print(f"Wrote {args.baseline}")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    comparisons = compare(baseline["benchmarks"], combined_timings(reports, baseline.get("stat", DEFAULT_STAT)))
+    failed = regressions(comparisons, args.threshold, args.min_baseline)
+
+    print(f"{'benchmark':<48}{'baseline':>10}{'current':>10}{'ratio':>8}")
+    for c in comparisons:
+        if c in failed:
+            flag = "  REGRESSION"
+        elif c.baseline is not None and not is_gated(c, args.min_baseline):
+            flag = "  (not gated)"
+        else:
+            flag = ""
+        print(f"{c.name:<48}{_format(c.baseline):>10}{_format(c.current):>10}{_format(c.ratio):>8}{flag}")
+    if failed:
+        print(f"{len(failed)} benchmark(s) slower than the baseline by more than {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
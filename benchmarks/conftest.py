@@ -0,0 +1,29 @@
+# benchmarks/conftest.py
+import pytest
+
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.storage import s3 as s3_clients
+from tax_bracket_ingest.storage.memory import reset_memory_stores
+
+
+@pytest.fixture(autouse=True)
+def ingest_env(monkeypatch):
+    """The same baseline environment as the test suite: no backend push, no real AWS, no log file."""
+    for name in ("AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "AWS_SECURITY_TOKEN", "AWS_SESSION_TOKEN"):
+        monkeypatch.setenv(name, "testing")
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("S3_BUCKET", "bench-bucket")
+    monkeypatch.setenv("S3_KEY", "history.csv")
+    monkeypatch.setenv("DRY_RUN", "0")
+    monkeypatch.setenv("ENABLE_BACKEND_PUSH", "0")
+    monkeypatch.setenv("LOG_TO_FILE", "0")
+    for name in ("FETCH_CACHE_S3_PREFIX", "FETCH_CACHE_DIR", "HISTORY_FORMAT", "HISTORY_CHUNK_ROWS",
+                 "STORAGE_BACKEND", "STORAGE_ROOT", "S3_ENDPOINT_URL"):
+        monkeypatch.delenv(name, raising=False)
+    run_ingest.get_ingest_config.cache_clear()
+    s3_clients.reset_s3_clients()
+    reset_memory_stores()
+    yield
+    run_ingest.get_ingest_config.cache_clear()
+    s3_clients.reset_s3_clients()
+    reset_memory_stores()
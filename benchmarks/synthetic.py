@@ -0,0 +1,114 @@
+# benchmarks/synthetic.py
+"""Generators for synthetic IRS-style pages used by the benchmarks."""
+from pathlib import Path
+
+SAMPLE_PAGE = Path(__file__).resolve().parent.parent / "tests" / "data" / "sample_page.html"
+
+NOISE_BLOCK = (
+    '<div class="nav"><ul>'
+    + "".join(f'<li><a href="/topic/{i}">Related topic {i}</a></li>' for i in range(20))
+    + "</ul><p>Archived content kept for reference. "
+    + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 8
+    + "</p></div>\n"
+)
+
+
+def inflate_page(target_bytes: int, page: str = None) -> str:
+    """Pad an IRS page with navigation-style noise until it reaches ``target_bytes``.
+
+    The bracket headers and tables are kept intact and placed at the end of the
+    body, the way archived IRS pages bury them under site chrome, so every
+    parser has to scan the whole document.
+    """
+    if page is None:
+        page = SAMPLE_PAGE.read_text(encoding="utf-8")
+    head, _, rest = page.partition("<body>")
+    body, _, tail = rest.partition("</body>")
+    missing = max(0, target_bytes - len(page))
+    repeats = missing // len(NOISE_BLOCK) + 1
+    return f"{head}<body>{NOISE_BLOCK * repeats}{body}</body>{tail}"
+
+
+PAGE_STATUS_HEADERS = (
+    "{year} tax rates for a single taxpayer",
+    "Married filing jointly or qualifying surviving spouse",
+    "Married filing separately",
+    "Head of household",
+)
+BASE_RATES = (10, 12, 22, 24, 32, 35, 37)
+BASE_STARTS = (0, 11601, 47151, 100526, 191951, 243726, 609351)
+
+
+def _brackets(year: int, status: int, brackets: int):
+    """``(rate, start)`` pairs for one status table, both strictly increasing.
+
+    Thresholds drift a little per year and per status so no two years hash
+    or normalize identically.
+    """
+    scale = 1 + (year - 1900) / 1000
+    extra = len(BASE_RATES) - 1
+    for i in range(brackets):
+        # Rates and starts keep rising past the seven real brackets; parsed
+        # tables are keyed by rate, so rates must stay unique.
+        rate = BASE_RATES[min(i, extra)] + max(0, i - extra)
+        base = BASE_STARTS[min(i, extra)] + 100000 * max(0, i - extra)
+        start = 0 if i == 0 else int(base * scale * (1 + status / 10)) + 1
+        yield rate, start
+
+
+def synthetic_raw_frame(year: int, brackets: int = 7):
+    """Raw ``Header``/``Rate``/``Range`` rows shaped like ``parse_irs_data_to_dataframe`` output."""
+    import pandas as pd
+
+    rows = []
+    for status, header in enumerate(PAGE_STATUS_HEADERS):
+        header = header.format(year=year)
+        rows.append((header, "Tax rate", "on taxable income from . . ."))
+        rows.extend((header, f"{rate}%", f"${start:,}") for rate, start in _brackets(year, status, brackets))
+    return pd.DataFrame(rows, columns=["Header", "Rate", "Range"])
+
+
+def synthetic_raw_history(years: int, first_year: int = 2024):
+    """``years`` raw frames, newest first."""
+    return [synthetic_raw_frame(first_year - i) for i in range(years)]
+
+
+def synthetic_page(year: int = 2024, statuses: int = 4, brackets: int = 7, page_bytes: int = 0) -> str:
+    """An IRS-style page with ``statuses`` filing-status tables of ``brackets`` rows each.
+
+    ``page_bytes`` pads the page with noise markup (see ``inflate_page``);
+    ``0`` leaves it as small as the tables allow.
+    """
+    if not 1 <= statuses <= len(PAGE_STATUS_HEADERS):
+        raise ValueError(f"statuses must be between 1 and {len(PAGE_STATUS_HEADERS)}")
+    sections = []
+    for status, header in enumerate(PAGE_STATUS_HEADERS[:statuses]):
+        pairs = list(_brackets(year, status, brackets))
+        ends = [f"${nxt - 1:,}" for _, nxt in pairs[1:]] + ["And up"]
+        rows = "".join(
+            f"<tr><td>{rate}%</td><td>${start:,}</td><td>{end}</td></tr>\n"
+            for (rate, start), end in zip(pairs, ends)
+        )
+        sections.append(
+            f"<h2>{header.format(year=year)}</h2>\n<table><thead><tr><th>Tax rate</th>"
+            f"<th>on taxable income from . . .</th><th>up to . . .</th></tr></thead>\n"
+            f"<tbody>\n{rows}</tbody></table>\n"
+        )
+    page = (
+        f'<!DOCTYPE html>\n<html lang="en">\n<head><meta charset="UTF-8">'
+        f"<title>IRS {year} Tax Brackets</title></head>\n<body>\n{''.join(sections)}</body>\n</html>\n"
+    )
+    return inflate_page(page_bytes, page) if page_bytes > len(page) else page
+
+
+def synthetic_history(years: int, first_year: int = 2024, brackets: int = 7):
+    """A normalized wide history of ``years`` years, newest first, as stored in ``history.csv``."""
+    import pandas as pd
+
+    from tax_bracket_ingest.parser.normalize import process_irs_dataframe
+
+    stacked = pd.concat(
+        [synthetic_raw_frame(first_year - i, brackets).assign(Year=first_year - i) for i in range(years)],
+        ignore_index=True,
+    )
+    return process_irs_dataframe(stacked)
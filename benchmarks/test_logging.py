@@ -0,0 +1,91 @@
+# benchmarks/test_logging.py
+"""Logging overhead per ingest run, with synchronous and queued handlers.
+
+Run with:
+    pytest benchmarks/test_logging.py --no-cov -p no:logging --benchmark-group-by=group
+
+``-p no:logging`` keeps pytest's own capture handler off the root logger, where
+it would format every record in every mode.
+
+Each mode logs at DEBUG (``ENV=dev``) to stdout and a log file under
+``tmp_path``. ``off`` leaves the root logger at WARNING with no handlers,
+``sync`` is the default ``setup_logging``, ``async`` sets ``LOG_ASYNC=1`` and
+``async-sampled`` also sets ``LOG_DEBUG_SAMPLE_EVERY=100``. Every round ends with
+``flush_logging``, as the Lambda handler does, so queued records are counted.
+The ``logging-records`` group logs 5,000 debug events with extras from one thread; the
+``logging-main`` group runs ``main`` on the memory backend with a 50-year history.
+"""
+import logging
+
+import pytest
+
+from benchmarks.synthetic import synthetic_history, synthetic_page
+from tax_bracket_ingest import logging_config, run_ingest
+from tax_bracket_ingest.storage.base import write_csv
+from tax_bracket_ingest.storage.manifest import Manifest
+
+MODES = {
+    "off": None,
+    "sync": {},
+    "async": {"LOG_ASYNC": "1"},
+    "async-sampled": {"LOG_ASYNC": "1", "LOG_DEBUG_SAMPLE_EVERY": "100"},
+}
+RECORDS = 5_000
+HISTORY_YEARS = 50
+PAGE_YEAR = 2024
+
+
+@pytest.fixture(params=list(MODES))
+def log_mode(request, monkeypatch, tmp_path):
+    root = logging.getLogger()
+    logging_config.reset_logging()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    root.handlers[:] = []
+    if MODES[request.param] is None:
+        root.setLevel(logging.WARNING)
+    else:
+        monkeypatch.setenv("ENV", "dev")
+        monkeypatch.setenv("LOG_TO_FILE", "1")
+        monkeypatch.setenv("LOG_PATH", str(tmp_path / "bench.log"))
+        for name, value in MODES[request.param].items():
+            monkeypatch.setenv(name, value)
+        logging_config.setup_logging()
+    yield request.param
+    logging_config.reset_logging()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+@pytest.mark.benchmark(group="logging-records")
+def test_debug_records(benchmark, log_mode):
+    log = logging.getLogger("tax_bracket_ingest.bench")
+
+    def emit():
+        for i in range(RECORDS):
+            log.debug("row_parsed", extra={"row": i, "status": "S", "action": "Parsed bracket row"})
+        logging_config.flush_logging()
+
+    benchmark.pedantic(emit, rounds=10, warmup_rounds=1, iterations=1)
+
+
+@pytest.mark.benchmark(group="logging-main")
+def test_main(benchmark, log_mode, monkeypatch):
+    monkeypatch.setenv("STORAGE_BACKEND", "memory")
+    run_ingest.get_ingest_config.cache_clear()
+    storage = run_ingest.get_storage()
+    html = synthetic_page(PAGE_YEAR).encode("utf-8")
+    monkeypatch.setattr(run_ingest, "fetch_irs_data", lambda: html)
+    history = synthetic_history(HISTORY_YEARS, first_year=PAGE_YEAR - 1)
+    manifest_json = Manifest.from_history(history).to_json().encode("utf-8")
+
+    def seed():
+        write_csv(storage, "history.csv", history)
+        storage.write("history.manifest.json", manifest_json)
+
+    def run():
+        run_ingest.main()
+        logging_config.flush_logging()
+
+    benchmark.pedantic(run, setup=seed, rounds=20, warmup_rounds=1, iterations=1)
+
+    assert len(storage.read("history.csv").splitlines()) == 1 + 7 * (HISTORY_YEARS + 1)
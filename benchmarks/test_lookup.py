@@ -0,0 +1,73 @@
+# benchmarks/test_lookup.py
+"""Marginal rate and tax lookups for 10M incomes against a 100-year history.
+
+Run with:
+    pytest benchmarks/test_lookup.py --no-cov --benchmark-group-by=group
+
+``scalar`` is the per-income Python loop the index replaces, timed on 100k
+incomes only; multiply by 100 to compare with the 10M-income cases.
+"""
+import bisect
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import synthetic_history
+from tax_bracket_ingest.lookup import BracketIndex
+
+INCOMES = 10_000_000
+SCALAR_INCOMES = 100_000
+YEARS = 100
+
+
+@pytest.fixture(scope="module")
+def history():
+    return synthetic_history(YEARS)
+
+
+@pytest.fixture(scope="module")
+def index(history):
+    return BracketIndex.from_wide(history)
+
+
+@pytest.fixture(scope="module")
+def incomes():
+    rng = np.random.default_rng(0)
+    return rng.lognormal(mean=11, sigma=1, size=INCOMES)
+
+
+def scalar_tax_owed(incomes, schedule):
+    """One ``bisect`` and a few float ops per income, in Python."""
+    thresholds = schedule.thresholds.tolist()
+    rates, base_tax = schedule.rates.tolist(), schedule.base_tax.tolist()
+    out = []
+    for income in incomes:
+        i = max(bisect.bisect_left(thresholds, income) - 1, 0)
+        out.append(max(base_tax[i] + (income - thresholds[i]) * rates[i], 0.0))
+    return out
+
+
+@pytest.mark.benchmark(group="lookup-build")
+def test_build_index(benchmark, history):
+    index = benchmark(BracketIndex.from_wide, history)
+    assert len(index.schedules) == YEARS * 4
+
+
+@pytest.mark.benchmark(group="lookup-10M")
+def test_marginal_rate(benchmark, index, incomes):
+    rates = benchmark(index.marginal_rate, incomes, 2024, "S")
+    assert rates.shape == incomes.shape
+
+
+@pytest.mark.benchmark(group="lookup-10M")
+def test_tax_owed(benchmark, index, incomes):
+    tax = benchmark(index.tax_owed, incomes, 2024, "MFJ")
+    sample = incomes[:: INCOMES // 1000]
+    np.testing.assert_allclose(tax[:: INCOMES // 1000], scalar_tax_owed(sample, index.schedule(2024, "MFJ")))
+
+
+@pytest.mark.benchmark(group="lookup-10M")
+def test_scalar_tax_owed_100k(benchmark, index, incomes):
+    schedule = index.schedule(2024, "MFJ")
+    sample = incomes[:SCALAR_INCOMES].tolist()
+    benchmark(scalar_tax_owed, sample, schedule)
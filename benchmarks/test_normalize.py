@@ -0,0 +1,87 @@
+# benchmarks/test_normalize.py
+"""Normalization throughput over a 100-year synthetic history.
+
+Run with:
+    pytest benchmarks/test_normalize.py --benchmark-group-by=group
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_raw_history
+from tax_bracket_ingest.parser.normalize import drop_one_duplicate, normalize_long, process_irs_dataframe
+
+YEARS = 100
+
+
+def legacy_process_irs_dataframe(df):
+    """process_irs_dataframe before vectorization: iloc slices, concat, per-column apply."""
+    status_rates = {
+        "Married Filing Jointly (Rates/Brackets)": (9, 16, 'MFJ Range Start'),
+        "Married Filing Separately (Rates/Brackets)": (17, 24, 'MFS Range Start'),
+        "Single Filer (Rates/Brackets)": (1, 8, 'S Range Start'),
+        "Head of Household (Rates/Brackets)": (25, 32, 'HOH Range Start'),
+    }
+    year = int(df['Header'][0].split(' ')[0])
+    rows = []
+    for status, (start, end, name) in status_rates.items():
+        sub_row = df.iloc[start:end, 1:4].copy()
+        sub_row.insert(0, 'Year', year)
+        sub_row.rename(columns={sub_row.columns[1]: status, sub_row.columns[2]: name}, inplace=True)
+        rows.append(sub_row.reset_index(drop=True))
+    merged_df = drop_one_duplicate(pd.concat(rows, axis=1), 'Year')
+    for col in [c for c in merged_df.columns if c.endswith("Range Start")]:
+        numeric_start = (
+            merged_df[col].astype(str).str.replace(r'[^\d.]', '', regex=True)
+            .replace(r'^\s*$', np.nan, regex=True).astype(float)
+        )
+        formatted_end = (numeric_start.shift(-1) - 1).apply(
+            lambda x: f"${int(x):,}" if pd.notnull(x) else np.nan
+        )
+        merged_df.insert(merged_df.columns.get_loc(col) + 1, col.replace("Start", "End"), formatted_end)
+    return merged_df
+
+
+@pytest.fixture(scope="module")
+def raw_history():
+    return synthetic_raw_history(YEARS)
+
+
+def _wide_history(raw_frames, normalize):
+    return pd.concat([normalize(raw) for raw in raw_frames], ignore_index=True)
+
+
+@pytest.mark.benchmark(group="wide-100y")
+def test_legacy_wide(benchmark, raw_history):
+    benchmark(_wide_history, raw_history, legacy_process_irs_dataframe)
+
+
+@pytest.mark.benchmark(group="wide-100y")
+def test_vectorized_wide(benchmark, raw_history):
+    result = benchmark(_wide_history, raw_history, process_irs_dataframe)
+    pd.testing.assert_frame_equal(result, _wide_history(raw_history, legacy_process_irs_dataframe))
+
+
+@pytest.mark.benchmark(group="long-100y")
+def test_vectorized_long(benchmark, raw_history):
+    result = benchmark(_wide_history, raw_history, normalize_long)
+    assert len(result) == YEARS * 4 * 7
+
+
+@pytest.fixture(scope="module")
+def stacked_history(raw_history):
+    return pd.concat(
+        [raw.assign(Year=2024 - i) for i, raw in enumerate(raw_history)], ignore_index=True
+    )
+
+
+@pytest.mark.benchmark(group="long-100y")
+def test_bulk_long(benchmark, stacked_history, raw_history):
+    result = benchmark(normalize_long, stacked_history)
+    pd.testing.assert_frame_equal(result, _wide_history(raw_history, normalize_long))
+
+
+@pytest.mark.benchmark(group="wide-100y")
+def test_bulk_wide(benchmark, stacked_history, raw_history):
+    result = benchmark(process_irs_dataframe, stacked_history)
+    pd.testing.assert_frame_equal(result, _wide_history(raw_history, legacy_process_irs_dataframe))
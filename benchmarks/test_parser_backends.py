@@ -0,0 +1,47 @@
+# benchmarks/test_parser_backends.py
+"""pytest-benchmark suite comparing every installed parser backend.
+
+Run with:
+    pytest benchmarks/test_parser_backends.py --benchmark-group-by=param:page
+"""
+import pytest
+
+from benchmarks.synthetic import SAMPLE_PAGE, inflate_page
+from tax_bracket_ingest.parser.backends import BACKENDS, available_backends
+from tax_bracket_ingest.parser.parser import parse_irs_data
+
+PAGES = {
+    "fixture": lambda: SAMPLE_PAGE.read_text(encoding="utf-8"),
+    "1MiB": lambda: inflate_page(1024 * 1024),
+    "25MiB": lambda: inflate_page(25 * 1024 * 1024),
+}
+
+_page_cache = {}
+
+
+def _page(name):
+    if name not in _page_cache:
+        _page_cache[name] = PAGES[name]()
+    return _page_cache[name]
+
+
+@pytest.fixture(scope="module")
+def expected():
+    # html.parser is always installed and is checked against the original
+    # BeautifulSoup walk in tests/unit/test_stream.py.
+    return parse_irs_data(_page("fixture"), backend="html.parser")
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+@pytest.mark.parametrize("page", list(PAGES))
+def test_parse_backend(benchmark, backend, page, expected):
+    if backend not in available_backends():
+        pytest.skip(f"{backend} is not installed")
+    html = _page(page)
+    rounds = 3 if len(html) > 10 * 1024 * 1024 else 10
+
+    result = benchmark.pedantic(
+        parse_irs_data, args=(html,), kwargs={"backend": backend}, rounds=rounds, iterations=1
+    )
+
+    assert result == expected
@@ -0,0 +1,138 @@
+# benchmarks/test_pipeline.py
+"""End-to-end pipeline benchmarks over synthetic IRS pages and histories.
+
+Run with:
+    pytest benchmarks/test_pipeline.py --no-cov --benchmark-disable-gc --benchmark-json=benchmark.json
+    python -m benchmarks.compare benchmark.json
+
+Parsing and normalization are timed per page shape (statuses x brackets,
+optionally padded with noise markup); ``main`` is timed against moto, the
+local-disk backend and the in-memory backend for histories of 1 to 200 years.
+"""
+import pandas as pd
+import pytest
+from moto import mock_aws
+
+from benchmarks.synthetic import SAMPLE_PAGE, synthetic_history, synthetic_page
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.parser.normalize import process_irs_dataframe
+from tax_bracket_ingest.parser.parser import parse_irs_brackets, parse_irs_data, parse_irs_data_to_dataframe
+from tax_bracket_ingest.storage.base import Storage, write_csv
+from tax_bracket_ingest.storage.manifest import Manifest
+from tax_bracket_ingest.storage.s3 import S3Storage, get_s3_client
+
+PAGES = {
+    "fixture": lambda: SAMPLE_PAGE.read_text(encoding="utf-8"),
+    "1x7": lambda: synthetic_page(statuses=1),
+    "4x7": lambda: synthetic_page(),
+    "4x60": lambda: synthetic_page(brackets=60),
+    "4x7-1MiB": lambda: synthetic_page(page_bytes=1024 * 1024),
+}
+HISTORY_YEARS = (1, 50, 200)
+BULK_PAGES = 100
+PAGE_YEAR = 2024
+
+_page_cache = {}
+
+
+def _page(name):
+    if name not in _page_cache:
+        _page_cache[name] = PAGES[name]()
+    return _page_cache[name]
+
+
+@pytest.mark.benchmark(group="calibration")
+def test_calibration(benchmark):
+    """Fixed pure-Python work; ``benchmarks.compare`` divides every timing by it."""
+    benchmark(lambda: sum(i * i for i in range(200_000)))
+
+
+@pytest.mark.benchmark(group="parse_irs_data")
+@pytest.mark.parametrize("page", list(PAGES))
+def test_parse_irs_data(benchmark, page):
+    html = _page(page)
+    result = benchmark(parse_irs_data, html)
+    assert result
+
+
+@pytest.mark.benchmark(group="parse_irs_data_to_dataframe")
+@pytest.mark.parametrize("page", list(PAGES))
+def test_parse_irs_data_to_dataframe(benchmark, page):
+    irs_data = parse_irs_data(_page(page))
+    df = benchmark(parse_irs_data_to_dataframe, irs_data)
+    assert len(df) > 0
+
+
+@pytest.mark.benchmark(group="parse_irs_brackets")
+@pytest.mark.parametrize("page", list(PAGES))
+def test_parse_irs_brackets(benchmark, page):
+    html = _page(page)
+    df = benchmark(lambda: parse_irs_brackets(html).to_frame())
+    pd.testing.assert_frame_equal(df, parse_irs_data_to_dataframe(parse_irs_data(html)))
+
+
+@pytest.fixture(scope="module")
+def bulk_pages():
+    return [synthetic_page(PAGE_YEAR - i) for i in range(BULK_PAGES)]
+
+
+def records_frame(irs_data):
+    """parse_irs_data_to_dataframe before BracketTable: one dict per row, then DataFrame(rows)."""
+    rows = []
+    for header, content in irs_data.items():
+        if 'table' in content:
+            for key, value in content['table'].items():
+                rows.append({'Header': header, 'Rate': key, 'Range': value})
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.benchmark(group="bulk-pages")
+@pytest.mark.parametrize("path", ["records", "columns"])
+def test_bulk_pages_to_frame(benchmark, bulk_pages, path):
+    parsed = [parse_irs_data(html) for html in bulk_pages]
+    convert = records_frame if path == "records" else parse_irs_data_to_dataframe
+    frames = benchmark(lambda: [convert(irs_data) for irs_data in parsed])
+    assert sum(map(len, frames)) == BULK_PAGES * 4 * 8
+
+
+@pytest.mark.benchmark(group="process_irs_dataframe")
+@pytest.mark.parametrize("page", list(PAGES))
+def test_process_irs_dataframe(benchmark, page):
+    raw = parse_irs_data_to_dataframe(parse_irs_data(_page(page)))
+    df = benchmark(process_irs_dataframe, raw)
+    assert df["Year"].iloc[0] == PAGE_YEAR
+
+
+@pytest.fixture(params=["moto", "local", "memory"])
+def storage(request, monkeypatch, tmp_path):
+    if request.param == "moto":
+        with mock_aws():
+            get_s3_client().create_bucket(Bucket="bench-bucket")
+            yield S3Storage("bench-bucket")
+        return
+    monkeypatch.setenv("STORAGE_BACKEND", request.param)
+    monkeypatch.setenv("STORAGE_ROOT", str(tmp_path))
+    run_ingest.get_ingest_config.cache_clear()
+    yield run_ingest.get_storage()
+
+
+def _seed(storage: Storage, history, manifest_json: bytes):
+    write_csv(storage, "history.csv", history)
+    storage.write("history.manifest.json", manifest_json)
+
+
+@pytest.mark.benchmark(group="main")
+@pytest.mark.parametrize("years", HISTORY_YEARS, ids=lambda years: f"{years}y")
+def test_main(benchmark, storage, monkeypatch, years):
+    html = synthetic_page(PAGE_YEAR).encode("utf-8")
+    monkeypatch.setattr(run_ingest, "fetch_irs_data", lambda: html)
+    history = synthetic_history(years, first_year=PAGE_YEAR - 1)
+    manifest_json = Manifest.from_history(history).to_json().encode("utf-8")
+
+    # Reseed before every round so each run appends the new year to the same history
+    benchmark.pedantic(
+        run_ingest.main, setup=lambda: _seed(storage, history, manifest_json),
+        rounds=20, warmup_rounds=1, iterations=1,
+    )
+
+    assert len(storage.read("history.csv").splitlines()) == 1 + 7 * (years + 1)
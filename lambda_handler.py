@@ -1,10 +1,33 @@
 # lambda_handler.py
-from tax_bracket_ingest.run_ingest import main, is_dry_run
+from tax_bracket_ingest.config import get_ingest_mode, is_dry_run
+from tax_bracket_ingest.runtime import flush_logs, init_runtime
 
 def handler(event, context):
+    init_runtime()
+    try:
+        return _handle(event)
+    finally:
+        flush_logs()
+
+
+def _handle(event):
+    if isinstance(event, dict) and event.get("Records"):
+        # SQS messages or S3 notifications: run each record as a job, report failures per record
+        from tax_bracket_ingest.worker.events import handle_records
+
+        return handle_records(event["Records"])
+
     if is_dry_run():
         print("Dry run enabled via DRY_RUN env var - backend and S3 writes are skipped.")
     print("Starting tax bracket ingestion process...")
     
+    # Imported here so the Lambda init phase does not pay for pandas/boto3/requests
+    mode = get_ingest_mode()
+    if mode == "async":
+        from tax_bracket_ingest.async_ingest import main
+    elif mode == "sources":
+        from tax_bracket_ingest.sources.scheduler import main
+    else:
+        from tax_bracket_ingest.run_ingest import main
     main()
     return {"statusCode": 200, "body": "Ingestion completed successfully."}
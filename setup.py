@@ -14,5 +14,10 @@ setup(
         "python-json-logger==3.3.0",
         "requests==2.32.4",
     ],
+    extras_require={
+        "parsers": ["lxml==6.1.3", "selectolax==1.0.0"],
+        "parquet": ["pyarrow==20.0.0"],
+        "compression": ["zstandard==0.23.0"],
+    },
     description='A package to scrape, parse, and normalize IRS tax bracket data.'
 )
@@ -0,0 +1,190 @@
+# tax_bracket_ingest/async_ingest.py
+"""Async variant of ``run_ingest.main`` that overlaps network round-trips.
+
+The IRS fetch runs alongside the S3 manifest/history read, and the backend
+push runs alongside the S3 history write. The blocking ``requests``/``boto3``
+calls from ``run_ingest`` run on worker threads via ``asyncio.to_thread``,
+bounded by a semaphore. A failure in one branch cancels its siblings. A call
+that is already in flight on a worker thread still finishes, but its result is
+discarded. The writes only start once every read has succeeded.
+
+Usage:
+    python -m tax_bracket_ingest.async_ingest
+    INGEST_MODE=async   # makes lambda_handler.handler use this pipeline
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.metrics import recording
+from tax_bracket_ingest.run_ingest import IngestConfig
+
+logger = logging.getLogger(__name__)
+
+INGEST_CONCURRENCY_ENV = "INGEST_MAX_CONCURRENCY"
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+def get_max_concurrency() -> int:
+    raw = os.getenv(INGEST_CONCURRENCY_ENV)
+    value = int(raw) if raw else DEFAULT_MAX_CONCURRENCY
+    if value < 1:
+        raise ValueError(f"{INGEST_CONCURRENCY_ENV} must be at least 1, got {value}")
+    return value
+
+
+class StageTimer:
+    """Collects wall-clock milliseconds per named stage."""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextlib.asynccontextmanager
+    async def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - start) * 1000, 3)
+
+
+class _Pipeline:
+    def __init__(self, config: IngestConfig, dry_run: bool, max_concurrency: int, snapshots=None):
+        self.config = config
+        self.dry_run = dry_run
+        self.snapshots = snapshots
+        self.limit = asyncio.Semaphore(max_concurrency)
+        self.timer = StageTimer()
+
+    async def blocking(self, fn, *args, **kwargs):
+        async with self.limit:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def timed(self, name: str, fn, *args, **kwargs):
+        async with self.timer.stage(name):
+            return await self.blocking(fn, *args, **kwargs)
+
+    async def read_stored(self):
+        """The manifest, plus the CSV history when no manifest exists yet and merges run in memory."""
+        if self.dry_run:
+            return None, None
+        async with self.timer.stage("read_history"):
+            manifest = await self.blocking(run_ingest.read_manifest_from_s3, config=self.config)
+            prev_hist = None
+            in_memory = self.config.history_format == "csv" and not run_ingest.get_history_chunk_rows()
+            if manifest is None and in_memory:
+                prev_hist = await self.blocking(
+                    run_ingest.read_csv_from_s3, self.config.s3_key, config=self.config
+                )
+            return manifest, prev_hist
+
+    async def run(self, cache) -> Optional[dict]:
+        async def fetch():
+            html = await self.blocking(run_ingest.replay_page, self.snapshots)
+            if html is not None:
+                return html, None
+            html, fetch_result = await self.timed("fetch", run_ingest.fetch_page, cache)
+            if html is None:
+                stored_task.cancel()  # an unchanged page needs nothing from S3
+                return html, fetch_result
+            await self.blocking(run_ingest.archive_page, self.snapshots, html)
+            return html, fetch_result
+
+        async with asyncio.TaskGroup() as tg:
+            stored_task = tg.create_task(self.read_stored())
+            fetch_task = tg.create_task(fetch())
+
+        html, fetch_result = fetch_task.result()
+        if html is None:
+            await self.blocking(run_ingest.refresh_validators, cache, fetch_result, self.dry_run)
+            return None
+        manifest, prev_hist = stored_task.result()
+        curr_df = await self.timed("parse", run_ingest.normalize_html, html, self.snapshots)
+        if self.dry_run:
+            update = run_ingest.dry_run_update(curr_df)
+        else:
+            update = await self.timed(
+                "plan", run_ingest.plan_history_update, curr_df, manifest, self.config, prev_hist
+            )
+
+        async with self.timer.stage("publish"):
+            async with asyncio.TaskGroup() as tg:
+                push_task = tg.create_task(
+                    self.timed("backend_push", run_ingest.push_current, curr_df, self.dry_run)
+                )
+                tg.create_task(self.timed(
+                    "write_history", run_ingest.write_history_update, update, self.config, self.dry_run
+                ))
+        run_ingest.remember_page(cache, fetch_result, self.dry_run, push_task.result())
+        return self.timer.timings
+
+
+async def run_async(
+    config: Optional[IngestConfig] = None,
+    dry_run: Optional[bool] = None,
+    max_concurrency: Optional[int] = None,
+) -> Dict[str, float]:
+    """Run one ingest with overlapping I/O.
+
+    Args:
+        config (Optional[IngestConfig]): Defaults to ``get_ingest_config()``.
+        dry_run (Optional[bool]): Defaults to the ``DRY_RUN`` env var.
+        max_concurrency (Optional[int]): Blocking calls allowed in flight at
+            once; defaults to ``INGEST_MAX_CONCURRENCY`` or 4.
+
+    Returns:
+        Dict[str, float]: Milliseconds spent per stage, plus ``total``.
+    """
+    start = time.perf_counter()
+    if dry_run is None:
+        dry_run = run_ingest.is_dry_run()
+    if config is None:
+        config = run_ingest.get_ingest_config()
+    if max_concurrency is None:
+        max_concurrency = get_max_concurrency()
+    run_ingest.log_dry_run(dry_run)
+
+    pipeline = _Pipeline(config, dry_run, max_concurrency, run_ingest.get_snapshot_cache(config, dry_run))
+    cache = run_ingest.get_fetch_cache(config)
+    with recording() as recorder:
+        try:
+            timings = await pipeline.run(cache)
+        except ExceptionGroup as group:
+            # Surface the failing stage's own exception, like the sync main does
+            if len(group.exceptions) == 1:
+                raise group.exceptions[0] from None
+            raise
+        finally:
+            await asyncio.to_thread(run_ingest.close_snapshots, pipeline.snapshots)
+    if timings is None:
+        return pipeline.timer.timings
+
+    timings["total"] = round((time.perf_counter() - start) * 1000, 3)
+    logger.info("ingest_complete", extra={
+        "stage_ms": timings,
+        "stages": recorder.summary(),
+        "action": "Ingest process completed successfully",
+    })
+    return timings
+
+
+def main():
+    return asyncio.run(run_async())
+
+
+if __name__ == "__main__":
+    from tax_bracket_ingest.runtime import init_runtime
+
+    init_runtime()
+    logger.info("starting_ingest", extra={"action": "Starting async ingest process"})
+    try:
+        main()
+    except Exception:
+        logger.exception("ingest_error", extra={"action": "Error during async ingest process"})
+        raise
+    finally:
+        logger.info("ingest_finished", extra={"action": "Ingest process finished"})
@@ -0,0 +1 @@
+# tax_bracket_ingest/backend/__init__.py
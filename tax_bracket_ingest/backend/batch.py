@@ -0,0 +1,317 @@
+# tax_bracket_ingest/backend/batch.py
+"""Batched, resumable backend upload for frames too large for one POST.
+
+The frame is cut into standalone CSV batches (each with the header) of at
+most ``max_bytes``. Boundaries depend only on row sizes, so the same frame
+always yields the same batches. Each batch carries an ``Idempotency-Key``
+derived from its position and content. A retried or resumed batch is
+therefore recognisable to the backend, which makes retrying POSTs safe.
+
+A checkpoint records the keys the backend has accepted. A rerun skips those
+and sends only what is missing or changed. Keys are stored per scope, the
+years a frame covers, so the daily push and a backfill sharing a checkpoint
+keep each other's progress. Pushing a scope again drops its keys that the
+new frame no longer produces, so the checkpoint does not grow without bound.
+The checkpoint is saved every ``checkpoint_every`` accepted batches or
+``checkpoint_interval`` seconds, and once when the push ends or fails.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Protocol, Set, Tuple, runtime_checkable
+
+import pandas as pd
+
+from tax_bracket_ingest.backend.response import handle_backend_response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RETRIES = 3
+DEFAULT_CHECKPOINT_EVERY = 50
+DEFAULT_CHECKPOINT_INTERVAL = 30.0
+_SIZE_SAMPLE_ROWS = 1000
+
+
+@dataclass(frozen=True)
+class Batch:
+    index: int
+    start: int
+    stop: int
+    body: bytes
+
+    @property
+    def rows(self) -> int:
+        return self.stop - self.start
+
+    @property
+    def key(self) -> str:
+        digest = hashlib.sha256(f"{self.index}:".encode("utf-8"))
+        digest.update(self.body)
+        return digest.hexdigest()
+
+
+def _csv(df: pd.DataFrame, start: int, stop: int) -> bytes:
+    return df.iloc[start:stop].to_csv(index=False).encode("utf-8")
+
+
+def iter_batches(df: pd.DataFrame, max_bytes: int = DEFAULT_MAX_BYTES) -> Iterator[Batch]:
+    """Split ``df`` into CSV batches no larger than ``max_bytes``, serialized lazily.
+
+    Rows per batch are estimated from the first rows, and a batch that still
+    comes out too large is halved until it fits.
+    """
+    header = len(df.iloc[:0].to_csv(index=False).encode("utf-8"))
+    if max_bytes <= header:
+        raise ValueError(f"max_bytes={max_bytes} cannot hold the {header}-byte CSV header")
+    sample = min(len(df), _SIZE_SAMPLE_ROWS)
+    row_bytes = (len(_csv(df, 0, sample)) - header) / sample if sample else 1
+    rows_per_batch = max(1, int((max_bytes - header) // max(row_bytes, 1)))
+
+    index = start = 0
+    while start < len(df):
+        stop = min(len(df), start + rows_per_batch)
+        body = _csv(df, start, stop)
+        while len(body) > max_bytes and stop - start > 1:
+            stop = start + (stop - start) // 2
+            body = _csv(df, start, stop)
+        if len(body) > max_bytes:
+            raise ValueError(f"Row {start} alone is {len(body)} bytes, above max_bytes={max_bytes}")
+        yield Batch(index, start, stop, body)
+        index += 1
+        start = stop
+
+
+@runtime_checkable
+class PushCheckpoint(Protocol):
+    """Persistent set of batch keys the backend has accepted."""
+
+    def load(self) -> Set[str]:
+        """Every stored key; empty when nothing was saved yet."""
+        ...
+
+    def save(self, keys: Set[str]) -> None:
+        """Replace the stored keys with ``keys``."""
+        ...
+
+
+def checkpoint_scope(df: pd.DataFrame) -> str:
+    """Checkpoint scope of a frame: the years it covers, e.g. ``Year=2023,2024``."""
+    if "Year" not in df.columns:
+        return "all"
+    return "Year=" + ",".join(str(year) for year in sorted(df["Year"].unique().tolist()))
+
+
+def _checkpoint_json(keys: Set[str]) -> str:
+    return json.dumps({"completed": sorted(keys)})
+
+
+class LocalPushCheckpoint:
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Set[str]:
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                return set(json.load(fh)["completed"])
+        except FileNotFoundError:
+            return set()
+
+    def save(self, keys: Set[str]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(_checkpoint_json(keys))
+        os.replace(tmp_path, self.path)
+
+
+class S3PushCheckpoint:
+    def __init__(self, bucket: str, key: str, client=None):
+        self.bucket = bucket
+        self.key = key
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from tax_bracket_ingest.storage.s3 import get_s3_client
+            self._client = get_s3_client()
+        return self._client
+
+    def load(self) -> Set[str]:
+        try:
+            resp = self.client.get_object(Bucket=self.bucket, Key=self.key)
+        except self.client.exceptions.NoSuchKey:
+            return set()
+        return set(json.loads(resp["Body"].read())["completed"])
+
+    def save(self, keys: Set[str]) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self.key,
+            Body=_checkpoint_json(keys).encode("utf-8"),
+            ContentType="application/json",
+        )
+
+
+@dataclass
+class BatchPushResult:
+    total: int = 0
+    sent: int = 0
+    skipped: int = 0
+    failed: List[int] = field(default_factory=list)
+    bytes_sent: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def to_log(self) -> dict:
+        return {
+            "batches": self.total,
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "bytes_sent": self.bytes_sent,
+        }
+
+
+_SESSIONS: Dict[Tuple[int, int], object] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def backend_session(pool_size: int = DEFAULT_CONCURRENCY, retries: int = DEFAULT_RETRIES):
+    """Pooled session that retries POSTs with backoff; idempotency keys make that safe."""
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get((pool_size, retries))
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            retry = Retry(
+                total=retries,
+                status_forcelist=(429, 500, 502, 503, 504),
+                backoff_factor=0.5,
+                allowed_methods=("POST",),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSIONS[(pool_size, retries)] = session
+    return session
+
+
+def push_batches(
+    df: pd.DataFrame,
+    url: str,
+    headers: dict,
+    timeout: float = 30,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    retries: int = DEFAULT_RETRIES,
+    checkpoint: Optional[PushCheckpoint] = None,
+    session=None,
+    scope: Optional[str] = None,
+    checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+    checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+) -> BatchPushResult:
+    """POST ``df`` in size-bounded batches with at most ``concurrency`` in flight.
+
+    Failed batches do not stop the others. They are reported in
+    ``result.failed`` and resent by the next run, because only accepted
+    batches are written to ``checkpoint``. Keys are stored under ``scope``,
+    by default ``checkpoint_scope(df)``.
+    """
+    import requests
+
+    if session is None:
+        session = backend_session(concurrency, retries)
+    prefix = f"{scope or checkpoint_scope(df)}/"
+    stored = checkpoint.load() if checkpoint is not None else set()
+    # Other scopes (daily run, backfills) are written back untouched; unscoped
+    # keys from before scopes existed can no longer match and are dropped
+    others = {key for key in stored if "/" in key and not key.startswith(prefix)}
+    done = {key[len(prefix):] for key in stored if key.startswith(prefix)}
+    kept: Set[str] = set()  # keys of this frame the backend has accepted
+    result = BatchPushResult()
+    lock = threading.Lock()
+    unsaved = 0
+    last_save = time.monotonic()
+
+    def save(keys: Set[str]) -> None:
+        nonlocal unsaved, last_save
+        checkpoint.save(others | {prefix + key for key in keys})
+        unsaved, last_save = 0, time.monotonic()
+
+    def send(batch: Batch) -> bool:
+        batch_headers = {
+            **headers,
+            "Idempotency-Key": batch.key,
+            "X-Batch-Index": str(batch.index),
+        }
+        try:
+            resp = session.post(url, headers=batch_headers, data=batch.body, timeout=timeout)
+        except requests.RequestException:
+            logger.exception("backend_batch_failed", extra={
+                "batch": batch.index,
+                "rows": batch.rows,
+                "backend_url": url,
+                "action": "Failed to push batch to backend",
+            })
+            return False
+        return not handle_backend_response(resp, batch.rows, url).startswith("failed_")
+
+    def finish(batch: Batch, accepted: bool) -> None:
+        nonlocal unsaved
+        with lock:
+            if accepted:
+                result.sent += 1
+                result.bytes_sent += len(batch.body)
+                kept.add(batch.key)
+                unsaved += 1
+            else:
+                result.failed.append(batch.index)
+        due = unsaved >= checkpoint_every or time.monotonic() - last_save >= checkpoint_interval
+        if checkpoint is not None and unsaved and due:
+            save(done | kept)
+
+    completed = False
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="backend-push") as pool:
+            in_flight = {}
+            for batch in iter_batches(df, max_bytes):
+                result.total += 1
+                if batch.key in done:
+                    kept.add(batch.key)
+                    result.skipped += 1
+                    continue
+                # Bound serialized-but-unsent batches to keep memory flat
+                while len(in_flight) >= 2 * concurrency:
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        finish(in_flight.pop(future), future.result())
+                in_flight[pool.submit(send, batch)] = batch
+            for future in list(in_flight):
+                finish(in_flight.pop(future), future.result())
+        completed = True
+    finally:
+        # Keys this frame no longer produces are dropped only after a complete pass
+        if checkpoint is not None and (unsaved or (completed and kept != done)):
+            save(kept if completed else done | kept)
+
+    result.failed.sort()
+    logger.info("backend_batch_push", extra={
+        **result.to_log(),
+        "backend_url": url,
+        "action": "Pushed batches to backend",
+    })
+    return result
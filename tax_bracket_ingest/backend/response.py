@@ -0,0 +1,37 @@
+# tax_bracket_ingest/backend/response.py
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def handle_backend_response(resp, rows: int, url: str):
+    """Log the backend reply and map it to the push result string."""
+    content_type = resp.headers.get("Content-Type", "")
+    response_text = resp.text
+    log_extra = {
+        "rows": rows,
+        "backend_url": url,
+        "status_code": resp.status_code,
+    }
+    payload = None
+    if "json" in content_type.lower():
+        try:
+            payload = resp.json()
+        except ValueError:
+            log_extra["response_text"] = response_text[:2048]
+            logger.warning("backend_push_invalid_json", extra=log_extra)
+        else:
+            log_extra["response_json"] = payload
+    else:
+        log_extra["response_text"] = response_text[:2048]
+    if not resp.ok:
+        logger.error("backend_push_non_2xx", extra=log_extra)
+        return "failed_backend_push"
+    if isinstance(payload, dict):
+        errors = payload.get("errors") or payload.get("error")
+        if errors:
+            log_extra["errors"] = errors
+            logger.error("backend_push_error_payload", extra=log_extra)
+            return "failed_backend_payload_errors"
+    logger.info("backend_push_response", extra=log_extra)
+    return response_text
@@ -0,0 +1,169 @@
+# tax_bracket_ingest/backend/upload.py
+"""Streamed, compressed CSV bodies for the backend upload.
+
+The DataFrame is serialized a slice at a time and compressed as it goes, so
+the full CSV never exists in memory. ``requests`` sends a generator body with
+``Transfer-Encoding: chunked``.
+
+Which ``Content-Encoding`` to use is negotiated per URL with an ``OPTIONS``
+request. A server advertises the request codings it accepts in
+``Accept-Encoding`` on that response (RFC 7694). When it advertises none,
+or the preflight fails, the upload is sent uncompressed.
+"""
+import logging
+import os
+import threading
+import zlib
+from importlib.util import find_spec
+from typing import Dict, Iterable, Iterator, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+AUTO = "auto"
+IDENTITY = "identity"
+ENCODINGS = ("zstd", "gzip", IDENTITY)
+DEFAULT_CHUNK_ROWS = 10_000
+
+_NEGOTIATED: Dict[str, str] = {}
+_NEGOTIATED_LOCK = threading.Lock()
+
+
+def zstd_available() -> bool:
+    return find_spec("zstandard") is not None
+
+
+def get_upload_encoding() -> str:
+    """``BACKEND_UPLOAD_ENCODING``: ``auto`` (default), ``zstd``, ``gzip`` or ``identity``."""
+    encoding = os.getenv("BACKEND_UPLOAD_ENCODING", AUTO).strip().lower()
+    if encoding not in ENCODINGS + (AUTO,):
+        raise ValueError(f"BACKEND_UPLOAD_ENCODING must be one of auto, {', '.join(ENCODINGS)}, got {encoding!r}")
+    if encoding == "zstd" and not zstd_available():
+        raise ImportError("BACKEND_UPLOAD_ENCODING=zstd requires zstandard; install tax_bracket_ingest[compression]")
+    return encoding
+
+
+def get_chunk_rows() -> int:
+    return int(os.getenv("BACKEND_UPLOAD_CHUNK_ROWS", DEFAULT_CHUNK_ROWS))
+
+
+def iter_csv_chunks(df: pd.DataFrame, rows_per_chunk: int = DEFAULT_CHUNK_ROWS) -> Iterator[bytes]:
+    """Yield the CSV of ``df`` (header first, no index) a slice of rows at a time."""
+    if rows_per_chunk < 1:
+        raise ValueError("rows_per_chunk must be at least 1")
+    if df.empty:
+        yield df.to_csv(index=False).encode("utf-8")
+        return
+    for start in range(0, len(df), rows_per_chunk):
+        part = df.iloc[start:start + rows_per_chunk]
+        yield part.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+def gzip_chunks(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def zstd_chunks(chunks: Iterable[bytes], level: int = 3) -> Iterator[bytes]:
+    import zstandard
+
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+def encode_chunks(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    if encoding == "gzip":
+        return gzip_chunks(chunks)
+    if encoding == "zstd":
+        return zstd_chunks(chunks)
+    return iter(chunks)
+
+
+class CountingStream:
+    """Iterates ``chunks`` while counting the bytes handed to the transport."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self.bytes_sent = 0
+
+    def __iter__(self):
+        for chunk in self._chunks:
+            self.bytes_sent += len(chunk)
+            yield chunk
+
+
+def parse_accept_encoding(header: Optional[str]) -> set:
+    """Codings listed in an ``Accept-Encoding`` value, minus any with ``q=0``.
+
+    Every ``;`` parameter is read. A malformed ``q`` counts as the default
+    weight of 1, so a bad header never fails the push.
+    """
+    accepted = set()
+    for item in (header or "").split(","):
+        coding, *params = item.split(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value.strip())
+                except ValueError:
+                    weight = 1.0
+        if weight == 0:
+            continue
+        accepted.add(coding)
+    return accepted
+
+
+def choose_encoding(accepted: set) -> str:
+    """Best coding both sides support; zstd only when ``zstandard`` is installed."""
+    if "zstd" in accepted and zstd_available():
+        return "zstd"
+    if "gzip" in accepted or "x-gzip" in accepted:
+        return "gzip"
+    return IDENTITY
+
+
+def negotiate_encoding(url: str, headers: dict, timeout: float, preference: str = AUTO) -> str:
+    """Request body coding for ``url``; probes with ``OPTIONS`` once per URL in ``auto`` mode."""
+    if preference != AUTO:
+        return preference
+    with _NEGOTIATED_LOCK:
+        if url in _NEGOTIATED:
+            return _NEGOTIATED[url]
+    import requests
+
+    try:
+        resp = requests.options(url, headers=headers, timeout=timeout)
+        encoding = choose_encoding(parse_accept_encoding(resp.headers.get("Accept-Encoding")))
+    except requests.RequestException:
+        encoding = IDENTITY
+    remember_encoding(url, encoding)
+    logger.info("backend_encoding_negotiated", extra={
+        "backend_url": url,
+        "encoding": encoding,
+        "action": "Chose request body compression for backend upload",
+    })
+    return encoding
+
+
+def remember_encoding(url: str, encoding: str) -> None:
+    with _NEGOTIATED_LOCK:
+        _NEGOTIATED[url] = encoding
+
+
+def reset_negotiated() -> None:
+    with _NEGOTIATED_LOCK:
+        _NEGOTIATED.clear()
@@ -0,0 +1,324 @@
+# tax_bracket_ingest/backfill.py
+"""Rebuild several years of history from archived IRS pages in one run.
+
+Usage:
+    python -m tax_bracket_ingest.backfill --years 2018-2024 \
+        --source-template "https://web.archive.org/web/{year}0401/https://www.irs.gov/..."
+    python -m tax_bracket_ingest.backfill --source 2023=archive/2023.html --source 2024=https://...
+    python -m tax_bracket_ingest.backfill --source 2022=s3://archive-bucket/irs/2022.html
+"""
+import argparse
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from tax_bracket_ingest.run_ingest import (
+    IngestConfig,
+    close_snapshots,
+    get_ingest_config,
+    get_snapshot_cache,
+    is_dry_run,
+    normalize_html,
+    push_csv_batches,
+    read_csv_from_s3,
+    read_manifest_from_s3,
+    write_df_to_s3,
+    write_manifest_to_s3,
+    write_parquet_partitions_to_s3,
+)
+from tax_bracket_ingest.scraper.fetch import fetch
+from tax_bracket_ingest.storage.base import ObjectNotFound
+from tax_bracket_ingest.storage.manifest import Manifest, fingerprint_year
+from tax_bracket_ingest.storage.snapshots import SnapshotCache
+
+logger = logging.getLogger(__name__)
+
+# requests' default HTTPAdapter keeps 10 connections per host; staying under
+# that lets every worker reuse a pooled connection of the shared session.
+DEFAULT_FETCH_WORKERS = 8
+
+
+@dataclass(frozen=True)
+class BackfillSource:
+    year: int
+    location: str
+
+    @property
+    def is_url(self) -> bool:
+        return self.location.startswith(("http://", "https://"))
+
+    @property
+    def is_s3(self) -> bool:
+        return self.location.startswith("s3://")
+
+
+def parse_years(spec: str) -> List[int]:
+    """Expand ``"2018-2020,2023"`` into ``[2018, 2019, 2020, 2023]``."""
+    years = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(v) for v in part.split("-", 1))
+            if end < start:
+                raise ValueError(f"Invalid year range {part!r}")
+            years.extend(range(start, end + 1))
+        else:
+            years.append(int(part))
+    return sorted(set(years))
+
+
+def build_sources(
+    years: Iterable[int] = (),
+    template: Optional[str] = None,
+    explicit: Iterable[str] = (),
+) -> List[BackfillSource]:
+    """Combine ``template.format(year=...)`` sources with explicit ``YEAR=LOCATION`` pairs.
+
+    Explicit pairs win over the template for the same year.
+    """
+    by_year: Dict[int, str] = {}
+    if template:
+        for year in years:
+            by_year[year] = template.format(year=year)
+    elif years:
+        raise ValueError("--years requires --source-template")
+    for pair in explicit:
+        year, sep, location = pair.partition("=")
+        if not sep or not location:
+            raise ValueError(f"Expected YEAR=URL_OR_PATH, got {pair!r}")
+        by_year[int(year)] = location
+    return [BackfillSource(year, location) for year, location in sorted(by_year.items())]
+
+
+def load_source(source: BackfillSource, snapshots: Optional[SnapshotCache] = None) -> bytes:
+    """Read a source page from disk, from ``s3://bucket/key``, or through the pooled fetch session.
+
+    With ``snapshots``, an archived URL already in the cache is not fetched
+    again, and every page read is added to the cache. Files and S3 objects
+    can be replaced, so they are always read.
+    """
+    if not source.is_url:
+        if source.is_s3:
+            html = read_s3_page(source.location)
+        else:
+            with open(source.location, "rb") as fh:
+                html = fh.read()
+        if snapshots is not None:
+            snapshots.put_html(html)
+        return html
+    html = snapshots.html_for_url(source.location) if snapshots is not None else None
+    if html is None:
+        html = fetch(source.location)
+        if snapshots is not None:
+            snapshots.put_html(html, url=source.location)
+    return html
+
+
+def read_s3_page(location: str) -> bytes:
+    from tax_bracket_ingest.storage.s3 import S3Storage
+
+    bucket, _, key = location[len("s3://"):].partition("/")
+    if not bucket or not key:
+        raise ValueError(f"Expected s3://BUCKET/KEY, got {location!r}")
+    return S3Storage(bucket).read(key)
+
+
+def fetch_sources(
+    sources: List[BackfillSource],
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+    snapshots: Optional[SnapshotCache] = None,
+) -> Dict[int, bytes]:
+    """Load every source concurrently on a bounded thread pool."""
+    workers = max(1, min(max_workers, len(sources)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill-fetch") as pool:
+        htmls = pool.map(lambda source: load_source(source, snapshots), sources)
+        pages = dict(zip((s.year for s in sources), htmls))
+    logger.info("backfill_fetched", extra={
+        "years": sorted(pages),
+        "bytes": sum(len(p) for p in pages.values()),
+        "workers": workers,
+        "action": "Fetched archived IRS pages",
+    })
+    return pages
+
+
+def normalize_page(year: int, html: bytes) -> pd.DataFrame:
+    """Parse and normalize one year's page; runs inside worker processes."""
+    return use_requested_year(year, normalize_html(html))
+
+
+def use_requested_year(year: int, df: pd.DataFrame) -> pd.DataFrame:
+    page_year = int(df["Year"].iloc[0])
+    if page_year != year:
+        logger.warning("backfill_year_mismatch", extra={
+            "year": year,
+            "page_year": page_year,
+            "action": "Page header year differs from requested year, using requested year",
+        })
+        df["Year"] = year
+    return df
+
+
+def normalize_pages(
+    pages: Dict[int, bytes],
+    max_workers: Optional[int] = None,
+    snapshots: Optional[SnapshotCache] = None,
+) -> Dict[int, pd.DataFrame]:
+    """Normalize pages in a process pool, or inline when ``max_workers`` is 0 or 1.
+
+    Inline mode exists for AWS Lambda, which has no ``/dev/shm`` for
+    multiprocessing primitives. With ``snapshots``, pages normalized by an
+    earlier run with the same code are read back instead; the cache is only
+    touched from this process.
+    """
+    years = sorted(pages)
+    if max_workers is not None and max_workers <= 1:
+        frames = {year: normalize_html(pages[year], snapshots) for year in years}
+    else:
+        frames = {}
+        if snapshots is not None:
+            for year in years:
+                cached = snapshots.get_normalized(pages[year])
+                if cached is not None:
+                    frames[year] = cached
+        missing = [year for year in years if year not in frames]
+        if missing:
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                computed = list(pool.map(normalize_html, [pages[y] for y in missing]))
+            for year, df in zip(missing, computed):
+                if snapshots is not None:
+                    snapshots.put_normalized(pages[year], df)
+                frames[year] = df
+    return {year: use_requested_year(year, frames[year]) for year in years}
+
+
+def merge_history(prev_hist: pd.DataFrame, frames: Dict[int, pd.DataFrame]) -> pd.DataFrame:
+    """Replace the backfilled years in ``prev_hist`` and order the result newest year first."""
+    if not prev_hist.empty:
+        prev_hist = prev_hist[~prev_hist["Year"].isin(list(frames))]
+    parts = [frames[year] for year in sorted(frames, reverse=True)]
+    if not prev_hist.empty:
+        parts.append(prev_hist)
+    merged = pd.concat(parts, ignore_index=True)
+    return merged.sort_values("Year", ascending=False, kind="stable", ignore_index=True)
+
+
+def read_history_or_empty(config: IngestConfig) -> pd.DataFrame:
+    try:
+        return read_csv_from_s3(config.s3_key, config=config)
+    except ObjectNotFound:
+        logger.info("backfill_history_missing", extra={
+            "s3_key": config.s3_key,
+            "action": "No existing history found, starting a new one",
+        })
+        return pd.DataFrame()
+
+
+def run_backfill(
+    sources: List[BackfillSource],
+    dry_run: Optional[bool] = None,
+    config: Optional[IngestConfig] = None,
+    fetch_workers: int = DEFAULT_FETCH_WORKERS,
+    parse_workers: Optional[int] = None,
+    push: bool = False,
+) -> pd.DataFrame:
+    """Fetch, normalize and merge ``sources`` into the history with a single write.
+
+    Any failing source aborts the run before the history is touched. With
+    ``HISTORY_FORMAT=parquet`` only the backfilled partitions are written and
+    the existing history is never read. With ``push`` the backfilled rows are
+    also sent to the backend in resumable batches once the history is written.
+
+    Returns:
+        pd.DataFrame: The merged history (CSV) or the written partitions (Parquet).
+    """
+    if not sources:
+        raise ValueError("No backfill sources given")
+    if config is None:
+        config = get_ingest_config()
+    if dry_run is None:
+        dry_run = is_dry_run()
+
+    snapshots = get_snapshot_cache(config, dry_run)
+    try:
+        pages = fetch_sources(sources, max_workers=fetch_workers, snapshots=snapshots)
+        frames = normalize_pages(pages, max_workers=parse_workers, snapshots=snapshots)
+    finally:
+        close_snapshots(snapshots)
+    return store_backfill(frames, dry_run, config, push)
+
+
+def store_backfill(
+    frames: Dict[int, pd.DataFrame], dry_run: bool, config: IngestConfig, push: bool = False
+) -> pd.DataFrame:
+    """Write normalized years into the history (and push them with ``push``); see ``run_backfill``."""
+    new_rows = merge_history(pd.DataFrame(), frames)
+    if config.history_format == "parquet":
+        write_parquet_partitions_to_s3(new_rows, dry_run=dry_run, config=config)
+        manifest = (None if dry_run else read_manifest_from_s3(config=config)) or Manifest()
+        for frame in frames.values():
+            manifest.update(fingerprint_year(frame))
+        write_manifest_to_s3(manifest, dry_run=dry_run, config=config)
+        hist_df = new_rows
+    else:
+        hist_df = _write_csv_history(frames, dry_run, config)
+    if push:
+        push_backfill(new_rows, dry_run, config)
+    return hist_df
+
+
+def _write_csv_history(frames: Dict[int, pd.DataFrame], dry_run: bool, config: IngestConfig) -> pd.DataFrame:
+    prev_hist = pd.DataFrame() if dry_run else read_history_or_empty(config)
+    hist_df = merge_history(prev_hist, frames)
+    logger.info("backfill_merged", extra={
+        "years": sorted(frames),
+        "rows_added": sum(len(f) for f in frames.values()),
+        "rows_total": len(hist_df),
+        "action": "Merged backfilled years into history",
+    })
+
+    write_df_to_s3(hist_df, config.s3_key, dry_run=dry_run, config=config)
+    write_manifest_to_s3(Manifest.from_history(hist_df), dry_run=dry_run, config=config)
+    return hist_df
+
+
+def push_backfill(new_rows: pd.DataFrame, dry_run: bool, config: IngestConfig) -> None:
+    status = push_csv_batches(new_rows, dry_run=dry_run, config=config)
+    if status == "failed_backend_push":
+        # The history is already written; rerunning resumes from the checkpoint
+        raise RuntimeError("Backfill push incomplete; rerun with --push to resend the failed batches")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill tax bracket history from archived IRS pages.")
+    parser.add_argument("--years", help="Years to backfill, e.g. 2018-2024 or 2019,2021")
+    parser.add_argument("--source-template", help="URL or path containing {year}")
+    parser.add_argument("--source", action="append", default=[], metavar="YEAR=URL_OR_PATH",
+                        help="Explicit source for one year (repeatable)")
+    parser.add_argument("--fetch-workers", type=int, default=DEFAULT_FETCH_WORKERS)
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count())
+    parser.add_argument("--push", action="store_true",
+                        help="Also push the backfilled rows to the backend in resumable batches")
+    args = parser.parse_args(argv)
+
+    years = parse_years(args.years) if args.years else []
+    sources = build_sources(years, args.source_template, args.source)
+    logger.info("starting_backfill", extra={
+        "years": [s.year for s in sources],
+        "action": "Starting backfill",
+    })
+    run_backfill(sources, fetch_workers=args.fetch_workers, parse_workers=args.parse_workers, push=args.push)
+    logger.info("backfill_complete", extra={"action": "Backfill completed successfully"})
+
+
+if __name__ == "__main__":
+    from tax_bracket_ingest.runtime import init_runtime
+
+    init_runtime()
+    main()
@@ -0,0 +1,125 @@
+# tax_bracket_ingest/config.py
+"""Environment-driven settings.
+
+Kept free of heavy imports so entry points can read flags (``DRY_RUN``,
+``INGEST_MODE``) before deciding what else to load.
+"""
+import logging
+import os
+import posixpath
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+TRUTHY_ENV_VALUES = {"1", "true", "t", "yes", "y", "on"}
+HISTORY_FORMATS = ("csv", "parquet")
+STORAGE_BACKENDS = ("s3", "local", "memory")
+INGEST_MODES = ("sync", "async", "sources")
+
+
+@dataclass(frozen=True)
+class IngestConfig:
+    s3_bucket: str
+    s3_key: str
+    history_format: str = "csv"
+    history_prefix: str = "history/"
+    manifest_key: Optional[str] = None
+    storage_backend: str = "s3"
+    storage_root: Optional[str] = None
+
+
+def default_manifest_key(s3_key: str) -> str:
+    """``history.csv`` -> ``history.manifest.json``, in the same S3 "directory"."""
+    return posixpath.splitext(s3_key)[0] + ".manifest.json"
+
+
+@lru_cache(maxsize=1)
+def get_ingest_config() -> IngestConfig:
+    bucket = os.getenv("S3_BUCKET")
+    key = os.getenv("S3_KEY")
+    storage_backend = os.getenv("STORAGE_BACKEND", "s3").strip().lower()
+    if storage_backend not in STORAGE_BACKENDS:
+        raise ValueError(f"STORAGE_BACKEND must be one of {', '.join(STORAGE_BACKENDS)}, got {storage_backend!r}")
+    storage_root = os.getenv("STORAGE_ROOT") or None
+    required = [("S3_KEY", key)]
+    if storage_backend == "s3":
+        required.insert(0, ("S3_BUCKET", bucket))
+    elif storage_backend == "local":
+        required.append(("STORAGE_ROOT", storage_root))
+    missing = [name for name, value in required if not value]
+    if missing:
+        logger.error(
+            "missing_env_vars",
+            extra={
+                "action": "Required storage configuration missing",
+                "missing": missing,
+            },
+        )
+        raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
+    history_format = os.getenv("HISTORY_FORMAT", "csv").strip().lower()
+    if history_format not in HISTORY_FORMATS:
+        raise ValueError(f"HISTORY_FORMAT must be one of {', '.join(HISTORY_FORMATS)}, got {history_format!r}")
+    config = IngestConfig(
+        s3_bucket=bucket,
+        s3_key=key,
+        history_format=history_format,
+        history_prefix=os.getenv("S3_HISTORY_PREFIX", "history/"),
+        manifest_key=os.getenv("S3_MANIFEST_KEY") or default_manifest_key(key),
+        storage_backend=storage_backend,
+        storage_root=storage_root,
+    )
+    logger.debug(
+        "ingest_config_loaded",
+        extra={
+            "s3_bucket": config.s3_bucket,
+            "s3_key": config.s3_key,
+            "history_format": config.history_format,
+            "history_prefix": config.history_prefix,
+            "storage_backend": config.storage_backend,
+            "action": "Loaded ingest configuration from environment",
+        },
+    )
+    return config
+
+
+def get_env_flag(name: str, default: bool = False) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in TRUTHY_ENV_VALUES
+
+def is_dry_run() -> bool:
+    return get_env_flag("DRY_RUN", default=True)
+
+def should_push_backend() -> bool:
+    return get_env_flag("ENABLE_BACKEND_PUSH", default=False)
+
+def should_batch_backend_push() -> bool:
+    return get_env_flag("BACKEND_BATCH_PUSH", default=False)
+
+def should_stream_backend_upload() -> bool:
+    return get_env_flag("BACKEND_STREAM_UPLOAD", default=False)
+
+def get_backend_timeout() -> float:
+    return float(os.getenv("BACKEND_TIMEOUT", "30"))
+
+def should_export_csv() -> bool:
+    return get_env_flag("HISTORY_CSV_EXPORT", default=False)
+
+def get_history_chunk_rows() -> int:
+    """Rows per chunk for streaming CSV history merges; ``0`` merges in memory."""
+    value = int(os.getenv("HISTORY_CHUNK_ROWS", "0"))
+    if value < 0:
+        raise ValueError(f"HISTORY_CHUNK_ROWS must be 0 or positive, got {value}")
+    return value
+
+def should_replay_snapshots() -> bool:
+    return get_env_flag("SNAPSHOT_REPLAY", default=False)
+
+def get_ingest_mode() -> str:
+    mode = os.getenv("INGEST_MODE", "sync").strip().lower()
+    if mode not in INGEST_MODES:
+        raise ValueError(f"INGEST_MODE must be one of {', '.join(INGEST_MODES)}, got {mode!r}")
+    return mode
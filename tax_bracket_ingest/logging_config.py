@@ -1,9 +1,268 @@
 # tax_bracket_ingest/logging_config.py
-import os
+"""JSON logging to stdout and, outside Lambda, a daily rotated file.
+
+By default records are formatted and written on the thread that logs them.
+With ``LOG_ASYNC=1`` the root logger gets a ``QueueHandler`` instead. It puts
+records in a buffer of ``LOG_QUEUE_SIZE`` records, and a ``QueueListener``
+thread formats and writes them. The listener takes up to ``LOG_BATCH_SIZE``
+records at a time and flushes each stream once per batch rather than once per
+record. When the buffer is full, ``LOG_QUEUE_FULL=block`` (default) makes the
+logging thread wait. ``drop`` discards the record instead; the number of
+dropped records is logged at the next flush. Buffered records are written by
+``flush_logging``, which the Lambda handler calls at the end of every
+invocation, and at interpreter exit.
+
+``LOG_DEBUG_SAMPLE_EVERY=N`` keeps the first and then every Nth record of each
+repeated debug event (same logger and message template), in both modes. Kept
+records carry ``sample_every``.
+"""
+import atexit
+import contextlib
 import logging
+import os
+import queue
+import threading
+from collections import Counter
 from logging.config import dictConfig
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import List, Optional
+
 from pythonjsonlogger import jsonlogger
 
+from tax_bracket_ingest.config import get_env_flag
+
+QUEUE_FULL_POLICIES = ("block", "drop")
+DEFAULT_QUEUE_SIZE = 10_000
+DEFAULT_BATCH_SIZE = 500
+
+_listener: Optional["BatchingQueueListener"] = None
+_queue_handler: Optional["BufferedQueueHandler"] = None
+_installed: List[logging.Handler] = []
+
+
+class DebugSampler(logging.Filter):
+    """Passes the 1st, (N+1)th, (2N+1)th... debug record of each event; other levels always pass."""
+
+    def __init__(self, every: int):
+        super().__init__()
+        self.every = every
+        self._seen: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every <= 1 or record.levelno > logging.DEBUG:
+            return True
+        key = (record.name, record.msg)
+        with self._lock:
+            seen = self._seen[key]
+            self._seen[key] = seen + 1
+        if seen % self.every:
+            return False
+        record.sample_every = self.every
+        return True
+
+
+class _DeferredFlush:
+    """Handler mixin: inside ``batch()``, records are written without a flush each."""
+
+    _deferring = False
+
+    def flush(self):
+        if not self._deferring:
+            super().flush()
+
+    @contextlib.contextmanager
+    def batch(self):
+        self.acquire()
+        self._deferring = True
+        try:
+            yield
+        finally:
+            self._deferring = False
+            self.flush()
+            self.release()
+
+
+class BatchStreamHandler(_DeferredFlush, logging.StreamHandler):
+    pass
+
+
+class BatchTimedRotatingFileHandler(_DeferredFlush, TimedRotatingFileHandler):
+    pass
+
+
+class _FlushRequest:
+    def __init__(self):
+        self.done = threading.Event()
+
+
+class BufferedQueueHandler(QueueHandler):
+    """``QueueHandler`` for an in-process bounded queue.
+
+    Records are passed on as they are, apart from merging ``args`` into the
+    message. The formatter runs on the listener thread and keeps ``exc_info``
+    and the ``extra`` fields. With ``block=False`` a full queue drops the
+    record and counts it in ``dropped``.
+    """
+
+    def __init__(self, log_queue: queue.Queue, block: bool = True):
+        super().__init__(log_queue)
+        self.block = block
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def take_dropped(self) -> int:
+        with self._dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+
+class BatchingQueueListener(QueueListener):
+    """``QueueListener`` that hands its handlers up to ``batch_size`` records per flush."""
+
+    def __init__(self, log_queue: queue.Queue, *handlers: logging.Handler, batch_size: int = DEFAULT_BATCH_SIZE):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self._stop_next = False
+
+    def dequeue(self, block: bool):
+        """A list of queued records, or the sentinel once the listener is stopping."""
+        if self._stop_next:
+            self._stop_next = False
+            return self._sentinel
+        first = self.queue.get(block)
+        if first is self._sentinel:
+            return first
+        batch = [first]
+        while len(batch) < self.batch_size:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is self._sentinel:
+                self._stop_next = True
+                break
+            batch.append(item)
+        return batch
+
+    def handle(self, batch) -> None:
+        requests = []
+        with contextlib.ExitStack() as stack:
+            for handler in self.handlers:
+                if isinstance(handler, _DeferredFlush):
+                    stack.enter_context(handler.batch())
+            for item in batch:
+                if isinstance(item, _FlushRequest):
+                    requests.append(item)
+                else:
+                    super().handle(item)
+        for request in requests:
+            request.done.set()
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)  # blocking: the queue may be full
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is written; ``False`` on timeout."""
+        request = _FlushRequest()
+        self.queue.put(request)
+        return request.done.wait(timeout)
+
+
+def flush_logging(timeout: Optional[float] = 5.0) -> None:
+    """Write out buffered records (``LOG_ASYNC=1``) and the stream buffers."""
+    if _queue_handler is not None:
+        dropped = _queue_handler.take_dropped()
+        if dropped:
+            logging.getLogger(__name__).warning("log_records_dropped", extra={
+                "dropped": dropped,
+                "action": "Dropped log records because the log queue was full",
+            })
+    if _listener is not None and _listener._thread is not None:
+        _listener.flush(timeout)
+    for handler in _installed:
+        handler.flush()
+
+
+def _flush_at_exit() -> None:
+    """Write out queued records; synchronous handlers are left to ``logging.shutdown``."""
+    if _listener is not None:
+        flush_logging()
+
+
+# Registered once here rather than per setup_logging, which tests and the
+# worker call again after reset_logging
+atexit.register(_flush_at_exit)
+
+
+def reset_logging() -> None:
+    """Stop the listener and remove every handler ``setup_logging`` installed."""
+    global _listener, _queue_handler
+    root_logger = logging.getLogger()
+    if _listener is not None:
+        if _listener._thread is not None:
+            _listener.stop()
+        _listener = None
+    for handler in [_queue_handler, *_installed]:
+        if handler is not None:
+            root_logger.removeHandler(handler)
+            handler.close()
+    _queue_handler = None
+    _installed.clear()
+    root_logger._configured_by_app = False
+
+
+def _positive_int(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    value = int(raw) if raw else default
+    if value < 1:
+        raise ValueError(f"{name} must be at least 1, got {value}")
+    return value
+
+
+def _queue_full_policy() -> str:
+    policy = os.getenv("LOG_QUEUE_FULL", "block").strip().lower()
+    if policy not in QUEUE_FULL_POLICIES:
+        raise ValueError(f"LOG_QUEUE_FULL must be one of {', '.join(QUEUE_FULL_POLICIES)}, got {policy!r}")
+    return policy
+
+
+def _use_queue(
+    root_logger: logging.Logger,
+    sampler: Optional[DebugSampler],
+    policy: str,
+    queue_size: int,
+    batch_size: int,
+) -> None:
+    """Move the configured handlers behind a ``BufferedQueueHandler`` and start the listener."""
+    global _listener, _queue_handler
+    log_queue = queue.Queue(queue_size)
+    handlers = list(root_logger.handlers)
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    _queue_handler = BufferedQueueHandler(log_queue, block=policy == "block")
+    if sampler is not None:
+        _queue_handler.addFilter(sampler)
+    root_logger.addHandler(_queue_handler)
+    _listener = BatchingQueueListener(log_queue, *handlers, batch_size=batch_size)
+    _listener.start()
+
+
 def setup_logging():
     env = os.getenv("ENV", "dev").lower()
     level =  logging.DEBUG if env == "dev" else logging.INFO
@@ -24,6 +283,12 @@ def setup_logging():
         log_path = os.path.join("/tmp", "logs", base)
     
     retention  = int(os.getenv("LOG_RETENTION_DAYS", 7))
+    use_queue = get_env_flag("LOG_ASYNC")
+    sample_every = _positive_int("LOG_DEBUG_SAMPLE_EVERY", 1)
+    if use_queue:
+        policy = _queue_full_policy()
+        queue_size = _positive_int("LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)
+        batch_size = _positive_int("LOG_BATCH_SIZE", DEFAULT_BATCH_SIZE)
     
     root_logger = logging.getLogger()
     if getattr(root_logger, "_configured_by_app", False):
@@ -35,7 +300,8 @@ def setup_logging():
         try:
             os.makedirs(os.path.dirname(log_path), exist_ok=True)
             file_handler_config = {
-                "class": "logging.handlers.TimedRotatingFileHandler",
+                "class": __name__ + ".BatchTimedRotatingFileHandler" if use_queue
+                else "logging.handlers.TimedRotatingFileHandler",
                 "filename": log_path,
                 "when": "D",
                 "backupCount": retention,
@@ -48,7 +314,7 @@ def setup_logging():
     
     handlers = {
         "console": {
-            "class": "logging.StreamHandler",
+            "class": __name__ + ".BatchStreamHandler" if use_queue else "logging.StreamHandler",
             "formatter": "json",
             "stream": "ext://sys.stdout"
         }
@@ -76,4 +342,11 @@ def setup_logging():
     }
 
     dictConfig(logging_config)
+    _installed[:] = root_logger.handlers
+    sampler = DebugSampler(sample_every) if sample_every > 1 else None
+    if use_queue:
+        _use_queue(root_logger, sampler, policy, queue_size, batch_size)
+    elif sampler is not None:
+        for handler in _installed:
+            handler.addFilter(sampler)
     root_logger._configured_by_app = True
\ No newline at end of file
@@ -0,0 +1,170 @@
+# tax_bracket_ingest/lookup.py
+"""Vectorized marginal rate and tax computation over the bracket history.
+
+``BracketIndex`` turns normalized brackets (the wide history written by
+``run_ingest``, or the long format of ``normalize_long``) into one
+``Schedule`` per ``(year, status)``. A schedule holds parallel arrays
+ordered by threshold: the income where each bracket begins, its rate, and
+the tax owed on all income below that point (precomputed as a running sum).
+Looking up any number of incomes is then a single ``np.searchsorted`` plus
+one multiply-add, with no per-income Python.
+
+A bracket listed as starting at ``$11,601`` taxes income *over* ``$11,600``
+(the previous bracket's ``End``), so every threshold after the first is its
+start minus one.
+
+Usage:
+    index = BracketIndex.from_wide(history_df)
+    index.tax_owed(incomes, 2024, "S")
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from tax_bracket_ingest.parser.normalize import FILING_STATUSES, _to_number
+
+StatusKey = Union[int, str]
+
+
+@dataclass(frozen=True)
+class Schedule:
+    """One year's brackets for one filing status, as parallel arrays sorted by threshold."""
+    thresholds: np.ndarray
+    rates: np.ndarray
+    base_tax: np.ndarray
+    intercepts: np.ndarray
+
+    @classmethod
+    def from_brackets(cls, starts: np.ndarray, rates: np.ndarray) -> "Schedule":
+        """Build from bracket starts in whole dollars and rates as fractions, in ascending order.
+
+        Raises:
+            ValueError: If the starts are empty or not strictly increasing.
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        rates = np.asarray(rates, dtype=np.float64)
+        if not len(starts) or np.any(np.diff(starts) <= 0):
+            raise ValueError(f"Bracket starts must be non-empty and strictly increasing, got {starts.tolist()}")
+        thresholds = starts.copy()
+        thresholds[1:] -= 1
+        # Tax owed on everything below each threshold: the full width of every lower bracket
+        base_tax = np.zeros(len(thresholds))
+        np.cumsum(np.diff(thresholds) * rates[:-1], out=base_tax[1:])
+        # In bracket i, tax = income * rates[i] + intercepts[i]: two gathers per income instead of three
+        return cls(thresholds, rates, base_tax, base_tax - thresholds * rates)
+
+    def bracket(self, incomes: np.ndarray) -> np.ndarray:
+        """Index of the bracket each income falls in; incomes below zero map to the first.
+
+        An income equal to a threshold is still in the lower bracket: only income over it is
+        taxed at the next rate.
+        """
+        index = np.searchsorted(self.thresholds, incomes, side="left") - 1
+        return np.maximum(index, 0, out=index)
+
+    def marginal_rate(self, incomes: np.ndarray) -> np.ndarray:
+        return self.rates[self.bracket(incomes)]
+
+    def tax_owed(self, incomes: np.ndarray) -> np.ndarray:
+        index = self.bracket(incomes)
+        tax = incomes * self.rates[index]
+        tax += self.intercepts[index]
+        return np.maximum(tax, 0.0, out=tax)
+
+
+def _status_index(status: StatusKey) -> int:
+    """Position in FILING_STATUSES from an index, a prefix (``"MFJ"``) or a column name."""
+    if isinstance(status, (int, np.integer)):
+        if 0 <= status < len(FILING_STATUSES):
+            return int(status)
+    else:
+        for index, filing_status in enumerate(FILING_STATUSES):
+            if status in (filing_status.prefix, filing_status.column):
+                return index
+    raise ValueError(
+        f"Unknown filing status {status!r}; expected one of {', '.join(s.prefix for s in FILING_STATUSES)}"
+    )
+
+
+class BracketIndex:
+    """Schedules keyed by ``(year, status index)``."""
+
+    def __init__(self, schedules: Dict[Tuple[int, int], Schedule]):
+        self.schedules = schedules
+
+    @classmethod
+    def from_long(cls, df: pd.DataFrame) -> "BracketIndex":
+        """Build from ``Year``/``Status``/``Rate``/``Start`` rows (see ``normalize_long``)."""
+        status = pd.Categorical(df["Status"], categories=[s.column for s in FILING_STATUSES]).codes
+        return cls._from_columns(
+            df["Year"].to_numpy(dtype=np.int64),
+            status.astype(np.int64),
+            df["Rate"].to_numpy(dtype=np.float64),
+            df["Start"].to_numpy(dtype=np.float64, na_value=np.nan),
+        )
+
+    @classmethod
+    def from_wide(cls, df: pd.DataFrame) -> "BracketIndex":
+        """Build from the wide history of ``process_irs_dataframe`` (``"10%"``, ``"$11,601"`` text)."""
+        years = df["Year"].to_numpy(dtype=np.int64)
+        columns: List[Tuple[np.ndarray, ...]] = []
+        for index, filing_status in enumerate(FILING_STATUSES):
+            if filing_status.column not in df.columns:
+                continue
+            columns.append((
+                years,
+                np.full(len(df), index, dtype=np.int64),
+                _to_number(df[filing_status.column]) / 100,
+                _to_number(df[filing_status.start_column]),
+            ))
+        if not columns:
+            return cls({})
+        return cls._from_columns(*(np.concatenate(parts) for parts in zip(*columns)))
+
+    @classmethod
+    def _from_columns(cls, years, status, rates, starts) -> "BracketIndex":
+        keep = (status >= 0) & ~np.isnan(rates) & ~np.isnan(starts)
+        years, status, rates, starts = years[keep], status[keep], rates[keep], starts[keep]
+        order = np.lexsort((starts, status, years))
+        years, status, rates, starts = years[order], status[order], rates[order], starts[order]
+
+        bounds = np.flatnonzero((np.diff(years) != 0) | (np.diff(status) != 0)) + 1
+        schedules = {}
+        for lo, hi in zip(np.concatenate([[0], bounds]), np.concatenate([bounds, [len(years)]])):
+            if hi > lo:
+                schedules[(int(years[lo]), int(status[lo]))] = Schedule.from_brackets(starts[lo:hi], rates[lo:hi])
+        return cls(schedules)
+
+    @property
+    def years(self) -> List[int]:
+        return sorted({year for year, _ in self.schedules})
+
+    def schedule(self, year: int, status: StatusKey) -> Schedule:
+        """The brackets for ``year`` and ``status``.
+
+        Raises:
+            ValueError: If the status is unknown or the index has no brackets for it that year.
+        """
+        key = (int(year), _status_index(status))
+        try:
+            return self.schedules[key]
+        except KeyError:
+            raise ValueError(
+                f"No brackets for {FILING_STATUSES[key[1]].prefix} in {key[0]}"
+            ) from None
+
+    def marginal_rate(self, incomes, year: int, status: StatusKey) -> np.ndarray:
+        """Rate (as a fraction) applied to the last dollar of each income."""
+        return self.schedule(year, status).marginal_rate(np.asarray(incomes, dtype=np.float64))
+
+    def tax_owed(self, incomes, year: int, status: StatusKey) -> np.ndarray:
+        """Tax owed on each taxable income, in dollars."""
+        return self.schedule(year, status).tax_owed(np.asarray(incomes, dtype=np.float64))
+
+    def effective_rate(self, incomes, year: int, status: StatusKey) -> np.ndarray:
+        """``tax_owed / income``; ``0`` for incomes of zero or less."""
+        incomes = np.asarray(incomes, dtype=np.float64)
+        tax = self.tax_owed(incomes, year, status)
+        return np.divide(tax, incomes, out=np.zeros_like(tax), where=incomes > 0)
@@ -0,0 +1,267 @@
+# tax_bracket_ingest/metrics.py
+"""Per-stage timing and memory metrics, emitted as structured log fields.
+
+Wrap a unit of work with ``stage("name")`` or decorate it with
+``@instrument("name")``. Each stage records:
+
+- ``wall_ms``: elapsed wall-clock time.
+- ``cpu_ms``: CPU time of the calling thread.
+- ``bytes_in`` / ``bytes_out``: payload sizes, either declared on the
+  decorator or added with ``add_bytes``.
+- ``peak_bytes``: when ``METRICS_TRACEMALLOC=1``, the peak memory traced
+  by ``tracemalloc`` during the stage, above what was traced at its start.
+
+Every finished stage is logged as ``stage_metrics``. Stages that finish
+inside ``recording()`` are also collected, so the entry point can attach a
+per-stage summary to ``ingest_complete``. With ``METRICS_EMF=1`` each stage
+is also printed to stdout in CloudWatch Embedded Metric Format, which Lambda
+turns into metrics without extra API calls.
+"""
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from tax_bracket_ingest.config import get_env_flag
+
+logger = logging.getLogger(__name__)
+
+EMF_NAMESPACE_ENV = "METRICS_NAMESPACE"
+DEFAULT_EMF_NAMESPACE = "TaxBracketIngest"
+RESULT = "return"
+
+_EMF_UNITS = {
+    "wall_ms": ("WallTime", "Milliseconds"),
+    "cpu_ms": ("CpuTime", "Milliseconds"),
+    "peak_bytes": ("PeakMemory", "Bytes"),
+    "bytes_in": ("BytesIn", "Bytes"),
+    "bytes_out": ("BytesOut", "Bytes"),
+}
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    wall_ms: float = 0.0
+    cpu_ms: float = 0.0
+    peak_bytes: Optional[int] = None
+    bytes_in: Optional[int] = None
+    bytes_out: Optional[int] = None
+    ok: bool = True
+
+    def to_log(self) -> dict:
+        fields = {"stage": self.name, "wall_ms": self.wall_ms, "cpu_ms": self.cpu_ms, "ok": self.ok}
+        for name in ("peak_bytes", "bytes_in", "bytes_out"):
+            value = getattr(self, name)
+            if value is not None:
+                fields[name] = value
+        return fields
+
+
+class MetricsRecorder:
+    """Collects the stages finished while it is active; safe across threads."""
+
+    def __init__(self):
+        self.stages: List[StageMetrics] = []
+        self._lock = threading.Lock()
+
+    def add(self, metrics: StageMetrics) -> None:
+        with self._lock:
+            self.stages.append(metrics)
+
+    def summary(self) -> Dict[str, dict]:
+        """Totals per stage name; ``peak_bytes`` is the largest single peak."""
+        out: Dict[str, dict] = {}
+        with self._lock:
+            stages = list(self.stages)
+        for m in stages:
+            entry = out.setdefault(m.name, {"calls": 0, "wall_ms": 0.0, "cpu_ms": 0.0, "errors": 0})
+            entry["calls"] += 1
+            entry["wall_ms"] = round(entry["wall_ms"] + m.wall_ms, 3)
+            entry["cpu_ms"] = round(entry["cpu_ms"] + m.cpu_ms, 3)
+            entry["errors"] += 0 if m.ok else 1
+            if m.peak_bytes is not None:
+                entry["peak_bytes"] = max(entry.get("peak_bytes", 0), m.peak_bytes)
+            for name in ("bytes_in", "bytes_out"):
+                value = getattr(m, name)
+                if value is not None:
+                    entry[name] = entry.get(name, 0) + value
+        return out
+
+
+_recorder: contextvars.ContextVar = contextvars.ContextVar("metrics_recorder", default=None)
+_current: contextvars.ContextVar = contextvars.ContextVar("metrics_stage", default=None)
+
+# tracemalloc keeps a single process-wide peak. A stage that resets it first
+# folds the peak so far into every stage still open, so nesting stays correct.
+_trace_lock = threading.Lock()
+_open_traces: List[list] = []
+
+
+def _trace_start() -> Optional[list]:
+    if not tracemalloc.is_tracing():
+        return None
+    with _trace_lock:
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in _open_traces:
+            frame[1] = max(frame[1], peak)
+        tracemalloc.reset_peak()
+        frame = [current, current]  # [traced at start, highest peak seen]
+        _open_traces.append(frame)
+    return frame
+
+
+def _trace_stop(frame: Optional[list]) -> Optional[int]:
+    if frame is None or not tracemalloc.is_tracing():
+        return None
+    with _trace_lock:
+        _, peak = tracemalloc.get_traced_memory()
+        frame[1] = max(frame[1], peak)
+        _open_traces.remove(frame)
+        for other in _open_traces:
+            other[1] = max(other[1], frame[1])
+    return max(0, frame[1] - frame[0])
+
+
+def payload_size(obj) -> Optional[int]:
+    """Byte size of a payload: length of bytes/str, shallow memory of a DataFrame."""
+    if obj is None:
+        return None
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return len(obj)
+    if isinstance(obj, str):
+        return len(obj.encode("utf-8"))
+    memory_usage = getattr(obj, "memory_usage", None)
+    if memory_usage is not None:
+        usage = memory_usage(index=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    return None
+
+
+def add_bytes(bytes_in: int = 0, bytes_out: int = 0) -> None:
+    """Add transferred bytes to the innermost open stage, if any."""
+    metrics = _current.get()
+    if metrics is None:
+        return
+    if bytes_in:
+        metrics.bytes_in = (metrics.bytes_in or 0) + bytes_in
+    if bytes_out:
+        metrics.bytes_out = (metrics.bytes_out or 0) + bytes_out
+
+
+def emf_record(metrics: StageMetrics, namespace: Optional[str] = None) -> dict:
+    """The CloudWatch Embedded Metric Format document for one stage."""
+    values = {
+        emf_name: getattr(metrics, field)
+        for field, (emf_name, _) in _EMF_UNITS.items()
+        if getattr(metrics, field) is not None
+    }
+    return {
+        "_aws": {
+            "Timestamp": int(time.time() * 1000),
+            "CloudWatchMetrics": [{
+                "Namespace": namespace or os.getenv(EMF_NAMESPACE_ENV, DEFAULT_EMF_NAMESPACE),
+                "Dimensions": [["Stage"]],
+                "Metrics": [
+                    {"Name": emf_name, "Unit": unit}
+                    for field, (emf_name, unit) in _EMF_UNITS.items()
+                    if emf_name in values
+                ],
+            }],
+        },
+        "Stage": metrics.name,
+        **values,
+    }
+
+
+def _publish(metrics: StageMetrics) -> None:
+    recorder = _recorder.get()
+    if recorder is not None:
+        recorder.add(metrics)
+    # One record per instrumented call; the per-run summary is ``ingest_complete.stages`` at INFO
+    logger.debug("stage_metrics", extra={**metrics.to_log(), "action": f"Measured stage {metrics.name}"})
+    if get_env_flag("METRICS_EMF"):
+        # EMF must be a bare JSON line on stdout, not wrapped by the log formatter
+        sys.stdout.write(json.dumps(emf_record(metrics)) + "\n")
+        sys.stdout.flush()
+
+
+@contextlib.contextmanager
+def stage(name: str):
+    """Measure the enclosed block as one stage; yields its ``StageMetrics``."""
+    metrics = StageMetrics(name)
+    token = _current.set(metrics)
+    trace = _trace_start()
+    wall_start, cpu_start = time.perf_counter(), time.thread_time()
+    try:
+        yield metrics
+    except BaseException:
+        metrics.ok = False
+        raise
+    finally:
+        metrics.wall_ms = round((time.perf_counter() - wall_start) * 1000, 3)
+        metrics.cpu_ms = round((time.thread_time() - cpu_start) * 1000, 3)
+        metrics.peak_bytes = _trace_stop(trace)
+        _current.reset(token)
+        _publish(metrics)
+
+
+def instrument(name: Optional[str] = None, bytes_in: Optional[str] = None, bytes_out: Optional[str] = None):
+    """Decorator form of ``stage``.
+
+    Args:
+        name (Optional[str]): Stage name; defaults to the function name.
+        bytes_in (Optional[str]): Parameter name, or ``"return"``, whose
+            ``payload_size`` counts as bytes in.
+        bytes_out (Optional[str]): Same, for bytes out.
+    """
+    def decorator(fn):
+        stage_name = name or fn.__name__
+        signature = inspect.signature(fn)
+
+        def size_of(source, bound, result):
+            if source is None:
+                return None
+            value = result if source == RESULT else bound.arguments.get(source)
+            return payload_size(value)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name):
+                result = fn(*args, **kwargs)
+                if bytes_in or bytes_out:
+                    bound = signature.bind_partial(*args, **kwargs)
+                    add_bytes(size_of(bytes_in, bound, result) or 0, size_of(bytes_out, bound, result) or 0)
+            return result
+
+        return wrapper
+    return decorator
+
+
+@contextlib.contextmanager
+def recording():
+    """Collect every stage finished inside the block, including on worker threads
+    started with ``asyncio.to_thread`` (which copies the context).
+
+    Starts ``tracemalloc`` for the block when ``METRICS_TRACEMALLOC=1``.
+    """
+    recorder = MetricsRecorder()
+    token = _recorder.set(recorder)
+    started_tracing = get_env_flag("METRICS_TRACEMALLOC") and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        yield recorder
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _recorder.reset(token)
@@ -0,0 +1,158 @@
+# tax_bracket_ingest/parser/backends.py
+"""HTML engine selection for the bracket parser.
+
+Every backend turns a page into the same event stream as
+``tax_bracket_ingest.parser.stream.iter_events`` (``(HEADER, text)``,
+``(TABLE,)`` and ``(ROW, rate, range)``), so ``parse_html`` builds an
+identical dict no matter which engine did the tokenizing.
+"""
+import importlib.util
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from tax_bracket_ingest.parser.stream import (
+    CELL_TAGS,
+    HEADER,
+    HEADER_TAGS,
+    ROW,
+    SKIPPED_TEXT_TAGS,
+    TABLE,
+    HtmlSource,
+    _iter_chunks,
+    iter_events as _stdlib_iter_events,
+)
+
+PARSER_BACKEND_ENV = "PARSER_BACKEND"
+
+
+@dataclass(frozen=True)
+class ParserBackend:
+    name: str
+    module: Optional[str]
+    iter_events: Callable[[HtmlSource], Iterator[tuple]]
+
+    def is_available(self) -> bool:
+        return self.module is None or importlib.util.find_spec(self.module) is not None
+
+
+def _lxml_text(element) -> str:
+    """``get_text(strip=True)`` for an lxml element, skipping comments and scripts."""
+    pieces = []
+
+    def walk(node):
+        if node.text and isinstance(node.tag, str) and node.tag not in SKIPPED_TEXT_TAGS:
+            pieces.append(node.text.strip())
+        for child in node:
+            if isinstance(child.tag, str) and child.tag not in SKIPPED_TEXT_TAGS:
+                walk(child)
+            if child.tail:
+                pieces.append(child.tail.strip())
+
+    walk(element)
+    return "".join(pieces)
+
+
+def _lxml_iter_events(source: HtmlSource) -> Iterator[tuple]:
+    """Incremental lxml pull parser; finished subtrees are discarded as it goes."""
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    table_depth = 0
+    capture_depth = 0
+
+    def drain():
+        nonlocal table_depth, capture_depth
+        for action, element in parser.read_events():
+            tag = element.tag
+            if action == "start":
+                if tag == "table":
+                    table_depth += 1
+                    yield (TABLE,)
+                if tag in HEADER_TAGS or tag == "tr":
+                    capture_depth += 1
+                continue
+
+            if tag in HEADER_TAGS:
+                capture_depth -= 1
+                yield (HEADER, _lxml_text(element))
+            elif tag == "tr":
+                capture_depth -= 1
+                if table_depth:
+                    cells = [_lxml_text(cell) for cell in element.iter(*CELL_TAGS)]
+                    if len(cells) >= 2:
+                        yield (ROW, cells[0], cells[1])
+            elif tag == "table":
+                table_depth -= 1
+
+            if capture_depth == 0 and isinstance(tag, str):
+                element.clear(keep_tail=True)
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+
+    for chunk in _iter_chunks(source):
+        parser.feed(chunk)
+        yield from drain()
+    parser.close()
+    yield from drain()
+
+
+def _selectolax_iter_events(source: HtmlSource) -> Iterator[tuple]:
+    """Lexbor-backed selectolax; parses the whole page in C, then walks it once."""
+    from selectolax.lexbor import LexborHTMLParser
+
+    if not isinstance(source, (str, bytes)):
+        source = "".join(_iter_chunks(source))
+    tree = LexborHTMLParser(source)
+    tree.strip_tags(list(SKIPPED_TEXT_TAGS))
+    for node in tree.css(", ".join([*sorted(HEADER_TAGS), "table"])):
+        if node.tag in HEADER_TAGS:
+            yield (HEADER, node.text(strip=True))
+            continue
+        yield (TABLE,)
+        for row in node.css("tr"):
+            cells = row.css(", ".join(sorted(CELL_TAGS)))
+            if len(cells) >= 2:
+                yield (ROW, cells[0].text(strip=True), cells[1].text(strip=True))
+
+
+# Ordered fastest first, as measured by benchmarks/test_parser_backends.py.
+BACKENDS: Dict[str, ParserBackend] = {
+    backend.name: backend
+    for backend in (
+        ParserBackend("selectolax", "selectolax", _selectolax_iter_events),
+        ParserBackend("lxml", "lxml", _lxml_iter_events),
+        ParserBackend("html.parser", None, _stdlib_iter_events),
+    )
+}
+
+
+def available_backends() -> Tuple[str, ...]:
+    """Names of the backends whose engine is importable, fastest first."""
+    return tuple(name for name, backend in BACKENDS.items() if backend.is_available())
+
+
+def get_backend(name: Optional[str] = None) -> ParserBackend:
+    """Resolve a backend by name, falling back to ``PARSER_BACKEND`` and then the default.
+
+    Args:
+        name (Optional[str]): Backend name; ``None`` uses the env var or the
+            fastest installed engine.
+
+    Returns:
+        ParserBackend: The resolved backend.
+
+    Raises:
+        ValueError: If the requested backend is unknown or its engine is not installed.
+    """
+    if name is None:
+        name = os.getenv(PARSER_BACKEND_ENV) or DEFAULT_BACKEND
+    backend = BACKENDS.get(name.strip().lower())
+    if backend is None:
+        raise ValueError(f"Unknown parser backend {name!r}; expected one of {', '.join(BACKENDS)}")
+    if not backend.is_available():
+        raise ValueError(f"Parser backend {name!r} requires the {backend.module!r} package")
+    return backend
+
+
+DEFAULT_BACKEND = available_backends()[0]
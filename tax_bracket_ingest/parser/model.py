@@ -0,0 +1,106 @@
+# tax_bracket_ingest/parser/model.py
+"""Column-oriented bracket rows: the parser's output before normalization.
+
+``parse_irs_data_to_dataframe`` used to flatten the parsed dict of dicts into
+one dict per row before pandas copied everything again. ``BracketTable``
+instead packs the rows into columns in one pass over the parsed tables:
+
+- ``codes``: ``int32`` index into ``headers`` for every row,
+- ``values``: one ``(3, rows)`` object block of header, rate and range text.
+
+``to_frame`` wraps ``values`` as the raw ``Header``/``Rate``/``Range`` frame
+without copying it. Parsed numbers are available as ``rate`` (``float32``)
+and ``start`` (nullable ``Int64``), computed in one vectorized pass on first
+use.
+"""
+from array import array
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+_NUMBER_NOISE = r"[^\d.]"
+RAW_COLUMNS = ("Header", "Rate", "Range")
+_RAW_INDEX = pd.Index(RAW_COLUMNS)  # immutable, so every frame can share it
+
+
+class BracketTable:
+    """Raw bracket rows grouped by header, in page order."""
+
+    __slots__ = ("headers", "codes", "values", "_rate", "_start")
+
+    def __init__(self, headers: List[str], codes: np.ndarray, rates: Sequence[str], ranges: Sequence[str]):
+        self.headers = headers
+        self.codes = codes
+        self.values = np.empty((len(RAW_COLUMNS), len(codes)), dtype=object)
+        self.values[0] = _objects(headers)[codes] if len(codes) else []
+        self.values[1] = rates
+        self.values[2] = ranges
+        self._rate: Optional[np.ndarray] = None
+        self._start: Optional[pd.arrays.IntegerArray] = None
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @classmethod
+    def from_dict(cls, irs_data: dict) -> "BracketTable":
+        """Build from the ``{header: {"table": {rate: range}}}`` shape of ``parse_irs_data``."""
+        headers, codes, rates, ranges = [], array("i"), [], []
+        for header, content in irs_data.items():
+            table = content.get("table") if content else None
+            if not table:
+                continue
+            codes.extend([len(headers)] * len(table))
+            headers.append(header)
+            rates.extend(table.keys())
+            ranges.extend(table.values())
+        return cls(headers, np.frombuffer(codes, dtype=np.int32), rates, ranges)
+
+    def to_dict(self) -> dict:
+        """The ``parse_irs_data`` dict, for callers that still want it."""
+        data: Dict[str, dict] = {header: {"table": {}} for header in self.headers}
+        for code, rate, range_ in zip(self.codes.tolist(), self.rate_text, self.range_text):
+            data[self.headers[code]]["table"][rate] = range_
+        return data
+
+    @property
+    def rate_text(self) -> np.ndarray:
+        return self.values[1]
+
+    @property
+    def range_text(self) -> np.ndarray:
+        return self.values[2]
+
+    def to_frame(self) -> pd.DataFrame:
+        """The raw ``Header``/``Rate``/``Range`` frame ``process_irs_dataframe`` expects.
+
+        The frame is a view of ``values``: pandas keeps the block as is.
+        """
+        return pd.DataFrame(self.values.T, columns=_RAW_INDEX, copy=False)
+
+    @property
+    def rate(self) -> np.ndarray:
+        """Rates as percent numbers (``10%`` -> ``10.0``); NaN for title rows."""
+        if self._rate is None:
+            self._rate = _parse_numbers(self.rate_text).astype(np.float32)
+        return self._rate
+
+    @property
+    def start(self) -> pd.arrays.IntegerArray:
+        """Bracket lower bounds in whole dollars; ``<NA>`` where the cell is not a number."""
+        if self._start is None:
+            values = _parse_numbers(self.range_text)
+            mask = np.isnan(values)
+            self._start = pd.arrays.IntegerArray(np.where(mask, 0, values).astype(np.int64), mask)
+        return self._start
+
+
+def _objects(values: List[str]) -> np.ndarray:
+    out = np.empty(len(values), dtype=object)
+    out[:] = values
+    return out
+
+
+def _parse_numbers(text: np.ndarray) -> np.ndarray:
+    cleaned = pd.Series(text, dtype=object, copy=False).str.replace(_NUMBER_NOISE, "", regex=True)
+    return pd.to_numeric(cleaned, errors="coerce").to_numpy(dtype=float)
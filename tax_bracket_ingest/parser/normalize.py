@@ -1,76 +1,224 @@
 # tax_bracket_ingest/parser/normalize.py
+import re
+from dataclasses import dataclass
+from typing import Tuple
+
 import pandas as pd
 import numpy as np
 
+from tax_bracket_ingest.metrics import RESULT, instrument
+
+
+@dataclass(frozen=True)
+class FilingStatus:
+    """A filing status, how to recognise its table header, and its wide-view columns."""
+    column: str
+    prefix: str
+    header_pattern: str
+
+    @property
+    def start_column(self) -> str:
+        return f"{self.prefix} Range Start"
+
+    @property
+    def end_column(self) -> str:
+        return f"{self.prefix} Range End"
+
+
+# Ordered as the statuses appear in the wide view.
+FILING_STATUSES: Tuple[FilingStatus, ...] = (
+    FilingStatus("Married Filing Jointly (Rates/Brackets)", "MFJ", r"\bjointly\b"),
+    FilingStatus("Married Filing Separately (Rates/Brackets)", "MFS", r"\bseparately\b"),
+    FilingStatus("Single Filer (Rates/Brackets)", "S", r"\bsingle\b"),
+    FilingStatus("Head of Household (Rates/Brackets)", "HOH", r"\bhead of household\b"),
+)
+
+_STATUS_PATTERNS = [re.compile(s.header_pattern, re.IGNORECASE) for s in FILING_STATUSES]
+_YEAR_PATTERN = re.compile(r"\b(\d{4})\b")
+
+# Typed long format: one row per (year, status, bracket).
+BRACKET_SCHEMA = {
+    "Year": "int64",
+    "Status": pd.CategoricalDtype([s.column for s in FILING_STATUSES]),
+    "Rate": "float64",
+    "Start": "Int64",
+    "End": "Int64",
+}
+
+
+def detect_status(header: str) -> int:
+    """Index into FILING_STATUSES for a table header, or -1 when it is not a status table."""
+    for index, pattern in enumerate(_STATUS_PATTERNS):
+        if pattern.search(str(header)):
+            return index
+    return -1
+
+
+def detect_year(headers) -> int:
+    """The first four-digit year mentioned in ``headers``."""
+    for header in headers:
+        match = _YEAR_PATTERN.search(str(header))
+        if match:
+            return int(match.group(1))
+    raise ValueError("No tax year found in the table headers")
+
+
+def _to_number(values: pd.Series) -> np.ndarray:
+    """Strip currency/percent formatting from a whole column in one regex pass."""
+    cleaned = values.astype(str).str.replace(r'[^\d.]', '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=float)
+
+
+def _format_currency(values: np.ndarray) -> np.ndarray:
+    """Format whole-dollar amounts as ``$1,234``; NaN stays NaN."""
+    out = np.full(len(values), np.nan, dtype=object)
+    mask = ~np.isnan(values)
+    out[mask] = [f"${v:,}" for v in values[mask].astype(np.int64).tolist()]
+    return out
+
+
+def _row_years(df: pd.DataFrame, headers) -> np.ndarray:
+    """Per-row tax year: a ``Year`` column when present, else the first year in ``headers``."""
+    if 'Year' in df.columns:
+        return df['Year'].to_numpy(dtype=np.int64)
+    return np.full(len(df), detect_year(headers), dtype=np.int64)
+
+
+def _bracket_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Find every status block from its header and derive numeric columns in one pass.
+
+    Headers are matched once per distinct value. Rows of tables that are not
+    filing-status tables, and column-title rows whose rate is not a number,
+    are dropped. Any number of brackets per status is supported.
+
+    Returns:
+        pd.DataFrame: One row per bracket, grouped by year (in order of first
+        appearance) then status (in FILING_STATUSES order) and in page order
+        within a group, holding
+        ``year``, ``status``, the position ``bracket`` within its group, the
+        original ``Rate``/``Range`` text and parsed ``rate``/``start``/``end``.
+    """
+    uniques_codes, uniques = pd.factorize(df['Header'])
+    header_status = np.array([detect_status(h) for h in uniques] + [-1], dtype=np.intp)
+    status = header_status[uniques_codes]  # factorize marks NaN headers with -1
+
+    numbers = _to_number(pd.concat([df['Rate'], df['Range']], ignore_index=True))
+    rate, start = numbers[:len(df)], numbers[len(df):]
+    # Prefer a year from a filing-status header over unrelated page headings
+    headers = [h for h, st in zip(uniques, header_status) if st >= 0]
+    years = _row_years(df, headers + [h for h in uniques if h not in headers])
+
+    keep = np.flatnonzero((status >= 0) & ~np.isnan(rate))
+    year_rank = pd.factorize(years)[0]  # years stay in order of first appearance
+    order = keep[np.lexsort((keep, status[keep], year_rank[keep]))]
+    status, rate, start, years = status[order], rate[order], start[order], years[order]
+
+    # A bracket ends one dollar before the next bracket of the same group starts
+    same_group = (status[1:] == status[:-1]) & (years[1:] == years[:-1])
+    end = np.full(len(start), np.nan)
+    end[:-1] = np.where(same_group, start[1:] - 1, np.nan)
+
+    group_start = np.flatnonzero(np.concatenate([[True], ~same_group])) if len(order) else np.array([], dtype=np.intp)
+    group_sizes = np.diff(np.append(group_start, len(order)))
+    bracket = np.arange(len(order)) - np.repeat(group_start, group_sizes)
+
+    return pd.DataFrame({
+        'year': years,
+        'status': status,
+        'bracket': bracket,
+        'rate_text': df['Rate'].to_numpy(dtype=object)[order],
+        'start_text': df['Range'].to_numpy(dtype=object)[order],
+        'rate': rate,
+        'start': start,
+        'end': end,
+    })
+
+
+def normalize_long(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize raw IRS rows into the typed long format of BRACKET_SCHEMA.
+
+    Args:
+        df (pd.DataFrame): Raw ``Header``/``Rate``/``Range`` rows from
+            ``parse_irs_data_to_dataframe``. Several years can be normalized in
+            one call by adding a ``Year`` column to the stacked rows.
+
+    Returns:
+        pd.DataFrame: One row per bracket with ``Year``, ``Status``, ``Rate``
+        (as a fraction), ``Start`` and ``End`` (``<NA>`` for the top bracket).
+    """
+    rows = _bracket_rows(df)
+    return pd.DataFrame({
+        'Year': rows['year'].to_numpy(),
+        'Status': pd.Categorical.from_codes(rows['status'].to_numpy(), dtype=BRACKET_SCHEMA['Status']),
+        'Rate': rows['rate'].to_numpy() / 100,
+        'Start': _to_nullable_int(rows['start'].to_numpy()),
+        'End': _to_nullable_int(rows['end'].to_numpy()),
+    })
+
+
+def _to_nullable_int(values: np.ndarray) -> pd.arrays.IntegerArray:
+    mask = np.isnan(values)
+    return pd.arrays.IntegerArray(np.where(mask, 0, values).astype(np.int64), mask)
+
+
+@instrument(bytes_in="df", bytes_out=RESULT)
 def process_irs_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """Process the IRS DataFrame to normalize and structure it.
-    
+
+    Filing statuses are detected from the ``Header`` values, so pages with
+    any number of brackets per status normalize correctly. Statuses with
+    fewer brackets than the longest one in the same year are padded with NaN.
+
     Args:
-        df (pd.DataFrame): The DataFrame containing IRS tax data.
-    
+        df (pd.DataFrame): The DataFrame containing IRS tax data. Stacked
+            multi-year rows need a ``Year`` column.
+
     Returns:
         pd.DataFrame: A normalized DataFrame with structured tax rates and brackets.
     """
-    
-    status_rates = {
-        "Married Filing Jointly (Rates/Brackets)": (9, 16, 'MFJ Range Start'),
-        "Married Filing Separately (Rates/Brackets)": (17, 24, 'MFS Range Start'),
-        "Single Filer (Rates/Brackets)": (1, 8, 'S Range Start'),
-        "Head of Household (Rates/Brackets)": (25, 32, 'HOH Range Start')
+    rows = _bracket_rows(df)
+    years = rows['year'].to_numpy()
+    status = rows['status'].to_numpy()
+    bracket = rows['bracket'].to_numpy()
+
+    # Wide rows per year = deepest status of that year
+    if len(years):
+        year_start = np.flatnonzero(np.concatenate([[True], years[1:] != years[:-1]]))
+        heights = np.maximum.reduceat(bracket, year_start) + 1
+        year_values = years[year_start]
+    else:
+        year_start = heights = year_values = np.array([], dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(heights)[:-1]]).astype(np.intp)
+    year_sizes = np.diff(np.append(year_start, len(years)))
+    target = np.repeat(offsets, year_sizes) + bracket
+    total = int(heights.sum())
+
+    texts = {
+        'rate': rows['rate_text'].to_numpy(),
+        'start': rows['start_text'].to_numpy(),
+        'end': _format_currency(rows['end'].to_numpy()),
     }
-    
-    year = int(df['Header'][0].split(' ')[0])
-    rows = []
-    
-    for status, (start, end, name) in status_rates.items():
-        
-        sub_row = df.iloc[start:end, 1:4].copy()
-        
-        sub_row.insert(0, 'Year', year)
-        
-        sub_row.rename(
-            columns={
-                sub_row.columns[1]: status, 
-                sub_row.columns[2]: name
-            },
-            inplace=True
-        )
-        
-        rows.append(sub_row.reset_index(drop=True))
-
-    # Merge all into one dataframe
-    merged_df = pd.concat(rows, axis=1)
-
-    # Drop duplicate 'Year' columns, keep only the first
-    merged_df = drop_one_duplicate(merged_df, 'Year')
-    
-    # add range end columns
-    merged_df = populate_range_end(merged_df)
-
-    return merged_df
+    columns = {'Year': np.repeat(year_values, heights).astype(np.int64)}
+    for index, filing_status in enumerate(FILING_STATUSES):
+        mask = status == index
+        for kind, name in (('rate', filing_status.column), ('start', filing_status.start_column),
+                           ('end', filing_status.end_column)):
+            values = np.full(total, np.nan, dtype=object)
+            values[target[mask]] = texts[kind][mask]
+            columns[name] = values
+    return pd.DataFrame(columns)
 
 def populate_range_end(df: pd.DataFrame) -> pd.DataFrame:
-    
+
     range_start_cols = [col for col in df.columns if col.endswith("Range Start")]
 
     for col in range_start_cols:
-        
-        numeric_start = (
-            df[col]
-            .astype(str)
-            .str.replace(r'[^\d.]', '', regex=True)
-            .replace(r'^\s*$', np.nan, regex=True)
-            .astype(float)
-        )
-        
-        numeric_end = numeric_start.shift(-1) - 1
-        
-        formatted_end = numeric_end.apply(
-            lambda x: f"${int(x):,}" if pd.notnull(x) else np.nan
-        )
+
+        numeric_start = _to_number(df[col])
+        numeric_end = np.append(numeric_start[1:] - 1, np.nan)
 
         ins_idx = df.columns.get_loc(col) + 1
-        df.insert(ins_idx, col.replace("Start", "End"), formatted_end)
+        df.insert(ins_idx, col.replace("Start", "End"), _format_currency(numeric_end))
 
     return df
 
@@ -97,5 +245,5 @@ def drop_one_duplicate(df: pd.DataFrame, duplicate_col: str) -> pd.DataFrame:
             new_cols.append(True)
     df = df.loc[:, new_cols]
     return df
-    
-   
\ No newline at end of file
+
+
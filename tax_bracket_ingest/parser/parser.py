@@ -1,35 +1,55 @@
 # tax_bracket_ingest/parser/parser.py
-from bs4 import BeautifulSoup
-import bs4
+from typing import TYPE_CHECKING, Optional, Union
+
 import pandas as pd
 
-def parse_html(html_content: str) -> dict:
+from tax_bracket_ingest.metrics import instrument
+from tax_bracket_ingest.parser.backends import get_backend
+from tax_bracket_ingest.parser.model import BracketTable
+from tax_bracket_ingest.parser.stream import HEADER, TABLE
+
+if TYPE_CHECKING:  # bs4 is only needed by callers that already hold a parsed tree
+    import bs4
+
+def parse_html(html_content: str, backend: Optional[str] = None) -> dict:
     """
     Parse the HTML content and extract relevant data.
     This function looks for specific tags (h2, h4, table) and extracts their text.
     It organizes the data into a dictionary where headers are keys and their corresponding
     table data is stored as values.
 
+    The page is tokenized by the selected engine (see
+    ``tax_bracket_ingest.parser.backends``) into header/table/row events, so
+    every backend yields the same dictionary.
+
     Args:
         html_content (str): The HTML content to parse.
+        backend (Optional[str]): Parser backend name. Defaults to ``PARSER_BACKEND``
+            or the fastest installed engine.
 
     Returns:
         dict : A dictionary containing extracted data.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-    
     data = {}
-    
-    for tag in soup.find_all(['h2','h4','table']):
-        if tag.name in ['h2', 'h4']:
+    last_header = None
+    table = None
+
+    for event in get_backend(backend).iter_events(html_content):
+        kind = event[0]
+        if kind == HEADER:
             # Use the text of the header as a key
-            header_text = tag.get_text(strip=True)
-            data[header_text] = {}
-        elif tag.name == 'table':
+            if event[1] not in data:
+                last_header = event[1]
+            data[event[1]] = {}
+        elif kind == TABLE:
             # Use the last header as the key for the table data
-            if data:
-                current_header = list(data.keys())[-1]
-                data[current_header]['table'] = parse_table(tag)
+            if last_header is not None:
+                table = {}
+                data[last_header]['table'] = table
+            else:
+                table = None
+        elif table is not None:
+            table[event[1]] = event[2]
     return data
 
 def parse_table(table : 'bs4.element.Tag') -> dict:
@@ -53,35 +73,49 @@ def parse_table(table : 'bs4.element.Tag') -> dict:
             data[key] = value
     return data
 
-def parse_irs_data(html_content: str) -> dict:
+@instrument(bytes_in="html_content")
+def parse_irs_brackets(html_content: str, backend: Optional[str] = None) -> BracketTable:
+    """
+    Parse the IRS bracket tables into a column-oriented ``BracketTable``.
+
+    Holds the same rows as ``parse_irs_data``; ``.to_frame()`` gives the input
+    of ``process_irs_dataframe`` without a per-row record in between.
+
+    Args:
+        html_content (str): The HTML content to parse.
+        backend (Optional[str]): Parser backend name, see ``parse_html``.
+    Returns:
+        BracketTable: One row per bracket-table row, grouped by header.
+    """
+    return BracketTable.from_dict(parse_html(html_content, backend=backend))
+
+@instrument(bytes_in="html_content")
+def parse_irs_data(html_content: str, backend: Optional[str] = None) -> dict:
     """
     Parse the IRS data from the provided HTML content.
     Args:
         html_content (str): The HTML content to parse.
+        backend (Optional[str]): Parser backend name, see ``parse_html``.
     Returns:
         dict: A dictionary containing structured IRS tax bracket data.
     """
     
-    raw_tax_bracket = parse_html(html_content)
+    raw_tax_bracket = parse_html(html_content, backend=backend)
     
     irs_tax_bracket = {k: v for k, v in raw_tax_bracket.items() if v and any(v.values())}
     return irs_tax_bracket
 
-def parse_irs_data_to_dataframe(irs_data: dict) -> pd.DataFrame:
+def parse_irs_data_to_dataframe(irs_data: Union[dict, BracketTable]) -> pd.DataFrame:
     """
-    Convert the parsed IRS data dictionary into a pandas DataFrame.
+    Convert the parsed IRS data into a pandas DataFrame.
     
     Args:
-        irs_data (dict): The parsed IRS data dictionary.
+        irs_data (Union[dict, BracketTable]): The parsed IRS data dictionary,
+            or the ``BracketTable`` from ``parse_irs_brackets``.
         
     Returns:
         pd.DataFrame: A DataFrame containing the structured IRS tax bracket data.
     """
-    # Flatten the dictionary and convert it to a DataFrame
-    rows = []
-    for header, content in irs_data.items():
-        if 'table' in content:
-            for key, value in content['table'].items():
-                rows.append({'Header': header, 'Rate': key, 'Range': value})
-    
-    return pd.DataFrame(rows)
\ No newline at end of file
+    if not isinstance(irs_data, BracketTable):
+        irs_data = BracketTable.from_dict(irs_data)
+    return irs_data.to_frame()
\ No newline at end of file
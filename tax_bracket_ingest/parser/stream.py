@@ -0,0 +1,187 @@
+# tax_bracket_ingest/parser/stream.py
+from html.parser import HTMLParser
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+HEADER_TAGS = frozenset({"h2", "h4"})
+CELL_TAGS = frozenset({"th", "td"})
+# Text inside these elements is not part of get_text() in BeautifulSoup.
+SKIPPED_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+# Event kinds produced by BracketStreamParser.
+HEADER = "header"
+TABLE = "table"
+ROW = "row"
+
+FEED_CHUNK_SIZE = 64 * 1024
+
+HtmlSource = Union[str, bytes, Iterable[Union[str, bytes]]]
+
+
+class BracketStreamParser(HTMLParser):
+    """SAX-style extractor for IRS bracket pages.
+
+    The parser never builds a tree. It keeps only the text of the header, row
+    and cell currently open and queues three kinds of events:
+
+    * ``(HEADER, text)`` when an ``h2``/``h4`` closes,
+    * ``(TABLE,)`` when a ``table`` opens,
+    * ``(ROW, rate, range)`` when a ``tr`` inside a table closes with at
+      least two cells.
+
+    Text is collapsed the same way as ``Tag.get_text(strip=True)``: every text
+    node is stripped and the non-empty pieces are joined without a separator.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.events: List[tuple] = []
+        self._header: Optional[List[str]] = None
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+        self._skip_depth = 0
+        self._table_depth = 0
+        self._text: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        self._flush_text()
+        if tag in SKIPPED_TEXT_TAGS:
+            self._skip_depth += 1
+        elif tag in HEADER_TAGS:
+            self._header = []
+        elif tag == "table":
+            self._close_row()
+            self._table_depth += 1
+            self.events.append((TABLE,))
+        elif tag == "tr" and self._table_depth:
+            self._close_row()
+            self._row = []
+        elif tag in CELL_TAGS:
+            self._close_cell()
+            if self._row is not None:
+                self._cell = []
+
+    def handle_endtag(self, tag):
+        self._flush_text()
+        if tag in SKIPPED_TEXT_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in HEADER_TAGS:
+            if self._header is not None:
+                self.events.append((HEADER, "".join(self._header)))
+                self._header = None
+        elif tag == "tr":
+            self._close_row()
+        elif tag == "table":
+            self._close_row()
+            self._table_depth = max(0, self._table_depth - 1)
+        elif tag in CELL_TAGS:
+            self._close_cell()
+
+    def handle_data(self, data):
+        # A text node may arrive in several pieces when it straddles two
+        # feed() calls, so it is only stripped once the next markup shows up.
+        if not self._skip_depth and (self._header is not None or self._cell is not None):
+            self._text.append(data)
+
+    def handle_comment(self, data):
+        self._flush_text()
+
+    def close(self):
+        super().close()
+        self._flush_text()
+        self._close_row()
+
+    def _flush_text(self):
+        if not self._text:
+            return
+        text = "".join(self._text).strip()
+        self._text.clear()
+        if not text:
+            return
+        if self._header is not None:
+            self._header.append(text)
+        if self._cell is not None:
+            self._cell.append(text)
+
+    def _close_cell(self):
+        if self._cell is not None:
+            self._row.append("".join(self._cell))
+            self._cell = None
+
+    def _close_row(self):
+        self._close_cell()
+        if self._row is not None:
+            if len(self._row) >= 2:
+                self.events.append((ROW, self._row[0], self._row[1]))
+            self._row = None
+
+
+def _iter_chunks(source: HtmlSource) -> Iterator[str]:
+    """Yield text chunks of at most FEED_CHUNK_SIZE characters from ``source``."""
+    if isinstance(source, bytes):
+        source = source.decode("utf-8", errors="replace")
+    if isinstance(source, str):
+        for start in range(0, len(source), FEED_CHUNK_SIZE):
+            yield source[start:start + FEED_CHUNK_SIZE]
+        return
+    decoder = None
+    for chunk in source:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                import codecs
+                decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+    if decoder is not None:
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+def iter_events(source: HtmlSource) -> Iterator[tuple]:
+    """Feed ``source`` through BracketStreamParser and yield events as they occur.
+
+    Args:
+        source: HTML as ``str``/``bytes`` or an iterable of chunks (for example
+            ``response.iter_content()``).
+
+    Yields:
+        tuple: ``(HEADER, text)``, ``(TABLE,)`` or ``(ROW, rate, range)``.
+    """
+    parser = BracketStreamParser()
+    for chunk in _iter_chunks(source):
+        parser.feed(chunk)
+        if parser.events:
+            yield from parser.events
+            parser.events.clear()
+    parser.close()
+    yield from parser.events
+    parser.events.clear()
+
+
+def iter_brackets(source: HtmlSource) -> Iterator[Tuple[str, str, str]]:
+    """Yield ``(header, rate, range)`` tuples in document order.
+
+    Rows are attributed to the most recently *introduced* header, mirroring
+    the ``list(data.keys())[-1]`` lookup of the original tree walk. Rows of a
+    table that precedes every header are dropped.
+
+    Args:
+        source: HTML as ``str``/``bytes`` or an iterable of chunks.
+
+    Yields:
+        Tuple[str, str, str]: The header text, first cell and second cell.
+    """
+    seen = set()
+    last_header = None
+    table_header = None
+    for event in iter_events(source):
+        kind = event[0]
+        if kind == HEADER:
+            if event[1] not in seen:
+                seen.add(event[1])
+                last_header = event[1]
+        elif kind == TABLE:
+            table_header = last_header
+        elif table_header is not None:
+            yield table_header, event[1], event[2]
@@ -1,93 +1,119 @@
 # tax_bracket_ingest/run_ingest.py
-from dotenv import load_dotenv
-from typing import Optional
+import contextlib
+import logging
+import os
 from dataclasses import dataclass
-from functools import lru_cache
+from typing import TYPE_CHECKING, ContextManager, Optional, Tuple
 
-from tax_bracket_ingest.logging_config import setup_logging
+from tax_bracket_ingest.config import (
+    IngestConfig,
+    get_backend_timeout,
+    get_history_chunk_rows,
+    get_ingest_config,
+    is_dry_run,
+    should_batch_backend_push,
+    should_export_csv,
+    should_push_backend,
+    should_replay_snapshots,
+    should_stream_backend_upload,
+)
+from tax_bracket_ingest.backend.response import handle_backend_response
+from tax_bracket_ingest.metrics import add_bytes, instrument, recording
+from tax_bracket_ingest.scraper.cache import FetchCache, LocalFetchCache, S3FetchCache
+from tax_bracket_ingest.scraper.fetch import IRS_URL, fetch_irs_data, fetch_irs_data_conditional
+from tax_bracket_ingest.storage import base as storage_base
+from tax_bracket_ingest.storage.base import ObjectNotFound, Storage, open_storage
+from tax_bracket_ingest.storage.snapshots import DEFAULT_MAX_BYTES as SNAPSHOT_MAX_BYTES, SnapshotCache
 
-load_dotenv()
-setup_logging()
+if TYPE_CHECKING:  # pandas and the modules built on it load on first use, not on import
+    import pandas as pd
+
+    from tax_bracket_ingest.backend import batch as batch_push
+    from tax_bracket_ingest.storage.manifest import Manifest
 
-import logging
 logger = logging.getLogger(__name__)
 
-import os
-from io import BytesIO
+# push_csv_to_backend / push_csv_batches results that mean the backend did not take the rows
+PUSH_FAILURES = ("failed_backend_push", "failed_backend_payload_errors")
 
-import boto3
-import pandas as pd
-import requests
 
-from tax_bracket_ingest.scraper.fetch import fetch_irs_data
-from tax_bracket_ingest.parser.parser import parse_irs_data, parse_irs_data_to_dataframe
-from tax_bracket_ingest.parser.normalize import process_irs_dataframe
+def get_fetch_cache(config: IngestConfig) -> Optional[FetchCache]:
+    """Build the conditional-GET cache from ``FETCH_CACHE_S3_PREFIX`` or ``FETCH_CACHE_DIR``."""
+    s3_prefix = os.getenv("FETCH_CACHE_S3_PREFIX")
+    if s3_prefix:
+        return S3FetchCache(config.s3_bucket, s3_prefix)
+    cache_dir = os.getenv("FETCH_CACHE_DIR")
+    if cache_dir:
+        return LocalFetchCache(cache_dir)
+    return None
 
 
-TRUTHY_ENV_VALUES = {"1", "true", "t", "yes", "y", "on"}
+def get_push_checkpoint(config: IngestConfig) -> Optional["batch_push.PushCheckpoint"]:
+    """Build the batch-push checkpoint from ``BACKEND_CHECKPOINT_S3_KEY`` or ``BACKEND_CHECKPOINT_PATH``."""
+    from tax_bracket_ingest.backend import batch as batch_push
 
+    s3_key = os.getenv("BACKEND_CHECKPOINT_S3_KEY")
+    if s3_key:
+        return batch_push.S3PushCheckpoint(config.s3_bucket, s3_key)
+    path = os.getenv("BACKEND_CHECKPOINT_PATH")
+    if path:
+        return batch_push.LocalPushCheckpoint(path)
+    return None
 
-@dataclass(frozen=True)
-class IngestConfig:
-    s3_bucket: str
-    s3_key: str
 
+def get_snapshot_cache(config: IngestConfig, dry_run: Optional[bool] = None) -> Optional[SnapshotCache]:
+    """Build the page/frame snapshot cache from ``SNAPSHOT_CACHE_PREFIX`` or ``SNAPSHOT_CACHE_DIR``.
 
-@lru_cache(maxsize=1)
-def get_ingest_config() -> IngestConfig:
-    bucket = os.getenv("S3_BUCKET")
-    key = os.getenv("S3_KEY")
-    missing = [name for name, value in (("S3_BUCKET", bucket), ("S3_KEY", key)) if not value]
-    if missing:
-        logger.error(
-            "missing_env_vars",
-            extra={
-                "action": "Required S3 configuration missing",
-                "missing": missing,
-            },
-        )
-        raise ValueError(f"Missing required environment variables: {', '.join(missing)}")
-    config = IngestConfig(s3_bucket=bucket, s3_key=key)
-    logger.debug(
-        "ingest_config_loaded",
-        extra={
-            "s3_bucket": config.s3_bucket,
-            "s3_key": config.s3_key,
-            "action": "Loaded ingest configuration from environment",
-        },
-    )
-    return config
+    The prefix lives in the history store (``STORAGE_BACKEND``); the directory
+    is a local cache independent of it. In a dry run (default: ``DRY_RUN``)
+    the cache is read-only.
+    """
+    if dry_run is None:
+        dry_run = is_dry_run()
+    max_bytes = int(os.getenv("SNAPSHOT_CACHE_MAX_BYTES", SNAPSHOT_MAX_BYTES))
+    prefix = os.getenv("SNAPSHOT_CACHE_PREFIX")
+    if prefix:
+        return SnapshotCache(get_storage(config), prefix, max_bytes, read_only=dry_run)
+    cache_dir = os.getenv("SNAPSHOT_CACHE_DIR")
+    if cache_dir:
+        from tax_bracket_ingest.storage.local import LocalStorage
 
+        return SnapshotCache(LocalStorage(cache_dir), "", max_bytes, read_only=dry_run)
+    return None
 
-def get_env_flag(name: str, default: bool = False) -> bool:
-    raw = os.getenv(name)
-    if raw is None:
-        return default
-    return raw.strip().lower() in TRUTHY_ENV_VALUES
 
-def is_dry_run() -> bool:
-    return get_env_flag("DRY_RUN", default=True)
+def close_snapshots(snapshots: Optional[SnapshotCache]) -> None:
+    """Write the snapshot index once at the end of a run, if reads changed it."""
+    if snapshots is not None:
+        snapshots.close()
 
-def should_push_backend() -> bool:
-    return get_env_flag("ENABLE_BACKEND_PUSH", default=False)
 
-    
-def read_csv_from_s3(key: str, config: Optional[IngestConfig] = None) -> pd.DataFrame:
+def get_storage(config: Optional[IngestConfig] = None) -> Storage:
+    """The history store selected by ``STORAGE_BACKEND`` (``s3``, ``local`` or ``memory``)."""
+    if config is None:
+        config = get_ingest_config()
+    return open_storage(config.storage_backend, bucket=config.s3_bucket, root=config.storage_root)
+
+
+@instrument()
+def read_csv_from_s3(key: str, config: Optional[IngestConfig] = None) -> "pd.DataFrame":
     if config is None:
         config = get_ingest_config()
-    s3 = boto3.client("s3")
     logger.debug(
         "fetch_s3_object",
         extra={
             "s3_bucket": config.s3_bucket,
             "s3_key": key,
-            "action": "Fetching CSV from S3",
+            "storage_backend": config.storage_backend,
+            "action": "Fetching CSV from storage",
         },
     )
-    resp = s3.get_object(Bucket=config.s3_bucket, Key=key)
-    return pd.read_csv(BytesIO(resp["Body"].read()))
+    df, size = storage_base.read_csv(get_storage(config), key)
+    add_bytes(bytes_in=size)
+    return df
 
-def write_df_to_s3(df: pd.DataFrame, key: str, dry_run: Optional[bool] = None, config: Optional[IngestConfig] = None):
+@instrument()
+def write_df_to_s3(df: "pd.DataFrame", key: str, dry_run: Optional[bool] = None, config: Optional[IngestConfig] = None):
     if config is None:
         config = get_ingest_config()
     if dry_run is None:
@@ -102,13 +128,125 @@ def write_df_to_s3(df: pd.DataFrame, key: str, dry_run: Optional[bool] = None, c
             },
         )
         return
-    s3 = boto3.client("s3")
-    buf = BytesIO()
-    df.to_csv(buf, index=False)
-    buf.seek(0)
-    s3.put_object(Bucket=config.s3_bucket, Key=key, Body=buf.getvalue())
+    add_bytes(bytes_out=storage_base.write_csv(get_storage(config), key, df))
+
+@instrument()
+def scan_csv_history_from_s3(
+    year: int, chunk_rows: int, config: Optional[IngestConfig] = None
+) -> Tuple["Manifest", Optional["pd.DataFrame"]]:
+    """Rebuild the manifest and pull out ``year``'s rows in one chunked pass over the CSV history."""
+    from tax_bracket_ingest.storage import merge as history_merge
+
+    if config is None:
+        config = get_ingest_config()
+    chunks = history_merge.iter_history_chunks(get_storage(config), config.s3_key, chunk_rows)
+    return history_merge.scan_history(chunks, year)
+
+@instrument()
+def merge_csv_history_in_s3(
+    curr_df: "pd.DataFrame", chunk_rows: int, dry_run: Optional[bool] = None, config: Optional[IngestConfig] = None
+) -> Optional[int]:
+    """Prepend ``curr_df`` to the CSV history, replacing its year, streaming chunk by chunk.
+
+    Returns:
+        Optional[int]: Rows in the rewritten history; ``None`` in dry-run mode.
+    """
+    from tax_bracket_ingest.storage import merge as history_merge
+
+    if config is None:
+        config = get_ingest_config()
+    if dry_run is None:
+        dry_run = is_dry_run()
+    if dry_run:
+        logger.info(
+            "dry_run_skip_write_s3",
+            extra={
+                "rows": len(curr_df),
+                "s3_key": config.s3_key,
+                "action": "Skipped merging into historical CSV in S3 in dry-run mode",
+            },
+        )
+        return None
+    storage = get_storage(config)
+    chunks = history_merge.iter_history_chunks(storage, config.s3_key, chunk_rows)
+    rows, size = history_merge.write_csv_frames(
+        storage, config.s3_key, history_merge.replace_years(curr_df, chunks)
+    )
+    add_bytes(bytes_out=size)
+    return rows
+
+@instrument()
+def read_parquet_partition_from_s3(year: int, config: Optional[IngestConfig] = None) -> Optional["pd.DataFrame"]:
+    from tax_bracket_ingest.storage import parquet as parquet_store
+
+    if config is None:
+        config = get_ingest_config()
+    return parquet_store.read_partition(get_storage(config), config.history_prefix, year)
+
+@instrument()
+def read_manifest_from_s3(config: Optional[IngestConfig] = None) -> Optional["Manifest"]:
+    from tax_bracket_ingest.storage.manifest import Manifest
+
+    if config is None:
+        config = get_ingest_config()
+    try:
+        body = get_storage(config).read(config.manifest_key)
+    except ObjectNotFound:
+        logger.info(
+            "manifest_missing",
+            extra={
+                "s3_key": config.manifest_key,
+                "action": "No history manifest found, falling back to reading history",
+            },
+        )
+        return None
+    add_bytes(bytes_in=len(body))
+    return Manifest.from_json(body)
+
+@instrument()
+def write_manifest_to_s3(manifest: "Manifest", dry_run: Optional[bool] = None, config: Optional[IngestConfig] = None):
+    if config is None:
+        config = get_ingest_config()
+    if dry_run is None:
+        dry_run = is_dry_run()
+    if dry_run:
+        logger.info(
+            "dry_run_skip_write_manifest",
+            extra={
+                "s3_key": config.manifest_key,
+                "action": "Skipped writing history manifest to S3 in dry-run mode",
+            },
+        )
+        return
+    body = manifest.to_json().encode("utf-8")
+    add_bytes(bytes_out=len(body))
+    get_storage(config).write(config.manifest_key, body, content_type="application/json")
+
+@instrument()
+def write_parquet_partitions_to_s3(df: "pd.DataFrame", dry_run: Optional[bool] = None, config: Optional[IngestConfig] = None):
+    from tax_bracket_ingest.storage import parquet as parquet_store
+
+    if config is None:
+        config = get_ingest_config()
+    if dry_run is None:
+        dry_run = is_dry_run()
+    if dry_run:
+        logger.info(
+            "dry_run_skip_write_s3",
+            extra={
+                "rows": len(df),
+                "prefix": config.history_prefix,
+                "action": "Skipped writing Parquet history partitions to S3 in dry-run mode",
+            },
+        )
+        return
+    storage = get_storage(config)
+    parquet_store.write_partitions(storage, config.history_prefix, df)
+    if should_export_csv():
+        parquet_store.export_csv(storage, config.history_prefix, config.s3_key)
     
-def push_csv_to_backend(df: pd.DataFrame, dry_run: Optional[bool] = None):
+@instrument()
+def push_csv_to_backend(df: "pd.DataFrame", dry_run: Optional[bool] = None):
     if dry_run is None:
         dry_run = is_dry_run()
     if dry_run:
@@ -120,7 +258,8 @@ def push_csv_to_backend(df: pd.DataFrame, dry_run: Optional[bool] = None):
             },
         )
         return "dry_run_skipped"
-    csv_bytes = df.to_csv(index=False).encode('utf-8')
+    import requests
+
     backend_url = os.getenv("BACKEND_URL")
     if not backend_url:
         logger.warning(
@@ -136,13 +275,18 @@ def push_csv_to_backend(df: pd.DataFrame, dry_run: Optional[bool] = None):
         "Content-Type": "text/csv", 
         "X-API-KEY": os.getenv("INGEST_API_KEY")
     }
+    timeout = get_backend_timeout()
     try:
-        resp = requests.post(
-            url,
-            headers=headers,
-            data=csv_bytes,
-            timeout=30
-        )
+        resp = post_streamed_csv(url, headers, df, timeout) if should_stream_backend_upload() else None
+        if resp is None:
+            csv_bytes = df.to_csv(index=False).encode('utf-8')
+            add_bytes(bytes_out=len(csv_bytes))
+            resp = requests.post(
+                url,
+                headers=headers,
+                data=csv_bytes,
+                timeout=timeout
+            )
     except requests.RequestException:
         logger.exception(
             "backend_push_failed",
@@ -153,127 +297,463 @@ def push_csv_to_backend(df: pd.DataFrame, dry_run: Optional[bool] = None):
             },
         )
         return "failed_backend_push"
-    content_type = resp.headers.get("Content-Type", "")
-    response_text = resp.text
-    log_extra = {
-        "rows": len(df),
-        "backend_url": url,
-        "status_code": resp.status_code,
-    }
-    payload = None
-    if "json" in content_type.lower():
-        try:
-            payload = resp.json()
-        except ValueError:
-            log_extra["response_text"] = response_text[:2048]
-            logger.warning("backend_push_invalid_json", extra=log_extra)
-        else:
-            log_extra["response_json"] = payload
-    else:
-        log_extra["response_text"] = response_text[:2048]
-    if not resp.ok:
-        logger.error("backend_push_non_2xx", extra=log_extra)
-        return "failed_backend_push"
-    if isinstance(payload, dict):
-        errors = payload.get("errors") or payload.get("error")
-        if errors:
-            log_extra["errors"] = errors
-            logger.error("backend_push_error_payload", extra=log_extra)
-            return "failed_backend_payload_errors"
-    logger.info("backend_push_response", extra=log_extra)
-    return response_text
-    
-    
-def main():
-    dry_run = is_dry_run()
-    logger.info(
-        "dry_run_configured",
-        extra={
-            "dry_run": dry_run,
-            "action": "Resolved dry run setting from environment",
-        },
-    )
+    return handle_backend_response(resp, len(df), url)
 
-    config = get_ingest_config()
 
+@instrument()
+def push_csv_batches(df: "pd.DataFrame", dry_run: Optional[bool] = None, config: Optional[IngestConfig] = None):
+    """Push ``df`` in size-bounded, idempotent batches, resuming from the checkpoint."""
+    from tax_bracket_ingest.backend import batch as batch_push
+
+    if dry_run is None:
+        dry_run = is_dry_run()
     if dry_run:
         logger.info(
-            "dry_run_mode",
-            extra={"action": "Running ingest process in dry-run mode"},
+            "dry_run_skip_backend_push",
+            extra={
+                "rows": len(df),
+                "action": "Skipped pushing batches to backend in dry-run mode",
+            },
         )
-    html = fetch_irs_data()
-    
-    raw_struct = parse_irs_data(html.decode('utf-8'))
-    raw_df = parse_irs_data_to_dataframe(raw_struct)
-    curr_df = process_irs_dataframe(raw_df)
-    
-    if dry_run:
-        hist_df = curr_df
+        return "dry_run_skipped"
+    backend_url = os.getenv("BACKEND_URL")
+    if not backend_url:
+        logger.warning(
+            "backend_url_missing",
+            extra={
+                "rows": len(df),
+                "action": "Skipped pushing batches because BACKEND_URL is unset",
+            },
+        )
+        return "skipped_no_backend_url"
+    if config is None:
+        config = get_ingest_config()
+    result = batch_push.push_batches(
+        df,
+        backend_url + "/api/v1/tax/upload",
+        headers={"Content-Type": "text/csv", "X-API-KEY": os.getenv("INGEST_API_KEY")},
+        timeout=get_backend_timeout(),
+        max_bytes=int(os.getenv("BACKEND_BATCH_MAX_BYTES", batch_push.DEFAULT_MAX_BYTES)),
+        concurrency=int(os.getenv("BACKEND_BATCH_CONCURRENCY", batch_push.DEFAULT_CONCURRENCY)),
+        retries=int(os.getenv("BACKEND_BATCH_RETRIES", batch_push.DEFAULT_RETRIES)),
+        checkpoint=get_push_checkpoint(config),
+    )
+    add_bytes(bytes_out=result.bytes_sent)
+    return "ok" if result.ok else "failed_backend_push"
+
+
+def post_streamed_csv(url: str, headers: dict, df: "pd.DataFrame", timeout: float):
+    """POST ``df`` as a chunked, compressed CSV stream.
+
+    Returns:
+        The response, or ``None`` when the backend takes no compressed bodies
+        (nothing advertised, or a ``415`` reply), in which case the caller
+        falls back to a plain buffered POST.
+    """
+    import requests
+
+    from tax_bracket_ingest.backend import upload
+
+    encoding = upload.negotiate_encoding(url, headers, timeout, upload.get_upload_encoding())
+    if encoding == upload.IDENTITY:
+        return None
+    body = upload.CountingStream(
+        upload.encode_chunks(upload.iter_csv_chunks(df, upload.get_chunk_rows()), encoding)
+    )
+    resp = requests.post(
+        url,
+        headers={**headers, "Content-Encoding": encoding},
+        data=body,
+        timeout=timeout,
+    )
+    add_bytes(bytes_out=body.bytes_sent)
+    if resp.status_code == 415:
+        upload.remember_encoding(url, upload.IDENTITY)
+        logger.warning("backend_encoding_rejected", extra={
+            "backend_url": url,
+            "encoding": encoding,
+            "action": "Backend rejected compressed upload, resending uncompressed",
+        })
+        return None
+    logger.debug("backend_stream_upload", extra={
+        "backend_url": url,
+        "encoding": encoding,
+        "rows": len(df),
+        "bytes_sent": body.bytes_sent,
+        "action": "Streamed compressed CSV to backend",
+    })
+    return resp
+
+
+@dataclass
+class HistoryUpdate:
+    """What a run has to write back after comparing the scraped year with storage.
+
+    ``hist_df`` is ``None`` when the stored history already holds the year.
+    With ``merge_chunk_rows`` set, the CSV history is instead rewritten by
+    streaming it through in chunks of that many rows, with ``curr_df`` prepended.
+    """
+    year: int
+    curr_df: "pd.DataFrame"
+    hist_df: Optional["pd.DataFrame"] = None
+    manifest: Optional["Manifest"] = None
+    manifest_dirty: bool = False
+    merge_chunk_rows: Optional[int] = None
+
+
+def fetch_page(cache: Optional[FetchCache]):
+    """Fetch the IRS page, conditionally when a cache is configured.
+
+    Returns:
+        tuple: ``(html, fetch_result)``; ``html`` is ``None`` when the page is
+        unchanged since the last ingest.
+    """
+    if cache is None:
+        return fetch_irs_data(), None
+    fetch_result = fetch_irs_data_conditional(cache)
+    if fetch_result.unchanged:
         logger.info(
-            "dry_run_skip_history_fetch",
+            "irs_page_unchanged",
             extra={
-                "rows": len(curr_df),
-                "action": "Skipped fetching historical CSV from S3 in dry-run mode",
+                "status_code": fetch_result.status_code,
+                "etag": fetch_result.entry.etag,
+                "sha256": fetch_result.entry.sha256,
+                "action": "IRS page unchanged since last ingest, skipping parse, S3 and backend",
             },
         )
+        return None, fetch_result
+    return fetch_result.content, fetch_result
+
+
+def replay_page(snapshots: Optional[SnapshotCache]) -> Optional[bytes]:
+    """With ``SNAPSHOT_REPLAY=1``, the IRS page archived by an earlier run instead of a fetch."""
+    if snapshots is None or not should_replay_snapshots():
+        return None
+    html = snapshots.html_for_url(IRS_URL)
+    if html is None:
+        logger.warning("snapshot_replay_missing", extra={
+            "url": IRS_URL,
+            "action": "No archived IRS page to replay, fetching it instead",
+        })
+        return None
+    logger.info("snapshot_replay", extra={
+        "bytes": len(html),
+        "action": "Replaying archived IRS page, skipping the fetch",
+    })
+    return html
+
+
+def archive_page(snapshots: Optional[SnapshotCache], html: bytes):
+    """Keep the fetched page in the snapshot cache, for replays and as a corpus."""
+    if snapshots is not None:
+        snapshots.put_html(html, url=IRS_URL)
+
+
+def parse_html_frame(html: bytes) -> "pd.DataFrame":
+    from tax_bracket_ingest.parser.parser import parse_irs_brackets
+
+    return parse_irs_brackets(html.decode('utf-8')).to_frame()
+
+
+def normalize_html(html: bytes, snapshots: Optional[SnapshotCache] = None) -> "pd.DataFrame":
+    """Parse and normalize a page, reusing frames cached for the same bytes and code."""
+    from tax_bracket_ingest.parser.normalize import process_irs_dataframe
+
+    if snapshots is not None:
+        return snapshots.load(html, parse_html_frame, process_irs_dataframe)
+    return process_irs_dataframe(parse_html_frame(html))
+
+
+def plan_history_update(
+    curr_df: "pd.DataFrame",
+    manifest: Optional["Manifest"],
+    config: IngestConfig,
+    prev_hist: Optional["pd.DataFrame"] = None,
+) -> HistoryUpdate:
+    """Decide whether the scraped year is new or revised, reading storage only when needed.
+
+    Args:
+        curr_df (pd.DataFrame): The freshly normalized year.
+        manifest (Optional[Manifest]): The stored manifest, if any.
+        config (IngestConfig): Where the history lives.
+        prev_hist (Optional[pd.DataFrame]): The CSV history when the caller
+            already downloaded it; read from S3 on demand otherwise, or
+            streamed in chunks when ``HISTORY_CHUNK_ROWS`` is set.
+
+    Returns:
+        HistoryUpdate: The rows to write and the manifest to store.
+    """
+    import pandas as pd
+
+    from tax_bracket_ingest.storage.manifest import Manifest, diff_fingerprints, fingerprint_year
+
+    year = int(curr_df["Year"].iloc[0])
+    curr_fp = fingerprint_year(curr_df)
+    update = HistoryUpdate(year=year, curr_df=curr_df)
+    chunk_rows = get_history_chunk_rows() if config.history_format == "csv" else 0
+    stored_fp = manifest.get(year) if manifest is not None else None
+    known_to_manifest = stored_fp is not None
+    if known_to_manifest:
+        change = diff_fingerprints(stored_fp, curr_fp)
+    elif config.history_format == "parquet":
+        prev_year_rows = read_parquet_partition_from_s3(year, config=config)
+        stored_fp = fingerprint_year(prev_year_rows) if prev_year_rows is not None else None
+        change = diff_fingerprints(stored_fp, curr_fp)
+    elif prev_hist is None and chunk_rows:
+        scanned, prev_year_rows = scan_csv_history_from_s3(year, chunk_rows, config=config)
+        if manifest is None:
+            manifest = scanned
+        stored_fp = fingerprint_year(prev_year_rows) if prev_year_rows is not None else None
+        change = diff_fingerprints(stored_fp, curr_fp)
     else:
-        prev_hist = read_csv_from_s3(config.s3_key, config=config)
-        
-        latest_year = prev_hist["Year"].max()
-        recent_year_rows = prev_hist[prev_hist["Year"] == latest_year]
-
-        # Compare and append only if new
-        if not curr_df.equals(recent_year_rows):
-            hist_df = pd.concat([curr_df, prev_hist], ignore_index=True)
-            logger.info("append_new_data", extra={
-                "year": latest_year,
-                "rows_added": len(curr_df),
-                "action": "Appending new data to historical CSV"
-            })
+        if prev_hist is None:
+            prev_hist = read_csv_from_s3(config.s3_key, config=config)
+        if manifest is None:
+            manifest = Manifest.from_history(prev_hist)
+        prev_year_rows = prev_hist[prev_hist["Year"] == year]
+        stored_fp = fingerprint_year(prev_year_rows) if not prev_year_rows.empty else None
+        change = diff_fingerprints(stored_fp, curr_fp)
+
+    if change.changed:
+        if config.history_format == "parquet":
+            update.hist_df = curr_df
+        elif prev_hist is None and chunk_rows:
+            update.merge_chunk_rows = chunk_rows
         else:
-            hist_df = prev_hist
-            logger.info("skipping_append", extra={
-                "year": latest_year,
-                "rows": len(curr_df),
-                "action": "No new data to append, skipping"
-            })
-    
-    # Push to backend when enabled
-    if should_push_backend():
-        resp = push_csv_to_backend(curr_df, dry_run=dry_run)
-        if not dry_run:
-            logger.info("pushed_to_backend",  extra={
-                "rows": len(curr_df),
-                "response": resp,
-                "action": "Pushed current tax data to backend"
-            })
+            if prev_hist is None:
+                prev_hist = read_csv_from_s3(config.s3_key, config=config)
+            # Replace a revised year rather than stacking a second copy of it
+            update.hist_df = pd.concat([curr_df, prev_hist[prev_hist["Year"] != year]], ignore_index=True)
+
+    if manifest is None:
+        manifest = Manifest()
+    if change.changed or not known_to_manifest:
+        manifest.update(curr_fp)
+        update.manifest_dirty = True
+    update.manifest = manifest
+
+    if change.changed:
+        logger.info("append_new_data", extra={
+            **change.to_log(),
+            "rows_added": len(curr_df),
+            "action": "Writing new or revised year to history"
+        })
     else:
+        logger.info("skipping_append", extra={
+            "year": year,
+            "rows": len(curr_df),
+            "digest": curr_fp.digest,
+            "action": "No new data to append, skipping"
+        })
+    return update
+
+
+def dry_run_update(curr_df: "pd.DataFrame") -> HistoryUpdate:
+    logger.info(
+        "dry_run_skip_history_fetch",
+        extra={
+            "rows": len(curr_df),
+            "action": "Skipped fetching historical CSV from S3 in dry-run mode",
+        },
+    )
+    return HistoryUpdate(year=int(curr_df["Year"].iloc[0]), curr_df=curr_df, hist_df=curr_df)
+
+
+def push_current(curr_df: "pd.DataFrame", dry_run: bool, push: Optional[bool] = None):
+    """Push the scraped year to the backend when ``push`` (default: ``ENABLE_BACKEND_PUSH``) is set."""
+    if push is None:
+        push = should_push_backend()
+    if not push:
         logger.info(
             "backend_push_disabled",
             extra={
                 "rows": len(curr_df),
-                "action": "Backend push skipped because ENABLE_BACKEND_PUSH=0",
+                "action": "Backend push skipped because pushing is disabled",
             },
         )
-    
-    # update S3
-    write_df_to_s3(hist_df, config.s3_key, dry_run=dry_run, config=config)
+        return None
+    if should_batch_backend_push():
+        resp = push_csv_batches(curr_df, dry_run=dry_run)
+    else:
+        resp = push_csv_to_backend(curr_df, dry_run=dry_run)
     if not dry_run:
+        logger.info("pushed_to_backend",  extra={
+            "rows": len(curr_df),
+            "response": resp,
+            "action": "Pushed current tax data to backend"
+        })
+    return resp
+
+
+def write_history_update(update: HistoryUpdate, config: IngestConfig, dry_run: bool):
+    """Write the history rows, then the manifest that describes them."""
+    from tax_bracket_ingest.storage import parquet as parquet_store
+
+    rows = None
+    if update.merge_chunk_rows:
+        rows = merge_csv_history_in_s3(update.curr_df, update.merge_chunk_rows, dry_run=dry_run, config=config)
+        updated_key = config.s3_key
+    elif update.hist_df is not None:
+        if config.history_format == "parquet":
+            write_parquet_partitions_to_s3(update.hist_df, dry_run=dry_run, config=config)
+            updated_key = parquet_store.partition_key(config.history_prefix, update.year)
+        else:
+            write_df_to_s3(update.hist_df, config.s3_key, dry_run=dry_run, config=config)
+            updated_key = config.s3_key
+        rows = len(update.hist_df)
+    if rows is not None and not dry_run:
         logger.info("updated_s3",  extra={
             "s3_bucket": config.s3_bucket,
-            "s3_key": config.s3_key,
-            "rows": len(hist_df),
-            "action": "Updated historical CSV in S3"
+            "s3_key": updated_key,
+            "rows": rows,
+            "action": "Updated history in S3"
         })
-    
-    logger.info("ingest_complete", extra={"action": "Ingest process completed successfully"})
+    if update.manifest_dirty:
+        write_manifest_to_s3(update.manifest, dry_run=dry_run, config=config)
+
+
+def push_failed(status) -> bool:
+    """Whether ``push_current`` reported a failed push rather than a backend reply."""
+    return status in PUSH_FAILURES
+
+
+def remember_page(cache: Optional[FetchCache], fetch_result, dry_run: bool, push_status=None):
+    """Store the page validators once the page has been fully processed.
+
+    After a failed push the old validators stay, so the next run fetches the
+    page again and retries the push instead of stopping at a 304.
+    """
+    if fetch_result is None or dry_run:
+        return
+    if push_failed(push_status):
+        logger.warning("fetch_cache_not_updated", extra={
+            "push_status": push_status,
+            "action": "Kept the previous IRS page validators so the next run retries the backend push"
+        })
+        return
+    cache.store(fetch_result.entry)
+    logger.info("fetch_cache_updated", extra={
+        "etag": fetch_result.entry.etag,
+        "sha256": fetch_result.entry.sha256,
+        "action": "Stored IRS page validators for the next conditional fetch"
+    })
+
+
+def refresh_validators(cache: Optional[FetchCache], fetch_result, dry_run: bool):
+    """Store the new validators of an unchanged page, so later runs still get a 304.
+
+    A server can rotate its ETag or Last-Modified while the content stays
+    the same; without this, every later run would download the whole page.
+    """
+    if fetch_result is not None and fetch_result.validators_changed:
+        remember_page(cache, fetch_result, dry_run)
+
+
+def log_dry_run(dry_run: bool):
+    logger.info(
+        "dry_run_configured",
+        extra={
+            "dry_run": dry_run,
+            "action": "Resolved dry run setting from environment",
+        },
+    )
+    if dry_run:
+        logger.info(
+            "dry_run_mode",
+            extra={"action": "Running ingest process in dry-run mode"},
+        )
+
+
+def ingest_irs_page(
+    config: IngestConfig,
+    dry_run: bool,
+    cache: Optional[FetchCache] = None,
+    snapshots: Optional[SnapshotCache] = None,
+    push: Optional[bool] = None,
+    history_lock: Optional[ContextManager] = None,
+) -> bool:
+    """Fetch, parse and store the IRS page once.
+
+    Args:
+        config (IngestConfig): Where the history lives.
+        dry_run (bool): Skip every write.
+        cache (Optional[FetchCache]): Conditional-GET validators, if any.
+        snapshots (Optional[SnapshotCache]): Page/frame cache, if any.
+        push (Optional[bool]): Push to the backend; defaults to ``ENABLE_BACKEND_PUSH``.
+        history_lock (Optional[ContextManager]): Held from reading the manifest
+            until the history is written, so runs sharing a process (the
+            worker) cannot overwrite each other's rows.
+
+    Returns:
+        bool: ``False`` when the page was unchanged and nothing was written.
+    """
+    html, fetch_result = replay_page(snapshots), None
+    if html is None:
+        html, fetch_result = fetch_page(cache)
+        if html is None:
+            refresh_validators(cache, fetch_result, dry_run)
+            return False
+        archive_page(snapshots, html)
+
+    ingest_irs_html(html, config, dry_run, cache, fetch_result, snapshots, push, history_lock)
+    return True
+
+
+def ingest_irs_html(
+    html: bytes,
+    config: IngestConfig,
+    dry_run: bool,
+    cache: Optional[FetchCache] = None,
+    fetch_result=None,
+    snapshots: Optional[SnapshotCache] = None,
+    push: Optional[bool] = None,
+    history_lock: Optional[ContextManager] = None,
+) -> None:
+    """Parse an IRS page that was already fetched, then update the history and push it.
+
+    The arguments are those of ``ingest_irs_page``. ``fetch_result`` holds the
+    validators to store in ``cache`` once the page is processed.
+    """
+    curr_df = normalize_html(html, snapshots)
+    with history_lock or contextlib.nullcontext():
+        if dry_run:
+            update = dry_run_update(curr_df)
+        else:
+            update = plan_history_update(curr_df, read_manifest_from_s3(config=config), config)
+
+        push_status = push_current(curr_df, dry_run, push)
+        write_history_update(update, config, dry_run)
+        remember_page(cache, fetch_result, dry_run, push_status)
+
+
+def main():
+    with recording() as recorder:
+        dry_run = is_dry_run()
+        config = get_ingest_config()
+        log_dry_run(dry_run)
+
+        snapshots = get_snapshot_cache(config, dry_run)
+        try:
+            changed = ingest_irs_page(config, dry_run, get_fetch_cache(config), snapshots)
+        finally:
+            close_snapshots(snapshots)
+        if not changed:
+            return
+
+    logger.info("ingest_complete", extra={
+        "stages": recorder.summary(),
+        "action": "Ingest process completed successfully",
+    })
 
 if __name__ == "__main__":
+    from tax_bracket_ingest.runtime import init_runtime
+
+    init_runtime()
     logger.info("starting_ingest",  extra={"action": "Starting ingest process"})
     try:
         main()
-    except Exception as e:
-        logger.error("ingest_error", error=str(e), extra={"action": "Error during ingest process"})
+    except Exception:
+        logger.exception("ingest_error", extra={"action": "Error during ingest process"})
         raise
     finally:
         logger.info("ingest_finished", extra={"action": "Ingest process finished"})
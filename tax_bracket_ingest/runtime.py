@@ -0,0 +1,34 @@
+# tax_bracket_ingest/runtime.py
+"""Process-wide setup that entry points run once, never at import time."""
+_initialized = False
+
+
+def init_runtime() -> None:
+    """Load ``.env`` and configure logging, once per process.
+
+    Called from ``lambda_handler`` and the ``python -m`` entry points so that
+    importing a module has no side effects and stays cheap.
+    """
+    global _initialized
+    if _initialized:
+        return
+    from dotenv import load_dotenv
+
+    from tax_bracket_ingest.logging_config import setup_logging
+
+    load_dotenv()
+    setup_logging()
+    _initialized = True
+
+
+def flush_logs() -> None:
+    """Write out log records still buffered by ``LOG_ASYNC=1``.
+
+    Lambda freezes the process once the handler returns, so a record still in
+    the queue would only be written on the next invocation, or never.
+    """
+    if not _initialized:
+        return
+    from tax_bracket_ingest.logging_config import flush_logging
+
+    flush_logging()
\ No newline at end of file
@@ -0,0 +1,98 @@
+# tax_bracket_ingest/scraper/cache.py
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Optional, Protocol, runtime_checkable
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """Validators remembered from the last fully processed response for a URL."""
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    sha256: str
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, raw) -> "CacheEntry":
+        return cls(**json.loads(raw))
+
+
+def _entry_name(url: str) -> str:
+    return hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json"
+
+
+@runtime_checkable
+class FetchCache(Protocol):
+    """Persistent store of CacheEntry objects, one per URL."""
+
+    def load(self, url: str) -> Optional[CacheEntry]:
+        """The entry last stored for ``url``, or ``None``."""
+        ...
+
+    def store(self, entry: CacheEntry) -> None:
+        """Replace the entry for ``entry.url``."""
+        ...
+
+
+class LocalFetchCache:
+    """Keeps one JSON file per URL in a local directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, _entry_name(url))
+
+    def load(self, url: str) -> Optional[CacheEntry]:
+        try:
+            with open(self._path(url), encoding="utf-8") as fh:
+                return CacheEntry.from_json(fh.read())
+        except FileNotFoundError:
+            return None
+
+    def store(self, entry: CacheEntry) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(entry.url)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(entry.to_json())
+        os.replace(tmp_path, path)
+
+
+class S3FetchCache:
+    """Keeps one JSON sidecar object per URL under an S3 prefix."""
+
+    def __init__(self, bucket: str, prefix: str, client=None):
+        self.bucket = bucket
+        self.prefix = prefix
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            from tax_bracket_ingest.storage.s3 import get_s3_client
+            self._client = get_s3_client()
+        return self._client
+
+    def _key(self, url: str) -> str:
+        return self.prefix + _entry_name(url)
+
+    def load(self, url: str) -> Optional[CacheEntry]:
+        try:
+            resp = self.client.get_object(Bucket=self.bucket, Key=self._key(url))
+        except self.client.exceptions.NoSuchKey:
+            return None
+        return CacheEntry.from_json(resp["Body"].read())
+
+    def store(self, entry: CacheEntry) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(entry.url),
+            Body=entry.to_json().encode("utf-8"),
+            ContentType="application/json",
+        )
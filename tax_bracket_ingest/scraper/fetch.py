@@ -1,7 +1,11 @@
 # tax_bracket_ingest/scraper/fetch.py
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import Optional
+
+from tax_bracket_ingest.metrics import RESULT, add_bytes, instrument
+from tax_bracket_ingest.scraper.cache import CacheEntry, FetchCache
 
 
 IRS_URL = "https://www.irs.gov/filing/federal-income-tax-rates-and-brackets"
@@ -11,20 +15,63 @@ class FetchError(RuntimeError):
     """Raised when retrieving IRS data fails."""
 
 
+@dataclass(frozen=True)
+class FetchResult:
+    """Outcome of a conditional fetch.
+
+    ``content`` is ``None`` when the server answered 304 Not Modified.
+    ``unchanged`` is true for a 304 and for a 200 whose body hashes to the
+    cached value. ``entry`` holds the validators to store once the caller
+    has finished processing the page. ``validators_changed`` is true when
+    its ETag or Last-Modified differ from the cached ones, so an unchanged
+    page still needs its entry stored.
+    """
+    content: Optional[bytes]
+    entry: CacheEntry
+    unchanged: bool
+    status_code: int
+    validators_changed: bool = False
+
+
 _DEFAULT_TIMEOUT = 10
-_MAX_RETRIES = Retry(
-    total=3,
-    status_forcelist=(429, 500, 502, 503, 504),
-    backoff_factor=0.5,
-    allowed_methods=("GET",),
-)
 _HEADERS = {
     "User-Agent": "tax-bracket-ingest/1.0 (+https://www.irs.gov/)",
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
 }
-_SESSION = requests.Session()
-_SESSION.mount("https://", HTTPAdapter(max_retries=_MAX_RETRIES))
-_SESSION.mount("http://", HTTPAdapter(max_retries=_MAX_RETRIES))
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _session():
+    """The pooled retrying session, built on first use so importing this module stays cheap."""
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+
+                retries = Retry(
+                    total=3,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    backoff_factor=0.5,
+                    allowed_methods=("GET",),
+                )
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(max_retries=retries))
+                session.mount("http://", HTTPAdapter(max_retries=retries))
+                _SESSION = session
+    return _SESSION
+
+
+def _get(url: str, timeout: float, headers: dict):
+    import requests
+
+    try:
+        return _session().get(url, timeout=timeout, headers=headers)
+    except requests.RequestException as exc:
+        raise FetchError(f"Request to {url} failed: {exc}") from exc
 
 
 def _format_body_snippet(body: str, limit: int = 200) -> str:
@@ -35,12 +82,10 @@ def _format_body_snippet(body: str, limit: int = 200) -> str:
     return f"{condensed[:limit]}..."
 
 
+@instrument(bytes_in=RESULT)
 def fetch(url: str, timeout: float = _DEFAULT_TIMEOUT) -> bytes:
     """Fetch a URL with retries, timeout, and diagnostic error reporting."""
-    try:
-        response = _SESSION.get(url, timeout=timeout, headers=_HEADERS)
-    except requests.RequestException as exc:
-        raise FetchError(f"Request to {url} failed: {exc}") from exc
+    response = _get(url, timeout, _HEADERS)
 
     if response.status_code != 200:
         snippet = _format_body_snippet(response.text)
@@ -51,6 +96,72 @@ def fetch(url: str, timeout: float = _DEFAULT_TIMEOUT) -> bytes:
     return response.content
 
 
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _validators(entry: CacheEntry):
+    return entry.etag, entry.last_modified
+
+
+@instrument()
+def fetch_conditional(
+    url: str,
+    cached: Optional[CacheEntry] = None,
+    timeout: float = _DEFAULT_TIMEOUT,
+) -> FetchResult:
+    """Fetch a URL, revalidating against a previous response when one is cached.
+
+    Sends ``If-None-Match`` / ``If-Modified-Since`` from ``cached`` and treats
+    both a 304 and a 200 with an identical content hash as unchanged.
+    """
+    headers = dict(_HEADERS)
+    if cached is not None:
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+
+    response = _get(url, timeout, headers)
+
+    if response.status_code == 304 and cached is not None:
+        entry = CacheEntry(
+            url=url,
+            etag=response.headers.get("ETag") or cached.etag,
+            last_modified=response.headers.get("Last-Modified") or cached.last_modified,
+            sha256=cached.sha256,
+        )
+        return FetchResult(
+            content=None, entry=entry, unchanged=True, status_code=304,
+            validators_changed=_validators(entry) != _validators(cached),
+        )
+
+    if response.status_code != 200:
+        snippet = _format_body_snippet(response.text)
+        raise FetchError(
+            f"GET {url} returned {response.status_code} {response.reason}: {snippet}"
+        )
+
+    content = response.content
+    add_bytes(bytes_in=len(content))
+    entry = CacheEntry(
+        url=url,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+        sha256=content_hash(content),
+    )
+    unchanged = cached is not None and cached.sha256 == entry.sha256
+    return FetchResult(
+        content=content, entry=entry, unchanged=unchanged, status_code=200,
+        validators_changed=cached is not None and _validators(entry) != _validators(cached),
+    )
+
+
 def fetch_irs_data() -> bytes:
     """Fetch the IRS tax bracket page contents."""
     return fetch(IRS_URL)
+
+
+def fetch_irs_data_conditional(cache: FetchCache) -> FetchResult:
+    """Revalidate the IRS page against ``cache``; the caller stores ``result.entry``."""
+    return fetch_conditional(IRS_URL, cache.load(IRS_URL))
@@ -0,0 +1 @@
+# tax_bracket_ingest/sources/__init__.py
\ No newline at end of file
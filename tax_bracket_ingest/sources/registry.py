@@ -0,0 +1,123 @@
+# tax_bracket_ingest/sources/registry.py
+"""Bracket pages to ingest, each with the adapters that turn it into rows.
+
+A ``Source`` names a URL, a parser adapter (page text -> raw
+``Header``/``Rate``/``Range`` frame) and a normalizer adapter (raw frame ->
+typed long rows, see ``normalize_long``). Adapters are looked up by name in
+``PARSERS`` and ``NORMALIZERS`` so sources can be listed in JSON; add new page
+layouts with ``register_parser`` / ``register_normalizer``.
+
+The IRS page is always registered. More sources (state pages) come from the
+JSON file named by ``SOURCES_FILE``::
+
+    [{"name": "co", "url": "https://...", "jurisdiction": "CO", "year": 2025}]
+"""
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+from tax_bracket_ingest.parser.normalize import normalize_long
+from tax_bracket_ingest.parser.parser import parse_irs_brackets
+from tax_bracket_ingest.scraper.fetch import IRS_URL
+
+SOURCES_FILE_ENV = "SOURCES_FILE"
+
+Parser = Callable[[str], pd.DataFrame]
+Normalizer = Callable[[pd.DataFrame, "Source"], pd.DataFrame]
+
+PARSERS: Dict[str, Parser] = {}
+NORMALIZERS: Dict[str, Normalizer] = {}
+
+
+def register_parser(name: str):
+    """Decorator adding a page-text -> raw-frame adapter to ``PARSERS``."""
+    def decorator(fn: Parser) -> Parser:
+        PARSERS[name] = fn
+        return fn
+    return decorator
+
+
+def register_normalizer(name: str):
+    """Decorator adding a raw-frame -> long-rows adapter to ``NORMALIZERS``."""
+    def decorator(fn: Normalizer) -> Normalizer:
+        NORMALIZERS[name] = fn
+        return fn
+    return decorator
+
+
+@register_parser("bracket_tables")
+def parse_bracket_tables(html: str) -> pd.DataFrame:
+    """Headings followed by two-column rate/range tables, the layout of the IRS page."""
+    return parse_irs_brackets(html).to_frame()
+
+
+@register_normalizer("filing_status")
+def normalize_filing_status(raw: pd.DataFrame, source: "Source") -> pd.DataFrame:
+    """One table per filing status, found from its heading.
+
+    The tax year comes from ``source.year`` when set, else from the headings.
+    """
+    if source.year is not None:
+        raw = raw.assign(Year=source.year)
+    return normalize_long(raw)
+
+
+@dataclass(frozen=True)
+class Source:
+    name: str
+    url: str
+    jurisdiction: str
+    parser: str = "bracket_tables"
+    normalizer: str = "filing_status"
+    year: Optional[int] = None
+
+    def __post_init__(self):
+        if self.parser not in PARSERS:
+            raise ValueError(f"Source {self.name!r}: unknown parser {self.parser!r}; expected one of {', '.join(PARSERS)}")
+        if self.normalizer not in NORMALIZERS:
+            raise ValueError(
+                f"Source {self.name!r}: unknown normalizer {self.normalizer!r}; expected one of {', '.join(NORMALIZERS)}"
+            )
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc.lower()
+
+    def load(self, html: bytes) -> pd.DataFrame:
+        """Parse and normalize one fetched page into long rows tagged with ``jurisdiction``."""
+        raw = PARSERS[self.parser](html.decode("utf-8"))
+        df = NORMALIZERS[self.normalizer](raw, self)
+        df.insert(0, "Jurisdiction", self.jurisdiction)
+        return df
+
+
+IRS_SOURCE = Source(name="irs", url=IRS_URL, jurisdiction="US")
+
+
+def load_sources(path: Optional[str] = None) -> List[Source]:
+    """The IRS source plus every source listed in ``path`` (default: ``SOURCES_FILE``).
+
+    Raises:
+        ValueError: If an entry is malformed, uses an unknown adapter, or
+            reuses a source name.
+    """
+    if path is None:
+        path = os.getenv(SOURCES_FILE_ENV)
+    sources = [IRS_SOURCE]
+    if path:
+        with open(path, encoding="utf-8") as fh:
+            entries = json.load(fh)
+        for entry in entries:
+            try:
+                sources.append(Source(**entry))
+            except TypeError as exc:
+                raise ValueError(f"Invalid source entry {entry!r} in {path}: {exc}") from exc
+    names = [source.name for source in sources]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate source names: {', '.join(duplicates)}")
+    return sources
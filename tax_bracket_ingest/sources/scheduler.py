@@ -0,0 +1,285 @@
+# tax_bracket_ingest/sources/scheduler.py
+"""Fetch, parse and store every registered source concurrently.
+
+Each source is fetched on a worker thread via ``asyncio.to_thread``. Requests
+to one host are limited to ``SOURCES_PER_HOST_CONCURRENCY`` in flight, and
+their starts are spaced ``SOURCES_PER_HOST_INTERVAL_MS`` apart, so fifty state
+pages on one government domain are not fetched in a burst. Different hosts
+proceed in parallel up to ``SOURCES_MAX_CONCURRENCY`` blocking calls overall.
+
+A failing source does not stop the others. Every source that succeeded is
+written to the combined dataset (see ``tax_bracket_ingest.storage.dataset``)
+before ``SourceIngestError`` reports the failures. With a fetch cache
+configured, unchanged pages are skipped like in ``run_ingest``.
+
+The IRS page also goes through ``run_ingest.ingest_irs_html``, so a sources
+run updates the federal history, its manifest and the backend push exactly
+like ``run_ingest``, from the same fetch.
+
+Usage:
+    python -m tax_bracket_ingest.sources.scheduler
+    INGEST_MODE=sources   # makes lambda_handler.handler use this pipeline
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.metrics import recording
+from tax_bracket_ingest.run_ingest import IngestConfig
+from tax_bracket_ingest.scraper import fetch as fetch_mod
+from tax_bracket_ingest.scraper.cache import FetchCache
+from tax_bracket_ingest.scraper.fetch import FetchResult
+from tax_bracket_ingest.sources.registry import IRS_SOURCE, Source, load_sources
+from tax_bracket_ingest.storage import dataset
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENCY_ENV = "SOURCES_MAX_CONCURRENCY"
+PER_HOST_CONCURRENCY_ENV = "SOURCES_PER_HOST_CONCURRENCY"
+PER_HOST_INTERVAL_ENV = "SOURCES_PER_HOST_INTERVAL_MS"
+DATASET_PREFIX_ENV = "SOURCES_DATASET_PREFIX"
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_PER_HOST_CONCURRENCY = 2
+DEFAULT_PER_HOST_INTERVAL_MS = 250
+DEFAULT_DATASET_PREFIX = "brackets/"
+
+
+def _positive_int(name: str, default: int, minimum: int = 1) -> int:
+    raw = os.getenv(name)
+    value = int(raw) if raw else default
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {value}")
+    return value
+
+
+class SourceIngestError(RuntimeError):
+    """Raised after a multi-source run in which at least one source failed."""
+
+    def __init__(self, failures: Dict[str, BaseException]):
+        self.failures = failures
+        details = "; ".join(f"{name}: {exc}" for name, exc in failures.items())
+        super().__init__(f"{len(failures)} source(s) failed: {details}")
+
+
+class HostLimiter:
+    """Caps the requests in flight per host and spaces out their starts.
+
+    ``clock`` and ``sleep`` default to ``time.monotonic`` and ``asyncio.sleep``.
+    """
+
+    def __init__(self, per_host: int, interval: float, clock=time.monotonic, sleep=asyncio.sleep):
+        self.per_host = per_host
+        self.interval = interval
+        self.clock = clock
+        self.sleep = sleep
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @contextlib.asynccontextmanager
+    async def slot(self, host: str):
+        semaphore = self._slots.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with semaphore:
+            # Reserve the next start time before sleeping, so waiters queue up in order
+            now = self.clock()
+            start = max(now, self._next_start.get(host, now))
+            self._next_start[host] = start + self.interval
+            if start > now:
+                await self.sleep(start - now)
+            yield
+
+
+@dataclass(frozen=True)
+class SourceResult:
+    """Outcome for one source.
+
+    ``frame`` is ``None`` when the page was unchanged or the source failed;
+    ``error`` holds the exception of a failed source. ``html`` is kept only
+    for the IRS page, which also updates the federal history.
+    """
+    source: Source
+    frame: Optional[pd.DataFrame] = None
+    fetch_result: Optional[FetchResult] = None
+    error: Optional[BaseException] = None
+    elapsed_ms: float = 0.0
+    html: Optional[bytes] = None
+
+
+class Scheduler:
+    def __init__(self, cache: Optional[FetchCache], max_concurrency: int, per_host: int, interval: float):
+        self.cache = cache
+        self.limit = asyncio.Semaphore(max_concurrency)
+        self.hosts = HostLimiter(per_host, interval)
+
+    async def blocking(self, fn, *args):
+        async with self.limit:
+            return await asyncio.to_thread(fn, *args)
+
+    def fetch(self, source: Source):
+        """``(html, fetch_result)``; ``html`` is ``None`` when the page is unchanged."""
+        if self.cache is None:
+            return fetch_mod.fetch(source.url), None
+        result = fetch_mod.fetch_conditional(source.url, self.cache.load(source.url))
+        return (None if result.unchanged else result.content), result
+
+    async def ingest(self, source: Source) -> SourceResult:
+        start = time.perf_counter()
+        try:
+            async with self.hosts.slot(source.host):
+                html, fetch_result = await self.blocking(self.fetch, source)
+            frame = None if html is None else await self.blocking(source.load, html)
+        except Exception as exc:
+            logger.warning("source_failed", extra={
+                "source": source.name,
+                "url": source.url,
+                "error": str(exc),
+                "action": "Failed to fetch or parse source, continuing with the others",
+            })
+            return SourceResult(source, error=exc, elapsed_ms=_ms_since(start))
+        return SourceResult(
+            source, frame, fetch_result, elapsed_ms=_ms_since(start),
+            html=html if source == IRS_SOURCE else None,
+        )
+
+    async def run(self, sources: Sequence[Source]) -> List[SourceResult]:
+        return list(await asyncio.gather(*(self.ingest(source) for source in sources)))
+
+
+def _ms_since(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def combine(results: Sequence[SourceResult]) -> pd.DataFrame:
+    """Stack every changed source's rows into one frame."""
+    frames = [result.frame for result in results if result.frame is not None]
+    if not frames:
+        return pd.DataFrame(columns=list(dataset.DATASET_COLUMNS))
+    return pd.concat(frames, ignore_index=True)
+
+
+async def ingest_federal_history(
+    results: Sequence[SourceResult],
+    cache: Optional[FetchCache],
+    config: IngestConfig,
+    dry_run: bool,
+) -> Optional[BaseException]:
+    """Update the federal history and push from the IRS page fetched in this run.
+
+    Returns:
+        Optional[BaseException]: The error, when updating the history failed.
+    """
+    irs = next((r for r in results if r.source == IRS_SOURCE and r.error is None), None)
+    if irs is None:
+        return None
+    if irs.html is None:
+        run_ingest.refresh_validators(cache, irs.fetch_result, dry_run)
+        return None
+    snapshots = run_ingest.get_snapshot_cache(config, dry_run)
+    try:
+        await asyncio.to_thread(run_ingest.archive_page, snapshots, irs.html)
+        await asyncio.to_thread(
+            run_ingest.ingest_irs_html, irs.html, config, dry_run, cache, irs.fetch_result, snapshots
+        )
+    except Exception as exc:
+        logger.warning("federal_history_failed", extra={
+            "url": IRS_SOURCE.url,
+            "error": str(exc),
+            "action": "Failed to update the federal history from the IRS page",
+        })
+        return exc
+    finally:
+        await asyncio.to_thread(run_ingest.close_snapshots, snapshots)
+    return None
+
+
+async def run_sources_async(
+    sources: Optional[Sequence[Source]] = None,
+    config: Optional[IngestConfig] = None,
+    dry_run: Optional[bool] = None,
+) -> List[SourceResult]:
+    """Ingest ``sources`` (default: ``load_sources()``) into the combined dataset.
+
+    Returns:
+        List[SourceResult]: One result per source, in the order given.
+
+    Raises:
+        SourceIngestError: If any source failed; the others are written first.
+    """
+    start = time.perf_counter()
+    if sources is None:
+        sources = load_sources()
+    if dry_run is None:
+        dry_run = run_ingest.is_dry_run()
+    if config is None:
+        config = run_ingest.get_ingest_config()
+    run_ingest.log_dry_run(dry_run)
+    scheduler = Scheduler(
+        run_ingest.get_fetch_cache(config),
+        _positive_int(MAX_CONCURRENCY_ENV, DEFAULT_MAX_CONCURRENCY),
+        _positive_int(PER_HOST_CONCURRENCY_ENV, DEFAULT_PER_HOST_CONCURRENCY),
+        _positive_int(PER_HOST_INTERVAL_ENV, DEFAULT_PER_HOST_INTERVAL_MS, minimum=0) / 1000,
+    )
+
+    with recording() as recorder:
+        results = await scheduler.run(sources)
+        combined = combine(results)
+        prefix = os.getenv(DATASET_PREFIX_ENV, DEFAULT_DATASET_PREFIX)
+        if dry_run:
+            logger.info("dry_run_skip_write_dataset", extra={
+                "rows": len(combined),
+                "prefix": prefix,
+                "action": "Skipped writing the combined bracket dataset in dry-run mode",
+            })
+        elif len(combined):
+            storage = run_ingest.get_storage(config)
+            partitions = await asyncio.to_thread(dataset.write_dataset, storage, prefix, combined)
+            logger.info("updated_dataset", extra={
+                "prefix": prefix,
+                "partitions": len(partitions),
+                "rows": len(combined),
+                "action": "Wrote changed sources to the combined bracket dataset",
+            })
+        for result in results:
+            if result.error is None and result.source != IRS_SOURCE:
+                run_ingest.remember_page(scheduler.cache, result.fetch_result, dry_run)
+        irs_error = await ingest_federal_history(results, scheduler.cache, config, dry_run)
+
+    failures = {result.source.name: result.error for result in results if result.error is not None}
+    if irs_error is not None:
+        failures[IRS_SOURCE.name] = irs_error
+    logger.info("sources_ingest_complete", extra={
+        "sources": len(results),
+        "changed": sum(result.frame is not None for result in results),
+        "failed": sorted(failures),
+        "source_ms": {result.source.name: result.elapsed_ms for result in results},
+        "total_ms": _ms_since(start),
+        "stages": recorder.summary(),
+        "action": "Multi-source ingest completed",
+    })
+    if failures:
+        raise SourceIngestError(failures)
+    return results
+
+
+def main():
+    return asyncio.run(run_sources_async())
+
+
+if __name__ == "__main__":
+    from tax_bracket_ingest.runtime import init_runtime
+
+    init_runtime()
+    logger.info("starting_ingest", extra={"action": "Starting multi-source ingest process"})
+    try:
+        main()
+    except Exception:
+        logger.exception("ingest_error", extra={"action": "Error during multi-source ingest process"})
+        raise
+    finally:
+        logger.info("ingest_finished", extra={"action": "Ingest process finished"})
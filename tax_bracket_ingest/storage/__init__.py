@@ -0,0 +1 @@
+# tax_bracket_ingest/storage/__init__.py
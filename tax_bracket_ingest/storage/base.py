@@ -0,0 +1,115 @@
+# tax_bracket_ingest/storage/base.py
+"""The object-store interface the pipeline is written against.
+
+Keys are ``/``-separated paths such as ``history.csv`` or
+``history/Year=2024/part-0.parquet``. Three implementations ship with the
+package and are selected with ``STORAGE_BACKEND``:
+
+- ``s3`` (default): ``S3Storage``, the bucket in ``S3_BUCKET``.
+- ``local``: ``LocalStorage``, files under ``STORAGE_ROOT``; reads are memory-mapped.
+- ``memory``: ``MemoryStorage``, a per-process dict, for tests and offline benchmarks.
+"""
+from typing import TYPE_CHECKING, BinaryIO, ContextManager, List, Optional, Protocol, Tuple, runtime_checkable
+
+from tax_bracket_ingest.config import STORAGE_BACKENDS
+
+if TYPE_CHECKING:  # pandas stays out of the import path of the light modules
+    import pandas as pd
+
+
+class ObjectNotFound(KeyError):
+    """Raised when a key does not exist in the store."""
+
+
+@runtime_checkable
+class Storage(Protocol):
+    def read(self, key: str) -> bytes:
+        """The whole object. Raises ``ObjectNotFound``."""
+        ...
+
+    def open(self, key: str) -> BinaryIO:
+        """A readable binary stream over the object. Raises ``ObjectNotFound``."""
+        ...
+
+    def write(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        """Store ``data`` under ``key``, replacing any existing object."""
+        ...
+
+    def writer(self, key: str, content_type: Optional[str] = None) -> ContextManager[BinaryIO]:
+        """A writable binary file; the object appears only if the block exits cleanly."""
+        ...
+
+    def exists(self, key: str) -> bool:
+        """Whether ``key`` is stored, without reading the object."""
+        ...
+
+    def list(self, prefix: str = "") -> List[str]:
+        """Every key under ``prefix``, sorted."""
+        ...
+
+    def delete(self, key: str) -> None:
+        """Remove ``key``; a missing key is not an error."""
+        ...
+
+
+class CountingReader:
+    """Pass-through reader that counts the bytes handed to its consumer."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read() if size is None or size < 0 else self.raw.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def __iter__(self):
+        return iter(lambda: self.read(64 * 1024), b"")
+
+
+def read_csv(storage: Storage, key: str, **read_csv_kwargs) -> Tuple["pd.DataFrame", int]:
+    """``pd.read_csv`` streamed from ``storage``.
+
+    Returns:
+        tuple: ``(frame, bytes_read)``.
+    """
+    import pandas as pd
+
+    with storage.open(key) as stream:
+        reader = CountingReader(stream)
+        df = pd.read_csv(reader, **read_csv_kwargs)
+    return df, reader.bytes_read
+
+
+def write_csv(storage: Storage, key: str, df: "pd.DataFrame") -> int:
+    """Serialize ``df`` as CSV straight into ``storage``; returns the bytes written."""
+    with storage.writer(key, content_type="text/csv") as fh:
+        df.to_csv(fh, index=False, mode="wb", encoding="utf-8")
+        size = fh.tell()
+    return size
+
+
+def open_storage(backend: str, bucket: Optional[str] = None, root: Optional[str] = None) -> Storage:
+    """Build the store named ``backend``.
+
+    Args:
+        backend (str): One of ``STORAGE_BACKENDS``.
+        bucket (Optional[str]): Bucket for ``s3``; also names the ``memory`` store.
+        root (Optional[str]): Directory for ``local``.
+    """
+    if backend == "s3":
+        from tax_bracket_ingest.storage.s3 import S3Storage
+
+        return S3Storage(bucket)
+    if backend == "local":
+        from tax_bracket_ingest.storage.local import LocalStorage
+
+        if not root:
+            raise ValueError("STORAGE_BACKEND=local requires STORAGE_ROOT")
+        return LocalStorage(root)
+    if backend == "memory":
+        from tax_bracket_ingest.storage.memory import MemoryStorage
+
+        return MemoryStorage.named(bucket or "default")
+    raise ValueError(f"STORAGE_BACKEND must be one of {', '.join(STORAGE_BACKENDS)}, got {backend!r}")
@@ -0,0 +1,87 @@
+# tax_bracket_ingest/storage/dataset.py
+"""Combined multi-source bracket dataset, partitioned by jurisdiction and year.
+
+Objects live at ``<prefix>Jurisdiction=<code>/Year=<year>/part-0.parquet``
+and hold the typed long format of ``normalize_long`` plus a ``Jurisdiction``
+column. A source rewrites only its own partitions, so sources can be ingested
+independently and the dataset read back as one frame.
+"""
+import logging
+import re
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+import pandas as pd
+
+from tax_bracket_ingest.parser.normalize import BRACKET_SCHEMA
+from tax_bracket_ingest.storage.base import Storage
+from tax_bracket_ingest.storage.parquet import PARTITION_FILE, _pa
+
+logger = logging.getLogger(__name__)
+
+DATASET_COLUMNS = ("Jurisdiction", *BRACKET_SCHEMA)
+_PARTITION_RE = re.compile(r"Jurisdiction=([^/]+)/Year=(\d+)/" + re.escape(PARTITION_FILE))
+
+
+def dataset_schema():
+    pa, _ = _pa()
+    return pa.schema([
+        pa.field("Jurisdiction", pa.string(), nullable=False),
+        pa.field("Year", pa.int32(), nullable=False),
+        pa.field("Status", pa.string(), nullable=False),
+        pa.field("Rate", pa.float64()),
+        pa.field("Start", pa.int64()),
+        pa.field("End", pa.int64()),
+    ])
+
+
+def partition_key(prefix: str, jurisdiction: str, year: int) -> str:
+    return f"{prefix}Jurisdiction={jurisdiction}/Year={int(year)}/{PARTITION_FILE}"
+
+
+def list_partitions(storage: Storage, prefix: str) -> List[Tuple[str, int]]:
+    """``(jurisdiction, year)`` of every partition under ``prefix``, sorted."""
+    partitions = []
+    for key in storage.list(prefix):
+        match = _PARTITION_RE.fullmatch(key[len(prefix):])
+        if match:
+            partitions.append((match.group(1), int(match.group(2))))
+    return sorted(partitions)
+
+
+def write_dataset(storage: Storage, prefix: str, df: pd.DataFrame) -> List[Tuple[str, int]]:
+    """Write one object per ``(Jurisdiction, Year)`` in ``df``, replacing existing partitions."""
+    pa, pq = _pa()
+    schema = dataset_schema()
+    written = []
+    for (jurisdiction, year), part in df.groupby(["Jurisdiction", "Year"], sort=False, observed=True):
+        key = partition_key(prefix, jurisdiction, year)
+        part = part.reset_index(drop=True).astype({"Status": str})
+        table = pa.Table.from_pandas(part[list(DATASET_COLUMNS)], schema=schema, preserve_index=False)
+        with storage.writer(key) as writer:
+            pq.write_table(table, writer, compression="zstd")
+        written.append((jurisdiction, int(year)))
+        logger.debug("wrote_dataset_partition", extra={
+            "s3_key": key,
+            "rows": len(part),
+            "action": "Wrote bracket dataset partition to storage",
+        })
+    return written
+
+
+def read_dataset(storage: Storage, prefix: str, jurisdiction: Optional[str] = None) -> pd.DataFrame:
+    """Read every partition (or one jurisdiction's) back into the typed long format."""
+    pa, pq = _pa()
+    frames = []
+    for code, year in list_partitions(storage, prefix):
+        if jurisdiction is not None and code != jurisdiction:
+            continue
+        data = storage.read(partition_key(prefix, code, year))
+        frames.append(pq.read_table(pa.BufferReader(data)).to_pandas())
+    if not frames:
+        return pd.DataFrame({
+            "Jurisdiction": pd.Series(dtype=object),
+            **{name: pd.Series(dtype=dtype) for name, dtype in BRACKET_SCHEMA.items()},
+        })
+    df = pd.concat(frames, ignore_index=True)
+    return df.astype({"Year": "int64", "Status": BRACKET_SCHEMA["Status"], "Start": "Int64", "End": "Int64"})
@@ -0,0 +1,77 @@
+# tax_bracket_ingest/storage/local.py
+"""``Storage`` on the local filesystem, for offline runs and disk-speed benchmarks.
+
+Keys map to paths under the root directory. Reads are memory-mapped, so
+the parser pages the file in from the OS cache instead of copying it into a
+Python buffer first. Writes go to a temporary file next to the target and are
+renamed into place, so readers never see a half-written object.
+"""
+import contextlib
+import io
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from tax_bracket_ingest.storage.base import ObjectNotFound
+
+
+class LocalStorage:
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Key {key!r} escapes the storage root")
+        return path
+
+    def read(self, key: str) -> bytes:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError as exc:
+            raise ObjectNotFound(key) from exc
+
+    def open(self, key: str):
+        try:
+            with open(self._path(key), "rb") as fh:
+                if os.fstat(fh.fileno()).st_size == 0:
+                    return io.BytesIO()  # an empty file cannot be mapped
+                # The mapping stays valid after the descriptor is closed
+                return mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError as exc:
+            raise ObjectNotFound(key) from exc
+
+    def write(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        with self.writer(key) as fh:
+            fh.write(data)
+
+    @contextlib.contextmanager
+    def writer(self, key: str, content_type: Optional[str] = None):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "wb") as fh:
+                yield fh
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def list(self, prefix: str = "") -> List[str]:
+        if not self.root.is_dir():
+            return []
+        keys = (
+            path.relative_to(self.root).as_posix()
+            for path in self.root.rglob("*")
+            if path.is_file() and not path.name.endswith(".tmp")
+        )
+        return sorted(key for key in keys if key.startswith(prefix))
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
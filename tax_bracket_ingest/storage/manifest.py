@@ -0,0 +1,180 @@
+# tax_bracket_ingest/storage/manifest.py
+"""Per-year content fingerprints of the normalized history.
+
+A fingerprint hashes the *meaning* of a year's brackets rather than its
+pandas representation: ``"10%"``, ``"10"`` and ``10.0`` canonicalize to the
+same token, as do ``"$11,600"`` and ``11600``, and blank/NaN/None all become
+the empty token. Freshly scraped strings therefore hash identically to the
+same year read back from CSV or Parquet.
+
+The manifest object stored next to the history maps each year to its
+fingerprint, so "did anything change?" costs one small GET.
+"""
+import hashlib
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+MANIFEST_VERSION = 1
+RATE_COLUMN_SUFFIX = "(Rates/Brackets)"
+_NUMERIC_NOISE = re.compile(r"[$,%\s]")
+
+
+def canonical_value(value) -> str:
+    """Reduce a cell to a dtype-independent token."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and math.isnan(value):
+        return ""
+    text = str(value).strip()
+    if not text or text.lower() == "nan":
+        return ""
+    try:
+        number = Decimal(_NUMERIC_NOISE.sub("", text))
+    except InvalidOperation:
+        return text.lower()
+    if not number.is_finite():
+        return text.lower()
+    return format(number.normalize(), "f")
+
+
+def _digest(parts: List[str]) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def status_columns(columns: List[str]) -> Dict[str, List[str]]:
+    """Group wide-frame columns by filing status.
+
+    Each ``... (Rates/Brackets)`` column starts a status block that owns the
+    columns after it (its range start/end) up to the next rate column.
+    """
+    groups: Dict[str, List[str]] = {}
+    current = None
+    for col in columns:
+        if col.endswith(RATE_COLUMN_SUFFIX):
+            current = col
+            groups[current] = [col]
+        elif current is not None and col != "Year":
+            groups[current].append(col)
+    return groups
+
+
+@dataclass
+class YearFingerprint:
+    year: int
+    digest: str
+    statuses: Dict[str, List[str]] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {"digest": self.digest, "statuses": self.statuses}
+
+    @classmethod
+    def from_dict(cls, year: int, raw: dict) -> "YearFingerprint":
+        return cls(year=int(year), digest=raw["digest"], statuses=raw["statuses"])
+
+
+def fingerprint_year(df: pd.DataFrame) -> YearFingerprint:
+    """Fingerprint one year of the wide normalized frame.
+
+    Returns per-bracket digests for every status plus a digest over all of
+    them. Brackets whose cells are all blank (padding) are ignored.
+    """
+    years = df["Year"].dropna().unique()
+    if len(years) != 1:
+        raise ValueError(f"Expected exactly one year, got {sorted(years)}")
+    statuses = {}
+    for status, cols in status_columns(list(df.columns)).items():
+        brackets = []
+        for row in df[cols].itertuples(index=False, name=None):
+            tokens = [canonical_value(v) for v in row]
+            if any(tokens):
+                brackets.append(_digest(tokens))
+        statuses[status] = brackets
+    digest = _digest([f"{name}={_digest(statuses[name])}" for name in sorted(statuses)])
+    return YearFingerprint(year=int(years[0]), digest=digest, statuses=statuses)
+
+
+@dataclass
+class YearChange:
+    """What differs between a stored year and a freshly normalized one."""
+    year: int
+    is_new: bool = False
+    added_statuses: List[str] = field(default_factory=list)
+    removed_statuses: List[str] = field(default_factory=list)
+    changed_brackets: Dict[str, List[int]] = field(default_factory=dict)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.is_new or self.added_statuses or self.removed_statuses or self.changed_brackets)
+
+    def to_log(self) -> dict:
+        return {
+            "year": self.year,
+            "is_new_year": self.is_new,
+            "added_statuses": self.added_statuses,
+            "removed_statuses": self.removed_statuses,
+            "changed_brackets": self.changed_brackets,
+        }
+
+
+def diff_fingerprints(old: Optional[YearFingerprint], new: YearFingerprint) -> YearChange:
+    """Compare two fingerprints of the same year down to bracket positions."""
+    change = YearChange(year=new.year)
+    if old is None:
+        change.is_new = True
+        return change
+    if old.digest == new.digest:
+        return change
+    change.added_statuses = sorted(set(new.statuses) - set(old.statuses))
+    change.removed_statuses = sorted(set(old.statuses) - set(new.statuses))
+    for status in sorted(set(old.statuses) & set(new.statuses)):
+        before, after = old.statuses[status], new.statuses[status]
+        changed = [
+            i for i in range(max(len(before), len(after)))
+            if i >= len(before) or i >= len(after) or before[i] != after[i]
+        ]
+        if changed:
+            change.changed_brackets[status] = changed
+    return change
+
+
+@dataclass
+class Manifest:
+    years: Dict[int, YearFingerprint] = field(default_factory=dict)
+
+    def get(self, year: int) -> Optional[YearFingerprint]:
+        return self.years.get(int(year))
+
+    def update(self, fingerprint: YearFingerprint) -> None:
+        self.years[fingerprint.year] = fingerprint
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "years": {str(y): fp.to_dict() for y, fp in sorted(self.years.items())},
+            },
+            sort_keys=True,
+        )
+
+    @classmethod
+    def from_json(cls, raw) -> "Manifest":
+        payload = json.loads(raw)
+        if payload.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version {payload.get('version')!r}")
+        return cls(years={
+            int(year): YearFingerprint.from_dict(year, fp) for year, fp in payload["years"].items()
+        })
+
+    @classmethod
+    def from_history(cls, hist_df: pd.DataFrame) -> "Manifest":
+        manifest = cls()
+        if not hist_df.empty:
+            for _, rows in hist_df.groupby("Year", sort=False):
+                manifest.update(fingerprint_year(rows))
+        return manifest
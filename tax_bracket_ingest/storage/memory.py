@@ -0,0 +1,66 @@
+# tax_bracket_ingest/storage/memory.py
+"""In-process ``Storage`` backed by a dict.
+
+Stores are registered by name, so every ``get_storage()`` call in a process
+with ``STORAGE_BACKEND=memory`` sees the same objects. Useful for tests and for
+throughput benchmarks that should not measure S3 or moto overhead.
+"""
+import contextlib
+import io
+import threading
+from typing import Dict, List, Optional
+
+from tax_bracket_ingest.storage.base import ObjectNotFound
+
+_STORES: Dict[str, "MemoryStorage"] = {}
+_STORES_LOCK = threading.Lock()
+
+
+class MemoryStorage:
+    def __init__(self):
+        self.objects: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def named(cls, name: str) -> "MemoryStorage":
+        with _STORES_LOCK:
+            store = _STORES.get(name)
+            if store is None:
+                store = _STORES[name] = cls()
+        return store
+
+    def read(self, key: str) -> bytes:
+        try:
+            return self.objects[key]
+        except KeyError:
+            raise ObjectNotFound(key) from None
+
+    def open(self, key: str):
+        return io.BytesIO(self.read(key))
+
+    def write(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        with self._lock:
+            self.objects[key] = bytes(data)
+
+    @contextlib.contextmanager
+    def writer(self, key: str, content_type: Optional[str] = None):
+        buf = io.BytesIO()
+        yield buf
+        self.write(key, buf.getvalue())
+
+    def exists(self, key: str) -> bool:
+        return key in self.objects
+
+    def list(self, prefix: str = "") -> List[str]:
+        with self._lock:
+            return sorted(key for key in self.objects if key.startswith(prefix))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self.objects.pop(key, None)
+
+
+def reset_memory_stores() -> None:
+    """Forget every named in-memory store."""
+    with _STORES_LOCK:
+        _STORES.clear()
@@ -0,0 +1,94 @@
+# tax_bracket_ingest/storage/merge.py
+"""Chunked CSV history merges with memory bounded by the chunk size.
+
+The history is read with ``pd.read_csv(chunksize=...)`` and every stage is a
+generator over those chunks, so no step ever holds more than one chunk of the
+stored history:
+
+    chunks = iter_history_chunks(storage, key, chunk_rows)
+    frames = replace_years(new_rows, chunks)
+    rows, size = write_csv_frames(storage, key, frames)
+
+``scan_history`` makes one streaming pass to rebuild the manifest and pull out
+a single year's rows, for histories that have no manifest yet.
+
+Rows of a year are assumed contiguous, which every writer in this package
+guarantees (new years are prepended, replaced years removed in place).
+"""
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+import pandas as pd
+
+from tax_bracket_ingest.storage.base import Storage
+from tax_bracket_ingest.storage.manifest import Manifest, fingerprint_year
+
+
+def iter_history_chunks(storage: Storage, key: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Stream the CSV history at ``key`` as frames of at most ``chunk_rows`` rows.
+
+    Cells stay strings, because per-chunk type inference could turn ``11600`` into
+    ``11600.0`` in one chunk and not the next. Rows are written back as read.
+    """
+    with storage.open(key) as body, pd.read_csv(body, chunksize=chunk_rows, dtype=str) as reader:
+        for chunk in reader:
+            chunk["Year"] = chunk["Year"].astype("int64")
+            yield chunk
+
+
+def replace_years(new_rows: pd.DataFrame, chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """Yield ``new_rows`` first, then the stored chunks without the years it replaces."""
+    years = new_rows["Year"].unique()
+    yield new_rows
+    for chunk in chunks:
+        kept = chunk[~chunk["Year"].isin(years)]
+        if not kept.empty:
+            yield kept
+
+
+def write_csv_frames(storage: Storage, key: str, frames: Iterable[pd.DataFrame]) -> Tuple[int, int]:
+    """Write ``frames`` as one CSV object, header once, streaming through ``storage.writer``.
+
+    Returns:
+        Tuple[int, int]: Rows and bytes written.
+    """
+    rows = 0
+    with storage.writer(key, content_type="text/csv") as writer:
+        for i, frame in enumerate(frames):
+            frame.to_csv(writer, index=False, header=i == 0, mode="wb", encoding="utf-8")
+            rows += len(frame)
+        size = writer.tell()
+    return rows, size
+
+
+def scan_history(chunks: Iterable[pd.DataFrame], year: int) -> Tuple[Manifest, Optional[pd.DataFrame]]:
+    """Fingerprint every stored year and return the rows of ``year``, one chunk at a time.
+
+    Only the rows of the year currently being read are carried across chunk
+    boundaries.
+
+    Raises:
+        ValueError: If a year's rows are split by other years.
+    """
+    manifest = Manifest()
+    found: Optional[pd.DataFrame] = None
+    pending: Dict[int, pd.DataFrame] = {}
+
+    def finish(done_year: int, rows: pd.DataFrame) -> None:
+        nonlocal found
+        if manifest.get(done_year) is not None:
+            raise ValueError(f"Rows for {done_year} are not contiguous in the history")
+        manifest.update(fingerprint_year(rows))
+        if done_year == year:
+            found = rows
+
+    for chunk in chunks:
+        for chunk_year, rows in chunk.groupby("Year", sort=False):
+            chunk_year = int(chunk_year)
+            for open_year in [y for y in pending if y != chunk_year]:
+                finish(open_year, pending.pop(open_year))
+            if chunk_year in pending:
+                rows = pd.concat([pending[chunk_year], rows], ignore_index=True)
+            pending[chunk_year] = rows.reset_index(drop=True)
+    for open_year, rows in pending.items():
+        finish(open_year, rows)
+    return manifest, found
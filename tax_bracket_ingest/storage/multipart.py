@@ -0,0 +1,153 @@
+# tax_bracket_ingest/storage/multipart.py
+"""Streaming S3 writes with bounded memory.
+
+``MultipartWriter`` is a writable binary file. A serializer such as
+``DataFrame.to_csv`` or ``pyarrow.parquet.write_table`` writes into it, and
+each full part is sent with ``UploadPart`` as soon as it is buffered. At most
+one part is held in memory, however large the object grows. An object smaller
+than one part is sent with a single ``PutObject`` instead, so small histories
+cost one request as before. ``S3Storage.writer`` returns one.
+
+Part size comes from the environment:
+
+    S3_MULTIPART_PART_BYTES=8388608   # at least 5 MiB, the S3 minimum
+"""
+import io
+import logging
+import os
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+PART_BYTES_ENV = "S3_MULTIPART_PART_BYTES"
+MIN_PART_BYTES = 5 * 1024 * 1024
+DEFAULT_PART_BYTES = 8 * 1024 * 1024
+
+
+def get_part_bytes() -> int:
+    raw = os.getenv(PART_BYTES_ENV)
+    value = int(raw) if raw else DEFAULT_PART_BYTES
+    if value < MIN_PART_BYTES:
+        raise ValueError(f"{PART_BYTES_ENV} must be at least {MIN_PART_BYTES}, got {value}")
+    return value
+
+
+class MultipartWriter(io.RawIOBase):
+    """Binary file that uploads to ``s3://bucket/key`` part by part.
+
+    Use it as a context manager: a clean exit completes the upload, an
+    exception aborts it so no partial object or orphaned parts remain.
+
+    Args:
+        client: A boto3 S3 client.
+        bucket (str): Target bucket.
+        key (str): Target key.
+        part_bytes (Optional[int]): Part size; defaults to ``get_part_bytes()``.
+        content_type (Optional[str]): ``Content-Type`` of the object.
+    """
+
+    def __init__(self, client, bucket: str, key: str, part_bytes: Optional[int] = None,
+                 content_type: Optional[str] = None):
+        super().__init__()
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.part_bytes = part_bytes or get_part_bytes()
+        self.content_type = content_type
+        self.bytes_written = 0
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts = []
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.bytes_written
+
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("write to closed MultipartWriter")
+        view = memoryview(data).cast("B")
+        size = view.nbytes
+        while view.nbytes:
+            # Never buffer past one part, so a full part goes out without a copy
+            take = min(view.nbytes, self.part_bytes - len(self._buffer))
+            self._buffer += view[:take]
+            view = view[take:]
+            if len(self._buffer) == self.part_bytes:
+                self._upload_part(self._buffer)
+                self._buffer = bytearray()
+        self.bytes_written += size
+        return size
+
+    def _extra(self) -> dict:
+        return {"ContentType": self.content_type} if self.content_type else {}
+
+    def _upload_part(self, body: bytearray) -> None:
+        if self._upload_id is None:
+            resp = self.client.create_multipart_upload(Bucket=self.bucket, Key=self.key, **self._extra())
+            self._upload_id = resp["UploadId"]
+        number = len(self._parts) + 1
+        resp = self.client.upload_part(
+            Bucket=self.bucket, Key=self.key, UploadId=self._upload_id, PartNumber=number, Body=body
+        )
+        self._parts.append({"ETag": resp["ETag"], "PartNumber": number})
+
+    def close(self) -> None:
+        """Send what is buffered and complete the upload."""
+        if self.closed:
+            return
+        try:
+            if self._upload_id is None:
+                self.client.put_object(Bucket=self.bucket, Key=self.key, Body=self._buffer, **self._extra())
+            else:
+                if self._buffer:
+                    self._upload_part(self._buffer)
+                self.client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=self.key,
+                    UploadId=self._upload_id,
+                    MultipartUpload={"Parts": self._parts},
+                )
+                logger.debug("s3_multipart_complete", extra={
+                    "s3_bucket": self.bucket,
+                    "s3_key": self.key,
+                    "parts": len(self._parts),
+                    "bytes": self.bytes_written,
+                    "action": "Completed multipart upload",
+                })
+        except Exception:
+            self.abort()
+            raise
+        finally:
+            self._buffer = bytearray()
+            super().close()
+
+    def abort(self) -> None:
+        """Discard the upload and any parts already sent."""
+        if self._upload_id is not None:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=self.key, UploadId=self._upload_id)
+            logger.warning("s3_multipart_aborted", extra={
+                "s3_bucket": self.bucket,
+                "s3_key": self.key,
+                "parts": len(self._parts),
+                "action": "Aborted multipart upload",
+            })
+            self._upload_id = None
+        self._buffer = bytearray()
+        if not self.closed:
+            super().close()
+
+    def __del__(self):
+        # IOBase.__del__ would close(), completing an upload that was abandoned
+        # half-way; leave it incomplete instead
+        pass
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+        return False
+
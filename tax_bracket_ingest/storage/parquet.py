@@ -0,0 +1,228 @@
+# tax_bracket_ingest/storage/parquet.py
+"""Year-partitioned Parquet layout for the bracket history.
+
+Objects live at ``<prefix>Year=<year>/part-0.parquet`` (Hive-style), so a run
+only reads and rewrites the partition for the year it scraped.
+
+Rates are stored as float fractions (``10%`` -> 0.1) and range bounds as
+int64 dollars (``$11,600`` -> 11600). Readers get the display strings back, so
+a frame read from Parquet equals the one ``pd.read_csv`` gives for the same
+history. A column whose text would not survive that round trip exactly is
+stored as strings instead.
+
+Usage:
+    python -m tax_bracket_ingest.storage.parquet migrate     # S3_KEY CSV -> partitions
+    python -m tax_bracket_ingest.storage.parquet export-csv  # partitions -> S3_KEY CSV
+"""
+import argparse
+import logging
+import re
+from io import BytesIO
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from tax_bracket_ingest.parser.normalize import FILING_STATUSES, _format_currency, _to_nullable_int, _to_number
+from tax_bracket_ingest.storage import base as storage_base
+from tax_bracket_ingest.storage.base import ObjectNotFound, Storage
+
+logger = logging.getLogger(__name__)
+
+PARTITION_FILE = "part-0.parquet"
+_PARTITION_RE = re.compile(r"Year=(\d+)/" + re.escape(PARTITION_FILE))
+RATE_COLUMNS = frozenset(s.column for s in FILING_STATUSES)
+BOUND_COLUMNS = frozenset(c for s in FILING_STATUSES for c in (s.start_column, s.end_column))
+
+
+def _pa():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:  # pragma: no cover - exercised only without the extra
+        raise ImportError(
+            "Reading or writing Parquet requires pyarrow; install tax_bracket_ingest[parquet]"
+        ) from exc
+    return pa, pq
+
+
+def history_schema(columns: List[str]):
+    """Year is a non-null int32, rates float64 and range bounds int64; other columns are strings."""
+    pa, _ = _pa()
+
+    def field(col):
+        if col == "Year":
+            return pa.field(col, pa.int32(), nullable=False)
+        if col in RATE_COLUMNS:
+            return pa.field(col, pa.float64())
+        if col in BOUND_COLUMNS:
+            return pa.field(col, pa.int64())
+        return pa.field(col, pa.string())
+
+    return pa.schema([field(col) for col in columns])
+
+
+def _format_rate(values: np.ndarray) -> np.ndarray:
+    """Format fractions as ``10%``/``12.5%``; NaN stays NaN."""
+    out = np.full(len(values), np.nan, dtype=object)
+    mask = ~np.isnan(values)
+    out[mask] = [f"{v * 100:g}%" for v in values[mask].tolist()]
+    return out
+
+
+def _encode(values: pd.Series):
+    """Rates or bounds of one text column, or ``None`` when formatting them back would change the text."""
+    numbers = _to_number(values)
+    if values.name in RATE_COLUMNS:
+        numbers = numbers / 100
+        formatted = _format_rate(numbers)
+    else:
+        formatted = _format_currency(numbers)
+    text = values.to_numpy(dtype=object)
+    present = pd.notna(text)
+    if not (np.array_equal(present, ~np.isnan(numbers)) and (formatted[present] == text[present]).all()):
+        return None
+    return numbers if values.name in RATE_COLUMNS else _to_nullable_int(numbers)
+
+
+def partition_key(prefix: str, year: int) -> str:
+    return f"{prefix}Year={int(year)}/{PARTITION_FILE}"
+
+
+def write_frame(df: pd.DataFrame, sink) -> None:
+    """Write ``df`` as zstd Parquet to a path or writable binary file."""
+    pa, pq = _pa()
+    schema = history_schema(list(df.columns))
+    columns = {}
+    for index, field in enumerate(schema):
+        columns[field.name] = df[field.name]
+        if field.name in RATE_COLUMNS or field.name in BOUND_COLUMNS:
+            encoded = _encode(df[field.name])
+            if encoded is None:
+                schema = schema.set(index, pa.field(field.name, pa.string()))
+            else:
+                columns[field.name] = encoded
+    table = pa.Table.from_pandas(pd.DataFrame(columns), schema=schema, preserve_index=False)
+    pq.write_table(table, sink, compression="zstd")
+
+
+def frame_to_parquet_bytes(df: pd.DataFrame) -> bytes:
+    buf = BytesIO()
+    write_frame(df, buf)
+    return buf.getvalue()
+
+
+def parquet_bytes_to_frame(data: bytes) -> pd.DataFrame:
+    pa, pq = _pa()
+    # BufferReader wraps the bytes without copying them
+    table = pq.read_table(pa.BufferReader(data))
+    df = table.to_pandas()
+    # Match what pd.read_csv gives for the same history.
+    if "Year" in df.columns:
+        df["Year"] = df["Year"].astype("int64")
+    for field in table.schema:
+        if field.name in RATE_COLUMNS and pa.types.is_floating(field.type):
+            df[field.name] = _format_rate(df[field.name].to_numpy(dtype=float))
+        elif field.name in BOUND_COLUMNS and pa.types.is_integer(field.type):
+            df[field.name] = _format_currency(df[field.name].to_numpy(dtype=float))
+    return df.fillna(value=float("nan"))
+
+
+def list_partition_years(storage: Storage, prefix: str) -> List[int]:
+    """Years that have a partition under ``prefix``, ascending."""
+    years = []
+    for key in storage.list(prefix):
+        match = _PARTITION_RE.fullmatch(key[len(prefix):])
+        if match:
+            years.append(int(match.group(1)))
+    return sorted(years)
+
+
+def read_partition(storage: Storage, prefix: str, year: int) -> Optional[pd.DataFrame]:
+    """Read one year's partition, or ``None`` when it does not exist."""
+    key = partition_key(prefix, year)
+    try:
+        data = storage.read(key)
+    except ObjectNotFound:
+        return None
+    logger.debug("read_parquet_partition", extra={
+        "s3_key": key,
+        "action": "Read history partition from storage",
+    })
+    return parquet_bytes_to_frame(data)
+
+
+def read_history(storage: Storage, prefix: str) -> pd.DataFrame:
+    """Read every partition, newest year first (the order of history.csv)."""
+    frames = [
+        read_partition(storage, prefix, year)
+        for year in reversed(list_partition_years(storage, prefix))
+    ]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def write_partitions(storage: Storage, prefix: str, df: pd.DataFrame) -> List[int]:
+    """Write one object per year present in ``df``, replacing existing partitions."""
+    years = []
+    for year, part in df.groupby("Year", sort=False):
+        key = partition_key(prefix, year)
+        with storage.writer(key) as writer:
+            write_frame(part.reset_index(drop=True), writer)
+        years.append(int(year))
+        logger.debug("wrote_parquet_partition", extra={
+            "s3_key": key,
+            "rows": len(part),
+            "action": "Wrote history partition to storage",
+        })
+    return years
+
+
+def migrate_csv(storage: Storage, csv_key: str, prefix: str) -> List[int]:
+    """Split the monolithic CSV history into year partitions."""
+    df, _ = storage_base.read_csv(storage, csv_key)
+    years = write_partitions(storage, prefix, df)
+    logger.info("migrated_csv_history", extra={
+        "s3_key": csv_key,
+        "prefix": prefix,
+        "years": years,
+        "rows": len(df),
+        "action": "Converted CSV history into Parquet partitions",
+    })
+    return years
+
+
+def export_csv(storage: Storage, prefix: str, csv_key: str) -> int:
+    """Rebuild the monolithic CSV from the partitions for consumers that still need it."""
+    df = read_history(storage, prefix)
+    storage_base.write_csv(storage, csv_key, df)
+    logger.info("exported_csv_history", extra={
+        "s3_key": csv_key,
+        "prefix": prefix,
+        "rows": len(df),
+        "action": "Exported Parquet history to CSV",
+    })
+    return len(df)
+
+
+def main(argv=None):
+    from tax_bracket_ingest.run_ingest import get_ingest_config, get_storage
+
+    parser = argparse.ArgumentParser(description="Manage the Parquet history layout.")
+    parser.add_argument("command", choices=["migrate", "export-csv"])
+    args = parser.parse_args(argv)
+
+    config = get_ingest_config()
+    storage = get_storage(config)
+    if args.command == "migrate":
+        migrate_csv(storage, config.s3_key, config.history_prefix)
+    else:
+        export_csv(storage, config.history_prefix, config.s3_key)
+
+
+if __name__ == "__main__":
+    from tax_bracket_ingest.runtime import init_runtime
+
+    init_runtime()
+    main()
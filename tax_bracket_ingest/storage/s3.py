@@ -0,0 +1,165 @@
+# tax_bracket_ingest/storage/s3.py
+"""One pooled S3 client per configuration, reused for the life of the process,
+and ``S3Storage``, the ``Storage`` implementation built on it.
+
+Creating a boto3 client resolves credentials, loads the service model and
+builds a fresh connection pool. Caching the client at module scope lets every
+S3 call in a run share one pool. Warm Lambda invocations reuse it as well.
+
+Pool size and retries come from the environment:
+
+    S3_MAX_POOL_CONNECTIONS=10   # urllib3 pool size per client
+    S3_MAX_ATTEMPTS=3            # total attempts including the first
+    S3_RETRY_MODE=standard       # legacy | standard | adaptive
+    S3_ENDPOINT_URL=...          # optional, e.g. a local S3 stand-in
+"""
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+RETRY_MODES = ("legacy", "standard", "adaptive")
+
+
+@dataclass(frozen=True)
+class S3ClientConfig:
+    max_pool_connections: int = 10
+    max_attempts: int = 3
+    retry_mode: str = "standard"
+    region_name: Optional[str] = None
+    endpoint_url: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> "S3ClientConfig":
+        retry_mode = os.getenv("S3_RETRY_MODE", "standard").strip().lower()
+        if retry_mode not in RETRY_MODES:
+            raise ValueError(f"S3_RETRY_MODE must be one of {', '.join(RETRY_MODES)}, got {retry_mode!r}")
+        return cls(
+            max_pool_connections=int(os.getenv("S3_MAX_POOL_CONNECTIONS", "10")),
+            max_attempts=int(os.getenv("S3_MAX_ATTEMPTS", "3")),
+            retry_mode=retry_mode,
+            region_name=os.getenv("AWS_REGION") or os.getenv("AWS_DEFAULT_REGION"),
+            endpoint_url=os.getenv("S3_ENDPOINT_URL") or None,
+        )
+
+    def botocore_config(self):
+        from botocore.config import Config
+
+        return Config(
+            max_pool_connections=self.max_pool_connections,
+            retries={"total_max_attempts": self.max_attempts, "mode": self.retry_mode},
+        )
+
+
+_LOCK = threading.Lock()
+_SESSION = None
+_CLIENTS: Dict[S3ClientConfig, object] = {}
+_OVERRIDE = None
+
+
+def get_s3_client(config: Optional[S3ClientConfig] = None):
+    """Return the cached client for ``config`` (default: ``S3ClientConfig.from_env()``).
+
+    Safe to call from several threads; boto3 sessions are not, so client
+    creation happens under a lock. An injected client (``set_s3_client``)
+    wins over everything else.
+    """
+    global _SESSION
+    if _OVERRIDE is not None:
+        return _OVERRIDE
+    if config is None:
+        config = S3ClientConfig.from_env()
+    client = _CLIENTS.get(config)
+    if client is not None:
+        return client
+    with _LOCK:
+        client = _CLIENTS.get(config)
+        if client is None:
+            if _SESSION is None:
+                import boto3  # deferred: dry runs and the parse path never need it
+
+                _SESSION = boto3.session.Session()
+            client = _SESSION.client(
+                "s3",
+                region_name=config.region_name,
+                endpoint_url=config.endpoint_url,
+                config=config.botocore_config(),
+            )
+            _CLIENTS[config] = client
+    return client
+
+
+def set_s3_client(client) -> None:
+    """Make ``get_s3_client`` return ``client`` (e.g. a moto or local client); ``None`` clears it."""
+    global _OVERRIDE
+    _OVERRIDE = client
+
+
+def reset_s3_clients() -> None:
+    """Drop cached clients and the session, e.g. after credentials change."""
+    global _SESSION, _OVERRIDE
+    with _LOCK:
+        _CLIENTS.clear()
+        _SESSION = None
+        _OVERRIDE = None
+
+
+class S3Storage:
+    """``Storage`` over one bucket; writes stream through ``MultipartWriter``."""
+
+    def __init__(self, bucket: str, client=None, part_bytes: Optional[int] = None):
+        self.bucket = bucket
+        self._client = client
+        self.part_bytes = part_bytes
+
+    @property
+    def client(self):
+        return self._client if self._client is not None else get_s3_client()
+
+    def _get(self, key: str) -> dict:
+        from tax_bracket_ingest.storage.base import ObjectNotFound
+
+        client = self.client
+        try:
+            return client.get_object(Bucket=self.bucket, Key=key)
+        except client.exceptions.NoSuchKey as exc:
+            raise ObjectNotFound(key) from exc
+
+    def read(self, key: str) -> bytes:
+        return self._get(key)["Body"].read()
+
+    def open(self, key: str):
+        return self._get(key)["Body"]
+
+    def write(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        extra = {"ContentType": content_type} if content_type else {}
+        self.client.put_object(Bucket=self.bucket, Key=key, Body=data, **extra)
+
+    def writer(self, key: str, content_type: Optional[str] = None):
+        from tax_bracket_ingest.storage.multipart import MultipartWriter
+
+        return MultipartWriter(
+            self.client, self.bucket, key, part_bytes=self.part_bytes, content_type=content_type
+        )
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def list(self, prefix: str = "") -> List[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        return sorted(
+            obj["Key"]
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        )
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
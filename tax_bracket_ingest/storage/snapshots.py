@@ -0,0 +1,245 @@
+# tax_bracket_ingest/storage/snapshots.py
+"""Content-addressed cache of fetched pages and the frames parsed from them.
+
+Every page is stored once under the SHA-256 of its bytes, gzip-compressed.
+Frames derived from it are stored as Parquet next to it, keyed by that hash
+plus a version of the code that produced them. The version is a hash of the
+parser (or normalizer) source files, so editing ``normalize.py`` makes every
+cached normalized frame miss while the parsed raw frames still hit. Layout
+under the prefix::
+
+    html/<sha256>.html.gz
+    urls/<sha256 of the URL>.json            {"url": ..., "sha256": ...}
+    frames/<sha256>/raw-<parser>.parquet
+    frames/<sha256>/normalized-<parser>-<normalizer>.parquet
+    index.json                               object sizes and last use
+
+The ``urls/`` pointers let replays and backfills load a page without fetching
+it, and make the cache a reproducible corpus of every page ever ingested.
+Once the objects exceed ``max_bytes`` the least recently used ones are
+deleted. Reads update the last-use times in memory only. ``index.json`` is
+rewritten when an object is stored and by ``close``, so a run that only hits
+the cache writes it once. One cache should not be shared by concurrent
+writers; content-addressed objects stay valid either way, only their
+eviction order is lost. A ``read_only`` cache (dry runs) never writes.
+"""
+import gzip
+import hashlib
+import importlib.util
+import json
+import logging
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from tax_bracket_ingest.storage.base import ObjectNotFound, Storage
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+INDEX_KEY = "index.json"
+PARSER_MODULES = (
+    "tax_bracket_ingest.parser.parser",
+    "tax_bracket_ingest.parser.model",
+    "tax_bracket_ingest.parser.stream",
+    "tax_bracket_ingest.parser.backends",
+)
+NORMALIZER_MODULES = ("tax_bracket_ingest.parser.normalize",)
+
+
+@lru_cache(maxsize=None)
+def code_version(modules: Tuple[str, ...]) -> str:
+    """Short hash of the source files of ``modules``; changes whenever their code does."""
+    digest = hashlib.sha256()
+    for name in modules:
+        digest.update(Path(importlib.util.find_spec(name).origin).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class SnapshotCache:
+    """Pages and parsed frames in a ``Storage``, evicted least recently used first."""
+
+    def __init__(
+        self, storage: Storage, prefix: str = "", max_bytes: int = DEFAULT_MAX_BYTES, read_only: bool = False
+    ):
+        self.storage = storage
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self._index: Optional[Dict[str, List[float]]] = None  # key -> [size, last used]
+        self._dirty = False  # last-use times not yet in index.json
+        self._lock = threading.Lock()
+
+    def as_read_only(self) -> "SnapshotCache":
+        """A cache over the same objects that never writes, for dry runs."""
+        if self.read_only:
+            return self
+        return SnapshotCache(self.storage, self.prefix, self.max_bytes, read_only=True)
+
+    def _key(self, name: str) -> str:
+        return f"{self.prefix}{name}"
+
+    def html_key(self, digest: str) -> str:
+        return self._key(f"html/{digest}.html.gz")
+
+    def url_key(self, url: str) -> str:
+        return self._key(f"urls/{content_hash(url.encode('utf-8'))}.json")
+
+    def raw_key(self, digest: str) -> str:
+        return self._key(f"frames/{digest}/raw-{code_version(PARSER_MODULES)}.parquet")
+
+    def normalized_key(self, digest: str) -> str:
+        versions = f"{code_version(PARSER_MODULES)}-{code_version(NORMALIZER_MODULES)}"
+        return self._key(f"frames/{digest}/normalized-{versions}.parquet")
+
+    def _entries(self) -> Dict[str, List[float]]:
+        if self._index is None:
+            try:
+                self._index = json.loads(self.storage.read(self._key(INDEX_KEY)))["objects"]
+            except ObjectNotFound:
+                self._index = {}
+        return self._index
+
+    def _save_index(self) -> None:
+        body = json.dumps({"objects": self._entries()}, sort_keys=True).encode("utf-8")
+        self.storage.write(self._key(INDEX_KEY), body, content_type="application/json")
+        self._dirty = False
+
+    def close(self) -> None:
+        """Persist the last-use times recorded by reads since the index was last written."""
+        with self._lock:
+            if self._dirty and not self.read_only:
+                self._save_index()
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return int(sum(size for size, _ in self._entries().values()))
+
+    def _get(self, key: str) -> Optional[bytes]:
+        try:
+            data = self.storage.read(key)
+        except ObjectNotFound:
+            return None
+        with self._lock:
+            self._entries()[key] = [len(data), time.time()]
+            self._dirty = True
+        return data
+
+    def _put(self, key: str, data: bytes, content_type: Optional[str] = None) -> None:
+        if self.read_only:
+            return
+        self.storage.write(key, data, content_type=content_type)
+        with self._lock:
+            entries = self._entries()
+            entries[key] = [len(data), time.time()]
+            evicted = self._evict(keep=key)
+            self._save_index()
+        if evicted:
+            logger.info("snapshot_cache_evicted", extra={
+                "evicted": len(evicted),
+                "max_bytes": self.max_bytes,
+                "action": "Evicted least recently used snapshots over the size limit",
+            })
+
+    def _evict(self, keep: str) -> List[str]:
+        entries = self._entries()
+        total = sum(size for size, _ in entries.values())
+        evicted = []
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self.storage.delete(key)
+            del entries[key]
+            total -= size
+            evicted.append(key)
+        return evicted
+
+    def put_html(self, html: bytes, url: Optional[str] = None) -> str:
+        """Store a fetched page (and, with ``url``, point the URL at it); returns its hash."""
+        digest = content_hash(html)
+        if self.read_only:
+            return digest
+        key = self.html_key(digest)
+        if self.storage.exists(key):
+            with self._lock:
+                entries = self._entries()
+                if key in entries:
+                    entries[key][1] = time.time()
+                    self._dirty = True
+        else:
+            self._put(key, gzip.compress(html, compresslevel=6), content_type="application/gzip")
+        if url is not None:
+            pointer = json.dumps({"url": url, "sha256": digest}, sort_keys=True).encode("utf-8")
+            if self._get(self.url_key(url)) != pointer:
+                self._put(self.url_key(url), pointer, content_type="application/json")
+        return digest
+
+    def get_html(self, digest: str) -> Optional[bytes]:
+        data = self._get(self.html_key(digest))
+        return None if data is None else gzip.decompress(data)
+
+    def html_for_url(self, url: str) -> Optional[bytes]:
+        """The last page stored for ``url``, or ``None``."""
+        pointer = self._get(self.url_key(url))
+        if pointer is None:
+            return None
+        return self.get_html(json.loads(pointer)["sha256"])
+
+    def _get_frame(self, key: str) -> Optional["pd.DataFrame"]:
+        from tax_bracket_ingest.storage.parquet import parquet_bytes_to_frame
+
+        data = self._get(key)
+        return None if data is None else parquet_bytes_to_frame(data)
+
+    def _put_frame(self, key: str, df: "pd.DataFrame") -> None:
+        from tax_bracket_ingest.storage.parquet import frame_to_parquet_bytes
+
+        self._put(key, frame_to_parquet_bytes(df), content_type="application/vnd.apache.parquet")
+
+    def get_normalized(self, html: bytes) -> Optional["pd.DataFrame"]:
+        return self._get_frame(self.normalized_key(content_hash(html)))
+
+    def put_normalized(self, html: bytes, df: "pd.DataFrame") -> None:
+        self._put_frame(self.normalized_key(content_hash(html)), df)
+
+    def load(
+        self,
+        html: bytes,
+        parse: Callable[[bytes], "pd.DataFrame"],
+        normalize: Callable[["pd.DataFrame"], "pd.DataFrame"],
+    ) -> "pd.DataFrame":
+        """The normalized frame for ``html``, running only the stages that miss.
+
+        A normalized hit skips both stages. Otherwise a raw hit skips ``parse``,
+        and whatever was computed is stored for the next run.
+        """
+        digest = content_hash(html)
+        normalized = self._get_frame(self.normalized_key(digest))
+        stage = "normalized"
+        if normalized is None:
+            raw = self._get_frame(self.raw_key(digest))
+            stage = "raw"
+            if raw is None:
+                stage = None
+                raw = parse(html)
+                self._put_frame(self.raw_key(digest), raw)
+            normalized = normalize(raw)
+            self._put_frame(self.normalized_key(digest), normalized)
+        logger.info("snapshot_cache_lookup", extra={
+            "sha256": digest,
+            "hit": stage,
+            "action": "Resolved parsed frames from the snapshot cache" if stage else "Cached newly parsed frames",
+        })
+        return normalized
@@ -0,0 +1 @@
+# tax_bracket_ingest/worker/__init__.py
\ No newline at end of file
@@ -0,0 +1,179 @@
+# tax_bracket_ingest/worker/events.py
+"""Batched Lambda events: SQS messages and S3 put notifications.
+
+``lambda_handler.handler`` hands any event with ``Records`` to
+``handle_records``. Every record becomes one or more ``IngestJob``s:
+
+- an SQS message whose body is a job in its JSON form, e.g.
+  ``{"source": "irs", "dry_run": false, "push": true}``. The flags in the
+  message override ``DRY_RUN`` and ``ENABLE_BACKEND_PUSH``;
+- an S3 notification for an archived page, e.g. ``irs/2021.html``. It is
+  backfilled for the year in its key; the flags come from the environment;
+- an SQS message carrying such an S3 notification (bucket -> queue -> Lambda).
+
+Records run concurrently, up to ``LAMBDA_BATCH_CONCURRENCY``, on one
+``JobRunner``, so a single invocation drains the batch with one set of
+clients. For SQS the result lists the failed message ids under
+``batchItemFailures``. The function needs ``ReportBatchItemFailures``
+enabled, so only those messages return to the queue. A direct S3 invocation
+has no partial failures, so any failed record raises ``BatchIngestError`` and
+Lambda retries the event.
+
+As in the worker, a record that raises ``ValueError`` (a malformed message,
+an unknown source, an unparseable page) cannot succeed on a retry. It is
+logged as ``record_rejected`` and acknowledged instead of being redelivered
+until it reaches the dead-letter queue.
+"""
+import json
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+from urllib.parse import unquote_plus
+
+from tax_bracket_ingest.metrics import recording
+from tax_bracket_ingest.worker.jobs import IngestJob
+from tax_bracket_ingest.worker.runner import JobRunner
+
+logger = logging.getLogger(__name__)
+
+BATCH_CONCURRENCY_ENV = "LAMBDA_BATCH_CONCURRENCY"
+DEFAULT_BATCH_CONCURRENCY = 4
+SQS_EVENT_SOURCE = "aws:sqs"
+S3_EVENT_SOURCE = "aws:s3"
+_YEAR = re.compile(r"(?<!\d)(?:19|20)\d{2}(?!\d)")
+
+
+class BatchIngestError(RuntimeError):
+    """Raised when records of an event without partial-failure reporting failed."""
+
+    def __init__(self, failed: Sequence[str]):
+        self.failed = list(failed)
+        super().__init__(f"{len(self.failed)} record(s) failed: {', '.join(self.failed)}")
+
+
+def get_batch_concurrency() -> int:
+    raw = os.getenv(BATCH_CONCURRENCY_ENV)
+    value = int(raw) if raw else DEFAULT_BATCH_CONCURRENCY
+    if value < 1:
+        raise ValueError(f"{BATCH_CONCURRENCY_ENV} must be at least 1, got {value}")
+    return value
+
+
+def year_from_key(key: str) -> int:
+    """The last stand-alone year in an object key: ``archive/2021/irs.html`` -> 2021."""
+    years = _YEAR.findall(key)
+    if not years:
+        raise ValueError(f"No tax year in S3 key {key!r}")
+    return int(years[-1])
+
+
+def jobs_from_record(record: dict) -> List[IngestJob]:
+    """The jobs one event record asks for; none for S3's test notification.
+
+    Raises:
+        ValueError: For a malformed record or an unsupported event source.
+    """
+    source = record.get("eventSource")
+    if source == SQS_EVENT_SOURCE:
+        try:
+            body = json.loads(record["body"])
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"SQS record has no JSON body: {exc}") from exc
+        if isinstance(body, dict) and body.get("Event") == "s3:TestEvent":
+            return []
+        if isinstance(body, dict) and "Records" in body:
+            return [job for inner in body["Records"] for job in jobs_from_record(inner)]
+        return [IngestJob.from_dict(body)]
+    if source == S3_EVENT_SOURCE:
+        try:
+            bucket = record["s3"]["bucket"]["name"]
+            key = unquote_plus(record["s3"]["object"]["key"])
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"S3 record without bucket and key: {exc}") from exc
+        return [IngestJob(source=f"s3://{bucket}/{key}", year=year_from_key(key))]
+    raise ValueError(f"Unsupported event source {source!r}")
+
+
+def record_id(record: dict) -> str:
+    """The SQS ``messageId``, or ``bucket/key`` for an S3 record."""
+    if "messageId" in record:
+        return record["messageId"]
+    s3 = record.get("s3", {})
+    return f"{s3.get('bucket', {}).get('name')}/{s3.get('object', {}).get('key')}"
+
+
+def process_record(record: dict, runner: JobRunner) -> bool:
+    """Run every job of ``record``; returns ``False`` if it failed and should be retried."""
+    start = time.perf_counter()
+    with recording() as recorder:
+        try:
+            jobs = jobs_from_record(record)
+            for job in jobs:
+                runner.run(job)
+        except ValueError:
+            logger.exception("record_rejected", extra={
+                "record_id": record_id(record),
+                "event_source": record.get("eventSource"),
+                "action": "Rejected event record that cannot succeed on a retry, acknowledging it",
+            })
+            return True
+        except Exception:
+            logger.exception("record_failed", extra={
+                "record_id": record_id(record),
+                "event_source": record.get("eventSource"),
+                "action": "Failed to ingest event record, reporting it for retry",
+            })
+            return False
+    logger.info("record_processed", extra={
+        "record_id": record_id(record),
+        "jobs": [job.to_dict() for job in jobs],
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+        "stages": recorder.summary(),
+        "action": "Ingested event record",
+    })
+    return True
+
+
+def handle_records(
+    records: Sequence[dict],
+    runner: Optional[JobRunner] = None,
+    max_workers: Optional[int] = None,
+) -> dict:
+    """Process a batch of event records concurrently.
+
+    Args:
+        records (Sequence[dict]): ``event["Records"]``.
+        runner (Optional[JobRunner]): Defaults to a new runner for this batch.
+        max_workers (Optional[int]): Records in flight at once; defaults to
+            ``LAMBDA_BATCH_CONCURRENCY`` or 4.
+
+    Returns:
+        dict: ``{"batchItemFailures": [...]}`` for SQS batches, a
+        ``statusCode`` 200 response otherwise.
+
+    Raises:
+        BatchIngestError: If a record of a non-SQS event failed.
+    """
+    if runner is None:
+        runner = JobRunner()
+    runner.warm()
+    if max_workers is None:
+        max_workers = get_batch_concurrency()
+    workers = max(1, min(max_workers, len(records)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="lambda-record") as pool:
+        succeeded = list(pool.map(lambda record: process_record(record, runner), records))
+    failed = [record_id(record) for record, ok in zip(records, succeeded) if not ok]
+    logger.info("batch_complete", extra={
+        "records": len(records),
+        "failed": failed,
+        "workers": workers,
+        "action": "Processed event batch",
+    })
+    if records and records[0].get("eventSource") == SQS_EVENT_SOURCE:
+        return {"batchItemFailures": [{"itemIdentifier": item} for item in failed]}
+    if failed:
+        raise BatchIngestError(failed)
+    return {"statusCode": 200, "body": f"Ingested {len(records)} record(s)."}
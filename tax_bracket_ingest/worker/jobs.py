@@ -0,0 +1,323 @@
+# tax_bracket_ingest/worker/jobs.py
+"""Ingest jobs and the queues a worker takes them from.
+
+A job names what to ingest (``source``), optionally the tax year, and
+per-job dry-run and push flags:
+
+- ``{"source": "irs"}``: the live IRS page, like ``run_ingest.main``.
+- ``{"source": "co"}``: a page registered in ``SOURCES_FILE``.
+- ``{"source": "https://web.archive.org/...", "year": 2021}``: an archived
+  page (URL or local path) for one year, like ``backfill``.
+
+Two queues ship with the package, selected with ``WORKER_QUEUE``:
+
+- ``memory`` (default): ``MemoryJobQueue``, in the worker process. Jobs come
+  in through the worker's ``POST /jobs`` endpoint and are lost on exit.
+- ``sqlite``: ``SQLiteJobQueue``, a table in the file ``WORKER_QUEUE_PATH``.
+  Jobs survive restarts and can be enqueued from other processes.
+
+A taken job counts as an attempt. A failed job is offered again after
+``retry_delay`` seconds, doubling with each attempt, until ``max_attempts``.
+A SQLite job that a crashed worker never finished is offered again once its
+lease runs out.
+"""
+import heapq
+import itertools
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field, replace
+from typing import Dict, List, Optional, Protocol, Tuple, runtime_checkable
+
+IRS_SOURCE_NAME = "irs"
+JOB_QUEUES = ("memory", "sqlite")
+JOB_STATUSES = ("pending", "running", "done", "failed")
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_DELAY = 30.0
+DEFAULT_LEASE_SECONDS = 900.0
+DEFAULT_POLL_INTERVAL = 0.5
+
+
+@dataclass(frozen=True)
+class IngestJob:
+    """One unit of work for the worker.
+
+    ``dry_run`` and ``push`` default to ``DRY_RUN`` and ``ENABLE_BACKEND_PUSH``
+    when ``None``. ``attempts`` is set by the queue that hands the job out.
+    """
+    source: str = IRS_SOURCE_NAME
+    year: Optional[int] = None
+    dry_run: Optional[bool] = None
+    push: Optional[bool] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attempts: int = 0
+
+    def __post_init__(self):
+        if not self.source:
+            raise ValueError("A job needs a source")
+        if self.source == IRS_SOURCE_NAME and self.year is not None:
+            raise ValueError("The live IRS page only holds the current year; give an archived page for a past year")
+
+    @property
+    def is_archive(self) -> bool:
+        """An archived page (URL or path) for ``year`` rather than a registered source."""
+        return self.year is not None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "IngestJob":
+        """Build a job from its JSON form.
+
+        Raises:
+            ValueError: On unknown fields or values of the wrong type.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object, got {data!r}")
+        unknown = sorted(set(data) - {"source", "year", "dry_run", "push", "id"})
+        if unknown:
+            raise ValueError(f"Unknown job fields: {', '.join(unknown)}")
+        types = {"source": str, "year": int, "dry_run": bool, "push": bool, "id": str}
+        for name, value in data.items():
+            # bool is an int subclass, so a year of true would otherwise pass
+            if value is not None and (not isinstance(value, types[name]) or (name == "year" and isinstance(value, bool))):
+                raise ValueError(f"Job field {name!r} must be {types[name].__name__}, got {value!r}")
+        return cls(**{name: value for name, value in data.items() if value is not None})
+
+    def to_dict(self) -> dict:
+        body = asdict(self)
+        del body["attempts"]
+        return body
+
+
+@runtime_checkable
+class JobQueue(Protocol):
+    def put(self, job: IngestJob) -> None:
+        """Add ``job``; it becomes available immediately."""
+        ...
+
+    def take(self, timeout: float) -> Optional[IngestJob]:
+        """The next available job, waiting up to ``timeout`` seconds; ``None`` if there is none."""
+        ...
+
+    def ack(self, job: IngestJob) -> None:
+        """Mark a taken job as done."""
+        ...
+
+    def fail(self, job: IngestJob, error: str, retry: bool = True) -> bool:
+        """Mark a taken job as failed; returns ``True`` when it will be offered again."""
+        ...
+
+    def status(self, job_id: str) -> Optional[str]:
+        """One of ``JOB_STATUSES``, or ``None`` for an unknown job."""
+        ...
+
+    def depth(self) -> int:
+        """Jobs waiting to be taken, including those waiting for a retry."""
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+def retry_delay_for(attempts: int, base: float) -> float:
+    """``base`` after the first attempt, doubling after each further one."""
+    return base * 2 ** max(attempts - 1, 0)
+
+
+class MemoryJobQueue:
+    """A heap of jobs ordered by the time they become available."""
+
+    def __init__(self, max_attempts: int = DEFAULT_MAX_ATTEMPTS, retry_delay: float = DEFAULT_RETRY_DELAY):
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self._ready: List[Tuple[float, int, IngestJob]] = []
+        self._order = itertools.count()
+        self._statuses: Dict[str, str] = {}
+        self._cond = threading.Condition()
+
+    def _push(self, job: IngestJob, available_at: float) -> None:
+        heapq.heappush(self._ready, (available_at, next(self._order), job))
+        self._statuses[job.id] = "pending"
+        self._cond.notify()
+
+    def put(self, job: IngestJob) -> None:
+        with self._cond:
+            self._push(job, time.monotonic())
+
+    def take(self, timeout: float) -> Optional[IngestJob]:
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if self._ready and self._ready[0][0] <= now:
+                    _, _, job = heapq.heappop(self._ready)
+                    self._statuses[job.id] = "running"
+                    return replace(job, attempts=job.attempts + 1)
+                if now >= deadline:
+                    return None
+                wake = deadline if not self._ready else min(deadline, self._ready[0][0])
+                self._cond.wait(wake - now)
+
+    def ack(self, job: IngestJob) -> None:
+        with self._cond:
+            self._statuses[job.id] = "done"
+
+    def fail(self, job: IngestJob, error: str, retry: bool = True) -> bool:
+        with self._cond:
+            if retry and job.attempts < self.max_attempts:
+                self._push(job, time.monotonic() + retry_delay_for(job.attempts, self.retry_delay))
+                return True
+            self._statuses[job.id] = "failed"
+            return False
+
+    def status(self, job_id: str) -> Optional[str]:
+        with self._cond:
+            return self._statuses.get(job_id)
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._ready)
+
+    def close(self) -> None:
+        pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_available ON jobs (status, available_at);
+"""
+
+
+class SQLiteJobQueue:
+    """Jobs in a SQLite table; safe to share between threads and processes.
+
+    ``available_at`` (wall-clock seconds) is when a pending job may be taken,
+    or when the lease of a running job runs out and it may be taken again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        # Autocommit; take() opens its own write transaction so two workers never claim one job
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def put(self, job: IngestJob) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, body, status, available_at) VALUES (?, ?, 'pending', ?)",
+                (job.id, json.dumps(job.to_dict(), sort_keys=True), time.time()),
+            )
+
+    def _claim(self) -> Optional[IngestJob]:
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # A job whose every attempt ended with its worker dying is not handed out again
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = 'lease expired' "
+                    "WHERE status = 'running' AND available_at <= ? AND attempts >= ?",
+                    (now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT id, body, attempts FROM jobs WHERE status IN ('pending', 'running') "
+                    "AND available_at <= ? ORDER BY available_at, rowid LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, available_at = ? WHERE id = ?",
+                        (now + self.lease_seconds, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return replace(IngestJob.from_dict(json.loads(row[1])), attempts=row[2] + 1)
+
+    def take(self, timeout: float) -> Optional[IngestJob]:
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self._claim()
+            remaining = deadline - time.monotonic()
+            if job is not None or remaining <= 0:
+                return job
+            time.sleep(min(self.poll_interval, remaining))
+
+    def ack(self, job: IngestJob) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = 'done', error = NULL WHERE id = ?", (job.id,))
+
+    def fail(self, job: IngestJob, error: str, retry: bool = True) -> bool:
+        requeue = retry and job.attempts < self.max_attempts
+        with self._lock:
+            if requeue:
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'pending', available_at = ?, error = ? WHERE id = ?",
+                    (time.time() + retry_delay_for(job.attempts, self.retry_delay), error, job.id),
+                )
+            else:
+                self._conn.execute("UPDATE jobs SET status = 'failed', error = ? WHERE id = ?", (error, job.id))
+        return requeue
+
+    def status(self, job_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return None if row is None else row[0]
+
+    def depth(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'pending'").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_job_queue(
+    kind: str,
+    path: Optional[str] = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+    lease_seconds: float = DEFAULT_LEASE_SECONDS,
+) -> JobQueue:
+    """Build the queue named ``kind``.
+
+    Args:
+        kind (str): One of ``JOB_QUEUES``.
+        path (Optional[str]): The database file for ``sqlite``.
+        max_attempts (int): Attempts before a failing job is given up.
+        retry_delay (float): Seconds before the first retry.
+        lease_seconds (float): ``sqlite`` only: how long a taken job stays
+            claimed before another worker may take it.
+    """
+    if kind == "memory":
+        return MemoryJobQueue(max_attempts, retry_delay)
+    if kind == "sqlite":
+        if not path:
+            raise ValueError("WORKER_QUEUE=sqlite requires WORKER_QUEUE_PATH")
+        return SQLiteJobQueue(path, max_attempts, retry_delay, lease_seconds)
+    raise ValueError(f"WORKER_QUEUE must be one of {', '.join(JOB_QUEUES)}, got {kind!r}")
@@ -0,0 +1,68 @@
+# tax_bracket_ingest/worker/runner.py
+"""Runs ``IngestJob``s with clients and caches shared between them.
+
+The long-running worker (``worker.service``) and the Lambda handler's batch
+mode (``worker.events``) both run jobs through one ``JobRunner``. The config,
+fetch cache and snapshot cache are built once per runner. The S3 client and
+the pooled HTTP session are cached per process. A lock serializes history
+writes, so jobs may run on several threads of one runner.
+"""
+import asyncio
+import threading
+from typing import Optional
+
+from tax_bracket_ingest import backfill, run_ingest
+from tax_bracket_ingest.backfill import BackfillSource
+from tax_bracket_ingest.run_ingest import IngestConfig
+from tax_bracket_ingest.sources.registry import load_sources
+from tax_bracket_ingest.sources.scheduler import run_sources_async
+from tax_bracket_ingest.worker.jobs import IRS_SOURCE_NAME, IngestJob
+
+
+class JobRunner:
+    def __init__(self, config: Optional[IngestConfig] = None):
+        self.config = config or run_ingest.get_ingest_config()
+        self.fetch_cache = run_ingest.get_fetch_cache(self.config)
+        self.snapshots = run_ingest.get_snapshot_cache(self.config, dry_run=False)
+        self.history_lock = threading.Lock()
+
+    def warm(self) -> None:
+        """Create the S3 client now rather than in the first job."""
+        if self.config.storage_backend == "s3":
+            from tax_bracket_ingest.storage.s3 import get_s3_client
+
+            get_s3_client()
+
+    def run(self, job: IngestJob) -> None:
+        """Ingest what ``job`` names.
+
+        Raises:
+            ValueError: For a job that cannot succeed on a retry, such as an
+                unknown source name or an unparseable page.
+        """
+        dry_run = run_ingest.is_dry_run() if job.dry_run is None else job.dry_run
+        snapshots = self.snapshots.as_read_only() if dry_run and self.snapshots is not None else self.snapshots
+        if job.source == IRS_SOURCE_NAME:
+            try:
+                run_ingest.ingest_irs_page(
+                    self.config, dry_run, self.fetch_cache, snapshots, job.push, self.history_lock
+                )
+            finally:
+                run_ingest.close_snapshots(snapshots)
+        elif job.is_archive:
+            push = run_ingest.should_push_backend() if job.push is None else job.push
+            try:
+                pages = backfill.fetch_sources([BackfillSource(job.year, job.source)], max_workers=1,
+                                               snapshots=snapshots)
+                frames = backfill.normalize_pages(pages, max_workers=1, snapshots=snapshots)
+            finally:
+                run_ingest.close_snapshots(snapshots)
+            with self.history_lock:
+                backfill.store_backfill(frames, dry_run, self.config, push=push)
+        else:
+            if job.push:
+                raise ValueError("Registered sources go to the bracket dataset, which is not pushed")
+            sources = {source.name: source for source in load_sources()}
+            if job.source not in sources:
+                raise ValueError(f"Unknown source {job.source!r}; give a registered name, or a page with a year")
+            asyncio.run(run_sources_async([sources[job.source]], self.config, dry_run))
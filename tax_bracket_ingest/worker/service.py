@@ -0,0 +1,291 @@
+# tax_bracket_ingest/worker/service.py
+"""Long-running worker that ingests jobs from a queue.
+
+A one-shot run (``run_ingest.main``, or a Lambda invocation) pays for
+interpreter start-up, imports and client setup every time. The worker pays
+once. The parsers are imported at start-up, and one ``JobRunner`` (see
+``tax_bracket_ingest.worker.runner``) with its clients and caches serves
+every job.
+
+Jobs (see ``tax_bracket_ingest.worker.jobs``) run on ``WORKER_CONCURRENCY``
+threads. Fetching and parsing overlap freely, but the runner's lock
+serializes history writes. Run one worker process per history. A job that raises is
+retried with backoff, except on ``ValueError`` (a bad job or page), which
+fails it at once.
+
+SIGTERM or SIGINT drains the worker. No new jobs are taken, and running jobs
+get ``WORKER_SHUTDOWN_TIMEOUT_SECONDS`` to finish. A SQLite job still running
+at exit is offered again once its lease runs out. Health, metrics and job
+submission are served on ``WORKER_STATUS_HOST``:``WORKER_STATUS_PORT`` (see
+``tax_bracket_ingest.worker.status``).
+
+Usage:
+    python -m tax_bracket_ingest.worker.service
+    python -m tax_bracket_ingest.worker.service enqueue --source irs --push
+    python -m tax_bracket_ingest.worker.service enqueue --source archive/2021.html --year 2021
+"""
+import argparse
+import logging
+import os
+import signal
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from tax_bracket_ingest.metrics import recording
+from tax_bracket_ingest.run_ingest import IngestConfig
+from tax_bracket_ingest.worker.jobs import (
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_RETRY_DELAY,
+    IRS_SOURCE_NAME,
+    IngestJob,
+    JobQueue,
+    MemoryJobQueue,
+    open_job_queue,
+)
+from tax_bracket_ingest.worker.runner import JobRunner
+from tax_bracket_ingest.worker.status import WorkerStats, start_status_server
+
+logger = logging.getLogger(__name__)
+
+QUEUE_ENV = "WORKER_QUEUE"
+QUEUE_PATH_ENV = "WORKER_QUEUE_PATH"
+CONCURRENCY_ENV = "WORKER_CONCURRENCY"
+POLL_ENV = "WORKER_POLL_SECONDS"
+SHUTDOWN_TIMEOUT_ENV = "WORKER_SHUTDOWN_TIMEOUT_SECONDS"
+MAX_ATTEMPTS_ENV = "WORKER_MAX_ATTEMPTS"
+RETRY_DELAY_ENV = "WORKER_RETRY_DELAY_SECONDS"
+LEASE_ENV = "WORKER_LEASE_SECONDS"
+STATUS_HOST_ENV = "WORKER_STATUS_HOST"
+STATUS_PORT_ENV = "WORKER_STATUS_PORT"
+DEFAULT_QUEUE = "memory"
+DEFAULT_QUEUE_PATH = "ingest-jobs.sqlite3"
+DEFAULT_CONCURRENCY = 2
+DEFAULT_POLL_SECONDS = 1.0
+DEFAULT_SHUTDOWN_TIMEOUT = 30.0
+DEFAULT_STATUS_HOST = "127.0.0.1"
+DEFAULT_STATUS_PORT = 8080
+
+
+def _env_number(name: str, default, cast=int, minimum=1):
+    raw = os.getenv(name)
+    value = cast(raw) if raw else default
+    if value < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {value}")
+    return value
+
+
+def open_queue_from_env() -> JobQueue:
+    """The queue selected by ``WORKER_QUEUE`` and its ``WORKER_*`` settings."""
+    return open_job_queue(
+        os.getenv(QUEUE_ENV, DEFAULT_QUEUE).strip().lower(),
+        os.getenv(QUEUE_PATH_ENV, DEFAULT_QUEUE_PATH),
+        max_attempts=_env_number(MAX_ATTEMPTS_ENV, DEFAULT_MAX_ATTEMPTS),
+        retry_delay=_env_number(RETRY_DELAY_ENV, DEFAULT_RETRY_DELAY, float, minimum=0),
+        lease_seconds=_env_number(LEASE_ENV, DEFAULT_LEASE_SECONDS, float),
+    )
+
+
+class Worker:
+    """Takes jobs from ``queue`` on ``concurrency`` threads until stopped."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        config: Optional[IngestConfig] = None,
+        poll_interval: float = DEFAULT_POLL_SECONDS,
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.runner = JobRunner(config)
+        self.stats = WorkerStats()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def draining(self) -> bool:
+        return self._stopping.is_set()
+
+    @property
+    def threads_alive(self) -> int:
+        return sum(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        self.runner.warm()
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._take_jobs, name=f"ingest-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("worker_started", extra={
+            "concurrency": self.concurrency,
+            "queue": type(self.queue).__name__,
+            "action": "Worker started taking ingest jobs",
+        })
+
+    def stop(self, timeout: float = DEFAULT_SHUTDOWN_TIMEOUT) -> bool:
+        """Stop taking jobs and wait up to ``timeout`` seconds for running ones.
+
+        Returns:
+            bool: ``True`` when every running job finished in time.
+        """
+        self._stopping.set()
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        finished = self.threads_alive == 0
+        if finished:
+            logger.info("worker_stopped", extra={"action": "Worker drained and stopped"})
+        else:
+            logger.warning("worker_shutdown_timeout", extra={
+                "in_flight": self.stats.snapshot()["in_flight"],
+                "timeout_s": timeout,
+                "action": "Jobs still running at shutdown, leaving them to their queue's retry",
+            })
+        return finished
+
+    def submit(self, job: IngestJob) -> None:
+        self.queue.put(job)
+        logger.info("job_enqueued", extra={
+            "job_id": job.id,
+            "source": job.source,
+            "year": job.year,
+            "action": "Enqueued ingest job",
+        })
+
+    def health(self) -> Tuple[int, dict]:
+        """``(http_status, body)`` for ``GET /healthz``."""
+        alive = self.threads_alive
+        if self.draining:
+            status = "draining"
+        elif alive < self.concurrency:
+            status = "degraded"
+        else:
+            status = "ok"
+        body = {
+            "status": status,
+            "threads_alive": alive,
+            "in_flight": self.stats.snapshot()["in_flight"],
+            "queue_depth": self.queue.depth(),
+        }
+        return (200 if status == "ok" else 503), body
+
+    def _take_jobs(self) -> None:
+        while not self._stopping.is_set():
+            job = self.queue.take(self.poll_interval)
+            if job is not None:
+                self.process(job)
+
+    def process(self, job: IngestJob) -> str:
+        """Run one taken job and settle it with the queue; returns the outcome."""
+        logger.info("job_started", extra={
+            "job_id": job.id,
+            "source": job.source,
+            "year": job.year,
+            "attempt": job.attempts,
+            "action": "Started ingest job",
+        })
+        self.stats.job_started()
+        start = time.perf_counter()
+        with recording() as recorder:
+            try:
+                self.runner.run(job)
+            except Exception as exc:
+                retried = self.queue.fail(job, str(exc), retry=not isinstance(exc, ValueError))
+                outcome = "retried" if retried else "failed"
+                logger.exception("job_failed", extra={
+                    "job_id": job.id,
+                    "attempt": job.attempts,
+                    "will_retry": retried,
+                    "action": "Ingest job failed" + (", it will be retried" if retried else ""),
+                })
+            else:
+                self.queue.ack(job)
+                outcome = "succeeded"
+        elapsed = time.perf_counter() - start
+        self.stats.job_finished(outcome, elapsed, recorder.summary())
+        if outcome == "succeeded":
+            logger.info("job_succeeded", extra={
+                "job_id": job.id,
+                "elapsed_ms": round(elapsed * 1000, 3),
+                "stages": recorder.summary(),
+                "action": "Ingest job completed",
+            })
+        return outcome
+
+
+def serve(worker: Worker, status_address: Optional[Tuple[str, int]], shutdown_timeout: float) -> bool:
+    """Run ``worker`` (and its status server) until SIGTERM or SIGINT, then drain it.
+
+    Returns:
+        bool: ``True`` when every running job finished before the timeout.
+    """
+    stop = threading.Event()
+
+    def request_stop(signum, _frame):
+        logger.info("worker_signal", extra={
+            "signal": signal.Signals(signum).name,
+            "action": "Shutdown requested, draining the worker",
+        })
+        stop.set()
+
+    previous = {sig: signal.signal(sig, request_stop) for sig in (signal.SIGTERM, signal.SIGINT)}
+    worker.start()
+    server = start_status_server(worker, *status_address) if status_address else None
+    try:
+        while not stop.wait(1.0):
+            pass
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+        # Keep answering /healthz (with 503) while the jobs drain
+        finished = worker.stop(shutdown_timeout)
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        if finished:
+            worker.queue.close()
+    return finished
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the ingest worker, or add a job to its SQLite queue.")
+    commands = parser.add_subparsers(dest="command")
+    enqueue = commands.add_parser("enqueue", help="Add a job to the WORKER_QUEUE=sqlite queue")
+    enqueue.add_argument("--source", default=IRS_SOURCE_NAME,
+                         help="irs, a name from SOURCES_FILE, or an archived page URL/path (with --year)")
+    enqueue.add_argument("--year", type=int)
+    enqueue.add_argument("--dry-run", action=argparse.BooleanOptionalAction, default=None)
+    enqueue.add_argument("--push", action=argparse.BooleanOptionalAction, default=None)
+    args = parser.parse_args(argv)
+
+    queue = open_queue_from_env()
+    if args.command == "enqueue":
+        if isinstance(queue, MemoryJobQueue):
+            raise ValueError("enqueue needs WORKER_QUEUE=sqlite; a memory queue takes jobs through POST /jobs")
+        job = IngestJob(source=args.source, year=args.year, dry_run=args.dry_run, push=args.push)
+        queue.put(job)
+        queue.close()
+        logger.info("job_enqueued", extra={
+            "job_id": job.id,
+            "source": job.source,
+            "year": job.year,
+            "action": "Enqueued ingest job",
+        })
+        print(job.id)
+        return job.id
+
+    worker = Worker(queue, _env_number(CONCURRENCY_ENV, DEFAULT_CONCURRENCY),
+                    poll_interval=_env_number(POLL_ENV, DEFAULT_POLL_SECONDS, float, minimum=0.01))
+    port = _env_number(STATUS_PORT_ENV, DEFAULT_STATUS_PORT, minimum=0)
+    status_address = (os.getenv(STATUS_HOST_ENV, DEFAULT_STATUS_HOST), port) if port else None
+    return serve(worker, status_address, _env_number(SHUTDOWN_TIMEOUT_ENV, DEFAULT_SHUTDOWN_TIMEOUT, float, minimum=0))
+
+
+if __name__ == "__main__":
+    from tax_bracket_ingest.runtime import init_runtime
+
+    init_runtime()
+    main()
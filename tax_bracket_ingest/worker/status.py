@@ -0,0 +1,172 @@
+# tax_bracket_ingest/worker/status.py
+"""HTTP endpoints of the worker, and the counters behind them.
+
+- ``GET /healthz``: ``200`` while every worker thread runs; ``503`` once the
+  worker is draining or a thread has died. The JSON body says which.
+- ``GET /metrics``: job counters, queue depth and per-stage totals (from
+  ``tax_bracket_ingest.metrics``) in the Prometheus text format.
+- ``POST /jobs``: enqueue a job from its JSON form (see ``IngestJob``);
+  answers ``202`` with the job id.
+- ``GET /jobs/<id>``: the job's status.
+"""
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Dict, List, Tuple
+
+from tax_bracket_ingest.worker.jobs import IngestJob
+
+if TYPE_CHECKING:
+    from tax_bracket_ingest.worker.service import Worker
+
+logger = logging.getLogger(__name__)
+
+JOB_OUTCOMES = ("succeeded", "retried", "failed")
+METRIC_PREFIX = "ingest_worker"
+
+
+class WorkerStats:
+    """Job counters and per-stage totals, updated from the worker threads."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.in_flight = 0
+        self.jobs: Dict[str, int] = dict.fromkeys(JOB_OUTCOMES, 0)
+        self.job_seconds = 0.0
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def job_started(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+
+    def job_finished(self, outcome: str, seconds: float, stages: Dict[str, dict]) -> None:
+        """Count a finished job; ``stages`` is its ``MetricsRecorder.summary()``."""
+        with self._lock:
+            self.in_flight -= 1
+            self.jobs[outcome] += 1
+            self.job_seconds += seconds
+            for name, summary in stages.items():
+                totals = self.stages.setdefault(name, {"calls": 0, "wall_ms": 0.0, "errors": 0})
+                for key in totals:
+                    totals[key] += summary[key]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "uptime_seconds": round(time.monotonic() - self.started_at, 3),
+                "in_flight": self.in_flight,
+                "jobs": dict(self.jobs),
+                "job_seconds": round(self.job_seconds, 3),
+                "stages": {name: dict(totals) for name, totals in self.stages.items()},
+            }
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def render_metrics(stats: dict, queue_depth: int, threads_alive: int) -> str:
+    """The Prometheus text exposition of a ``WorkerStats.snapshot()``."""
+    families: List[Tuple[str, str, str, List[Tuple[str, float]]]] = [
+        ("jobs_total", "counter", "Jobs finished, by outcome.",
+         [(_labels(outcome=outcome), count) for outcome, count in stats["jobs"].items()]),
+        ("job_seconds_total", "counter", "Wall-clock seconds spent running jobs.", [("", stats["job_seconds"])]),
+        ("jobs_in_flight", "gauge", "Jobs running now.", [("", stats["in_flight"])]),
+        ("queue_depth", "gauge", "Jobs waiting in the queue, including retries.", [("", queue_depth)]),
+        ("threads_alive", "gauge", "Worker threads taking jobs.", [("", threads_alive)]),
+        ("uptime_seconds", "gauge", "Seconds since the worker started.", [("", stats["uptime_seconds"])]),
+        ("stage_calls_total", "counter", "Measured pipeline stages run by jobs.",
+         [(_labels(stage=name), totals["calls"]) for name, totals in sorted(stats["stages"].items())]),
+        ("stage_errors_total", "counter", "Measured pipeline stages that raised.",
+         [(_labels(stage=name), totals["errors"]) for name, totals in sorted(stats["stages"].items())]),
+        ("stage_seconds_total", "counter", "Wall-clock seconds per measured pipeline stage.",
+         [(_labels(stage=name), round(totals["wall_ms"] / 1000, 6)) for name, totals in sorted(stats["stages"].items())]),
+    ]
+    lines = []
+    for name, kind, help_text, samples in families:
+        lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {METRIC_PREFIX}_{name} {kind}")
+        lines.extend(f"{METRIC_PREFIX}_{name}{labels} {value}" for labels, value in samples)
+    return "\n".join(lines) + "\n"
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    server: "StatusServer"
+
+    def _send(self, status: int, body, content_type: str = "application/json") -> None:
+        payload = (body if isinstance(body, str) else json.dumps(body, sort_keys=True)).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        worker = self.server.worker
+        if self.path == "/healthz":
+            status, body = worker.health()
+            self._send(status, body)
+        elif self.path == "/metrics":
+            text = render_metrics(worker.stats.snapshot(), worker.queue.depth(), worker.threads_alive)
+            self._send(200, text, content_type="text/plain; version=0.0.4")
+        elif self.path.startswith("/jobs/"):
+            job_id = self.path[len("/jobs/"):]
+            status = worker.queue.status(job_id)
+            if status is None:
+                self._send(404, {"error": f"Unknown job {job_id!r}"})
+            else:
+                self._send(200, {"id": job_id, "status": status})
+        else:
+            self._send(404, {"error": "Not found"})
+
+    def do_POST(self):
+        if self.path != "/jobs":
+            self._send(404, {"error": "Not found"})
+            return
+        worker = self.server.worker
+        if worker.draining:
+            self._send(503, {"error": "Worker is shutting down"})
+            return
+        try:
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            job = IngestJob.from_dict(json.loads(body or b"{}"))
+        except ValueError as exc:  # json.JSONDecodeError included
+            self._send(400, {"error": str(exc)})
+            return
+        worker.submit(job)
+        self._send(202, {"id": job.id, "status": "pending"})
+
+    def log_message(self, fmt, *args):
+        logger.debug("worker_status_request", extra={
+            "request": fmt % args,
+            "action": "Served a worker status request",
+        })
+
+
+class StatusServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, worker: "Worker", host: str, port: int):
+        super().__init__((host, port), _StatusHandler)
+        self.worker = worker
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_status_server(worker: "Worker", host: str, port: int) -> StatusServer:
+    """Serve the endpoints on a daemon thread; port ``0`` picks a free one."""
+    server = StatusServer(worker, host, port)
+    threading.Thread(target=server.serve_forever, name="worker-status", daemon=True).start()
+    logger.info("worker_status_listening", extra={
+        "url": server.url,
+        "action": "Serving worker health, metrics and job endpoints",
+    })
+    return server
@@ -1,5 +1,7 @@
 # tests/conftest.py
 import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from moto import mock_aws
 import pytest
@@ -8,6 +10,8 @@ import boto3
 
 from tax_bracket_ingest import run_ingest
 import tax_bracket_ingest.scraper.fetch as fetch_mod
+from tax_bracket_ingest.storage import s3 as s3_clients
+from tax_bracket_ingest.storage.memory import reset_memory_stores
 
 TEST_DATA = Path(__file__).parent / "data"
 
@@ -88,8 +92,30 @@ def aws_credentials_env(monkeypatch):
     monkeypatch.setenv("S3_KEY", "history.csv")
     monkeypatch.setenv("DRY_RUN", "0")
     monkeypatch.setenv("ENABLE_BACKEND_PUSH", "0")
+    monkeypatch.setenv("LOG_TO_FILE", "0")
     yield
     
+@pytest.fixture(autouse=True)
+def fresh_ingest_config():
+    """Re-read configuration from the (monkeypatched) environment in every test."""
+    run_ingest.get_ingest_config.cache_clear()
+    yield
+    run_ingest.get_ingest_config.cache_clear()
+
+@pytest.fixture(autouse=True)
+def fresh_s3_clients():
+    """Never let a client cached in one test (and its moto backend) leak into the next."""
+    s3_clients.reset_s3_clients()
+    yield
+    s3_clients.reset_s3_clients()
+
+@pytest.fixture(autouse=True)
+def fresh_memory_stores():
+    """Objects written to a STORAGE_BACKEND=memory store never outlive the test."""
+    reset_memory_stores()
+    yield
+    reset_memory_stores()
+
 @pytest.fixture(autouse=True)
 def backend_url(monkeypatch):
     """Ensure BACKEND_URL is set for both unit and integration tests."""
@@ -100,3 +126,58 @@ def backend_url(monkeypatch):
 def dummy_response():
     """Returns a dummy response object with a 200 status code."""
     return DummyResponse()
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Dispatches to ``server.routes[(method, path)]`` and records every request."""
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()  # blank line after the last chunk
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            self.chunk_count = len(chunks)
+            return b"".join(chunks)
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _dispatch(self):
+        self.chunk_count = 0
+        body = self._read_body()
+        self.server.requests.append(
+            {"method": self.command, "path": self.path, "headers": dict(self.headers), "body": body,
+             "chunks": self.chunk_count}
+        )
+        route = self.server.routes.get((self.command, self.path))
+        status, headers, payload = route(self, body) if route else (404, {}, b"not found")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if payload and self.command != "HEAD":
+            self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_HEAD = do_OPTIONS = _dispatch
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_stand_in():
+    """Local HTTP server; tests register ``server.routes[(method, path)] = fn(handler, body)``."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.routes = {}
+    server.requests = []
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,119 @@
+# tests/integration/test_async_ingest.py
+import asyncio
+import io
+import threading
+
+import pandas as pd
+import pytest
+
+import lambda_handler
+from tax_bracket_ingest import async_ingest, run_ingest
+from tax_bracket_ingest.scraper.cache import CacheEntry
+from tax_bracket_ingest.scraper.fetch import FetchResult
+
+
+@pytest.fixture
+def seeded_bucket(moto_s3_client, sample_normalized_csv_bytes):
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    moto_s3_client.put_object(Bucket="test-bucket", Key="history.csv", Body=sample_normalized_csv_bytes)
+    return moto_s3_client
+
+
+def _read(client, key):
+    return client.get_object(Bucket="test-bucket", Key=key)["Body"].read()
+
+
+@pytest.mark.integration
+def test_async_run_writes_same_history_as_sync(seeded_bucket, sample_normalized_csv_bytes):
+    timings = async_ingest.main()
+    async_csv = _read(seeded_bucket, "history.csv")
+    async_manifest = _read(seeded_bucket, "history.manifest.json")
+
+    seeded_bucket.put_object(Bucket="test-bucket", Key="history.csv", Body=sample_normalized_csv_bytes)
+    seeded_bucket.delete_object(Bucket="test-bucket", Key="history.manifest.json")
+    run_ingest.main()
+
+    assert async_csv == _read(seeded_bucket, "history.csv")
+    assert async_manifest == _read(seeded_bucket, "history.manifest.json")
+    assert {"fetch", "read_history", "parse", "plan", "backend_push", "write_history", "publish", "total"} <= set(timings)
+
+
+@pytest.mark.integration
+def test_fetch_overlaps_history_read_and_push_overlaps_write(seeded_bucket, monkeypatch):
+    # Each pair only gets past its barrier when both calls are in flight together
+    reads = threading.Barrier(2, timeout=5)
+    publishes = threading.Barrier(2, timeout=5)
+
+    def waits_for(barrier, fn):
+        def wrapper(*args, **kwargs):
+            barrier.wait()
+            return fn(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(run_ingest, "fetch_page", waits_for(reads, run_ingest.fetch_page))
+    monkeypatch.setattr(run_ingest, "read_manifest_from_s3", waits_for(reads, run_ingest.read_manifest_from_s3))
+    monkeypatch.setattr(run_ingest, "push_current", waits_for(publishes, run_ingest.push_current))
+    monkeypatch.setattr(run_ingest, "write_history_update", waits_for(publishes, run_ingest.write_history_update))
+
+    asyncio.run(async_ingest.run_async())
+
+    hist = pd.read_csv(io.BytesIO(_read(seeded_bucket, "history.csv")))
+    assert hist["Year"].tolist() == [2024] * 7 + [2023] * 7
+
+
+@pytest.mark.integration
+def test_failed_fetch_cancels_pipeline_before_any_write(seeded_bucket, monkeypatch):
+    def boom(_cache):
+        raise RuntimeError("IRS unreachable")
+
+    monkeypatch.setattr(run_ingest, "fetch_page", boom)
+    monkeypatch.setattr(run_ingest, "plan_history_update", lambda *a, **k: pytest.fail("planned after failure"))
+    monkeypatch.setattr(run_ingest, "write_history_update", lambda *a, **k: pytest.fail("wrote after failure"))
+
+    with pytest.raises(RuntimeError, match="IRS unreachable"):
+        async_ingest.main()
+
+
+@pytest.mark.integration
+def test_failed_write_surfaces_and_skips_fetch_cache(seeded_bucket, monkeypatch, tmp_path):
+    monkeypatch.setenv("FETCH_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(run_ingest, "fetch_page", lambda cache: (run_ingest.fetch_irs_data(), None))
+
+    def fail_write(*_args, **_kwargs):
+        raise OSError("S3 down")
+
+    monkeypatch.setattr(run_ingest, "write_history_update", fail_write)
+    monkeypatch.setattr(run_ingest, "remember_page", lambda *a, **k: pytest.fail("cache updated after failure"))
+
+    with pytest.raises(OSError, match="S3 down"):
+        async_ingest.main()
+
+
+@pytest.mark.integration
+def test_lambda_handler_uses_async_mode(monkeypatch):
+    calls = []
+    monkeypatch.setenv("INGEST_MODE", "async")
+    monkeypatch.setattr(async_ingest, "main", lambda: calls.append("async"))
+    monkeypatch.setattr(run_ingest, "main", lambda: calls.append("sync"))
+
+    assert lambda_handler.handler({}, None)["statusCode"] == 200
+    assert calls == ["async"]
+
+
+def test_invalid_concurrency_rejected(monkeypatch):
+    monkeypatch.setenv("INGEST_MAX_CONCURRENCY", "0")
+    with pytest.raises(ValueError):
+        async_ingest.get_max_concurrency()
+
+
+@pytest.mark.integration
+def test_unchanged_page_skips_parse_and_publish(seeded_bucket, monkeypatch):
+    unchanged = FetchResult(None, CacheEntry("https://irs.example", '"v1"', None, "abc"), True, 304)
+    monkeypatch.setattr(run_ingest, "fetch_page", lambda cache: (None, unchanged))
+    monkeypatch.setattr(run_ingest, "normalize_html", lambda *a: pytest.fail("parsed unchanged page"))
+    monkeypatch.setattr(run_ingest, "push_current", lambda *a: pytest.fail("pushed unchanged page"))
+
+    timings = asyncio.run(async_ingest.run_async())
+
+    assert "parse" not in timings
+    assert "fetch" in timings
@@ -0,0 +1,97 @@
+# tests/integration/test_backfill.py
+import io
+
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest.backfill import (
+    BackfillSource,
+    build_sources,
+    merge_history,
+    parse_years,
+    run_backfill,
+)
+from tax_bracket_ingest.storage.s3 import S3Storage, get_s3_client
+
+
+def test_parse_years():
+    assert parse_years("2018-2020, 2023,2019") == [2018, 2019, 2020, 2023]
+    with pytest.raises(ValueError):
+        parse_years("2020-2018")
+
+
+def test_build_sources_explicit_overrides_template():
+    sources = build_sources([2022, 2023], "https://archive.test/{year}", ["2023=pages/2023.html"])
+    assert sources == [
+        BackfillSource(2022, "https://archive.test/2022"),
+        BackfillSource(2023, "pages/2023.html"),
+    ]
+
+
+def test_merge_history_replaces_backfilled_years(sample_normalized_df):
+    replacement = sample_normalized_df.copy()
+    replacement["MFJ Range Start"] = "$1"
+    older = sample_normalized_df.assign(Year=2022)
+    prev = pd.concat([sample_normalized_df, older], ignore_index=True)
+
+    merged = merge_history(prev, {2023: replacement, 2024: sample_normalized_df.assign(Year=2024)})
+
+    assert merged["Year"].tolist() == [2024] * 7 + [2023] * 7 + [2022] * 7
+    assert (merged.loc[merged["Year"] == 2023, "MFJ Range Start"] == "$1").all()
+
+
+@pytest.mark.integration
+def test_run_backfill_merges_years_in_one_write(
+    moto_s3_client, sample_page_html, sample_normalized_csv_bytes, http_stand_in, tmp_path, monkeypatch
+):
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    moto_s3_client.put_object(Bucket="test-bucket", Key="history.csv", Body=sample_normalized_csv_bytes)
+
+    page_2022 = tmp_path / "2022.html"
+    page_2022.write_bytes(sample_page_html.replace(b"2024", b"2022"))
+    http_stand_in.routes[("GET", "/2024")] = lambda handler, body: (200, {}, sample_page_html)
+
+    puts = []
+    get_s3_client().meta.events.register("before-call.s3.PutObject", lambda **kw: puts.append(1))
+
+    hist = run_backfill(
+        [
+            BackfillSource(2022, str(page_2022)),
+            BackfillSource(2024, http_stand_in.url + "/2024"),
+        ],
+        parse_workers=2,
+    )
+
+    assert len(puts) == 2  # history + manifest
+    stored = pd.read_csv(io.BytesIO(
+        moto_s3_client.get_object(Bucket="test-bucket", Key="history.csv")["Body"].read()
+    ))
+    assert stored["Year"].tolist() == [2024] * 7 + [2023] * 7 + [2022] * 7
+    assert len(hist) == len(stored)
+    pd.testing.assert_frame_equal(
+        stored[stored["Year"] == 2023].reset_index(drop=True),
+        pd.read_csv(io.BytesIO(sample_normalized_csv_bytes)),
+        check_dtype=False,
+    )
+
+
+@pytest.mark.integration
+def test_run_backfill_parquet_writes_only_backfilled_partitions(
+    moto_s3_client, sample_page_html, tmp_path, monkeypatch
+):
+    pytest.importorskip("pyarrow")
+    from tax_bracket_ingest.storage import parquet as store
+
+    monkeypatch.setenv("HISTORY_FORMAT", "parquet")
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    sources = []
+    for year in (2021, 2022):
+        page = tmp_path / f"{year}.html"
+        page.write_bytes(sample_page_html.replace(b"2024", str(year).encode()))
+        sources.append(BackfillSource(year, str(page)))
+
+    run_backfill(sources, parse_workers=1)
+
+    assert store.list_partition_years(S3Storage("test-bucket", moto_s3_client), "history/") == [2021, 2022]
+    manifest = moto_s3_client.get_object(Bucket="test-bucket", Key="history.manifest.json")["Body"].read()
+    assert b'"2021"' in manifest and b'"2022"' in manifest
@@ -0,0 +1,146 @@
+# tests/integration/test_batch_push.py
+import io
+import threading
+
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.backend.batch import LocalPushCheckpoint, push_batches
+
+UPLOAD = "/api/v1/tax/upload"
+
+
+@pytest.fixture
+def backend(http_stand_in):
+    """Stand-in backend; ``server.fail`` maps batch index -> list of statuses to return first."""
+    lock = threading.Lock()
+    http_stand_in.fail = {}
+    http_stand_in.active = 0
+    http_stand_in.max_active = 0
+    http_stand_in.accepted = {}
+
+    def post(handler, body):
+        index = int(handler.headers["X-Batch-Index"])
+        with lock:
+            http_stand_in.active += 1
+            http_stand_in.max_active = max(http_stand_in.max_active, http_stand_in.active)
+            queued = http_stand_in.fail.get(index) or []
+            status = queued.pop(0) if queued else 200
+            if status == 200:
+                http_stand_in.accepted[handler.headers["Idempotency-Key"]] = body
+        threading.Event().wait(0.01)
+        with lock:
+            http_stand_in.active -= 1
+        return status, {"Content-Type": "application/json"}, b'{"status": "ok"}' if status == 200 else b'{}'
+
+    http_stand_in.routes[("POST", UPLOAD)] = post
+    return http_stand_in
+
+
+@pytest.fixture
+def big_df(sample_normalized_df):
+    return pd.concat([sample_normalized_df] * 300, ignore_index=True)
+
+
+def _posts(server):
+    return [r for r in server.requests if r["method"] == "POST"]
+
+
+@pytest.mark.integration
+def test_batches_sent_with_bounded_concurrency(backend, big_df):
+    result = push_batches(big_df, backend.url + UPLOAD, {"Content-Type": "text/csv"},
+                          max_bytes=20_000, concurrency=3, retries=0)
+
+    assert result.ok and result.sent == result.total > 3
+    assert backend.max_active <= 3
+    keys = [r["headers"]["Idempotency-Key"] for r in _posts(backend)]
+    assert len(set(keys)) == len(keys) == result.total
+    bodies = sorted(_posts(backend), key=lambda r: int(r["headers"]["X-Batch-Index"]))
+    rebuilt = pd.concat([pd.read_csv(io.BytesIO(r["body"])) for r in bodies], ignore_index=True)
+    pd.testing.assert_frame_equal(rebuilt, big_df, check_dtype=False)
+
+
+@pytest.mark.integration
+def test_transient_errors_are_retried(backend, big_df):
+    backend.fail = {1: [503, 502]}
+
+    result = push_batches(big_df, backend.url + UPLOAD, {}, max_bytes=20_000, retries=3)
+
+    assert result.ok
+    attempts = [r for r in _posts(backend) if r["headers"]["X-Batch-Index"] == "1"]
+    assert len(attempts) == 3
+    assert len({r["headers"]["Idempotency-Key"] for r in attempts}) == 1
+
+
+@pytest.mark.integration
+def test_rerun_resumes_from_checkpoint(backend, big_df, tmp_path):
+    checkpoint = LocalPushCheckpoint(str(tmp_path / "checkpoint.json"))
+    backend.fail = {2: [400]}
+
+    first = push_batches(big_df, backend.url + UPLOAD, {}, max_bytes=20_000, retries=0, checkpoint=checkpoint)
+    assert first.failed == [2]
+    assert first.sent == first.total - 1
+    sent_before = len(_posts(backend))
+
+    second = push_batches(big_df, backend.url + UPLOAD, {}, max_bytes=20_000, retries=0, checkpoint=checkpoint)
+
+    assert second.ok and second.sent == 1 and second.skipped == first.total - 1
+    assert [r["headers"]["X-Batch-Index"] for r in _posts(backend)[sent_before:]] == ["2"]
+    assert len(checkpoint.load()) == first.total
+
+
+@pytest.mark.integration
+def test_frames_sharing_a_checkpoint_keep_each_others_progress(backend, big_df, sample_normalized_df, tmp_path):
+    checkpoint = LocalPushCheckpoint(str(tmp_path / "checkpoint.json"))
+    daily = sample_normalized_df.assign(Year=2024)
+
+    backfill = push_batches(big_df, backend.url + UPLOAD, {}, max_bytes=20_000, checkpoint=checkpoint)
+    push_batches(daily, backend.url + UPLOAD, {}, max_bytes=20_000, checkpoint=checkpoint)
+    sent_before = len(_posts(backend))
+
+    again = push_batches(big_df, backend.url + UPLOAD, {}, max_bytes=20_000, checkpoint=checkpoint)
+
+    assert again.skipped == backfill.total and len(_posts(backend)) == sent_before
+    assert len(checkpoint.load()) == backfill.total + 1
+
+
+class CountingCheckpoint(LocalPushCheckpoint):
+    saves = 0
+
+    def save(self, keys):
+        self.saves += 1
+        super().save(keys)
+
+
+@pytest.mark.integration
+def test_checkpoint_is_saved_periodically_and_pruned_per_scope(backend, big_df, sample_normalized_df, tmp_path):
+    checkpoint = CountingCheckpoint(str(tmp_path / "checkpoint.json"))
+    daily = push_batches(sample_normalized_df.assign(Year=2024), backend.url + UPLOAD, {}, checkpoint=checkpoint)
+
+    first = push_batches(big_df, backend.url + UPLOAD, {}, max_bytes=20_000, checkpoint=checkpoint,
+                         checkpoint_every=4)
+    assert checkpoint.saves == 1 + -(-first.sent // 4)
+
+    revised = big_df.assign(**{"MFJ Range Start": "$1"})
+    second = push_batches(revised, backend.url + UPLOAD, {}, max_bytes=20_000, checkpoint=checkpoint)
+
+    keys = checkpoint.load()
+    assert second.sent == second.total and len(keys) == daily.total + second.total
+    assert sum(key.startswith("Year=2023/") for key in keys) == second.total
+
+
+@pytest.mark.integration
+def test_main_pushes_in_batches_when_enabled(moto_s3_client, sample_normalized_csv_bytes, backend, monkeypatch):
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    moto_s3_client.put_object(Bucket="test-bucket", Key="history.csv", Body=sample_normalized_csv_bytes)
+    monkeypatch.setenv("BACKEND_URL", backend.url)
+    monkeypatch.setenv("ENABLE_BACKEND_PUSH", "1")
+    monkeypatch.setenv("BACKEND_BATCH_PUSH", "1")
+    monkeypatch.setenv("BACKEND_BATCH_MAX_BYTES", "500")
+    monkeypatch.setenv("BACKEND_CHECKPOINT_S3_KEY", "push/checkpoint.json")
+
+    run_ingest.main()
+
+    assert len(_posts(backend)) > 1
+    assert moto_s3_client.get_object(Bucket="test-bucket", Key="push/checkpoint.json")
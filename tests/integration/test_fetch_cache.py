@@ -0,0 +1,102 @@
+# tests/integration/test_fetch_cache.py
+import pytest
+
+from tax_bracket_ingest import run_ingest
+import tax_bracket_ingest.scraper.fetch as fetch_mod
+
+
+@pytest.fixture
+def irs_page_server(http_stand_in, sample_page_html, monkeypatch):
+    def page(handler, _body):
+        if handler.headers.get("If-None-Match") == '"2024"':
+            return 304, {"ETag": '"2024"'}, b""
+        return 200, {"ETag": '"2024"'}, sample_page_html
+    http_stand_in.routes[("GET", "/irs")] = page
+    monkeypatch.setattr(fetch_mod, "IRS_URL", http_stand_in.url + "/irs")
+    return http_stand_in
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("cache_env", ["FETCH_CACHE_DIR", "FETCH_CACHE_S3_PREFIX"])
+def test_unchanged_page_short_circuits_main(
+    moto_s3_client, sample_normalized_csv_bytes, irs_page_server, monkeypatch, tmp_path, cache_env
+):
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    moto_s3_client.put_object(Bucket="test-bucket", Key="history.csv", Body=sample_normalized_csv_bytes)
+    monkeypatch.setenv(cache_env, str(tmp_path) if cache_env == "FETCH_CACHE_DIR" else "cache/fetch/")
+
+    run_ingest.main()
+    assert len(irs_page_server.requests) == 1
+
+    def fail(*_, **__):
+        pytest.fail("Unchanged page must not reach parse, S3 or the backend")
+
+    monkeypatch.setattr("tax_bracket_ingest.parser.parser.parse_irs_brackets", fail)
+    monkeypatch.setattr(run_ingest, "read_csv_from_s3", fail)
+    monkeypatch.setattr(run_ingest, "write_df_to_s3", fail)
+    monkeypatch.setattr(run_ingest, "push_csv_to_backend", fail)
+    monkeypatch.setenv("ENABLE_BACKEND_PUSH", "1")
+
+    run_ingest.main()
+    assert irs_page_server.requests[-1]["headers"]["If-None-Match"] == '"2024"'
+
+
+@pytest.mark.integration
+def test_dry_run_does_not_update_cache(irs_page_server, monkeypatch, tmp_path):
+    monkeypatch.setenv("DRY_RUN", "1")
+    monkeypatch.setenv("FETCH_CACHE_DIR", str(tmp_path))
+
+    run_ingest.main()
+    run_ingest.main()
+
+    assert all("If-None-Match" not in r["headers"] for r in irs_page_server.requests)
+    assert not list(tmp_path.iterdir())
+
+
+@pytest.mark.integration
+def test_failed_push_keeps_cache_so_next_run_retries(
+    moto_s3_client, sample_normalized_csv_bytes, irs_page_server, monkeypatch, tmp_path
+):
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    moto_s3_client.put_object(Bucket="test-bucket", Key="history.csv", Body=sample_normalized_csv_bytes)
+    monkeypatch.setenv("FETCH_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("ENABLE_BACKEND_PUSH", "1")
+    monkeypatch.setenv("BACKEND_URL", irs_page_server.url)
+    statuses = [503, 200]
+    irs_page_server.routes[("POST", "/api/v1/tax/upload")] = lambda handler, body: (
+        statuses.pop(0), {"Content-Type": "application/json"}, b'{"status": "ok"}'
+    )
+
+    run_ingest.main()
+    run_ingest.main()
+    run_ingest.main()
+
+    pages = [r for r in irs_page_server.requests if r["path"] == "/irs"]
+    pushes = [r for r in irs_page_server.requests if r["path"] == "/api/v1/tax/upload"]
+    assert ["If-None-Match" in r["headers"] for r in pages] == [False, False, True]
+    assert len(pushes) == 2 and statuses == []
+
+
+@pytest.mark.integration
+def test_rotated_etag_on_an_unchanged_page_is_stored(
+    moto_s3_client, sample_normalized_csv_bytes, http_stand_in, sample_page_html, monkeypatch, tmp_path
+):
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    moto_s3_client.put_object(Bucket="test-bucket", Key="history.csv", Body=sample_normalized_csv_bytes)
+    monkeypatch.setenv("FETCH_CACHE_DIR", str(tmp_path))
+    etags = ['"v1"', '"v2"', '"v2"']
+    statuses = []
+
+    def page(handler, _body):
+        etag = etags.pop(0)
+        status = 304 if handler.headers.get("If-None-Match") == etag else 200
+        statuses.append(status)
+        return status, {"ETag": etag}, b"" if status == 304 else sample_page_html
+    http_stand_in.routes[("GET", "/irs")] = page
+    monkeypatch.setattr(fetch_mod, "IRS_URL", http_stand_in.url + "/irs")
+
+    run_ingest.main()
+    run_ingest.main()  # same body, new ETag
+    run_ingest.main()
+
+    assert statuses == [200, 200, 304]
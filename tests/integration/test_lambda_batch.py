@@ -0,0 +1,123 @@
+# tests/integration/test_lambda_batch.py
+import io
+import json
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import lambda_handler
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.worker.events import BatchIngestError
+
+
+def sqs_record(body, message_id):
+    return {"eventSource": "aws:sqs", "messageId": message_id,
+            "body": body if isinstance(body, str) else json.dumps(body)}
+
+
+def s3_record(bucket, key):
+    return {"eventSource": "aws:s3", "s3": {"bucket": {"name": bucket}, "object": {"key": key}}}
+
+
+@pytest.fixture
+def memory_history(monkeypatch, sample_normalized_csv_bytes):
+    monkeypatch.setenv("STORAGE_BACKEND", "memory")
+    storage = run_ingest.get_storage()
+    storage.write("history.csv", sample_normalized_csv_bytes)
+    return storage
+
+
+def history_years(storage):
+    return pd.read_csv(io.BytesIO(storage.read("history.csv"))).groupby("Year").size().to_dict()
+
+
+@pytest.mark.integration
+def test_sqs_batch_reports_only_failed_messages(memory_history, sample_page_html, tmp_path):
+    page_2022 = tmp_path / "2022.html"
+    page_2022.write_bytes(sample_page_html.replace(b"2024", b"2022"))
+    event = {"Records": [
+        sqs_record({"source": "irs"}, "ok-irs"),
+        sqs_record("{not json", "bad-json"),
+        sqs_record({"source": str(page_2022), "year": 2022}, "ok-archive"),
+        sqs_record({"source": str(tmp_path / "missing.html"), "year": 2019}, "missing-page"),
+    ]}
+
+    result = lambda_handler.handler(event, None)
+
+    # bad-json can never succeed, so it is acknowledged rather than redelivered
+    assert result == {"batchItemFailures": [{"itemIdentifier": "missing-page"}]}
+    assert history_years(memory_history) == {2022: 7, 2023: 7, 2024: 7}
+
+
+@pytest.mark.integration
+def test_records_that_cannot_succeed_are_acknowledged(memory_history, caplog):
+    event = {"Records": [
+        sqs_record("{not json", "bad-json"),
+        sqs_record({"source": "no-such-source"}, "unknown-source"),
+        sqs_record({"source": "irs", "year": 2020}, "bad-job"),
+    ]}
+
+    assert lambda_handler.handler(event, None) == {"batchItemFailures": []}
+    rejected = [r.record_id for r in caplog.records if r.getMessage() == "record_rejected"]
+    assert sorted(rejected) == ["bad-job", "bad-json", "unknown-source"]
+
+
+@pytest.mark.integration
+def test_records_run_concurrently_in_one_invocation(memory_history, sample_page_html, monkeypatch):
+    monkeypatch.setenv("LAMBDA_BATCH_CONCURRENCY", "4")
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def slow_fetch():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.1)
+        with lock:
+            running[0] -= 1
+        return sample_page_html
+
+    monkeypatch.setattr(run_ingest, "fetch_irs_data", slow_fetch)
+    event = {"Records": [sqs_record({"source": "irs", "dry_run": True}, f"m-{i}") for i in range(4)]}
+
+    assert lambda_handler.handler(event, None) == {"batchItemFailures": []}
+    assert peak[0] > 1
+
+
+@pytest.mark.integration
+def test_message_flags_override_the_environment(memory_history, http_stand_in, monkeypatch):
+    monkeypatch.setenv("BACKEND_URL", http_stand_in.url)
+    http_stand_in.routes[("POST", "/api/v1/tax/upload")] = lambda handler, body: (
+        200, {"Content-Type": "application/json"}, b'{"status": "ok"}'
+    )
+    event = {"Records": [sqs_record({"source": "irs", "dry_run": True, "push": True}, "dry")]}
+
+    # The environment has ENABLE_BACKEND_PUSH=0 and DRY_RUN=0. The message's
+    # dry_run flag keeps the push and the manifest write from happening
+    assert lambda_handler.handler(event, None) == {"batchItemFailures": []}
+    assert http_stand_in.requests == [] and memory_history.list() == ["history.csv"]
+
+    event = {"Records": [sqs_record({"source": "irs", "push": True}, "push")]}
+    assert lambda_handler.handler(event, None) == {"batchItemFailures": []}
+    assert [r["path"] for r in http_stand_in.requests] == ["/api/v1/tax/upload"]
+    assert memory_history.list() == ["history.csv", "history.manifest.json"]
+
+
+@pytest.mark.integration
+def test_s3_put_notifications_backfill_uploaded_pages(memory_history, moto_s3_client, sample_page_html):
+    moto_s3_client.create_bucket(Bucket="archive-bucket")
+    moto_s3_client.put_object(Bucket="archive-bucket", Key="irs/2021.html",
+                              Body=sample_page_html.replace(b"2024", b"2021"))
+    moto_s3_client.put_object(Bucket="archive-bucket", Key="irs/tax year 2020.html",
+                              Body=sample_page_html.replace(b"2024", b"2020"))
+
+    direct = lambda_handler.handler({"Records": [s3_record("archive-bucket", "irs/2021.html")]}, None)
+    via_sqs = lambda_handler.handler({"Records": [
+        sqs_record({"Records": [s3_record("archive-bucket", "irs/tax+year+2020.html")]}, "s3-note"),
+    ]}, None)
+
+    assert direct["statusCode"] == 200 and via_sqs == {"batchItemFailures": []}
+    assert history_years(memory_history) == {2020: 7, 2021: 7, 2023: 7}
+    with pytest.raises(BatchIngestError, match="archive-bucket/irs/1999.html"):
+        lambda_handler.handler({"Records": [s3_record("archive-bucket", "irs/1999.html")]}, None)
@@ -0,0 +1,54 @@
+# tests/integration/test_manifest_change_detection.py
+import json
+
+import pytest
+
+from tax_bracket_ingest import run_ingest
+
+
+@pytest.fixture
+def seeded_bucket(moto_s3_client, sample_normalized_csv_bytes):
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    moto_s3_client.put_object(Bucket="test-bucket", Key="history.csv", Body=sample_normalized_csv_bytes)
+    return moto_s3_client
+
+
+@pytest.mark.integration
+def test_manifest_written_then_used_instead_of_history(seeded_bucket, monkeypatch):
+    run_ingest.main()
+
+    manifest = json.loads(
+        seeded_bucket.get_object(Bucket="test-bucket", Key="history.manifest.json")["Body"].read()
+    )
+    assert sorted(manifest["years"]) == ["2023", "2024"]
+
+    monkeypatch.setattr(run_ingest, "read_csv_from_s3", lambda *a, **k: pytest.fail("history downloaded"))
+    monkeypatch.setattr(run_ingest, "write_df_to_s3", lambda *a, **k: pytest.fail("history rewritten"))
+    run_ingest.main()
+
+
+@pytest.mark.integration
+def test_rerun_without_manifest_does_not_duplicate_year(seeded_bucket):
+    run_ingest.main()
+    seeded_bucket.delete_object(Bucket="test-bucket", Key="history.manifest.json")
+
+    run_ingest.main()
+
+    hist = run_ingest.read_csv_from_s3("history.csv")
+    assert hist["Year"].tolist() == [2024] * 7 + [2023] * 7
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("chunk_rows", ["0", "4"])
+def test_revised_year_known_to_manifest_keeps_older_years(seeded_bucket, sample_page_html, monkeypatch,
+                                                          chunk_rows):
+    monkeypatch.setenv("HISTORY_CHUNK_ROWS", chunk_rows)
+    run_ingest.main()
+
+    revised_page = sample_page_html.replace(b"$11,601", b"$11,651")
+    monkeypatch.setattr(run_ingest, "fetch_irs_data", lambda: revised_page)
+    run_ingest.main()
+
+    hist = run_ingest.read_csv_from_s3("history.csv")
+    assert hist["Year"].tolist() == [2024] * 7 + [2023] * 7
+    assert hist.loc[hist["Year"] == 2024].astype(str).apply(lambda col: col.str.contains("11,651")).any().any()
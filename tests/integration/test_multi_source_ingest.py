@@ -0,0 +1,152 @@
+# tests/integration/test_multi_source_ingest.py
+import asyncio
+import io
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import lambda_handler
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.scraper import fetch as fetch_mod
+from tax_bracket_ingest.sources import scheduler
+from tax_bracket_ingest.sources.registry import IRS_SOURCE, Source
+from tax_bracket_ingest.storage import dataset
+
+STATE_PAGE = (
+    b"<h4>Single</h4><table><tr><td>2%</td><td>$0</td></tr><tr><td>5%</td><td>$10,000</td></tr></table>"
+)
+STATES = [Source(f"st{i}", f"https://state{i % 2}.example.gov/{i}", f"S{i}", year=2025) for i in range(6)]
+
+
+@pytest.fixture
+def memory_storage(monkeypatch, sample_normalized_csv_bytes):
+    """Memory storage seeded with the federal history, which a run with the IRS source updates."""
+    monkeypatch.setenv("STORAGE_BACKEND", "memory")
+    monkeypatch.setenv("SOURCES_PER_HOST_INTERVAL_MS", "0")
+    storage = run_ingest.get_storage()
+    storage.write("history.csv", sample_normalized_csv_bytes)
+    return storage
+
+
+@pytest.fixture
+def pages(monkeypatch, sample_page_html):
+    """Serve the IRS sample page and a state page, recording each request's host and time."""
+    calls, lock = [], threading.Lock()
+
+    def fake_fetch(url):
+        with lock:
+            calls.append((url.split("/")[2], time.monotonic()))
+        time.sleep(0.02)
+        if "boom" in url:
+            raise fetch_mod.FetchError(f"GET {url} returned 500")
+        return sample_page_html if url == IRS_SOURCE.url else STATE_PAGE
+
+    monkeypatch.setattr(fetch_mod, "fetch", fake_fetch)
+    return calls
+
+
+def _run(sources):
+    return asyncio.run(scheduler.run_sources_async(sources))
+
+
+@pytest.mark.integration
+def test_sources_land_in_one_partitioned_dataset(memory_storage, pages):
+    results = _run([IRS_SOURCE, *STATES])
+
+    assert [r.source.name for r in results] == ["irs", *(s.name for s in STATES)]
+    df = dataset.read_dataset(memory_storage, "brackets/")
+    assert df.groupby("Jurisdiction").size().to_dict() == {"US": 28, **{s.jurisdiction: 2 for s in STATES}}
+    assert ("US", 2024) in dataset.list_partitions(memory_storage, "brackets/")
+
+
+@pytest.mark.integration
+def test_irs_page_also_updates_the_federal_history_and_pushes(memory_storage, pages, monkeypatch):
+    pushed = []
+    monkeypatch.setattr(run_ingest, "push_current", lambda df, dry_run, push=None: pushed.append(len(df)))
+
+    _run([IRS_SOURCE, *STATES[:1]])
+
+    hist = pd.read_csv(io.BytesIO(memory_storage.read("history.csv")))
+    assert hist.groupby("Year").size().to_dict() == {2023: 7, 2024: 7}
+    assert memory_storage.read("history.manifest.json")
+    assert pushed == [7]
+    assert len(pages) == 2  # the IRS page is fetched once for both
+
+
+@pytest.mark.integration
+def test_fetches_overlap_within_per_host_limits(memory_storage, pages, monkeypatch):
+    monkeypatch.setenv("SOURCES_PER_HOST_CONCURRENCY", "1")
+    lock, in_flight, peak = threading.Lock(), {}, {}
+    other_host_started = threading.Event()
+    fetch = fetch_mod.fetch
+
+    def tracked_fetch(url):
+        host = url.split("/")[2]
+        with lock:
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+        if host == "state1.example.gov":
+            other_host_started.set()
+        elif host == "state0.example.gov":
+            # Returns only once the other host is fetching too, so the hosts overlap
+            assert other_host_started.wait(5)
+        try:
+            return fetch(url)
+        finally:
+            with lock:
+                in_flight[host] -= 1
+
+    monkeypatch.setattr(fetch_mod, "fetch", tracked_fetch)
+
+    _run(STATES)
+
+    assert sorted(host for host, _ in pages) == ["state0.example.gov"] * 3 + ["state1.example.gov"] * 3
+    assert peak == {"state0.example.gov": 1, "state1.example.gov": 1}
+
+
+@pytest.mark.integration
+def test_failed_source_does_not_block_the_others(memory_storage, pages):
+    broken = Source("boom", "https://boom.example.gov/", "XX", year=2025)
+
+    with pytest.raises(scheduler.SourceIngestError, match="boom") as excinfo:
+        _run([broken, *STATES[:2]])
+
+    assert list(excinfo.value.failures) == ["boom"]
+    assert [code for code, _ in dataset.list_partitions(memory_storage, "brackets/")] == ["S0", "S1"]
+
+
+@pytest.mark.integration
+def test_unchanged_sources_are_skipped_with_fetch_cache(memory_storage, pages, monkeypatch, tmp_path):
+    monkeypatch.setenv("FETCH_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        fetch_mod, "fetch_conditional",
+        lambda url, cached: fetch_mod.FetchResult(
+            STATE_PAGE, fetch_mod.CacheEntry(url, None, None, fetch_mod.content_hash(STATE_PAGE)),
+            unchanged=cached is not None, status_code=200,
+        ),
+    )
+
+    assert all(r.frame is not None for r in _run(STATES[:2]))
+    assert all(r.frame is None for r in _run(STATES[:2]))
+
+
+@pytest.mark.integration
+def test_dry_run_writes_nothing(memory_storage, pages, monkeypatch):
+    monkeypatch.setenv("DRY_RUN", "1")
+
+    _run(STATES[:2])
+
+    assert memory_storage.list() == ["history.csv"]
+
+
+@pytest.mark.integration
+def test_lambda_handler_uses_sources_mode(monkeypatch):
+    calls = []
+    monkeypatch.setenv("INGEST_MODE", "sources")
+    monkeypatch.setattr(scheduler, "main", lambda: calls.append("sources"))
+    monkeypatch.setattr(run_ingest, "main", lambda: calls.append("sync"))
+
+    assert lambda_handler.handler({}, None)["statusCode"] == 200
+    assert calls == ["sources"]
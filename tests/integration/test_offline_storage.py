@@ -0,0 +1,52 @@
+# tests/integration/test_offline_storage.py
+import io
+
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest import async_ingest, run_ingest
+from tax_bracket_ingest.storage import s3 as s3_clients
+from tax_bracket_ingest.storage.local import LocalStorage
+from tax_bracket_ingest.storage.manifest import Manifest
+
+
+@pytest.fixture(params=["local", "memory"])
+def offline_storage(request, monkeypatch, tmp_path):
+    monkeypatch.setenv("STORAGE_BACKEND", request.param)
+    monkeypatch.setenv("STORAGE_ROOT", str(tmp_path))
+    monkeypatch.delenv("S3_BUCKET")
+    monkeypatch.setattr(s3_clients, "get_s3_client", lambda *a, **k: pytest.fail("S3 must not be used"))
+    return run_ingest.get_storage()
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("entry", [run_ingest.main, async_ingest.main])
+@pytest.mark.parametrize("chunk_rows", ["0", "3"])
+def test_pipeline_runs_against_offline_storage(offline_storage, sample_normalized_csv_bytes, monkeypatch,
+                                               entry, chunk_rows):
+    monkeypatch.setenv("HISTORY_CHUNK_ROWS", chunk_rows)
+    offline_storage.write("history.csv", sample_normalized_csv_bytes)
+
+    entry()
+
+    hist = pd.read_csv(io.BytesIO(offline_storage.read("history.csv")))
+    assert hist["Year"].tolist() == [2024] * 7 + [2023] * 7
+    manifest = Manifest.from_json(offline_storage.read("history.manifest.json"))
+    assert manifest.to_json() == Manifest.from_history(hist).to_json()
+    if isinstance(offline_storage, LocalStorage):
+        assert offline_storage.list() == ["history.csv", "history.manifest.json"]
+
+
+@pytest.mark.integration
+def test_parquet_history_on_offline_storage(offline_storage, sample_normalized_df, monkeypatch):
+    pytest.importorskip("pyarrow")
+    from tax_bracket_ingest.storage import parquet as store
+
+    monkeypatch.setenv("HISTORY_FORMAT", "parquet")
+    run_ingest.get_ingest_config.cache_clear()
+    store.write_partitions(offline_storage, "history/", sample_normalized_df)
+
+    run_ingest.main()
+
+    assert store.list_partition_years(offline_storage, "history/") == [2023, 2024]
+    pd.testing.assert_frame_equal(store.read_partition(offline_storage, "history/", 2023), sample_normalized_df)
@@ -0,0 +1,39 @@
+# tests/integration/test_parquet_history.py
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.storage import parquet as store
+from tax_bracket_ingest.storage.s3 import S3Storage
+
+
+@pytest.mark.integration
+def test_main_reads_and_writes_only_the_scraped_year(moto_s3_client, sample_normalized_df, monkeypatch):
+    monkeypatch.setenv("HISTORY_FORMAT", "parquet")
+    monkeypatch.setenv("HISTORY_CSV_EXPORT", "1")
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    store.write_partitions(S3Storage("test-bucket", moto_s3_client), "history/", sample_normalized_df)
+    old_partition = moto_s3_client.head_object(Bucket="test-bucket", Key="history/Year=2023/part-0.parquet")
+
+    monkeypatch.setattr(run_ingest, "read_csv_from_s3", lambda *a, **k: pytest.fail("CSV history must not be read"))
+    run_ingest.main()
+
+    assert store.list_partition_years(S3Storage("test-bucket", moto_s3_client), "history/") == [2023, 2024]
+    untouched = moto_s3_client.head_object(Bucket="test-bucket", Key="history/Year=2023/part-0.parquet")
+    assert untouched["ETag"] == old_partition["ETag"]
+    assert untouched["LastModified"] == old_partition["LastModified"]
+
+    exported = pd.read_csv(moto_s3_client.get_object(Bucket="test-bucket", Key="history.csv")["Body"])
+    assert exported["Year"].tolist() == [2024] * 7 + [2023] * 7
+
+
+@pytest.mark.integration
+def test_main_skips_write_when_partition_unchanged(moto_s3_client, monkeypatch):
+    monkeypatch.setenv("HISTORY_FORMAT", "parquet")
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+
+    run_ingest.main()
+    monkeypatch.setattr("tax_bracket_ingest.storage.parquet.write_partitions", lambda *a, **k: pytest.fail("rewrote partition"))
+    run_ingest.main()
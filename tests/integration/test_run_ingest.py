@@ -60,3 +60,21 @@ def test_run_ingest_end_to_end(
         old_df.reset_index(drop=True),
         check_dtype=False
     )
+
+
+@pytest.mark.integration
+def test_ingest_complete_carries_stage_summary(moto_s3_client, sample_normalized_csv_bytes, caplog):
+    import logging
+
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    moto_s3_client.put_object(Bucket="test-bucket", Key="history.csv", Body=sample_normalized_csv_bytes)
+    caplog.set_level(logging.INFO)
+
+    run_ingest_main()
+
+    complete = next(r for r in caplog.records if r.getMessage() == "ingest_complete")
+    stages = complete.stages
+    assert {"parse_irs_brackets", "process_irs_dataframe", "read_csv_from_s3", "write_df_to_s3"} <= set(stages)
+    assert stages["read_csv_from_s3"]["bytes_in"] == len(sample_normalized_csv_bytes)
+    assert stages["write_df_to_s3"]["bytes_out"] > len(sample_normalized_csv_bytes)
+    assert stages["process_irs_dataframe"]["bytes_out"] > 0
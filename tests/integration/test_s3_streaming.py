@@ -0,0 +1,93 @@
+# tests/integration/test_s3_streaming.py
+import logging
+import tracemalloc
+
+import moto.s3.models
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.storage import multipart
+from tax_bracket_ingest.storage.base import write_csv
+from tax_bracket_ingest.storage.multipart import MultipartWriter
+from tax_bracket_ingest.storage.s3 import S3Storage, get_s3_client
+
+
+def bracket_history(rows: int) -> pd.DataFrame:
+    amounts = [f"${i * 37:,}" for i in range(rows)]
+    return pd.DataFrame({
+        "Year": [2024 - i // 7 for i in range(rows)],
+        **{col: amounts for col in ("Tax Rate", "Single Start", "Single End", "MFJ Start", "MFJ End")},
+    })
+
+
+@pytest.fixture
+def bucket(moto_s3_client):
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    return moto_s3_client
+
+
+def _count_calls(client, operation):
+    calls = []
+    client.meta.events.register(f"before-call.s3.{operation}", lambda **kw: calls.append(1))
+    return calls
+
+
+@pytest.mark.integration
+def test_large_history_round_trips_through_multipart_upload(bucket, monkeypatch):
+    monkeypatch.setenv("S3_MULTIPART_PART_BYTES", str(multipart.MIN_PART_BYTES))
+    hist = bracket_history(250_000)
+    parts = _count_calls(get_s3_client(), "UploadPart")
+    puts = _count_calls(get_s3_client(), "PutObject")
+
+    run_ingest.write_df_to_s3(hist, "history.csv")
+    stored = run_ingest.read_csv_from_s3("history.csv")
+
+    assert len(parts) >= 2
+    assert puts == []
+    pd.testing.assert_frame_equal(stored, hist)
+
+
+@pytest.mark.integration
+def test_failed_serialization_leaves_no_object_or_parts(bucket):
+    with pytest.raises(RuntimeError):
+        with MultipartWriter(bucket, "test-bucket", "history.csv", part_bytes=multipart.MIN_PART_BYTES) as writer:
+            writer.write(b"x" * (multipart.MIN_PART_BYTES + 1))
+            raise RuntimeError("serializer failed")
+
+    assert "Uploads" not in bucket.list_multipart_uploads(Bucket="test-bucket")
+    assert "Contents" not in bucket.list_objects_v2(Bucket="test-bucket")
+
+
+@pytest.mark.integration
+def test_upload_memory_stays_flat_as_history_grows(bucket, monkeypatch, caplog):
+    # Small parts keep the test fast; moto spools stored parts to disk so only
+    # the client side is measured. moto handles each request in-process, so
+    # memory is sampled between S3 calls, not inside them.
+    caplog.set_level(logging.WARNING)  # captured botocore debug records would hold request bodies
+    caplog.set_level(logging.WARNING, logger="botocore")
+    monkeypatch.setattr(moto.s3.models, "S3_UPLOAD_PART_MIN_SIZE", 1024)
+    monkeypatch.setenv("MOTO_S3_DEFAULT_KEY_BUFFER_SIZE", "1024")
+    storage = S3Storage("test-bucket", bucket, part_bytes=256 * 1024)
+    peak = [0]
+    bucket.meta.events.register(
+        "before-call.s3.*", lambda **kw: peak.__setitem__(0, max(peak[0], tracemalloc.get_traced_memory()[1]))
+    )
+    bucket.meta.events.register("after-call.s3.*", lambda **kw: tracemalloc.reset_peak())
+
+    def upload_peak(hist):
+        peak[0] = 0
+        tracemalloc.start()
+        try:
+            size = write_csv(storage, "history.csv", hist)
+        finally:
+            tracemalloc.stop()
+        return size, peak[0]
+
+    small_size, small_peak = upload_peak(bracket_history(30_000))
+    large_size, large_peak = upload_peak(bracket_history(120_000))
+
+    # A buffered upload holds the whole CSV, so its peak grows with every extra byte
+    assert large_size > 3 * small_size
+    assert large_peak - small_peak < (large_size - small_size) / 4
+    assert large_peak < large_size
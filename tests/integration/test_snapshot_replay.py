@@ -0,0 +1,72 @@
+# tests/integration/test_snapshot_replay.py
+import io
+
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest import async_ingest, backfill, run_ingest
+from tax_bracket_ingest.backfill import BackfillSource, run_backfill
+
+
+def fail(*_args, **_kwargs):
+    pytest.fail("stage ran although the snapshot cache had its result")
+
+
+@pytest.fixture
+def memory_history(monkeypatch, sample_normalized_csv_bytes):
+    monkeypatch.setenv("STORAGE_BACKEND", "memory")
+    storage = run_ingest.get_storage()
+    storage.write("history.csv", sample_normalized_csv_bytes)
+    return storage
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("entry", [run_ingest.main, async_ingest.main])
+@pytest.mark.parametrize("cache_env", ["SNAPSHOT_CACHE_DIR", "SNAPSHOT_CACHE_PREFIX"])
+def test_replay_skips_fetch_and_parse(memory_history, sample_normalized_csv_bytes, monkeypatch, tmp_path,
+                                      entry, cache_env):
+    monkeypatch.setenv(cache_env, str(tmp_path) if cache_env == "SNAPSHOT_CACHE_DIR" else "snapshots/")
+    entry()
+    first = memory_history.read("history.csv")
+
+    memory_history.write("history.csv", sample_normalized_csv_bytes)
+    memory_history.delete("history.manifest.json")
+    monkeypatch.setenv("SNAPSHOT_REPLAY", "1")
+    monkeypatch.setattr(run_ingest, "fetch_irs_data", fail)
+    monkeypatch.setattr("tax_bracket_ingest.parser.parser.parse_irs_brackets", fail)
+    entry()
+
+    assert memory_history.read("history.csv") == first
+    hist = pd.read_csv(io.BytesIO(first))
+    assert hist["Year"].tolist() == [2024] * 7 + [2023] * 7
+
+
+@pytest.mark.integration
+def test_replay_without_archived_page_fetches(memory_history, monkeypatch, tmp_path):
+    monkeypatch.setenv("SNAPSHOT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("SNAPSHOT_REPLAY", "1")
+
+    run_ingest.main()
+
+    cache = run_ingest.get_snapshot_cache(run_ingest.get_ingest_config())
+    assert cache.html_for_url(run_ingest.IRS_URL) is not None
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("parse_workers", [1, 2])
+def test_backfill_replay_skips_fetch_and_parse(memory_history, sample_page_html, http_stand_in, monkeypatch,
+                                               tmp_path, parse_workers):
+    monkeypatch.setenv("SNAPSHOT_CACHE_DIR", str(tmp_path / "snapshots"))
+    page_2022 = tmp_path / "2022.html"
+    page_2022.write_bytes(sample_page_html.replace(b"2024", b"2022"))
+    http_stand_in.routes[("GET", "/2024")] = lambda handler, body: (200, {}, sample_page_html)
+    sources = [BackfillSource(2022, str(page_2022)), BackfillSource(2024, http_stand_in.url + "/2024")]
+
+    first = run_backfill(sources, parse_workers=parse_workers)
+    assert len(http_stand_in.requests) == 1
+
+    monkeypatch.setattr(backfill, "fetch", fail)
+    monkeypatch.setattr("tax_bracket_ingest.parser.parser.parse_irs_brackets", fail)
+    again = run_backfill(sources, parse_workers=parse_workers)
+
+    pd.testing.assert_frame_equal(again, first)
@@ -0,0 +1,93 @@
+# tests/integration/test_stream_upload.py
+import gzip
+import io
+
+import pandas as pd
+import pytest
+import zstandard
+
+from tax_bracket_ingest.backend import upload
+from tax_bracket_ingest.run_ingest import push_csv_to_backend
+
+UPLOAD = "/api/v1/tax/upload"
+
+
+@pytest.fixture
+def backend(http_stand_in, monkeypatch):
+    """Stand-in backend whose advertised codings are set per test via ``server.accepts``."""
+    http_stand_in.accepts = None
+    http_stand_in.reject_compressed = False
+
+    def options(_handler, _body):
+        headers = {"Accept-Encoding": http_stand_in.accepts} if http_stand_in.accepts else {}
+        return 204, headers, b""
+
+    def post(handler, _body):
+        if http_stand_in.reject_compressed and handler.headers.get("Content-Encoding"):
+            return 415, {"Accept-Encoding": "identity"}, b"unsupported"
+        return 200, {"Content-Type": "application/json"}, b'{"status": "ok"}'
+
+    http_stand_in.routes[("OPTIONS", UPLOAD)] = options
+    http_stand_in.routes[("POST", UPLOAD)] = post
+    monkeypatch.setenv("BACKEND_URL", http_stand_in.url)
+    monkeypatch.setenv("BACKEND_STREAM_UPLOAD", "1")
+    monkeypatch.setenv("BACKEND_UPLOAD_CHUNK_ROWS", "500")
+    upload.reset_negotiated()
+    yield http_stand_in
+    upload.reset_negotiated()
+
+
+@pytest.fixture
+def large_df(sample_normalized_df):
+    return pd.concat([sample_normalized_df] * 1000, ignore_index=True)
+
+
+def _decode(request):
+    encoding = request["headers"].get("Content-Encoding")
+    if encoding == "gzip":
+        return gzip.decompress(request["body"])
+    if encoding == "zstd":
+        return zstandard.ZstdDecompressor().stream_reader(io.BytesIO(request["body"])).read()
+    return request["body"]
+
+
+def _posts(server):
+    return [r for r in server.requests if r["method"] == "POST"]
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("accepts, expected", [("zstd, gzip", "zstd"), ("gzip", "gzip")])
+def test_streams_compressed_chunks(backend, large_df, accepts, expected):
+    backend.accepts = accepts
+
+    assert push_csv_to_backend(large_df, dry_run=False) == '{"status": "ok"}'
+
+    (post,) = _posts(backend)
+    assert post["headers"]["Content-Encoding"] == expected
+    assert post["headers"]["Transfer-Encoding"] == "chunked"
+    assert post["chunks"] > 1
+    assert len(post["body"]) < len(large_df.to_csv(index=False)) / 5
+    assert _decode(post) == large_df.to_csv(index=False).encode("utf-8")
+
+
+@pytest.mark.integration
+def test_falls_back_to_buffered_post_without_advertised_codings(backend, large_df):
+    push_csv_to_backend(large_df, dry_run=False)
+
+    (post,) = _posts(backend)
+    assert "Content-Encoding" not in post["headers"]
+    assert int(post["headers"]["Content-Length"]) == len(post["body"])
+    assert post["body"] == large_df.to_csv(index=False).encode("utf-8")
+
+
+@pytest.mark.integration
+def test_415_resends_uncompressed_and_remembers(backend, sample_normalized_df):
+    backend.accepts = "gzip"
+    backend.reject_compressed = True
+
+    assert push_csv_to_backend(sample_normalized_df, dry_run=False) == '{"status": "ok"}'
+    push_csv_to_backend(sample_normalized_df, dry_run=False)
+
+    encodings = [p["headers"].get("Content-Encoding") for p in _posts(backend)]
+    assert encodings == ["gzip", None, None]
+    assert sum(r["method"] == "OPTIONS" for r in backend.requests) == 1
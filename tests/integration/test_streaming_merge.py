@@ -0,0 +1,42 @@
+# tests/integration/test_streaming_merge.py
+import pytest
+
+from tax_bracket_ingest import async_ingest, run_ingest
+
+
+@pytest.fixture
+def seeded_bucket(moto_s3_client, sample_normalized_csv_bytes):
+    moto_s3_client.create_bucket(Bucket="test-bucket")
+    moto_s3_client.put_object(Bucket="test-bucket", Key="history.csv", Body=sample_normalized_csv_bytes)
+    return moto_s3_client
+
+
+def _read(client, key):
+    return client.get_object(Bucket="test-bucket", Key=key)["Body"].read()
+
+
+def _reseed(client, body):
+    client.put_object(Bucket="test-bucket", Key="history.csv", Body=body)
+    client.delete_object(Bucket="test-bucket", Key="history.manifest.json")
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("entry", [run_ingest.main, async_ingest.main])
+def test_streaming_merge_writes_same_history_as_in_memory(seeded_bucket, sample_normalized_csv_bytes,
+                                                          monkeypatch, entry):
+    entry()
+    in_memory = _read(seeded_bucket, "history.csv"), _read(seeded_bucket, "history.manifest.json")
+
+    _reseed(seeded_bucket, sample_normalized_csv_bytes)
+    monkeypatch.setenv("HISTORY_CHUNK_ROWS", "3")
+    monkeypatch.setattr(run_ingest, "read_csv_from_s3", lambda *a, **k: pytest.fail("history loaded whole"))
+    entry()
+
+    assert (_read(seeded_bucket, "history.csv"), _read(seeded_bucket, "history.manifest.json")) == in_memory
+
+
+
+def test_negative_chunk_rows_rejected(monkeypatch):
+    monkeypatch.setenv("HISTORY_CHUNK_ROWS", "-1")
+    with pytest.raises(ValueError):
+        run_ingest.get_history_chunk_rows()
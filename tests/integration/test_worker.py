@@ -0,0 +1,182 @@
+# tests/integration/test_worker.py
+import io
+import json
+import os
+import signal
+import threading
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.storage import dataset
+from tax_bracket_ingest.worker import service
+from tax_bracket_ingest.worker.jobs import IngestJob, MemoryJobQueue, SQLiteJobQueue
+from tax_bracket_ingest.worker.runner import JobRunner
+from tax_bracket_ingest.worker.service import Worker
+from tax_bracket_ingest.worker.status import start_status_server
+
+
+def wait_for(predicate, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for the worker"
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def memory_history(monkeypatch, sample_normalized_csv_bytes):
+    monkeypatch.setenv("STORAGE_BACKEND", "memory")
+    storage = run_ingest.get_storage()
+    storage.write("history.csv", sample_normalized_csv_bytes)
+    return storage
+
+
+@pytest.fixture
+def running_worker(memory_history):
+    worker = Worker(MemoryJobQueue(retry_delay=0), concurrency=2, poll_interval=0.05)
+    worker.start()
+    server = start_status_server(worker, "127.0.0.1", 0)
+    yield worker, server.url
+    worker.stop(timeout=5)
+    server.shutdown()
+    server.server_close()
+
+
+def submit(url, body):
+    resp = requests.post(url + "/jobs", json=body, timeout=5)
+    assert resp.status_code == 202, resp.text
+    return resp.json()["id"]
+
+
+def job_status(url, job_id):
+    return requests.get(f"{url}/jobs/{job_id}", timeout=5).json()["status"]
+
+
+@pytest.mark.integration
+def test_worker_runs_each_kind_of_job_concurrently(running_worker, memory_history, sample_page_html, tmp_path,
+                                                   monkeypatch):
+    worker, url = running_worker
+    page_2022 = tmp_path / "2022.html"
+    page_2022.write_bytes(sample_page_html.replace(b"2024", b"2022"))
+    sources_file = tmp_path / "sources.json"
+    sources_file.write_text(json.dumps([{"name": "co", "url": "https://tax.example.gov/co", "jurisdiction": "CO"}]))
+    monkeypatch.setenv("SOURCES_FILE", str(sources_file))
+
+    ids = [
+        submit(url, {"source": "irs"}),
+        submit(url, {"source": str(page_2022), "year": 2022}),
+        submit(url, {"source": "irs"}),
+        submit(url, {"source": "co"}),
+    ]
+    wait_for(lambda: all(job_status(url, job_id) == "done" for job_id in ids))
+
+    hist = pd.read_csv(io.BytesIO(memory_history.read("history.csv")))
+    assert hist.groupby("Year").size().to_dict() == {2022: 7, 2023: 7, 2024: 7}
+    assert dataset.list_partitions(memory_history, "brackets/") == [("CO", 2024)]
+
+    metrics = requests.get(url + "/metrics", timeout=5).text
+    assert 'ingest_worker_jobs_total{outcome="succeeded"} 4' in metrics
+    assert 'ingest_worker_stage_calls_total{stage="parse_irs_brackets"}' in metrics
+    assert "ingest_worker_queue_depth 0" in metrics
+    health = requests.get(url + "/healthz", timeout=5)
+    assert health.status_code == 200 and health.json()["status"] == "ok"
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("push, posts", [(None, 1), (False, 0)])
+def test_archive_job_push_defaults_to_the_environment(memory_history, http_stand_in, sample_page_html, tmp_path,
+                                                     monkeypatch, push, posts):
+    monkeypatch.setenv("ENABLE_BACKEND_PUSH", "1")
+    monkeypatch.setenv("BACKEND_URL", http_stand_in.url)
+    http_stand_in.routes[("POST", "/api/v1/tax/upload")] = lambda handler, body: (
+        200, {"Content-Type": "application/json"}, b'{"status": "ok"}'
+    )
+    page_2022 = tmp_path / "2022.html"
+    page_2022.write_bytes(sample_page_html.replace(b"2024", b"2022"))
+
+    JobRunner().run(IngestJob(str(page_2022), year=2022, dry_run=False, push=push))
+
+    assert len(http_stand_in.requests) == posts
+
+
+@pytest.mark.integration
+def test_bad_jobs_are_rejected_or_failed_without_retry(running_worker):
+    worker, url = running_worker
+
+    assert requests.post(url + "/jobs", data=b"{not json", timeout=5).status_code == 400
+    assert requests.post(url + "/jobs", json={"source": "irs", "year": 2020}, timeout=5).status_code == 400
+    job_id = submit(url, {"source": "no-such-source"})
+    wait_for(lambda: job_status(url, job_id) == "failed")
+
+    assert worker.stats.snapshot()["jobs"] == {"succeeded": 0, "retried": 0, "failed": 1}
+    assert requests.get(url + "/jobs/unknown", timeout=5).status_code == 404
+
+
+@pytest.mark.integration
+def test_transient_failures_are_retried(running_worker, sample_page_html, monkeypatch):
+    worker, url = running_worker
+    calls = []
+
+    def flaky_fetch():
+        calls.append(1)
+        if len(calls) == 1:
+            raise requests.ConnectionError("connection reset")
+        return sample_page_html
+
+    monkeypatch.setattr(run_ingest, "fetch_irs_data", flaky_fetch)
+    job_id = submit(url, {"source": "irs", "dry_run": True})
+    wait_for(lambda: job_status(url, job_id) == "done")
+
+    assert len(calls) == 2
+    assert worker.stats.snapshot()["jobs"] == {"succeeded": 1, "retried": 1, "failed": 0}
+
+
+@pytest.mark.integration
+def test_sigterm_drains_the_running_job(memory_history, sample_page_html, monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_fetch():
+        entered.set()
+        assert release.wait(5)
+        return sample_page_html
+
+    monkeypatch.setattr(run_ingest, "fetch_irs_data", slow_fetch)
+    queue = MemoryJobQueue()
+    worker = Worker(queue, concurrency=1, poll_interval=0.05)
+    job, queued = IngestJob(), IngestJob()
+    queue.put(job)
+    health = {}
+
+    def terminate_mid_job():
+        assert entered.wait(5)
+        queue.put(queued)
+        os.kill(os.getpid(), signal.SIGTERM)
+        wait_for(lambda: worker.draining)
+        health["while_draining"] = worker.health()
+        release.set()
+
+    threading.Thread(target=terminate_mid_job, daemon=True).start()
+    assert service.serve(worker, None, shutdown_timeout=5) is True
+
+    assert health["while_draining"][0] == 503 and health["while_draining"][1]["status"] == "draining"
+    assert queue.status(job.id) == "done"
+    assert queue.status(queued.id) == "pending"  # left for the next worker
+    assert 2024 in pd.read_csv(io.BytesIO(memory_history.read("history.csv")))["Year"].tolist()
+
+
+@pytest.mark.integration
+def test_enqueue_command_writes_to_the_sqlite_queue(tmp_path, monkeypatch):
+    path = tmp_path / "jobs.sqlite3"
+    monkeypatch.setenv("WORKER_QUEUE", "sqlite")
+    monkeypatch.setenv("WORKER_QUEUE_PATH", str(path))
+
+    job_id = service.main(["enqueue", "--source", "archive/2021.html", "--year", "2021", "--no-dry-run", "--push"])
+
+    job = SQLiteJobQueue(str(path)).take(0)
+    assert job == IngestJob("archive/2021.html", year=2021, dry_run=False, push=True, id=job_id, attempts=1)
+    monkeypatch.setenv("WORKER_QUEUE", "memory")
+    with pytest.raises(ValueError, match="POST /jobs"):
+        service.main(["enqueue"])
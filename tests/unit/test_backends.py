@@ -0,0 +1,36 @@
+# tests/unit/test_backends.py
+import pytest
+
+from tax_bracket_ingest.parser import backends
+from tax_bracket_ingest.parser.backends import available_backends, get_backend
+from tax_bracket_ingest.parser.parser import parse_irs_data
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backends_return_same_shape(sample_page_html, name):
+    expected = parse_irs_data(sample_page_html, backend="html.parser")
+    assert parse_irs_data(sample_page_html.decode("utf-8"), backend=name) == expected
+
+
+def test_default_backend_is_fastest_installed():
+    assert get_backend().name == available_backends()[0]
+    assert "html.parser" in available_backends()
+
+
+def test_env_var_overrides_default(monkeypatch):
+    monkeypatch.setenv(backends.PARSER_BACKEND_ENV, "html.parser")
+    assert get_backend().name == "html.parser"
+
+
+def test_unknown_backend_raises(monkeypatch):
+    monkeypatch.setenv(backends.PARSER_BACKEND_ENV, "html5lib")
+    with pytest.raises(ValueError, match="Unknown parser backend"):
+        get_backend()
+
+
+def test_uninstalled_backend_raises(monkeypatch):
+    monkeypatch.setitem(
+        backends.BACKENDS, "lxml", backends.ParserBackend("lxml", "not_a_real_module", None)
+    )
+    with pytest.raises(ValueError, match="requires"):
+        get_backend("lxml")
@@ -0,0 +1,71 @@
+# tests/unit/test_benchmark_compare.py
+import json
+
+import pytest
+
+from benchmarks import compare
+from benchmarks.synthetic import synthetic_history, synthetic_page
+from tax_bracket_ingest.parser.normalize import process_irs_dataframe
+from tax_bracket_ingest.parser.parser import parse_irs_data, parse_irs_data_to_dataframe
+
+
+def report(**timings):
+    return {
+        "machine_info": {"python_version": "3.11.7", "cpu": {"brand_raw": "test"}},
+        "benchmarks": [{"name": name, "stats": {"median": value}} for name, value in timings.items()],
+    }
+
+
+def test_timings_are_normalized_by_calibration():
+    assert compare.relative_timings(report(test_calibration=2.0, test_parse=1.0)) == {"test_parse": 0.5}
+    with pytest.raises(ValueError):
+        compare.relative_timings(report(test_parse=1.0))
+
+
+def test_main_flags_only_regressions_beyond_threshold(tmp_path, capsys):
+    baseline, current = tmp_path / "baseline.json", tmp_path / "current.json"
+    baseline.write_text(json.dumps(compare.build_baseline([report(test_calibration=1.0, a=1.0, b=1.0)])))
+
+    # A machine twice as slow: calibration doubles too, so only ``b`` regressed
+    current.write_text(json.dumps(report(test_calibration=2.0, a=2.4, b=3.2, new=1.0)))
+
+    assert compare.main([str(current), "--baseline", str(baseline), "--threshold", "0.5"]) == 1
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines if "REGRESSION" in line] == ["b"]
+    assert compare.main([str(current), "--baseline", str(baseline), "--threshold", "0.7"]) == 0
+
+
+def test_one_slow_run_or_a_tiny_benchmark_does_not_fail(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(compare.build_baseline([report(test_calibration=1.0, big=1.0, tiny=0.01)])))
+    runs = []
+    for i, big in enumerate((1.0, 2.3, 1.1)):
+        runs.append(tmp_path / f"run{i}.json")
+        runs[-1].write_text(json.dumps(report(test_calibration=1.0, big=big, tiny=0.03)))
+
+    assert compare.main([*map(str, runs), "--baseline", str(baseline)]) == 0
+    assert "tiny" in next(line for line in capsys.readouterr().out.splitlines() if "(not gated)" in line)
+    assert compare.main([*map(str, runs), "--baseline", str(baseline), "--min-baseline", "0"]) == 1
+
+
+def test_update_writes_median_of_runs_as_baseline(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    runs = []
+    for i, a in enumerate((1.0, 3.0, 1.2)):
+        runs.append(tmp_path / f"run{i}.json")
+        runs[-1].write_text(json.dumps(report(test_calibration=4.0, a=a)))
+
+    assert compare.main([*map(str, runs), "--baseline", str(baseline), "--update"]) == 0
+    assert json.loads(baseline.read_text())["benchmarks"] == {"a": 0.3}
+
+
+@pytest.mark.parametrize("statuses,brackets", [(1, 7), (4, 7), (4, 40)])
+def test_synthetic_page_normalizes_like_synthetic_history(statuses, brackets):
+    html = synthetic_page(2024, statuses=statuses, brackets=brackets, page_bytes=64 * 1024)
+    df = process_irs_dataframe(parse_irs_data_to_dataframe(parse_irs_data(html)))
+
+    assert len(html) >= 64 * 1024
+    assert len(df) == brackets
+    if statuses == 4:
+        expected = synthetic_history(3, first_year=2024, brackets=brackets)
+        assert df.equals(expected[expected["Year"] == 2024].reset_index(drop=True))
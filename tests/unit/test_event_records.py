@@ -0,0 +1,51 @@
+# tests/unit/test_event_records.py
+import json
+
+import pytest
+
+from tax_bracket_ingest.worker.events import jobs_from_record, record_id, year_from_key
+from tax_bracket_ingest.worker.jobs import IngestJob
+
+
+def s3_record(key, bucket="archive-bucket"):
+    return {"eventSource": "aws:s3", "s3": {"bucket": {"name": bucket}, "object": {"key": key}}}
+
+
+def sqs_record(body, message_id="m-1"):
+    return {"eventSource": "aws:sqs", "messageId": message_id, "body": json.dumps(body)}
+
+
+def test_sqs_message_carries_job_and_flags():
+    [job] = jobs_from_record(sqs_record({"source": "irs", "dry_run": False, "push": True, "id": "j-1"}))
+
+    assert job == IngestJob("irs", dry_run=False, push=True, id="j-1")
+
+
+def test_s3_notifications_become_archive_jobs_directly_or_through_sqs():
+    direct = jobs_from_record(s3_record("irs/tax+year+2021.html"))
+    wrapped = jobs_from_record(sqs_record({"Records": [s3_record("2019/irs.html"), s3_record("irs/2020.html")]}))
+
+    assert [(job.source, job.year) for job in direct] == [("s3://archive-bucket/irs/tax year 2021.html", 2021)]
+    assert [job.year for job in wrapped] == [2019, 2020]
+    assert jobs_from_record(sqs_record({"Service": "Amazon S3", "Event": "s3:TestEvent"})) == []
+    assert record_id(s3_record("irs/2021.html")) == "archive-bucket/irs/2021.html"
+
+
+@pytest.mark.parametrize("key, year", [
+    ("archive/2021.html", 2021),
+    ("irs/2018/page-20240401.html", 2018),
+    ("y1999/2003/irs.html", 2003),
+])
+def test_year_from_key(key, year):
+    assert year_from_key(key) == year
+
+
+@pytest.mark.parametrize("record, message", [
+    (s3_record("irs/latest.html"), "No tax year"),
+    ({"eventSource": "aws:sqs", "messageId": "m"}, "no JSON body"),
+    (sqs_record({"source": "irs", "retries": 3}), "Unknown job fields"),
+    ({"eventSource": "aws:sns"}, "Unsupported event source"),
+])
+def test_malformed_records_are_rejected(record, message):
+    with pytest.raises(ValueError, match=message):
+        jobs_from_record(record)
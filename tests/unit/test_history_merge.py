@@ -0,0 +1,83 @@
+# tests/unit/test_history_merge.py
+import tracemalloc
+
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest.storage import merge
+from tax_bracket_ingest.storage.local import LocalStorage
+from tax_bracket_ingest.storage.manifest import Manifest
+
+
+def chunked(df: pd.DataFrame, rows: int):
+    return (df.iloc[start:start + rows] for start in range(0, len(df), rows))
+
+
+@pytest.fixture
+def history(sample_normalized_df):
+    return pd.concat(
+        [sample_normalized_df.assign(Year=year) for year in (2023, 2022, 2021)], ignore_index=True
+    )
+
+
+def test_replace_years_prepends_and_drops_replaced_year(history, sample_normalized_df):
+    revised = sample_normalized_df.assign(Year=2022)
+    revised["MFJ Range Start"] = "$1"
+
+    merged = pd.concat(list(merge.replace_years(revised, chunked(history, 4))), ignore_index=True)
+
+    assert merged["Year"].tolist() == [2022] * 7 + [2023] * 7 + [2021] * 7
+    assert (merged.loc[merged["Year"] == 2022, "MFJ Range Start"] == "$1").all()
+
+
+def test_scan_history_matches_in_memory_manifest(history):
+    manifest, rows = merge.scan_history(chunked(history, 5), 2022)
+
+    assert manifest.to_json() == Manifest.from_history(history).to_json()
+    pd.testing.assert_frame_equal(rows, history[history["Year"] == 2022].reset_index(drop=True))
+    assert merge.scan_history(chunked(history, 5), 2030)[1] is None
+
+
+def test_scan_history_rejects_split_year(history):
+    shuffled = pd.concat([history.iloc[:3], history.iloc[7:], history.iloc[3:7]], ignore_index=True)
+    with pytest.raises(ValueError, match="2023"):
+        merge.scan_history(chunked(shuffled, 4), 2023)
+
+
+def test_streamed_merge_is_lossless(tmp_path, history, sample_normalized_df):
+    path = tmp_path / "history.csv"
+    history.to_csv(path, index=False)
+    path.write_text(path.read_text().replace("$0", "0"))  # numeric-looking cells in some chunks only
+    store = LocalStorage(tmp_path)
+
+    chunks = merge.iter_history_chunks(store, "history.csv", chunk_rows=3)
+    rows, size = merge.write_csv_frames(store, "out.csv", merge.replace_years(history.iloc[:0], chunks))
+
+    assert rows == len(history)
+    assert store.read("out.csv") == path.read_bytes()
+    assert size == path.stat().st_size
+
+
+def test_merge_memory_is_bounded_by_chunk_not_history(tmp_path, sample_normalized_df):
+    def peak_for(years):
+        path = tmp_path / f"history-{years}.csv"
+        pd.concat(
+            [sample_normalized_df.assign(Year=3000 - i) for i in range(years)], ignore_index=True
+        ).to_csv(path, index=False)
+        store = LocalStorage(tmp_path)
+        tracemalloc.start()
+        try:
+            chunks = merge.iter_history_chunks(store, path.name, chunk_rows=500)
+            merge.write_csv_frames(
+                store, f"merged-{years}.csv",
+                merge.replace_years(sample_normalized_df.assign(Year=3001), chunks),
+            )
+            return path.stat().st_size, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    small_size, small_peak = peak_for(500)
+    large_size, large_peak = peak_for(2000)
+
+    assert large_size > 3 * small_size
+    assert large_peak - small_peak < (large_size - small_size) / 4
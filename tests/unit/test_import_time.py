@@ -0,0 +1,86 @@
+# tests/unit/test_import_time.py
+"""Cold-start guard: fails when importing the Lambda entry point gets heavier.
+
+Uses ``python -X importtime`` in a fresh interpreter, so the result does not
+depend on what the test session has already imported.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+HEAVY_MODULES = {"pandas", "numpy", "boto3", "botocore", "requests", "bs4", "pyarrow", "lxml", "selectolax"}
+# Generous: measured ~25ms locally, against ~780ms before imports were deferred
+LAMBDA_HANDLER_BUDGET_MS = 150
+
+
+def _run(code: str, importtime: bool = False, env=None) -> subprocess.CompletedProcess:
+    args = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    return subprocess.run(
+        args, cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, **(env or {})},
+    )
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Map each imported module to its cumulative import time in microseconds."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+
+def _top_level(modules) -> set:
+    return {name.split(".")[0] for name in modules}
+
+
+def test_parse_importtime():
+    sample = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   posixpath\n"
+        "import time:       553 |     775688 | lambda_handler\n"
+    )
+    assert parse_importtime(sample) == {"posixpath": 120, "lambda_handler": 775688}
+
+
+def test_lambda_handler_import_stays_light():
+    modules = parse_importtime(_run("import lambda_handler", importtime=True).stderr)
+
+    assert not HEAVY_MODULES & _top_level(modules)
+    assert modules["lambda_handler"] / 1000 < LAMBDA_HANDLER_BUDGET_MS
+
+
+@pytest.mark.parametrize("module", ["tax_bracket_ingest.run_ingest", "tax_bracket_ingest.async_ingest"])
+def test_ingest_entry_points_defer_heavy_libraries(module):
+    modules = parse_importtime(_run(f"import {module}", importtime=True).stderr)
+
+    assert not HEAVY_MODULES & _top_level(modules)
+
+
+@pytest.mark.parametrize("module", ["tax_bracket_ingest.run_ingest", "lambda_handler"])
+def test_import_has_no_side_effects(module, tmp_path):
+    result = _run(
+        f"import logging, {module}; print(logging.getLogger().handlers)",
+        env={"LOG_PATH": str(tmp_path / "ingest.log"), "LOG_TO_FILE": "1"},
+    )
+    assert result.stdout.strip() == "[]"
+    assert not (tmp_path / "ingest.log").exists()
+
+
+def test_dry_run_never_loads_boto3():
+    page = REPO_ROOT / "tests" / "data" / "sample_page.html"
+    code = (
+        "import sys\n"
+        "from tax_bracket_ingest import run_ingest\n"
+        f"run_ingest.fetch_irs_data = lambda: open({str(page)!r}, 'rb').read()\n"
+        "run_ingest.main()\n"
+        "print(sorted({'boto3', 'botocore', 'bs4'} & set(sys.modules)))\n"
+    )
+    result = _run(code, env={"DRY_RUN": "1", "ENABLE_BACKEND_PUSH": "0", "FETCH_CACHE_DIR": "", "FETCH_CACHE_S3_PREFIX": ""})
+    assert result.stdout.strip().splitlines()[-1] == "[]"
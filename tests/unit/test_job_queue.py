@@ -0,0 +1,107 @@
+# tests/unit/test_job_queue.py
+import threading
+import time
+
+import pytest
+
+from tax_bracket_ingest.worker import jobs as jobs_mod
+from tax_bracket_ingest.worker.jobs import IngestJob, MemoryJobQueue, SQLiteJobQueue, open_job_queue
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def queue(request, tmp_path):
+    q = open_job_queue(request.param, str(tmp_path / "jobs.sqlite3"), max_attempts=2, retry_delay=0.05)
+    yield q
+    q.close()
+
+
+def test_jobs_are_taken_in_order_and_acked(queue):
+    first, second = IngestJob(), IngestJob("https://archive.test/2021", year=2021, push=True)
+    queue.put(first)
+    queue.put(second)
+
+    taken = [queue.take(1), queue.take(1)]
+    assert [job.id for job in taken] == [first.id, second.id]
+    assert taken[1] == IngestJob("https://archive.test/2021", year=2021, push=True, id=second.id, attempts=1)
+    assert queue.status(first.id) == "running" and queue.depth() == 0
+
+    queue.ack(taken[0])
+    assert queue.status(first.id) == "done"
+    assert queue.status("unknown") is None
+    assert queue.take(0.05) is None
+
+
+def test_failed_jobs_retry_with_delay_until_max_attempts(queue):
+    job = IngestJob()
+    queue.put(job)
+
+    assert queue.fail(queue.take(1), "boom") is True
+    assert queue.status(job.id) == "pending" and queue.depth() == 1
+    assert queue.take(0) is None  # still waiting out the retry delay
+    again = queue.take(1)
+    assert again.attempts == 2
+
+    assert queue.fail(again, "boom") is False
+    assert queue.status(job.id) == "failed" and queue.depth() == 0
+
+
+def test_failures_marked_permanent_are_not_retried(queue):
+    queue.put(IngestJob())
+    job = queue.take(1)
+
+    assert queue.fail(job, "bad page", retry=False) is False
+    assert queue.status(job.id) == "failed"
+
+
+def test_take_wakes_up_for_a_job_put_while_waiting():
+    queue = MemoryJobQueue()
+    job = IngestJob()
+    threading.Timer(0.05, queue.put, args=(job,)).start()
+
+    start = time.monotonic()
+    assert queue.take(5).id == job.id
+    assert time.monotonic() - start < 1
+
+
+def test_sqlite_jobs_survive_restarts_and_expired_leases(tmp_path, monkeypatch):
+    path = str(tmp_path / "jobs.sqlite3")
+    clock = [1000.0]
+    monkeypatch.setattr(jobs_mod.time, "time", lambda: clock[0])
+    producer = SQLiteJobQueue(path)
+    job = IngestJob(dry_run=True)
+    producer.put(job)
+    producer.close()
+
+    crashed = SQLiteJobQueue(path, max_attempts=2, lease_seconds=60)
+    assert crashed.take(0) == IngestJob(dry_run=True, id=job.id, attempts=1)
+    assert crashed.take(0) is None  # leased
+
+    clock[0] += 61
+    restarted = SQLiteJobQueue(path, max_attempts=2, lease_seconds=60)
+    assert restarted.take(0).attempts == 2
+
+    clock[0] += 61  # the second attempt also died: give up rather than loop forever
+    assert restarted.take(0) is None
+    assert restarted.status(job.id) == "failed"
+
+
+@pytest.mark.parametrize("data, message", [
+    ({"source": "irs", "year": 2020}, "only holds the current year"),
+    ({"source": "irs", "force": True}, "Unknown job fields: force"),
+    ({"source": "x", "year": "2020"}, "'year' must be int"),
+    ({"source": "x", "year": True}, "'year' must be int"),
+    ({"source": ""}, "needs a source"),
+    (["irs"], "Expected a JSON object"),
+])
+def test_job_validation(data, message):
+    with pytest.raises(ValueError, match=message):
+        IngestJob.from_dict(data)
+
+
+def test_job_round_trips_through_json_form():
+    job = IngestJob("co", dry_run=False)
+
+    assert IngestJob.from_dict(job.to_dict()) == job
+    assert IngestJob.from_dict({}).source == "irs"
+    with pytest.raises(ValueError, match="WORKER_QUEUE must be one of"):
+        open_job_queue("redis")
@@ -0,0 +1,140 @@
+# tests/unit/test_logging_config.py
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+from tax_bracket_ingest import logging_config
+from tax_bracket_ingest.logging_config import (
+    BatchingQueueListener,
+    BatchStreamHandler,
+    BufferedQueueHandler,
+    DebugSampler,
+)
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+
+
+def debug_record(msg, *args, name="tax_bracket_ingest.test", level=logging.DEBUG):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def app_logging(monkeypatch, tmp_path):
+    """``setup_logging`` into ``tmp_path``; the root logger is restored afterwards."""
+    root = logging.getLogger()
+    logging_config.reset_logging()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    monkeypatch.setenv("LOG_TO_FILE", "1")
+    monkeypatch.setenv("LOG_PATH", str(tmp_path / "app.log"))
+    yield tmp_path / "app.log"
+    logging_config.reset_logging()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_async_logging_writes_json_with_extras_and_tracebacks(app_logging, monkeypatch):
+    monkeypatch.setenv("LOG_ASYNC", "1")
+    logging_config.setup_logging()
+    assert isinstance(logging.getLogger().handlers[-1], BufferedQueueHandler)
+
+    log = logging.getLogger("tax_bracket_ingest.test")
+    log.info("loaded %s rows", 7, extra={"year": 2024, "action": "Loaded rows"})
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        log.exception("load_failed")
+    logging_config.flush_logging()
+
+    first, second = read_lines(app_logging)
+    assert first["message"] == "loaded 7 rows" and first["year"] == 2024
+    assert second["levelname"] == "ERROR" and "RuntimeError: boom" in second["exc_info"]
+
+
+def test_repeated_setup_registers_no_exit_hooks(app_logging, monkeypatch):
+    registered = []
+    monkeypatch.setattr(logging_config.atexit, "register", registered.append)
+    monkeypatch.setenv("LOG_ASYNC", "1")
+
+    for _ in range(3):
+        logging_config.reset_logging()
+        logging_config.setup_logging()
+
+    assert registered == []
+
+
+def test_full_queue_drops_or_blocks_by_policy():
+    dropping = BufferedQueueHandler(queue.Queue(2), block=False)
+    for i in range(5):
+        dropping.handle(debug_record("event %d", i))
+
+    assert dropping.queue.qsize() == 2 and dropping.take_dropped() == 3
+    assert dropping.take_dropped() == 0
+
+    blocking = BufferedQueueHandler(queue.Queue(1), block=True)
+    blocking.handle(debug_record("first"))
+    with pytest.raises(queue.Full):
+        blocking.queue.put(debug_record("second"), timeout=0.01)
+
+
+def test_dropped_records_are_reported_on_flush(app_logging, monkeypatch):
+    monkeypatch.setenv("LOG_ASYNC", "1")
+    monkeypatch.setenv("LOG_QUEUE_FULL", "drop")
+    logging_config.setup_logging()
+    logging_config._queue_handler.dropped = 4
+
+    logging_config.flush_logging()
+    logging_config.flush_logging()
+
+    [warning] = [line for line in read_lines(app_logging) if line["message"] == "log_records_dropped"]
+    assert warning["dropped"] == 4
+
+
+def test_listener_flushes_once_per_batch():
+    stream = CountingStream()
+    handler = BatchStreamHandler(stream)
+    log_queue = queue.Queue()
+    for i in range(100):
+        log_queue.put(debug_record("event %d", i))
+    listener = BatchingQueueListener(log_queue, handler, batch_size=40)
+
+    listener.start()
+    assert listener.flush(timeout=5)
+    listener.stop()
+
+    assert stream.getvalue().splitlines() == [f"event {i}" for i in range(100)]
+    assert stream.flushes <= 4
+
+
+def test_sampler_keeps_every_nth_repeat_of_each_debug_event():
+    sampler = DebugSampler(every=3)
+    kept = [i for i in range(7) if sampler.filter(debug_record("fetch %s", i))]
+    other = [sampler.filter(debug_record("parse %s", i)) for i in range(2)]
+    info = [sampler.filter(debug_record("fetch %s", i, level=logging.INFO)) for i in range(3)]
+
+    assert kept == [0, 3, 6] and other == [True, False] and info == [True] * 3
+
+
+@pytest.mark.parametrize("name, value", [
+    ("LOG_QUEUE_FULL", "wait"),
+    ("LOG_QUEUE_SIZE", "0"),
+    ("LOG_DEBUG_SAMPLE_EVERY", "-1"),
+])
+def test_invalid_settings_are_rejected(app_logging, monkeypatch, name, value):
+    monkeypatch.setenv("LOG_ASYNC", "1")
+    monkeypatch.setenv(name, value)
+    with pytest.raises(ValueError, match=name):
+        logging_config.setup_logging()
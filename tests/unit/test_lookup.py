@@ -0,0 +1,112 @@
+# tests/unit/test_lookup.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest.lookup import BracketIndex, Schedule
+from tax_bracket_ingest.parser.normalize import FILING_STATUSES, normalize_long, process_irs_dataframe
+from tax_bracket_ingest.parser.parser import parse_irs_brackets
+
+
+def scalar_brackets(df, year, status):
+    """``[(threshold, rate), ...]`` for one status, read row by row from the wide history."""
+    rows = df[df["Year"] == year]
+    brackets = []
+    for rate, start in zip(rows[status.column], rows[status.start_column]):
+        if isinstance(rate, str):
+            start = int(start.replace("$", "").replace(",", ""))
+            brackets.append((start - 1 if brackets else start, float(rate.rstrip("%")) / 100))
+    return brackets
+
+
+def scalar_tax(income, brackets):
+    tax = 0.0
+    for i, (threshold, rate) in enumerate(brackets):
+        upper = brackets[i + 1][0] if i + 1 < len(brackets) else float("inf")
+        if income > threshold:
+            tax += (min(income, upper) - threshold) * rate
+    return tax
+
+
+def scalar_marginal(income, brackets):
+    rate = brackets[0][1]
+    for threshold, bracket_rate in brackets:
+        if income > threshold:
+            rate = bracket_rate
+    return rate
+
+
+@pytest.fixture
+def raw(sample_page_html):
+    return parse_irs_brackets(sample_page_html.decode("utf-8")).to_frame()
+
+
+@pytest.fixture
+def wide(raw):
+    return process_irs_dataframe(raw)
+
+
+def test_published_2024_single_schedule(wide):
+    index = BracketIndex.from_wide(wide)
+
+    # IRS 2024 single: $5,426 plus 22% of the amount over $47,150
+    assert index.tax_owed([50_000], 2024, "S").tolist() == [5_426 + 0.22 * 2_850]
+    assert index.marginal_rate([11_600, 11_600.5, 609_351], 2024, "S").tolist() == [0.10, 0.12, 0.37]
+    assert index.schedule(2024, "S").base_tax.tolist() == [0, 1_160, 5_426, 17_168.5, 39_110.5, 55_678.5, 183_647.25]
+
+
+@pytest.mark.parametrize("status", FILING_STATUSES, ids=lambda s: s.prefix)
+def test_matches_scalar_reference(wide, status):
+    index = BracketIndex.from_wide(wide)
+    brackets = scalar_brackets(wide, 2024, status)
+    rng = np.random.default_rng(7)
+    thresholds = np.array([t for t, _ in brackets], dtype=float)
+    incomes = np.concatenate([
+        rng.uniform(0, 1_000_000, 2_000),
+        thresholds, thresholds + 0.01, thresholds - 0.01, [0, 1e9],
+    ])
+
+    tax = index.tax_owed(incomes, 2024, status.prefix)
+    rate = index.marginal_rate(incomes, 2024, status.column)
+
+    np.testing.assert_allclose(tax, [scalar_tax(x, brackets) for x in incomes], rtol=1e-12, atol=1e-6)
+    assert rate.tolist() == [scalar_marginal(x, brackets) for x in incomes]
+
+
+def test_long_and_wide_build_the_same_index(raw, wide):
+    from_long, from_wide = BracketIndex.from_long(normalize_long(raw)), BracketIndex.from_wide(wide)
+
+    assert from_long.schedules.keys() == from_wide.schedules.keys() == {(2024, i) for i in range(4)}
+    for key, schedule in from_long.schedules.items():
+        np.testing.assert_array_equal(schedule.thresholds, from_wide.schedules[key].thresholds)
+        np.testing.assert_allclose(schedule.rates, from_wide.schedules[key].rates)
+
+
+def test_multi_year_history_with_padding():
+    wide = pd.DataFrame({
+        "Year": [2025, 2025, 2024, 2024, 2024],
+        "Single Filer (Rates/Brackets)": ["10%", "20%", "10%", "15%", "30%"],
+        "S Range Start": ["$0", "$1,001", "$0", "$501", "$2,001"],
+        "Head of Household (Rates/Brackets)": ["5%", np.nan, "5%", np.nan, np.nan],
+        "HOH Range Start": ["$0", np.nan, "$0", np.nan, np.nan],
+    })
+    index = BracketIndex.from_wide(wide)
+
+    assert index.years == [2024, 2025]
+    assert index.tax_owed([3_000], 2024, 2).tolist() == [50 + 225 + 300]
+    assert index.tax_owed([3_000], 2025, "S").tolist() == [100 + 400]
+    assert index.marginal_rate([10**6], 2025, "HOH").tolist() == [0.05]
+    with pytest.raises(ValueError, match="No brackets for MFJ in 2025"):
+        index.tax_owed([1], 2025, "MFJ")
+
+
+def test_edge_incomes_and_rejected_inputs():
+    schedule = Schedule.from_brackets([0, 101], [0.1, 0.2])
+    index = BracketIndex({(2024, 2): schedule})
+
+    assert index.tax_owed([-50, 0, 100], 2024, "S").tolist() == [0, 0, 10]
+    assert index.effective_rate([0, 200], 2024, "S").tolist() == [0, 0.15]
+    with pytest.raises(ValueError, match="Unknown filing status"):
+        index.tax_owed([1], 2024, "XX")
+    with pytest.raises(ValueError, match="strictly increasing"):
+        Schedule.from_brackets([0, 0], [0.1, 0.2])
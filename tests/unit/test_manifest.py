@@ -0,0 +1,52 @@
+# tests/unit/test_manifest.py
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest.storage.manifest import (
+    Manifest,
+    canonical_value,
+    diff_fingerprints,
+    fingerprint_year,
+)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("10%", 10.0),
+    ("$11,600", 11600),
+    ("$0", "0"),
+    (np.nan, None),
+    ("", " "),
+])
+def test_canonical_value_ignores_representation(a, b):
+    assert canonical_value(a) == canonical_value(b)
+
+
+def test_fingerprint_ignores_dtypes(sample_normalized_df, sample_normalized_csv_bytes):
+    as_strings = pd.read_csv(io.BytesIO(sample_normalized_csv_bytes), dtype=str)
+    assert not sample_normalized_df.equals(as_strings)
+    assert fingerprint_year(sample_normalized_df).digest == fingerprint_year(as_strings).digest
+
+
+def test_diff_reports_status_and_bracket(sample_normalized_df):
+    old = fingerprint_year(sample_normalized_df)
+    revised = sample_normalized_df.copy()
+    revised.loc[2, "HOH Range Start"] = "$63,200"
+
+    change = diff_fingerprints(old, fingerprint_year(revised))
+
+    assert change.changed
+    assert change.changed_brackets == {"Head of Household (Rates/Brackets)": [2]}
+    assert not diff_fingerprints(old, fingerprint_year(sample_normalized_df)).changed
+    assert diff_fingerprints(None, old).is_new
+
+
+def test_manifest_round_trip(sample_normalized_df):
+    manifest = Manifest.from_history(
+        pd.concat([sample_normalized_df, sample_normalized_df.assign(Year=2022)], ignore_index=True)
+    )
+    restored = Manifest.from_json(manifest.to_json())
+    assert sorted(restored.years) == [2022, 2023]
+    assert restored.get(2023) == manifest.get(2023)
@@ -0,0 +1,90 @@
+# tests/unit/test_metrics.py
+import asyncio
+import json
+import logging
+
+import pytest
+
+from tax_bracket_ingest import metrics
+from tax_bracket_ingest.metrics import RESULT, add_bytes, instrument, recording, stage
+
+
+@instrument(bytes_in="payload", bytes_out=RESULT)
+def double(payload: bytes) -> bytes:
+    return payload * 2
+
+
+def test_stage_logs_timings(caplog):
+    caplog.set_level(logging.DEBUG, logger="tax_bracket_ingest.metrics")
+
+    with stage("work") as m:
+        sum(range(10000))
+        add_bytes(bytes_in=10, bytes_out=3)
+
+    record = next(r for r in caplog.records if r.getMessage() == "stage_metrics")
+    assert record.stage == "work" and record.ok and record.levelno == logging.DEBUG
+    assert record.wall_ms >= 0 and record.cpu_ms >= 0
+    assert (record.bytes_in, record.bytes_out) == (10, 3)
+    assert m.peak_bytes is None  # tracemalloc off by default
+
+
+def test_instrument_counts_argument_and_result_sizes():
+    with recording() as recorder:
+        assert double(payload=b"abc") == b"abcabc"
+    assert recorder.summary()["double"]["bytes_in"] == 3
+    assert recorder.summary()["double"]["bytes_out"] == 6
+
+
+def test_failed_stage_is_recorded_as_error():
+    with recording() as recorder:
+        with pytest.raises(ValueError):
+            with stage("boom"):
+                raise ValueError("x")
+    assert recorder.summary()["boom"]["errors"] == 1
+
+
+def test_recording_collects_worker_threads():
+    async def run():
+        with recording() as recorder:
+            await asyncio.gather(*(asyncio.to_thread(double, b"x") for _ in range(3)))
+        return recorder
+
+    summary = asyncio.run(run()).summary()
+    assert summary["double"]["calls"] == 3
+    assert summary["double"]["bytes_in"] == 3
+
+
+def test_tracemalloc_peaks_cover_nested_stages(monkeypatch):
+    monkeypatch.setenv("METRICS_TRACEMALLOC", "1")
+
+    with recording() as recorder:
+        with stage("outer") as outer:
+            with stage("inner") as inner:
+                block = bytearray(4 * 1024 * 1024)
+                del block
+
+    assert inner.peak_bytes >= 4_000_000
+    assert outer.peak_bytes >= inner.peak_bytes
+    assert recorder.summary()["outer"]["peak_bytes"] == outer.peak_bytes
+
+
+def test_emf_line_written_to_stdout(monkeypatch, capsys):
+    monkeypatch.setenv("METRICS_EMF", "1")
+    monkeypatch.setenv("METRICS_NAMESPACE", "Test/Ingest")
+
+    double(b"ab")
+
+    doc = json.loads(capsys.readouterr().out.strip().splitlines()[-1])
+    directive = doc["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Namespace"] == "Test/Ingest"
+    assert directive["Dimensions"] == [["Stage"]]
+    assert {m["Name"] for m in directive["Metrics"]} == {"WallTime", "CpuTime", "BytesIn", "BytesOut"}
+    assert doc["Stage"] == "double" and doc["BytesIn"] == 2
+
+
+def test_payload_size():
+    import pandas as pd
+
+    assert metrics.payload_size(None) is None
+    assert metrics.payload_size("é") == 2
+    assert metrics.payload_size(pd.DataFrame({"a": [1, 2]})) > 0
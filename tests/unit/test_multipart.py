@@ -0,0 +1,86 @@
+# tests/unit/test_multipart.py
+import pytest
+
+from tax_bracket_ingest.storage import multipart
+from tax_bracket_ingest.storage.base import write_csv
+from tax_bracket_ingest.storage.multipart import MultipartWriter
+from tax_bracket_ingest.storage.s3 import S3Storage
+
+
+class RecordingS3:
+    def __init__(self):
+        self.calls = []
+        self.parts = {}
+
+    def put_object(self, **kwargs):
+        self.calls.append(("put_object", bytes(kwargs["Body"])))
+
+    def create_multipart_upload(self, **kwargs):
+        self.calls.append(("create_multipart_upload", kwargs.get("ContentType")))
+        return {"UploadId": "upload-1"}
+
+    def upload_part(self, **kwargs):
+        self.parts[kwargs["PartNumber"]] = bytes(kwargs["Body"])
+        self.calls.append(("upload_part", kwargs["PartNumber"]))
+        return {"ETag": f"etag-{kwargs['PartNumber']}"}
+
+    def complete_multipart_upload(self, **kwargs):
+        self.calls.append(("complete_multipart_upload", kwargs["MultipartUpload"]["Parts"]))
+
+    def abort_multipart_upload(self, **kwargs):
+        self.calls.append(("abort_multipart_upload", kwargs["UploadId"]))
+
+
+def test_small_object_is_one_put():
+    client = RecordingS3()
+    with MultipartWriter(client, "bucket", "key", part_bytes=100) as writer:
+        writer.write(b"a" * 40)
+        writer.write(b"b" * 40)
+
+    assert client.calls == [("put_object", b"a" * 40 + b"b" * 40)]
+    assert writer.bytes_written == 80
+
+
+def test_large_object_is_sent_in_full_parts():
+    client = RecordingS3()
+    data = bytes(range(256)) * 10
+    with MultipartWriter(client, "bucket", "key", part_bytes=1000, content_type="text/csv") as writer:
+        for start in range(0, len(data), 333):
+            writer.write(data[start:start + 333])
+
+    assert [len(client.parts[n]) for n in sorted(client.parts)] == [1000, 1000, 560]
+    assert b"".join(client.parts[n] for n in sorted(client.parts)) == data
+    assert client.calls[0] == ("create_multipart_upload", "text/csv")
+    assert client.calls[-1] == ("complete_multipart_upload", [
+        {"ETag": "etag-1", "PartNumber": 1},
+        {"ETag": "etag-2", "PartNumber": 2},
+        {"ETag": "etag-3", "PartNumber": 3},
+    ])
+
+
+def test_error_aborts_upload():
+    client = RecordingS3()
+    with pytest.raises(RuntimeError):
+        with MultipartWriter(client, "bucket", "key", part_bytes=10) as writer:
+            writer.write(b"x" * 25)
+            raise RuntimeError("serializer failed")
+
+    names = [name for name, _ in client.calls]
+    assert names[-1] == "abort_multipart_upload"
+    assert "complete_multipart_upload" not in names
+    assert "put_object" not in names
+
+
+def test_write_csv_matches_to_csv(sample_normalized_df):
+    client = RecordingS3()
+    size = write_csv(S3Storage("bucket", client, part_bytes=256), "key", sample_normalized_df)
+
+    body = b"".join(client.parts[n] for n in sorted(client.parts))
+    assert body == sample_normalized_df.to_csv(index=False).encode("utf-8")
+    assert size == len(body)
+
+
+def test_part_size_below_s3_minimum_rejected(monkeypatch):
+    monkeypatch.setenv("S3_MULTIPART_PART_BYTES", str(1024 * 1024))
+    with pytest.raises(ValueError):
+        multipart.get_part_bytes()
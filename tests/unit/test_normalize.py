@@ -2,6 +2,10 @@
 
 import pytest
 from tax_bracket_ingest.parser.normalize import (
+    BRACKET_SCHEMA,
+    FILING_STATUSES,
+    normalize_long,
+    populate_range_end,
     process_irs_dataframe, 
     drop_one_duplicate
 )
@@ -41,6 +45,88 @@ def test_drop_one_duplicate(sample_raw_csv):
     assert len_after == len_before - 2, "One duplicate 'Header' column should be removed."
     assert cleaned_df.columns.tolist().count('Header') == 1, "There should be only one 'Header' column in the cleaned DataFrame."
     
+def test_process_irs_dataframe_values(sample_raw_csv):
+    normalized_df = process_irs_dataframe(sample_raw_csv)
+
+    assert normalized_df.columns.tolist() == ['Year'] + [
+        col for s in FILING_STATUSES for col in (s.column, s.start_column, s.end_column)
+    ]
+    assert normalized_df['MFJ Range Start'].tolist()[:2] == ['$0', '$23,201']
+    assert normalized_df['MFJ Range End'].tolist()[:2] == ['$23,200', '$94,300']
+    assert pd.isna(normalized_df['HOH Range End'].iloc[-1])
+    assert normalized_df['Single Filer (Rates/Brackets)'].tolist()[-1] == '37%'
+
+def test_normalize_long_is_typed(sample_raw_csv):
+    long_df = normalize_long(sample_raw_csv)
+
+    assert dict(long_df.dtypes) == {col: pd.api.types.pandas_dtype(t) for col, t in BRACKET_SCHEMA.items()}
+    assert len(long_df) == 28
+    mfj = long_df[long_df['Status'] == 'Married Filing Jointly (Rates/Brackets)']
+    assert mfj['Rate'].tolist() == [0.10, 0.12, 0.22, 0.24, 0.32, 0.35, 0.37]
+    assert mfj['Start'].tolist()[:2] == [0, 23201]
+    assert mfj['End'].tolist()[:2] == [23200, 94300]
+    assert mfj['End'].isna().tolist() == [False] * 6 + [True]
+
+def test_populate_range_end():
+    df = pd.DataFrame({'S Range Start': ['$0', '$11,601', '$47,151']})
+    result = populate_range_end(df)
+    assert result.columns.tolist() == ['S Range Start', 'S Range End']
+    assert result['S Range End'].tolist()[:2] == ['$11,600', '$47,150']
+    assert pd.isna(result['S Range End'].iloc[-1])
+
+
+def _raw_page(year, brackets, headers):
+    rows = []
+    for header in headers:
+        rows.append((header, 'Tax rate', 'on taxable income from . . .'))
+        for i in range(brackets):
+            rows.append((header, f'{10 + i}%', f'${i * 1000:,}'))
+    return pd.DataFrame(rows, columns=['Header', 'Rate', 'Range'])
+
+def test_process_irs_dataframe_detects_statuses_from_headers():
+    headers = [
+        'Head of Household',
+        'Married Filing Jointly or Qualifying Widow(er)',
+        'Tax Rate Schedules for 2016 - Single',
+        'Married Filing Separately',
+    ]
+    raw = pd.concat([
+        pd.DataFrame([('Standard deduction', 'Filing status', 'Amount')], columns=['Header', 'Rate', 'Range']),
+        _raw_page(2016, 6, headers),
+    ], ignore_index=True)
+
+    normalized_df = process_irs_dataframe(raw)
+
+    assert len(normalized_df) == 6
+    assert (normalized_df['Year'] == 2016).all()
+    assert normalized_df['HOH Range Start'].tolist() == ['$0', '$1,000', '$2,000', '$3,000', '$4,000', '$5,000']
+    assert normalized_df['S Range End'].tolist()[:5] == ['$999', '$1,999', '$2,999', '$3,999', '$4,999']
+    assert normalized_df['Married Filing Jointly (Rates/Brackets)'].tolist()[-1] == '15%'
+
+def test_uneven_bracket_counts_are_padded():
+    raw = pd.concat([
+        _raw_page(2024, 7, ['2024 tax rates for a single taxpayer']),
+        _raw_page(2024, 5, ['Married filing jointly']),
+    ], ignore_index=True)
+
+    normalized_df = process_irs_dataframe(raw)
+
+    assert len(normalized_df) == 7
+    assert normalized_df['MFJ Range Start'].isna().tolist() == [False] * 5 + [True] * 2
+    assert pd.isna(normalized_df['MFJ Range End'].iloc[4])
+    assert normalized_df['MFS Range Start'].isna().all()
+
+def test_stacked_years_normalize_in_one_call(sample_raw_csv):
+    older = _raw_page(2016, 6, ['Single', 'Married filing jointly', 'Married filing separately', 'Head of household'])
+    stacked = pd.concat([sample_raw_csv.assign(Year=2024), older.assign(Year=2016)], ignore_index=True)
+
+    normalized_df = process_irs_dataframe(stacked)
+    long_df = normalize_long(stacked)
+
+    assert normalized_df['Year'].tolist() == [2024] * 7 + [2016] * 6
+    pd.testing.assert_frame_equal(normalized_df.iloc[:7], process_irs_dataframe(sample_raw_csv))
+    assert long_df.groupby('Year').size().to_dict() == {2016: 24, 2024: 28}
+
 
 if __name__ == "__main__":
     pytest.main()
\ No newline at end of file
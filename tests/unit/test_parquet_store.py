@@ -0,0 +1,83 @@
+# tests/unit/test_parquet_store.py
+import io
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from tax_bracket_ingest.storage import parquet as store
+from tax_bracket_ingest.storage.s3 import S3Storage
+
+BUCKET = "test-bucket"
+PREFIX = "history/"
+
+
+@pytest.fixture
+def bucket(moto_s3_client):
+    moto_s3_client.create_bucket(Bucket=BUCKET)
+    return moto_s3_client
+
+
+@pytest.fixture
+def storage(bucket):
+    return S3Storage(BUCKET, bucket)
+
+
+@pytest.fixture
+def two_year_history(sample_normalized_df):
+    return pd.concat([sample_normalized_df.assign(Year=2024), sample_normalized_df], ignore_index=True)
+
+
+def test_partition_round_trip_keeps_types(storage, sample_normalized_df):
+    store.write_partitions(storage, PREFIX, sample_normalized_df)
+
+    assert store.list_partition_years(storage, PREFIX) == [2023]
+    key = store.partition_key(PREFIX, 2023)
+    assert key == "history/Year=2023/part-0.parquet"
+    df = store.read_partition(storage, PREFIX, 2023)
+    pd.testing.assert_frame_equal(df, sample_normalized_df)
+    assert store.read_partition(storage, PREFIX, 1999) is None
+
+
+def test_schema_is_typed(sample_normalized_df):
+    import pyarrow.parquet as pq
+
+    schema = pq.read_schema(io.BytesIO(store.frame_to_parquet_bytes(sample_normalized_df)))
+    assert str(schema.field("Year").type) == "int32"
+    assert str(schema.field("Single Filer (Rates/Brackets)").type) == "double"
+    assert str(schema.field("MFJ Range Start").type) == "int64"
+    assert str(schema.field("MFJ Range End").type) == "int64"
+
+
+def test_rates_and_bounds_round_trip_to_display_strings():
+    import pyarrow.parquet as pq
+
+    df = pd.DataFrame({
+        "Year": [2024, 2024, 2024],
+        "Single Filer (Rates/Brackets)": ["10%", "12.5%", "37%"],
+        "S Range Start": ["$0", "$11,601", "$1,000,001"],
+        "S Range End": ["$11,600", "$1,000,000", float("nan")],
+        "HOH Range Start": ["$0", "about $17k", float("nan")],
+    })
+    data = store.frame_to_parquet_bytes(df)
+
+    table = pq.read_table(io.BytesIO(data))
+    assert table.column("Single Filer (Rates/Brackets)").to_pylist() == [0.1, 0.125, 0.37]
+    assert table.column("S Range End").to_pylist() == [11600, 1000000, None]
+    assert str(table.schema.field("HOH Range Start").type) == "string"  # kept as text
+    pd.testing.assert_frame_equal(store.parquet_bytes_to_frame(data), df)
+
+
+def test_migrate_and_export_csv(storage, bucket, two_year_history):
+    buf = io.BytesIO()
+    two_year_history.to_csv(buf, index=False)
+    bucket.put_object(Bucket=BUCKET, Key="history.csv", Body=buf.getvalue())
+
+    assert store.migrate_csv(storage, "history.csv", PREFIX) == [2024, 2023]
+    assert store.list_partition_years(storage, PREFIX) == [2023, 2024]
+
+    bucket.delete_object(Bucket=BUCKET, Key="history.csv")
+    assert store.export_csv(storage, PREFIX, "history.csv") == 14
+    exported = pd.read_csv(bucket.get_object(Bucket=BUCKET, Key="history.csv")["Body"])
+    pd.testing.assert_frame_equal(exported, two_year_history)
@@ -0,0 +1,76 @@
+# tests/unit/test_parser_model.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest.parser.model import BracketTable
+from tax_bracket_ingest.parser.normalize import process_irs_dataframe
+from tax_bracket_ingest.parser.parser import (
+    parse_html,
+    parse_irs_brackets,
+    parse_irs_data,
+    parse_irs_data_to_dataframe,
+)
+
+
+def dict_pipeline_frame(html):
+    """The nested-dict path parse_irs_brackets replaced: filter, then one dict per row."""
+    irs_data = {k: v for k, v in parse_html(html, backend="html.parser").items() if v and any(v.values())}
+    rows = [
+        {"Header": header, "Rate": rate, "Range": value}
+        for header, content in irs_data.items()
+        for rate, value in content["table"].items()
+    ]
+    return pd.DataFrame(rows, columns=["Header", "Rate", "Range"])
+
+
+@pytest.mark.parametrize("html", [
+    "<table><tr><td>a</td><td>b</td></tr></table><h2>Late</h2>",
+    "<h2>A</h2><h2>B</h2><h2>A</h2><table><tr><td>1</td><td>2</td></tr></table>",
+    "<h2>A</h2><table><tr><td>1</td><td>2</td></tr></table><table><tr><td>x</td><td>y</td></tr></table>",
+    # repeated rate keeps its first slot; a repeated header drops its rows; rows after a
+    # new header still land in the open table
+    "<h2>X</h2><table><tr><td>1</td><td>a</td></tr><tr><td>2</td><td>b</td></tr><tr><td>1</td><td>c</td></tr>"
+    "</table><h2>Y</h2><tr><td>3</td><td>d</td></tr><table><tr><td>4</td><td>e</td></tr></table>"
+    "<h2>X</h2><h4>Z</h4><table></table>",
+    "",
+])
+def test_bracket_table_matches_dict_pipeline(html):
+    table = parse_irs_brackets(html, backend="html.parser")
+
+    pd.testing.assert_frame_equal(table.to_frame(), dict_pipeline_frame(html))
+    assert table.to_dict() == parse_irs_data(html, backend="html.parser")
+
+
+def test_sample_page_normalizes_identically(sample_page_html):
+    html = sample_page_html.decode("utf-8")
+    frame = parse_irs_brackets(html).to_frame()
+
+    pd.testing.assert_frame_equal(frame, dict_pipeline_frame(html))
+    pd.testing.assert_frame_equal(process_irs_dataframe(frame), process_irs_dataframe(dict_pipeline_frame(html)))
+
+
+def test_to_frame_wraps_columns_without_copying(sample_page_html):
+    table = parse_irs_brackets(sample_page_html.decode("utf-8"))
+    frame = table.to_frame()
+
+    assert np.shares_memory(frame.to_numpy(), table.values)
+    assert table.codes.dtype == np.int32
+    assert len(table.headers) == 4 and len(table) == 4 * 8
+
+
+def test_typed_columns(sample_page_html):
+    table = parse_irs_brackets(sample_page_html.decode("utf-8"))
+
+    assert table.rate.dtype == np.float32
+    assert np.isnan(table.rate[0]) and table.rate[1:3].tolist() == [10.0, 12.0]
+    assert table.start.dtype == "Int64"
+    assert table.start[0] is pd.NA and table.start[1:3].tolist() == [0, 11601]
+
+
+def test_dataframe_from_dict_or_table(sample_page_html):
+    html = sample_page_html.decode("utf-8")
+    from_dict = parse_irs_data_to_dataframe(parse_irs_data(html))
+
+    pd.testing.assert_frame_equal(from_dict, parse_irs_data_to_dataframe(parse_irs_brackets(html)))
+    assert BracketTable.from_dict({}).to_frame().columns.tolist() == ["Header", "Rate", "Range"]
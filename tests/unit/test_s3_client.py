@@ -0,0 +1,73 @@
+# tests/unit/test_s3_client.py
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.storage import s3 as s3_clients
+from tax_bracket_ingest.storage.s3 import S3ClientConfig, get_s3_client
+
+
+def test_client_is_reused_per_configuration():
+    first = get_s3_client()
+    assert get_s3_client() is first
+    assert get_s3_client(S3ClientConfig(max_pool_connections=4)) is not first
+
+
+def test_concurrent_callers_share_one_client():
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        clients = list(pool.map(lambda _: get_s3_client(), range(32)))
+    assert len({id(c) for c in clients}) == 1
+
+
+def test_pool_and_retry_settings_from_env(monkeypatch):
+    monkeypatch.setenv("S3_MAX_POOL_CONNECTIONS", "25")
+    monkeypatch.setenv("S3_MAX_ATTEMPTS", "5")
+    monkeypatch.setenv("S3_RETRY_MODE", "adaptive")
+
+    client = get_s3_client()
+
+    assert client.meta.config.max_pool_connections == 25
+    assert client.meta.config.retries == {"total_max_attempts": 5, "mode": "adaptive"}
+
+
+def test_invalid_retry_mode(monkeypatch):
+    monkeypatch.setenv("S3_RETRY_MODE", "aggressive")
+    with pytest.raises(ValueError):
+        S3ClientConfig.from_env()
+
+
+def test_injected_client_is_used_by_ingest_helpers(sample_normalized_csv_bytes):
+    class FakeS3:
+        def __init__(self):
+            self.calls = []
+
+        def get_object(self, **kwargs):
+            self.calls.append(kwargs)
+            self.body = _Body(sample_normalized_csv_bytes)
+            return {"Body": self.body}
+
+    class _Body:
+        def __init__(self, data):
+            self.data = data
+            self.reads = []
+
+        def read(self, amt=None):
+            self.reads.append(amt)
+            chunk, self.data = (self.data, b"") if amt is None else (self.data[:amt], self.data[amt:])
+            return chunk
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    fake = FakeS3()
+    s3_clients.set_s3_client(fake)
+
+    df = run_ingest.read_csv_from_s3("history.csv")
+
+    assert fake.calls == [{"Bucket": "test-bucket", "Key": "history.csv"}]
+    assert len(df) == 7
+    assert None not in fake.body.reads  # streamed in blocks, never read whole
@@ -33,5 +33,66 @@ def test_fetch_irs_data_content(sample_page_html):
     assert "Head of household" in content, "Fetched content should contain 'Head of Household'."
     assert "Married filing separately" in content, "Fetched content should contain 'Married Filing Separately'."
 
+@pytest.fixture
+def irs_stand_in(http_stand_in, sample_page_html):
+    """Serve the sample page with validators and honour If-None-Match."""
+    def page(handler, _body):
+        if handler.headers.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"'}, b""
+        return 200, {"ETag": '"v1"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}, sample_page_html
+    http_stand_in.routes[("GET", "/brackets")] = page
+    return http_stand_in
+
+
+def test_fetch_conditional_records_validators(irs_stand_in, sample_page_html):
+    from tax_bracket_ingest.scraper.fetch import content_hash, fetch_conditional
+
+    result = fetch_conditional(irs_stand_in.url + "/brackets")
+
+    assert result.status_code == 200 and not result.unchanged
+    assert result.content == sample_page_html
+    assert result.entry.etag == '"v1"'
+    assert result.entry.last_modified == "Wed, 01 Jan 2025 00:00:00 GMT"
+    assert result.entry.sha256 == content_hash(sample_page_html)
+
+
+def test_fetch_conditional_not_modified(irs_stand_in):
+    from tax_bracket_ingest.scraper.fetch import fetch_conditional
+
+    url = irs_stand_in.url + "/brackets"
+    first = fetch_conditional(url)
+    second = fetch_conditional(url, first.entry)
+
+    assert second.status_code == 304 and second.unchanged
+    assert second.content is None
+    assert second.entry == first.entry
+    sent = irs_stand_in.requests[-1]["headers"]
+    assert sent["If-None-Match"] == '"v1"'
+    assert sent["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+def test_fetch_conditional_same_hash_without_validators(http_stand_in, sample_page_html):
+    from tax_bracket_ingest.scraper.fetch import fetch_conditional
+
+    http_stand_in.routes[("GET", "/plain")] = lambda handler, body: (200, {}, sample_page_html)
+    url = http_stand_in.url + "/plain"
+    first = fetch_conditional(url)
+    second = fetch_conditional(url, first.entry)
+
+    assert second.status_code == 200 and second.unchanged
+    assert "If-None-Match" not in http_stand_in.requests[-1]["headers"]
+
+
+def test_local_fetch_cache_round_trip(tmp_path):
+    from tax_bracket_ingest.scraper.cache import CacheEntry, FetchCache, LocalFetchCache, S3FetchCache
+
+    cache = LocalFetchCache(str(tmp_path / "cache"))
+    entry = CacheEntry(url="https://example.test", etag='"e"', last_modified=None, sha256="abc")
+
+    assert isinstance(cache, FetchCache) and isinstance(S3FetchCache("bucket", "cache/"), FetchCache)
+    assert cache.load(entry.url) is None
+    cache.store(entry)
+    assert cache.load(entry.url) == entry
+
 if __name__ == "__main__":
     pytest.main()
\ No newline at end of file
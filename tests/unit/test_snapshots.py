@@ -0,0 +1,115 @@
+# tests/unit/test_snapshots.py
+import gzip
+
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest.parser.normalize import process_irs_dataframe
+from tax_bracket_ingest.run_ingest import parse_html_frame
+from tax_bracket_ingest.storage import snapshots as snapshots_mod
+from tax_bracket_ingest.storage.local import LocalStorage
+from tax_bracket_ingest.storage.memory import MemoryStorage
+from tax_bracket_ingest.storage.snapshots import SnapshotCache, content_hash
+
+
+def failing(stage):
+    def fail(*_args):
+        pytest.fail(f"{stage} ran on a cache hit")
+    return fail
+
+
+def test_pages_are_stored_compressed_and_found_by_url(sample_page_html):
+    cache = SnapshotCache(MemoryStorage(), "snap/")
+
+    digest = cache.put_html(sample_page_html, url="https://irs.test/page")
+
+    stored = cache.storage.read(f"snap/html/{digest}.html.gz")
+    assert digest == content_hash(sample_page_html)
+    assert len(stored) < len(sample_page_html) and gzip.decompress(stored) == sample_page_html
+    assert cache.html_for_url("https://irs.test/page") == sample_page_html
+    assert cache.html_for_url("https://irs.test/other") is None
+
+
+def test_load_runs_only_the_stages_that_miss(sample_page_html, monkeypatch):
+    cache = SnapshotCache(MemoryStorage())
+    expected = process_irs_dataframe(parse_html_frame(sample_page_html))
+
+    first = cache.load(sample_page_html, parse_html_frame, process_irs_dataframe)
+    again = cache.load(sample_page_html, failing("parse"), failing("normalize"))
+
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(again, expected)
+
+    # A normalizer change misses the normalized frame but still reuses the parsed one
+    real_version = snapshots_mod.code_version
+    monkeypatch.setattr(snapshots_mod, "code_version",
+                        lambda modules: "changed" if modules == snapshots_mod.NORMALIZER_MODULES else real_version(modules))
+    renormalized = cache.load(sample_page_html, failing("parse"), lambda raw: process_irs_dataframe(raw).head(1))
+    assert len(renormalized) == 1
+    assert cache.get_normalized(sample_page_html).equals(renormalized)
+
+
+def test_least_recently_used_objects_are_evicted(tmp_path, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr(snapshots_mod.time, "time", lambda: next(clock))
+    cache = SnapshotCache(LocalStorage(tmp_path), max_bytes=100)
+    pages = [bytes([i]) * 4000 for i in range(4)]  # ~40 bytes each once gzipped
+
+    digests = [cache.put_html(pages[0]), cache.put_html(pages[1])]
+    assert cache.get_html(digests[0]) == pages[0]  # page 1 is now the oldest
+    digests.append(cache.put_html(pages[2]))
+
+    assert cache.get_html(digests[1]) is None
+    assert cache.get_html(digests[0]) == pages[0] and cache.get_html(digests[2]) == pages[2]
+    assert cache.total_bytes <= 100
+
+    # The index survives a new instance, so the next eviction still knows the sizes
+    reopened = SnapshotCache(LocalStorage(tmp_path), max_bytes=100)
+    reopened.put_html(pages[3])
+    assert reopened.get_html(digests[0]) is None
+    assert sorted(p.name for p in (tmp_path / "html").iterdir()) == sorted(
+        f"{content_hash(page)}.html.gz" for page in pages[2:]
+    )
+
+
+class CountingStorage(MemoryStorage):
+    def __init__(self):
+        super().__init__()
+        self.reads, self.writes = [], []
+
+    def read(self, key):
+        self.reads.append(key)
+        return super().read(key)
+
+    def write(self, key, data, content_type=None):
+        self.writes.append(key)
+        super().write(key, data, content_type)
+
+
+def test_hits_write_the_index_once_on_close(sample_page_html):
+    storage = CountingStorage()
+    SnapshotCache(storage).load(sample_page_html, parse_html_frame, process_irs_dataframe)
+    SnapshotCache(storage).put_html(sample_page_html, url="https://irs.test/page")
+    storage.reads.clear()
+    storage.writes.clear()
+
+    cache = SnapshotCache(storage)
+    digest = cache.put_html(sample_page_html, url="https://irs.test/page")
+    cache.load(sample_page_html, failing("parse"), failing("normalize"))
+    assert storage.writes == []
+    assert cache.html_key(digest) not in storage.reads  # an existing page is not downloaded
+
+    cache.close()
+    cache.close()
+    assert storage.writes == ["index.json"]
+
+
+def test_read_only_cache_never_writes(sample_page_html):
+    storage = CountingStorage()
+    cache = SnapshotCache(storage).as_read_only()
+
+    cache.put_html(sample_page_html, url="https://irs.test/page")
+    cache.load(sample_page_html, parse_html_frame, process_irs_dataframe)
+    cache.close()
+
+    assert storage.writes == []
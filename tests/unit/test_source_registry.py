@@ -0,0 +1,106 @@
+# tests/unit/test_source_registry.py
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+
+from tax_bracket_ingest.parser.normalize import BRACKET_SCHEMA
+from tax_bracket_ingest.sources.registry import IRS_SOURCE, Source, load_sources
+from tax_bracket_ingest.sources.scheduler import HostLimiter
+from tax_bracket_ingest.storage import dataset
+from tax_bracket_ingest.storage.memory import MemoryStorage
+
+STATE_PAGE = (
+    b"<h2>Income tax rates</h2>"
+    b"<h4>Single filers</h4><table><tr><th>Rate</th><th>Taxable income</th></tr>"
+    b"<tr><td>2%</td><td>$0</td></tr><tr><td>4.5%</td><td>$10,000</td></tr></table>"
+    b"<h4>Married filing jointly</h4><table><tr><td>2%</td><td>$0</td></tr></table>"
+)
+
+
+def test_irs_source_loads_long_rows(sample_page_html):
+    df = IRS_SOURCE.load(sample_page_html)
+
+    assert df.columns.tolist() == ["Jurisdiction", *BRACKET_SCHEMA]
+    assert set(df["Jurisdiction"]) == {"US"} and set(df["Year"]) == {2024}
+    assert len(df) == 4 * 7
+
+
+def test_source_year_overrides_headings():
+    df = Source("co", "https://tax.example.gov/co", "CO", year=2025).load(STATE_PAGE)
+
+    assert df["Year"].tolist() == [2025] * 3
+    assert df["Rate"].tolist() == [0.02, 0.02, 0.045]
+    assert df["End"].tolist() == [pd.NA, 9999, pd.NA]
+
+
+def test_load_sources_reads_file(tmp_path, monkeypatch):
+    path = tmp_path / "sources.json"
+    path.write_text(json.dumps([{"name": "co", "url": "https://Tax.Example.gov/co", "jurisdiction": "CO"}]))
+    monkeypatch.setenv("SOURCES_FILE", str(path))
+
+    sources = load_sources()
+
+    assert [s.name for s in sources] == ["irs", "co"]
+    assert sources[1].host == "tax.example.gov"
+
+
+@pytest.mark.parametrize("entry,match", [
+    ({"name": "co", "url": "u", "jurisdiction": "CO", "parser": "pdf"}, "unknown parser"),
+    ({"name": "co", "url": "u"}, "Invalid source entry"),
+    ({"name": "irs", "url": "u", "jurisdiction": "US"}, "Duplicate source names: irs"),
+])
+def test_load_sources_rejects_bad_entries(tmp_path, entry, match):
+    path = tmp_path / "sources.json"
+    path.write_text(json.dumps([entry]))
+    with pytest.raises(ValueError, match=match):
+        load_sources(str(path))
+
+
+def test_host_limiter_spaces_starts_and_caps_in_flight():
+    now = [0.0]
+
+    async def sleep(seconds):
+        now[0] += seconds  # virtual time: the sleeper wakes at the start it reserved
+        await asyncio.sleep(0)
+
+    async def scenario():
+        limiter = HostLimiter(per_host=1, interval=0.05, clock=lambda: now[0], sleep=sleep)
+        starts, in_flight, peak = {"a": [], "b": []}, {"a": 0, "b": 0}, {"a": 0, "b": 0}
+
+        async def request(host):
+            async with limiter.slot(host):
+                starts[host].append(now[0])
+                in_flight[host] += 1
+                peak[host] = max(peak[host], in_flight[host])
+                await asyncio.sleep(0)
+                in_flight[host] -= 1
+
+        await asyncio.gather(*(request(host) for _ in range(3) for host in ("a", "b")))
+        return starts, peak
+
+    starts, peak = asyncio.run(scenario())
+    assert peak == {"a": 1, "b": 1}
+    assert starts["a"] == pytest.approx([0.0, 0.05, 0.1])
+    for host in ("a", "b"):
+        assert all(b - a >= 0.05 - 1e-9 for a, b in zip(starts[host], starts[host][1:]))
+    # Another host has its own spacing, not the queue of host ``a``
+    assert starts["b"][0] == 0.0
+
+
+def test_dataset_round_trip_by_partition():
+    storage = MemoryStorage()
+    df = pd.concat([
+        IRS_SOURCE.load(b"<h2>2024 tax rates for a single taxpayer</h2><table><tr><td>10%</td><td>$0</td></tr></table>"),
+        Source("co", "https://tax.example.gov/co", "CO", year=2025).load(STATE_PAGE),
+    ], ignore_index=True)
+
+    assert dataset.write_dataset(storage, "brackets/", df) == [("US", 2024), ("CO", 2025)]
+    assert dataset.list_partitions(storage, "brackets/") == [("CO", 2025), ("US", 2024)]
+
+    back = dataset.read_dataset(storage, "brackets/")
+    expected = df.sort_values("Jurisdiction", kind="stable").reset_index(drop=True)
+    pd.testing.assert_frame_equal(back, expected)
+    assert dataset.read_dataset(storage, "brackets/", jurisdiction="US")["Jurisdiction"].tolist() == ["US"]
+    assert dataset.read_dataset(storage, "other/").columns.tolist() == list(dataset.DATASET_COLUMNS)
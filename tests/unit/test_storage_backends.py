@@ -0,0 +1,114 @@
+# tests/unit/test_storage_backends.py
+import pytest
+
+from tax_bracket_ingest import run_ingest
+from tax_bracket_ingest.storage.base import ObjectNotFound, Storage, open_storage, read_csv, write_csv
+from tax_bracket_ingest.storage.local import LocalStorage
+from tax_bracket_ingest.storage.memory import MemoryStorage
+from tax_bracket_ingest.storage.s3 import S3Storage
+
+
+@pytest.fixture(params=["s3", "local", "memory"])
+def storage(request, tmp_path):
+    if request.param == "s3":
+        client = request.getfixturevalue("moto_s3_client")
+        client.create_bucket(Bucket="test-bucket")
+        return S3Storage("test-bucket", client)
+    if request.param == "local":
+        return LocalStorage(tmp_path)
+    return MemoryStorage()
+
+
+def test_backends_satisfy_protocol(storage):
+    assert isinstance(storage, Storage)
+
+
+def test_write_read_open_list(storage):
+    storage.write("history/Year=2024/part-0.parquet", b"2024")
+    storage.write("history/Year=2023/part-0.parquet", b"2023")
+    storage.write("history.csv", b"")
+
+    assert storage.read("history/Year=2024/part-0.parquet") == b"2024"
+    with storage.open("history/Year=2023/part-0.parquet") as fh:
+        assert fh.read() == b"2023"
+    with storage.open("history.csv") as fh:
+        assert fh.read() == b""
+    assert storage.list("history/") == [
+        "history/Year=2023/part-0.parquet",
+        "history/Year=2024/part-0.parquet",
+    ]
+    assert storage.list("nothing/") == []
+
+
+def test_missing_key_raises_object_not_found(storage):
+    with pytest.raises(ObjectNotFound):
+        storage.read("missing.csv")
+    with pytest.raises(ObjectNotFound):
+        storage.open("missing.csv")
+
+
+def test_exists_checks_a_key_without_reading_it(storage):
+    storage.write("snapshots/a", b"a")
+
+    assert storage.exists("snapshots/a")
+    assert not storage.exists("snapshots/missing")
+
+
+def test_delete_removes_key_and_ignores_missing(storage):
+    storage.write("snapshots/a", b"a")
+    storage.write("snapshots/b", b"b")
+
+    storage.delete("snapshots/a")
+    storage.delete("snapshots/missing")
+
+    assert storage.list("snapshots/") == ["snapshots/b"]
+
+
+def test_failed_writer_leaves_previous_object(storage):
+    storage.write("history.csv", b"old")
+    with pytest.raises(RuntimeError):
+        with storage.writer("history.csv") as fh:
+            fh.write(b"half-written")
+            raise RuntimeError("serializer failed")
+
+    assert storage.read("history.csv") == b"old"
+    assert storage.list() == ["history.csv"]
+
+
+def test_csv_round_trip(storage, sample_normalized_df):
+    size = write_csv(storage, "history.csv", sample_normalized_df)
+    df, bytes_read = read_csv(storage, "history.csv")
+
+    assert size == bytes_read == len(sample_normalized_df.to_csv(index=False).encode("utf-8"))
+    assert df.equals(sample_normalized_df)
+
+
+def test_local_keys_cannot_escape_root(tmp_path):
+    with pytest.raises(ValueError):
+        LocalStorage(tmp_path / "root").read("../outside.csv")
+
+
+def test_open_storage_selects_backend(tmp_path):
+    assert isinstance(open_storage("s3", bucket="b"), S3Storage)
+    assert isinstance(open_storage("local", root=str(tmp_path)), LocalStorage)
+    assert open_storage("memory", bucket="b") is open_storage("memory", bucket="b")
+    with pytest.raises(ValueError):
+        open_storage("local")
+    with pytest.raises(ValueError):
+        open_storage("ftp")
+
+
+def test_config_requires_only_the_selected_backends_settings(monkeypatch, tmp_path):
+    monkeypatch.delenv("S3_BUCKET")
+    monkeypatch.setenv("STORAGE_BACKEND", "local")
+    with pytest.raises(ValueError, match="STORAGE_ROOT"):
+        run_ingest.get_ingest_config()
+
+    run_ingest.get_ingest_config.cache_clear()
+    monkeypatch.setenv("STORAGE_ROOT", str(tmp_path))
+    assert isinstance(run_ingest.get_storage(), LocalStorage)
+
+    run_ingest.get_ingest_config.cache_clear()
+    monkeypatch.setenv("STORAGE_BACKEND", "gcs")
+    with pytest.raises(ValueError):
+        run_ingest.get_ingest_config()
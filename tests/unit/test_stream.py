@@ -0,0 +1,48 @@
+# tests/unit/test_stream.py
+import pytest
+from bs4 import BeautifulSoup
+
+from tax_bracket_ingest.parser.parser import parse_html, parse_table, parse_irs_data
+from tax_bracket_ingest.parser.stream import iter_brackets
+
+
+def soup_parse_html(html_content):
+    """Reference tree walk that parse_html replaced."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    data = {}
+    for tag in soup.find_all(['h2', 'h4', 'table']):
+        if tag.name in ['h2', 'h4']:
+            data[tag.get_text(strip=True)] = {}
+        elif data:
+            data[list(data.keys())[-1]]['table'] = parse_table(tag)
+    return data
+
+
+def test_parse_html_matches_tree_walk(sample_page_html):
+    html = sample_page_html.decode('utf-8')
+    assert parse_html(html) == soup_parse_html(html)
+
+
+@pytest.mark.parametrize("html", [
+    "<table><tr><td>a</td><td>b</td></tr></table><h2>Late</h2>",
+    "<h2>A <b>b</b> &amp; c</h2><table><tr><th>r</th><td>v<script>x()</script></td></tr>"
+    "<tr><td>single cell</td></tr></table><h4>Empty</h4>",
+    "<h2>A</h2><h2>B</h2><h2>A</h2><table><tr><td>1</td><td>2</td></tr></table>",
+    "<h2>A</h2><table><tr><td>1</td><td>2</td></tr></table><table><tr><td>x</td><td>y</td></tr></table>",
+])
+def test_parse_html_matches_tree_walk_edge_cases(html):
+    assert parse_html(html) == soup_parse_html(html)
+
+
+def test_iter_brackets_matches_parse_irs_data(sample_page_html):
+    expected = [
+        (header, rate, value)
+        for header, content in parse_irs_data(sample_page_html).items()
+        for rate, value in content['table'].items()
+    ]
+    assert list(iter_brackets(sample_page_html)) == expected
+
+
+def test_iter_brackets_accepts_byte_chunks(sample_page_html):
+    chunks = (sample_page_html[i:i + 7] for i in range(0, len(sample_page_html), 7))
+    assert list(iter_brackets(chunks)) == list(iter_brackets(sample_page_html))
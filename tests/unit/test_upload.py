@@ -0,0 +1,56 @@
+# tests/unit/test_upload.py
+import gzip
+import io
+
+import pandas as pd
+import pytest
+import zstandard
+
+from tax_bracket_ingest.backend import upload
+
+
+def test_csv_chunks_join_to_full_csv(sample_normalized_df):
+    chunks = list(upload.iter_csv_chunks(sample_normalized_df, rows_per_chunk=3))
+
+    assert len(chunks) == 3
+    assert b"".join(chunks) == sample_normalized_df.to_csv(index=False).encode("utf-8")
+
+
+def test_empty_frame_yields_header_only():
+    df = pd.DataFrame(columns=["Year", "Rate"])
+    assert b"".join(upload.iter_csv_chunks(df)) == b"Year,Rate\n"
+
+
+@pytest.mark.parametrize("encoding, decode", [
+    ("gzip", gzip.decompress),
+    ("zstd", lambda data: zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)).read()),
+    ("identity", lambda data: data),
+])
+def test_encoded_stream_round_trips(sample_normalized_df, encoding, decode):
+    big = pd.concat([sample_normalized_df] * 200, ignore_index=True)
+    body = b"".join(upload.encode_chunks(upload.iter_csv_chunks(big, 100), encoding))
+
+    assert decode(body) == big.to_csv(index=False).encode("utf-8")
+
+
+def test_parse_accept_encoding():
+    assert upload.parse_accept_encoding("gzip;q=0.5, ZSTD , br;q=0") == {"gzip", "zstd"}
+    assert upload.parse_accept_encoding(None) == set()
+
+
+def test_parse_accept_encoding_reads_every_parameter_and_tolerates_bad_weights():
+    assert upload.parse_accept_encoding("gzip;level=9;q=0, zstd;q=abc, br;q=") == {"zstd", "br"}
+
+
+def test_choose_encoding_prefers_zstd(monkeypatch):
+    assert upload.choose_encoding({"gzip", "zstd"}) == "zstd"
+    assert upload.choose_encoding({"gzip"}) == "gzip"
+    assert upload.choose_encoding({"br"}) == upload.IDENTITY
+    monkeypatch.setattr(upload, "zstd_available", lambda: False)
+    assert upload.choose_encoding({"zstd"}) == upload.IDENTITY
+
+
+def test_invalid_encoding_setting(monkeypatch):
+    monkeypatch.setenv("BACKEND_UPLOAD_ENCODING", "brotli")
+    with pytest.raises(ValueError):
+        upload.get_upload_encoding()